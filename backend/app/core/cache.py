@@ -0,0 +1,338 @@
+"""In-process caches.
+
+Caches are local to a worker process: entries must be invalidated explicitly
+when the source data changes, and expire after a TTL to bound the staleness
+across processes. Entries of a `SizedLRUCache` never expire: it caches
+immutable data, bounded by its size in memory rather than its count.
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+
+from pydantic import BaseModel, computed_field
+
+from .metrics import Counter
+
+
+class CacheStats(BaseModel):
+    """Point-in-time statistics of a cache."""
+
+    size: int
+    max_size: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+    evictions: int
+    """Entries removed to make room for new ones."""
+    invalidations: int
+    """Entries removed because the source data changed."""
+
+    @computed_field
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class TTLCache[K: Hashable, V]:
+    """Bounded, thread-safe LRU cache whose entries expire after a TTL.
+
+    Values are returned as stored: they should be immutable, since they are
+    shared between requests.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl_seconds: float,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            max_size: Maximum number of entries (0 disables the cache)
+            ttl_seconds: Time after which an entry expires
+            timer: Clock used for expiration (default: `time.monotonic`)
+
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._timer = timer
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = Counter()
+        self.misses = Counter()
+        self.evictions = Counter()
+        self.invalidations = Counter()
+
+    def get(self, key: K) -> V | None:
+        """Get a value, if cached and not expired.
+
+        Args:
+            key: The cache key
+
+        Returns:
+            The cached value, or None on a miss.
+
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= self._timer():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses.inc()
+                return None
+            self._entries.move_to_end(key)
+        self.hits.inc()
+        return entry[1]
+
+    def set(self, key: K, value: V) -> None:
+        """Cache a value, evicting the least recently used entry if full.
+
+        Args:
+            key: The cache key
+            value: The value to cache
+
+        """
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self._timer() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions.inc()
+
+    def invalidate(self, key: K) -> None:
+        """Remove an entry, if cached.
+
+        Args:
+            key: The cache key
+
+        """
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self.invalidations.inc()
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        """Get the statistics of the cache.
+
+        Returns:
+            CacheStats: Size and counters, since the process started.
+
+        """
+        return CacheStats(
+            size=len(self._entries),
+            max_size=self.max_size,
+            ttl_seconds=self.ttl_seconds,
+            hits=self.hits.value,
+            misses=self.misses.value,
+            evictions=self.evictions.value,
+            invalidations=self.invalidations.value,
+        )
+
+
+class SizedCacheStats(BaseModel):
+    """Point-in-time statistics of a cache bounded by a memory budget."""
+
+    size: int
+    total_bytes: int
+    """Sum of the sizes of the cached entries."""
+    max_bytes: int
+    hits: int
+    misses: int
+    loads: int
+    """Entries loaded on a miss, by `SizedLRUCache.get_or_load`."""
+    coalesced: int
+    """Misses which waited for a load already in progress."""
+    evictions: int
+    """Entries removed to make room for new ones."""
+    invalidations: int
+    """Entries removed because the source data changed."""
+
+    @computed_field
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class SizedLRUCache[K: Hashable, V]:
+    """Thread-safe LRU cache bounded by the total size of its entries.
+
+    Each entry has a size, such as its memory footprint in bytes: the least
+    recently used entries are evicted when the total exceeds the budget. An
+    entry larger than the whole budget is not cached.
+
+    Missing entries are loaded with `get_or_load`, once: concurrent lookups of
+    a key being loaded wait for the same load, on the event loop. A load
+    during which the key is invalidated is returned to its lookups, but not
+    cached: it may have read the data from before the change.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            max_bytes: Maximum total size of the entries (0 disables the cache)
+
+        """
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[K, tuple[int, V]] = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._loads: dict[K, asyncio.Future[V]] = {}
+        self._generations: dict[K, int] = {}
+        """Invalidations of the keys being loaded, since their load started."""
+        self.hits = Counter()
+        self.misses = Counter()
+        self.loads = Counter()
+        self.coalesced = Counter()
+        self.evictions = Counter()
+        self.invalidations = Counter()
+
+    def get(self, key: K) -> V | None:
+        """Get a value, if cached.
+
+        Args:
+            key: The cache key
+
+        Returns:
+            The cached value, or None on a miss.
+
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses.inc()
+                return None
+            self._entries.move_to_end(key)
+        self.hits.inc()
+        return entry[1]
+
+    def set(self, key: K, value: V, size: int) -> None:
+        """Cache a value, evicting the least recently used entries if full.
+
+        Args:
+            key: The cache key
+            value: The value to cache
+            size: The size of the value, counted against the budget
+
+        """
+        with self._lock:
+            self._store(key, value, size)
+
+    def _store(self, key: K, value: V, size: int) -> None:
+        if size > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._total_bytes -= previous[0]
+        self._entries[key] = (size, value)
+        self._total_bytes += size
+        while self._total_bytes > self.max_bytes:
+            evicted_size, _ = self._entries.popitem(last=False)[1]
+            self._total_bytes -= evicted_size
+            self.evictions.inc()
+
+    async def get_or_load(
+        self,
+        key: K,
+        load: Callable[[], Awaitable[tuple[V, int]]],
+    ) -> V:
+        """Get a value, loading and caching it on a miss.
+
+        A key is loaded once at a time: lookups while it is loaded wait for
+        the same load, and get its result or its exception. A cancelled
+        lookup does not cancel the load for the others.
+
+        Args:
+            key: The cache key
+            load: Coroutine function returning the value and its size
+
+        Returns:
+            The cached or loaded value.
+
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        future = self._loads.get(key)
+        if future is None:
+            with self._lock:
+                self._generations[key] = 0
+            future = asyncio.ensure_future(self._load(key, load))
+            self._loads[key] = future
+        else:
+            self.coalesced.inc()
+        return await asyncio.shield(future)
+
+    async def _load(
+        self,
+        key: K,
+        load: Callable[[], Awaitable[tuple[V, int]]],
+    ) -> V:
+        try:
+            value, size = await load()
+            self.loads.inc()
+            with self._lock:
+                if self._generations[key] == 0:
+                    self._store(key, value, size)
+            return value
+        finally:
+            del self._loads[key]
+            with self._lock:
+                del self._generations[key]
+
+    def invalidate(self, key: K) -> None:
+        """Remove an entry, if cached, and keep the load in progress from caching it.
+
+        Args:
+            key: The cache key
+
+        """
+        with self._lock:
+            if key in self._generations:
+                self._generations[key] += 1
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._total_bytes -= entry[0]
+                self.invalidations.inc()
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> SizedCacheStats:
+        """Get the statistics of the cache.
+
+        Returns:
+            SizedCacheStats: Size and counters, since the process started.
+
+        """
+        with self._lock:
+            size, total_bytes = len(self._entries), self._total_bytes
+        return SizedCacheStats(
+            size=size,
+            total_bytes=total_bytes,
+            max_bytes=self.max_bytes,
+            hits=self.hits.value,
+            misses=self.misses.value,
+            loads=self.loads.value,
+            coalesced=self.coalesced.value,
+            evictions=self.evictions.value,
+            invalidations=self.invalidations.value,
+        )
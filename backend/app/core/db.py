@@ -1,19 +1,220 @@
-"""Database session management for the application."""
+"""Database session management for the application.
 
-from collections.abc import Generator
+Two engines are exposed:
 
+- `async_engine` (asyncpg) backs the `AsyncSession` dependency used by every
+  FastAPI route, so database round-trips never block the event loop.
+- `engine` (psycopg2) is kept for synchronous tooling such as `scripts/cli.py`.
+
+Both use an instrumented pool, sized through the `DB_*` settings, whose
+statistics are exposed by `get_pool_stats`.
+"""
+
+import time
+from collections.abc import AsyncGenerator, Generator
+from typing import Any
+
+from pydantic import BaseModel
+from sqlalchemy import exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import (
+    AsyncAdaptedQueuePool,
+    ConnectionPoolEntry,
+    NullPool,
+    Pool,
+    QueuePool,
+)
 from sqlmodel import Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from .metrics import Counter, Histogram, HistogramSnapshot
 from .settings import settings
 
+_ASYNC_DRIVER = "postgresql+asyncpg"
+_SYNC_DRIVER = "postgresql"
+
+
+def get_database_url(*, driver: str = _SYNC_DRIVER) -> str:
+    """Build the database URL for the given SQLAlchemy driver.
+
+    `DATABASE_URL` may use the `postgres://` scheme (Heroku, Vercel, Neon...),
+    which SQLAlchemy does not understand. asyncpg also rejects the libpq
+    `sslmode` query parameter and expects `ssl` instead.
+
+    Args:
+        driver: SQLAlchemy dialect and driver prefix
+            (default: "postgresql", which uses psycopg2).
+
+    Returns:
+        The database URL targeting the requested driver.
+
+    """
+    url = settings.database_url.get_secret_value()
+    scheme, separator, rest = url.partition("://")
+    if not separator or not scheme.startswith("postgres"):
+        return url
+
+    if driver == _ASYNC_DRIVER:
+        rest = rest.replace("sslmode=", "ssl=")
+    return f"{driver}://{rest}"
+
+
+class PoolMetrics:
+    """Checkout metrics of a connection pool."""
+
+    def __init__(self) -> None:
+        """Initialize empty metrics."""
+        self.wait_time = Histogram()
+        """Time spent waiting for a connection, including failed checkouts."""
+        self.checkout_timeouts = Counter()
+        """Number of checkouts that exceeded `DB_POOL_TIMEOUT`."""
+
+
+class _InstrumentedPoolMixin(Pool):
+    """Record checkout wait times and timeouts of a SQLAlchemy pool."""
+
+    metrics: PoolMetrics
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.checkout_timeouts.inc()
+            raise
+        finally:
+            self.metrics.wait_time.observe(time.perf_counter() - start)
+
+    def recreate(self) -> Pool:
+        # Keep the metrics when the engine is disposed
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    """`QueuePool` recording checkout metrics."""
+
+
+class InstrumentedAsyncAdaptedQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    """`AsyncAdaptedQueuePool` recording checkout metrics."""
+
+
+class InstrumentedNullPool(_InstrumentedPoolMixin, NullPool):
+    """`NullPool` recording connection times as checkout metrics."""
+
+
+def get_engine_options(*, is_async: bool) -> dict[str, Any]:
+    """Get the pool options of an engine from the settings.
+
+    In serverless mode (`DB_SERVERLESS`), connections are not pooled by the
+    application but by an external pooler. Since such poolers usually run in
+    transaction mode, asyncpg's prepared statement caches are disabled too.
+
+    Args:
+        is_async: Whether the options are for the asyncpg engine.
+
+    Returns:
+        Keyword arguments for `create_engine` or `create_async_engine`.
+
+    """
+    if settings.DB_SERVERLESS:
+        options: dict[str, Any] = {"poolclass": InstrumentedNullPool}
+        if is_async:
+            options["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+            }
+        return options
+
+    return {
+        "poolclass": (
+            InstrumentedAsyncAdaptedQueuePool if is_async else InstrumentedQueuePool
+        ),
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+
+
 engine = create_engine(
-    settings.database_url.get_secret_value().replace("postgres://", "postgresql://"),
+    get_database_url(),
     echo=settings.DEBUG,
+    **get_engine_options(is_async=False),
 )
+"""Synchronous engine, used by CLI scripts."""
+
+async_engine = create_async_engine(
+    get_database_url(driver=_ASYNC_DRIVER),
+    echo=settings.DEBUG,
+    **get_engine_options(is_async=True),
+)
+"""Asynchronous engine, used by the API."""
+
+async_session_factory = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    # Objects are serialized after the commit: attributes must stay loaded
+    # since lazy refreshes are not possible outside of an awaitable context.
+    expire_on_commit=False,
+)
+
+
+class PoolStats(BaseModel):
+    """Live statistics of a connection pool."""
+
+    pool_class: str
+    size: int | None
+    """Configured pool size (`None` when connections are not pooled)."""
+    checked_out: int | None
+    """Connections currently in use."""
+    checked_in: int | None
+    """Idle connections available in the pool."""
+    overflow: int | None
+    """Connections opened beyond the pool size (negative while the pool fills up)."""
+    wait_time: HistogramSnapshot | None
+    """Time spent waiting for a connection, in seconds."""
+    checkout_timeouts: int | None
+
+
+def get_pool_stats(engine: Engine | AsyncEngine) -> PoolStats:
+    """Get live statistics of the pool of an engine.
+
+    Args:
+        engine: The engine to inspect
+
+    Returns:
+        PoolStats: The pool statistics. Fields that do not apply to the pool
+            class are `None`.
+
+    """
+    pool = engine.pool
+    metrics: PoolMetrics | None = getattr(pool, "metrics", None)
+    is_queue_pool = isinstance(pool, QueuePool)
+    return PoolStats(
+        pool_class=type(pool).__name__,
+        size=pool.size() if is_queue_pool else None,
+        checked_out=pool.checkedout() if is_queue_pool else None,
+        checked_in=pool.checkedin() if is_queue_pool else None,
+        overflow=pool.overflow() if is_queue_pool else None,
+        wait_time=metrics.wait_time.snapshot() if metrics else None,
+        checkout_timeouts=metrics.checkout_timeouts.value if metrics else None,
+    )
 
 
 def get_session() -> Generator[Session, None, None]:
-    """Dependency to get a database session.
+    """Get a synchronous database session.
 
     Yields:
         Session: A SQLModel session for database operations.
@@ -21,3 +222,14 @@ def get_session() -> Generator[Session, None, None]:
     """
     with Session(engine) as session:
         yield session
+
+
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency to get an asynchronous database session.
+
+    Yields:
+        AsyncSession: A SQLModel async session for database operations.
+
+    """
+    async with async_session_factory() as session:
+        yield session
@@ -1,17 +1,22 @@
 """Defines dependencies for FastAPI routes."""
 
+import secrets
 from typing import Annotated
 from uuid import uuid4
 
 from fastapi import Depends, HTTPException, Path, status
-from fastapi.security import OAuth2PasswordBearer
-from sqlmodel import Session, select
+from fastapi.security import APIKeyHeader, OAuth2PasswordBearer
+from sqlmodel import and_, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.core.db import get_session
+from app.core.db import get_async_session
 from app.core.exceptions import UnauthorizedError
 from app.core.logging import get_logger
-from app.models import Membership, Project, User
+from app.core.pagination import Pagination, get_pagination
+from app.core.settings import settings
+from app.models import Membership, Project
 from app.models.enums import UserRole
+from app.models.user import UserSnapshot
 from app.services import AuthService, UserService
 
 ProjectId = Annotated[
@@ -30,14 +35,18 @@ oauth2_scheme = OAuth2PasswordBearer(
 )
 
 
-SessionDep = Annotated[Session, Depends(get_session)]
+SessionDep = Annotated[AsyncSession, Depends(get_async_session)]
+"""Dependency to get an async database session."""
+
+PaginationDep = Annotated[Pagination, Depends(get_pagination)]
+"""Dependency to get the pagination parameters of a list request."""
 
 
 def get_user_service(session: SessionDep) -> UserService:
     """Dependency to get a UserService instance.
 
     Args:
-        session: SQLModel database session for operations
+        session: SQLModel async database session for operations
 
     Returns:
         UserService: An instance of UserService initialized with the session
@@ -50,21 +59,22 @@ UserServiceDep = Annotated[UserService, Depends(get_user_service)]
 """Dependency to get a UserService instance."""
 
 
-def get_current_user(
-    session: SessionDep,
+async def get_current_user(
+    user_service: UserServiceDep,
     token: Annotated[str, Depends(oauth2_scheme)],
-) -> User:
+) -> UserSnapshot:
     """Get the currently authenticated user.
 
     This function retrieves the current user from the UserService using
-    the provided JWT token.
+    the provided JWT token. Users are cached by token subject, so most
+    requests do not hit the database.
 
     Args:
-        session: SQLModel database session for operations
+        user_service: Service used to load the user
         token: The JWT token from the request
 
     Returns:
-        User: The currently authenticated user
+        UserSnapshot: The currently authenticated user
 
     Raises:
         UnauthorizedError: If the user is not authenticated or the token is invalid
@@ -76,22 +86,42 @@ def get_current_user(
         raise UnauthorizedError(missing_token_message)
     payload = AuthService.decode_jwt_token(token)
     user_id = payload.get("sub")
-    user = session.exec(select(User).where(User.id == user_id)).first()
+    user = await user_service.get_snapshot(user_id) if user_id else None
     if not user:
         raise UnauthorizedError(not_authenticated_message)
     return user
 
 
-CurrentUserDep = Annotated[User, Depends(get_current_user)]
+CurrentUserDep = Annotated[UserSnapshot, Depends(get_current_user)]
 """Dependency to get the currently authenticated user."""
 
 
-def get_project_member_or_owner(
+async def get_project_member_or_owner(
     project_id: ProjectId,
     current_user: CurrentUserDep,
     session: SessionDep,
 ) -> tuple[Project, Membership | None]:
-    """Get project and user's membership (if any)."""
+    """Get project and user's membership (if any).
+
+    The project and the membership of the current user are loaded with a
+    single joined query. FastAPI caches dependencies for the duration of a
+    request: every dependency requiring `CurrentProjectMembershipDep`
+    (including `require_project_admin` and `require_project_editor`) shares
+    the same result, so access is resolved once per request.
+
+    Args:
+        project_id: ID of the project from the path
+        current_user: The currently authenticated user
+        session: SQLModel async database session for operations
+
+    Returns:
+        The project, and the membership of the user (None for the owner).
+
+    Raises:
+        HTTPException: 404 if the project does not exist, 403 if the user is
+            neither the owner nor a member of the project.
+
+    """
     project_not_found = HTTPException(
         status_code=status.HTTP_404_NOT_FOUND,
         detail="Project not found",
@@ -102,24 +132,29 @@ def get_project_member_or_owner(
         detail="Access denied to this project",
     )
 
-    # Get project
-    project = session.exec(select(Project).where(Project.id == project_id)).first()
+    statement = (
+        select(Project, Membership)
+        .outerjoin(
+            Membership,
+            and_(
+                Membership.project_id == Project.id,
+                Membership.user_id == current_user.id,
+            ),
+        )
+        .where(Project.id == project_id)
+    )
+    row = (await session.exec(statement)).first()
 
-    if not project:
+    if not row:
         raise project_not_found
 
+    project, membership = row
+
     # Check if user is owner
     if project.owner_id == current_user.id:
         return project, None
 
     # Check if user is member
-    member_statement = select(Membership).where(
-        Membership.project_id == project_id,
-        Membership.user_id == current_user.id,
-    )
-    member_result = session.exec(member_statement)
-    membership = member_result.first()
-
     if not membership:
         logger.warning(
             "User %s tried to access project %s without membership",
@@ -135,12 +170,12 @@ CurrentProjectMembershipDep = Annotated[
     tuple[Project, Membership | None],
     Depends(get_project_member_or_owner),
 ]
+"""Dependency to get the project from the path and the user's membership."""
 
 
-def require_project_admin(
-    project_id: ProjectId,
+async def require_project_admin(
+    current_project_membership: CurrentProjectMembershipDep,
     current_user: CurrentUserDep,
-    session: SessionDep,
 ) -> Project:
     """Require user to be project owner or admin."""
     admin_access_required = HTTPException(
@@ -148,31 +183,26 @@ def require_project_admin(
         detail="Admin access required",
     )
 
-    project, membership = get_project_member_or_owner(
-        project_id,
-        current_user,
-        session,
-    )
+    project, membership = current_project_membership
 
     # Owner has admin rights
     if project.owner_id == current_user.id:
         logger.info(
-            "🔐 User %s is the owner of project %s", current_user.id, project_id
+            "🔐 User %s is the owner of project %s", current_user.id, project.id
         )
         return project
 
     # Check if user is admin member
     if membership and membership.role == UserRole.ADMIN:
-        logger.info("🔐 User %s is an admin of project %s", current_user.id, project_id)
+        logger.info("🔐 User %s is an admin of project %s", current_user.id, project.id)
         return project
 
     raise admin_access_required
 
 
-def require_project_editor(
-    project_id: ProjectId,
+async def require_project_editor(
+    current_project_membership: CurrentProjectMembershipDep,
     current_user: CurrentUserDep,
-    session: SessionDep,
 ) -> Project:
     """Require user to be project owner, admin, or editor."""
     editor_access_required = HTTPException(
@@ -180,11 +210,7 @@ def require_project_editor(
         detail="Editor access required",
     )
 
-    project, membership = get_project_member_or_owner(
-        project_id,
-        current_user,
-        session,
-    )
+    project, membership = current_project_membership
 
     # Owner has all rights
     if project.owner_id == current_user.id:
@@ -197,6 +223,31 @@ def require_project_editor(
     raise editor_access_required
 
 
+internal_api_key_scheme = APIKeyHeader(
+    name=settings.API_KEY_HEADER,
+    scheme_name="InternalApiKey",
+    description="Secret API key of internal services",
+    auto_error=False,
+)
+
+
+async def verify_internal_api_key(
+    api_key: Annotated[str | None, Depends(internal_api_key_scheme)],
+) -> None:
+    """Require the secret API key shared with internal services.
+
+    Args:
+        api_key: The API key from the request header
+
+    Raises:
+        UnauthorizedError: If the API key is missing or invalid
+
+    """
+    expected = settings.ml_api_secret_api_key.get_secret_value()
+    if not api_key or not secrets.compare_digest(api_key, expected):
+        raise UnauthorizedError("Invalid or missing internal API key")
+
+
 # from fastapi.security import APIKeyHeader, APIKeyQuery,
 
 # query_scheme = APIKeyQuery(name=_API_KEY_QUERY, auto_error=False)
@@ -46,3 +46,14 @@ class MissingAuthSecretError(HTTPException):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="AUTH_SECRET is not set in the environment variables.",
         )
+
+
+class InvalidCursorError(HTTPException):
+    """Exception raised when a pagination cursor cannot be decoded."""
+
+    def __init__(self) -> None:
+        """Initialize the exception with a specific status code and detail."""
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor.",
+        )
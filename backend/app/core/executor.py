@@ -0,0 +1,134 @@
+"""Bounded thread pools for blocking I/O.
+
+Some client libraries, such as `google-cloud-storage`, only have blocking
+APIs. Calling them from an `async def` route freezes the event loop for the
+whole call, so they are run on a dedicated pool of threads instead. Each pool
+is bounded, so that a burst of slow calls queues up instead of taking the
+threads Starlette uses for sync dependencies and file operations.
+"""
+
+import asyncio
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+from pydantic import BaseModel
+
+from .metrics import Counter, Histogram, HistogramSnapshot
+
+
+class ExecutorStats(BaseModel):
+    """Point-in-time statistics of a blocking executor."""
+
+    name: str
+    max_workers: int
+    queued: int
+    """Calls submitted and waiting for a free thread."""
+    running: int
+    """Calls being run by a thread."""
+    completed: int
+    failed: int
+    """Calls that raised an exception (included in `completed`)."""
+    queue_time: HistogramSnapshot
+    """Time spent waiting for a free thread, in seconds."""
+    run_time: HistogramSnapshot
+    """Time spent running the calls, in seconds."""
+
+
+class BlockingExecutor:
+    """Run blocking calls from the event loop on a bounded thread pool."""
+
+    def __init__(self, name: str, max_workers: int) -> None:
+        """Initialize the executor. Threads are started on demand.
+
+        Args:
+            name: Name of the executor, used as prefix of its thread names
+            max_workers: Maximum number of calls run concurrently
+
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix=name,
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self.completed = Counter()
+        self.failed = Counter()
+        self.queue_time = Histogram()
+        self.run_time = Histogram()
+
+    async def run[**P, T](
+        self,
+        func: Callable[P, T],
+        *args: P.args,
+        **kwargs: P.kwargs,
+    ) -> T:
+        """Run a blocking function on the pool and wait for its result.
+
+        Args:
+            func: The blocking function
+            *args: Positional arguments of the function
+            **kwargs: Keyword arguments of the function
+
+        Returns:
+            The return value of the function. Its exceptions are re-raised.
+
+        """
+        submitted_at = time.perf_counter()
+        with self._lock:
+            self._queued += 1
+
+        def _call() -> T:
+            started_at = time.perf_counter()
+            self.queue_time.observe(started_at - submitted_at)
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+            try:
+                return func(*args, **kwargs)
+            except BaseException:
+                self.failed.inc()
+                raise
+            finally:
+                self.run_time.observe(time.perf_counter() - started_at)
+                with self._lock:
+                    self._running -= 1
+                self.completed.inc()
+
+        future = self._pool.submit(_call)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            # A call still in the queue is dropped, a running one completes
+            if future.cancel():
+                with self._lock:
+                    self._queued -= 1
+            raise
+
+    def stats(self) -> ExecutorStats:
+        """Get the statistics of the executor.
+
+        Returns:
+            ExecutorStats: Current load and counters, since the process started.
+
+        """
+        with self._lock:
+            queued, running = self._queued, self._running
+        return ExecutorStats(
+            name=self.name,
+            max_workers=self.max_workers,
+            queued=queued,
+            running=running,
+            completed=self.completed.value,
+            failed=self.failed.value,
+            queue_time=self.queue_time.snapshot(),
+            run_time=self.run_time.snapshot(),
+        )
+
+    def shutdown(self) -> None:
+        """Wait for the pending calls and stop the threads."""
+        self._pool.shutdown(wait=True)
@@ -0,0 +1,112 @@
+"""In-process metrics collectors.
+
+Metrics are kept in memory, per worker process, and are exposed on the
+internal `/metrics` routes. They are thread-safe, since they can be updated
+from the event loop as well as from the threads running sync code.
+"""
+
+import bisect
+import math
+import threading
+
+from pydantic import BaseModel
+
+DEFAULT_LATENCY_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+"""Default histogram bucket upper bounds, in seconds."""
+
+
+class HistogramSnapshot(BaseModel):
+    """Point-in-time view of a histogram.
+
+    Buckets are cumulative, as in Prometheus: each bucket counts the
+    observations lower than or equal to its upper bound.
+    """
+
+    buckets: dict[str, int]
+    count: int
+    sum: float
+
+
+class Counter:
+    """Monotonically increasing counter."""
+
+    def __init__(self) -> None:
+        """Initialize the counter to zero."""
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1) -> None:
+        """Increment the counter.
+
+        Args:
+            amount: Value to add to the counter (default: 1)
+
+        """
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> int:
+        """Current value of the counter."""
+        return self._value
+
+
+class Histogram:
+    """Histogram of observed values, with fixed buckets."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS) -> None:
+        """Initialize an empty histogram.
+
+        Args:
+            buckets: Sorted bucket upper bounds. A `+Inf` bucket is always added.
+
+        """
+        self._bounds = (*sorted(buckets), math.inf)
+        self._counts = [0] * len(self._bounds)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Record an observation.
+
+        Args:
+            value: The observed value
+
+        """
+        index = bisect.bisect_left(self._bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def snapshot(self) -> HistogramSnapshot:
+        """Get a consistent view of the histogram.
+
+        Returns:
+            HistogramSnapshot: Cumulative bucket counts, total count and sum.
+
+        """
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+
+        buckets = {}
+        cumulative = 0
+        for bound, count in zip(self._bounds, counts, strict=True):
+            cumulative += count
+            label = "+Inf" if math.isinf(bound) else f"{bound:g}"
+            buckets[label] = cumulative
+        return HistogramSnapshot(buckets=buckets, count=cumulative, sum=total)
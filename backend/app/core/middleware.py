@@ -9,6 +9,7 @@ from typing import TYPE_CHECKING
 from starlette.middleware.cors import CORSMiddleware
 from starlette.middleware.trustedhost import TrustedHostMiddleware
 
+from .pagination import NEXT_CURSOR_HEADER
 from .settings import settings
 
 if TYPE_CHECKING:
@@ -24,6 +25,8 @@ def _add_cors_middleware(app: "FastAPI") -> None:
         allow_credentials=True,
         allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH"],
         allow_headers=["*"],
+        # Let browsers read the pagination headers of list responses
+        expose_headers=[NEXT_CURSOR_HEADER, "Link"],
     )
 
 
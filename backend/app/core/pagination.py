@@ -0,0 +1,183 @@
+"""Keyset pagination for list endpoints.
+
+Lists are sorted from the most recent item, on `(created_at, id)`. A page
+ends with an opaque cursor encoding the sort key of its last item, and the
+next page starts strictly after it. Unlike `OFFSET`, the database seeks to the
+cursor with an index instead of scanning and discarding the skipped rows.
+
+The next cursor is returned in the `X-Next-Cursor` and `Link` response
+headers, so list endpoints keep returning plain arrays.
+"""
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Annotated
+
+from fastapi import Query, Request, Response
+from sqlalchemy import desc, tuple_
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql.expression import SelectOfScalar
+
+from .exceptions import InvalidCursorError
+
+DEFAULT_PAGE_SIZE = 100
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: datetime, id_: str) -> str:
+    """Encode the sort key of an item into an opaque cursor.
+
+    Args:
+        created_at: Creation date of the item
+        id_: ID of the item
+
+    Returns:
+        The URL-safe cursor.
+
+    """
+    payload = json.dumps([created_at.isoformat(), id_], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """Decode a cursor into the sort key of an item.
+
+    Args:
+        cursor: Cursor returned by a previous page
+
+    Returns:
+        The creation date and ID of the last item of the previous page.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed
+
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id_ = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), str(id_)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+        raise InvalidCursorError from e
+
+
+@dataclass(frozen=True)
+class Pagination:
+    """Pagination parameters of a list request."""
+
+    limit: int = DEFAULT_PAGE_SIZE
+    cursor: str | None = None
+    offset: int | None = None
+    """Deprecated: number of items to skip, ignored when a cursor is given."""
+
+
+@dataclass(frozen=True)
+class Page[T]:
+    """Items of a page, and the cursor of the next one (None on the last page)."""
+
+    items: list[T]
+    next_cursor: str | None = None
+
+
+def get_pagination(
+    limit: Annotated[
+        int | None,
+        Query(examples=[10], gt=0, le=DEFAULT_PAGE_SIZE, description="Page size"),
+    ] = None,
+    cursor: Annotated[
+        str | None,
+        Query(description="Cursor of the page, from the previous page"),
+    ] = None,
+    offset: Annotated[
+        int | None,
+        Query(
+            ge=0,
+            deprecated=True,
+            description="Number of items to skip. Use `cursor` instead.",
+        ),
+    ] = None,
+) -> Pagination:
+    """Dependency to get the pagination parameters of a list request."""
+    return Pagination(limit=limit or DEFAULT_PAGE_SIZE, cursor=cursor, offset=offset)
+
+
+def page_statement[T](
+    statement: SelectOfScalar[T],
+    model: type[SQLModel],
+    pagination: Pagination,
+    extra_rows: int = 0,
+) -> SelectOfScalar[T]:
+    """Restrict a statement to a page, sorted from the most recent item.
+
+    Args:
+        statement: Statement selecting the items, without ordering
+        model: Model of the items, with `created_at` and `id` columns
+        pagination: Pagination parameters
+        extra_rows: Rows to fetch on top of the page size (default: 0)
+
+    Returns:
+        The statement selecting the items of the page.
+
+    """
+    statement = statement.order_by(desc(model.created_at), desc(model.id))
+    if pagination.cursor:
+        statement = statement.where(
+            tuple_(model.created_at, model.id) < decode_cursor(pagination.cursor),
+        )
+    elif pagination.offset:
+        statement = statement.offset(pagination.offset)
+    return statement.limit(pagination.limit + extra_rows)
+
+
+async def paginate[T](
+    session: AsyncSession,
+    statement: SelectOfScalar[T],
+    model: type[SQLModel],
+    pagination: Pagination,
+) -> Page[T]:
+    """Fetch a page of a statement, sorted from the most recent item.
+
+    Args:
+        session: Async session used to run the statement
+        statement: Statement selecting the items, without ordering
+        model: Model of the items, with `created_at` and `id` columns
+        pagination: Pagination parameters
+
+    Returns:
+        The items of the page and the cursor of the next page.
+
+    """
+    # One extra row tells whether there is a next page
+    statement = page_statement(statement, model, pagination, extra_rows=1)
+    items = list((await session.exec(statement)).all())
+    if len(items) <= pagination.limit:
+        return Page(items=items)
+
+    items = items[: pagination.limit]
+    last = items[-1]
+    return Page(items=items, next_cursor=encode_cursor(last.created_at, last.id))
+
+
+def set_next_page_headers(
+    request: Request,
+    response: Response,
+    next_cursor: str | None,
+) -> None:
+    """Add the cursor and the link of the next page to a list response.
+
+    Args:
+        request: The list request
+        response: The response to add headers to
+        next_cursor: Cursor of the next page (no header on the last page)
+
+    """
+    if not next_cursor:
+        return
+    next_url = request.url.remove_query_params("offset").include_query_params(
+        cursor=next_cursor,
+    )
+    response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    response.headers["Link"] = f'<{next_url}>; rel="next"'
@@ -53,8 +53,68 @@ class Settings(BaseSettings):
     """Header name for API key authentication."""
     API_KEY_QUERY: str = "key"
     """Query parameter name for API key authentication."""
+    USER_CACHE_MAX_SIZE: int = 10_000
+    """Authenticated users cached per worker (0 disables the cache)."""
+    USER_CACHE_TTL_SECONDS: float = 60.0
+    """Seconds after which a cached user is read again from the database."""
 
     BUCKET_NAME: str
+    GCS_UPLOAD_CHUNK_SIZE: int = 8 * 1024 * 1024
+    """Size of the chunks of resumable uploads, in bytes (multiple of 256 KiB).
+    It bounds the memory used by each upload."""
+    GCS_EXECUTOR_MAX_WORKERS: int = 8
+    """Threads running blocking storage calls, per worker process. Calls beyond
+    this limit wait in a queue."""
+    GCS_COMPOSITE_UPLOAD_THRESHOLD: int = 256 * 1024 * 1024
+    """Size from which files are uploaded as parallel parts composed
+    server-side, in bytes (0 to always use a single upload stream)."""
+    GCS_COMPOSITE_PART_SIZE: int = 32 * 1024 * 1024
+    """Size of the parts of composite uploads, in bytes."""
+    GCS_COMPOSITE_PARALLELISM: int = 4
+    """Parts of a composite upload sent concurrently. Each holds a part in
+    memory, and takes a thread of the storage executor."""
+    DATASET_PREVIEW_RANGE_SIZE: int = 64 * 1024
+    """Bytes of a dataset read by the first range request of a preview. Each
+    following request reads as many bytes as read so far."""
+    DATASET_PREVIEW_MAX_SIZE: int = 16 * 1024 * 1024
+    """Bytes of a dataset read at most by a preview, which returns fewer rows
+    beyond."""
+    DATASET_UPLOAD_URL_EXPIRATION: int = 3600
+    """Seconds for which the signed URLs of direct dataset uploads are valid."""
+
+    # Training jobs
+    JOB_QUEUE_POLL_INTERVAL: float = 5.0
+    """Seconds an idle worker waits before looking for pending jobs again."""
+    JOB_LEASE_DURATION: float = 120.0
+    """Seconds for which a worker owns a claimed job without a heartbeat. Jobs
+    with an expired lease are requeued, or failed after `JOB_MAX_RETRIES`."""
+    JOB_HEARTBEAT_INTERVAL: float = 30.0
+    """Seconds between the lease extensions of a running job."""
+    JOB_MAX_RETRIES: int = 3
+    """Times a job is requeued after its lease expired before failing."""
+
+    # Model serving
+    MODEL_CACHE_MAX_BYTES: int = 2 * 1024 * 1024 * 1024
+    """Memory budget of the deployed models loaded per worker process, in bytes
+    (0 disables the cache). Least recently used models are evicted beyond."""
+    MODEL_EXECUTOR_MAX_WORKERS: int = 2
+    """Threads loading model artifacts, per worker process."""
+
+    # Database connection pool
+    DB_POOL_SIZE: int = 5
+    """Number of connections kept open in the pool."""
+    DB_MAX_OVERFLOW: int = 10
+    """Connections opened on top of `DB_POOL_SIZE` under load, closed on return."""
+    DB_POOL_PRE_PING: bool = True
+    """Test connections on checkout, to discard the ones closed by the server."""
+    DB_POOL_RECYCLE: int = 1800
+    """Seconds after which a connection is replaced (-1 to disable)."""
+    DB_POOL_TIMEOUT: float = 30.0
+    """Seconds to wait for a connection before raising a timeout error."""
+    DB_SERVERLESS: bool = False
+    """Open a connection per session (no pooling), for use behind an external
+    pooler such as PgBouncer or a serverless Postgres proxy."""
+
     # CORS - includes Vercel domains
     ALLOWED_ORIGINS: list[str] = [
         "http://localhost:3000",
@@ -1,13 +1,40 @@
-"""Utility functions for Google Cloud Platform (GCP) interactions."""
+"""Utility functions for Google Cloud Platform (GCP) interactions.
 
+The storage client is blocking: async functions run its calls on
+`storage_executor`, a dedicated thread pool, to keep the event loop free.
+"""
+
+import asyncio
+import hashlib
 import os
+from dataclasses import dataclass
+from datetime import timedelta
 from functools import cache
+from typing import BinaryIO
+from uuid import uuid4
 
+import google.auth
 from fastapi import UploadFile
+from google.api_core.exceptions import PreconditionFailed, RequestRangeNotSatisfiable
+from google.auth.credentials import Credentials, Signing
+from google.auth.transport.requests import Request
 from google.cloud import storage
 
+from app.core.executor import BlockingExecutor
 from app.core.settings import settings
-from app.utils import get_blob_name
+from app.utils import get_content_blob_name
+
+storage_executor = BlockingExecutor(
+    name="gcs",
+    max_workers=settings.GCS_EXECUTOR_MAX_WORKERS,
+)
+"""Thread pool running the blocking storage calls of async functions."""
+
+COMPOSE_MAX_SOURCES = 32
+"""Maximum number of source objects of a single compose request."""
+
+CSV_CONTENT_TYPES = ("text/csv", "application/csv")
+"""Content types of the dataset files."""
 
 
 @cache
@@ -45,6 +72,104 @@ def get_bucket(bucket_name: str | None = None) -> storage.Bucket:
     return client.bucket(bucket_name or os.getenv("GCS_BUCKET"))
 
 
+@cache
+def get_signing_credentials() -> Credentials:
+    """Get the credentials signing the URLs of direct uploads.
+
+    Service account keys sign the URLs locally. Other credentials, such as the
+    ones of Cloud Run, sign them with the IAM API: their service account needs
+    the "Service Account Token Creator" role on itself.
+
+    Returns:
+        The application default credentials.
+
+    """
+    credentials, _ = google.auth.default(
+        scopes=["https://www.googleapis.com/auth/cloud-platform"],
+    )
+    return credentials
+
+
+def generate_upload_url(
+    blob_name: str,
+    *,
+    content_type: str,
+    md5_hash: str,
+    expiration: timedelta,
+    resumable: bool = True,
+    bucket_name: str | None = None,
+) -> tuple[str, str, dict[str, str]]:
+    """Generate a V4 signed URL uploading a file directly to a blob.
+
+    A resumable URL starts an upload session: the `Location` header of its
+    response is the session URL, to which the file is sent in one or more
+    `PUT` requests. Otherwise, the file is sent in a single `PUT` request to
+    the URL, and its MD5 hash is checked by the storage.
+
+    Args:
+        blob_name: The name of the blob to upload to.
+        content_type: The MIME type of the file, signed with the URL.
+        md5_hash: The base64-encoded MD5 hash of the file.
+        expiration: How long the URL remains valid.
+        resumable: Whether to start a resumable upload session
+            (default: `True`).
+        bucket_name: The name of the GCP bucket
+            (default: None, uses `GCS_BUCKET` env var).
+
+    Returns:
+        The URL, its HTTP method, and the headers to send with the request.
+
+    """
+    credentials = get_signing_credentials()
+    signer = {}
+    if not isinstance(credentials, Signing):
+        # Sign with the IAM API, on behalf of the service account
+        if not credentials.valid:
+            credentials.refresh(Request())
+        signer = {
+            "service_account_email": credentials.service_account_email,
+            "access_token": credentials.token,
+        }
+
+    headers = {"Content-Type": content_type}
+    if resumable:
+        method = "POST"
+        headers["x-goog-resumable"] = "start"
+    else:
+        method = "PUT"
+        headers["Content-MD5"] = md5_hash
+
+    url = (
+        get_bucket(bucket_name)
+        .blob(blob_name)
+        .generate_signed_url(
+            version="v4",
+            expiration=expiration,
+            method="RESUMABLE" if resumable else method,
+            content_type=content_type,
+            content_md5=None if resumable else md5_hash,
+            credentials=credentials,
+            **signer,
+        )
+    )
+    return url, method, headers
+
+
+def get_blob(blob_name: str, bucket_name: str | None = None) -> storage.Blob | None:
+    """Get a blob with its metadata (size, content type, hashes).
+
+    Args:
+        blob_name: The name of the blob.
+        bucket_name: The name of the GCP bucket
+            (default: None, uses `GCS_BUCKET` env var).
+
+    Returns:
+        The blob, or None if it does not exist.
+
+    """
+    return get_bucket(bucket_name).get_blob(blob_name)
+
+
 def check_blob_exists(blob_name: str, bucket_name: str | None = None) -> bool:
     """Check if a blob exists in the specified GCP bucket.
 
@@ -81,53 +206,357 @@ def upload_content_to_blob(
     blob.upload_from_string(content, content_type=content_type)
 
 
-async def upload_csv_to_blob(
+def upload_file_to_blob(
+    blob_name: str,
+    file: BinaryIO,
+    bucket_name: str | None = None,
+    content_type: str = "application/octet-stream",
+    size: int | None = None,
+    chunk_size: int | None = None,
+    if_generation_match: int | None = None,
+) -> None:
+    """Stream a file object to a GCP storage blob.
+
+    Files larger than 8 MiB, or of unknown size, are sent with a resumable
+    upload, one chunk at a time: at most `chunk_size` bytes of the file are
+    held in memory.
+
+    Args:
+        blob_name: The name of the blob to create or overwrite.
+        file: The file object to upload, read from its current position.
+        bucket_name: The name of the GCP bucket
+            (default: None, uses `GCS_BUCKET` env var).
+        content_type: The MIME type of the content
+            (default: "application/octet-stream").
+        size: The number of bytes to upload (default: None, read until EOF).
+        chunk_size: The size of the chunks of resumable uploads, a multiple of
+            256 KiB (default: None, uses `GCS_UPLOAD_CHUNK_SIZE` setting).
+        if_generation_match: Only upload if the generation of the blob
+            matches, 0 to only create a new blob (default: None, no condition).
+
+    Raises:
+        PreconditionFailed: If `if_generation_match` does not match.
+
+    """
+    bucket = get_bucket(bucket_name)
+    blob = bucket.blob(
+        blob_name,
+        chunk_size=chunk_size or settings.GCS_UPLOAD_CHUNK_SIZE,
+    )
+    blob.upload_from_file(
+        file,
+        content_type=content_type,
+        size=size,
+        if_generation_match=if_generation_match,
+    )
+
+
+def compose_blobs(
+    blob_name: str,
+    source_names: list[str],
+    bucket_name: str | None = None,
+    content_type: str = "application/octet-stream",
+    if_generation_match: int | None = None,
+) -> list[str]:
+    """Concatenate blobs into a new blob, server-side.
+
+    A compose request takes at most 32 sources: longer lists are composed by
+    groups into intermediate blobs, named after the first source of each group,
+    until the final compose fits in a single request.
+
+    Args:
+        blob_name: The name of the blob to create or overwrite.
+        source_names: The names of the blobs to concatenate, in order.
+        bucket_name: The name of the GCP bucket
+            (default: None, uses `GCS_BUCKET` env var).
+        content_type: The MIME type of the composed blob
+            (default: "application/octet-stream").
+        if_generation_match: Only compose if the generation of the blob
+            matches, 0 to only create a new blob (default: None, no condition).
+
+    Returns:
+        The names of the intermediate blobs, to delete with the sources.
+
+    Raises:
+        PreconditionFailed: If `if_generation_match` does not match.
+
+    """
+    bucket = get_bucket(bucket_name)
+    intermediates: list[str] = []
+    names = source_names
+    level = 0
+    while len(names) > COMPOSE_MAX_SOURCES:
+        level += 1
+        groups = [
+            names[i : i + COMPOSE_MAX_SOURCES]
+            for i in range(0, len(names), COMPOSE_MAX_SOURCES)
+        ]
+        names = []
+        for group in groups:
+            intermediate = bucket.blob(f"{group[0]}.compose-{level}")
+            intermediate.compose([bucket.blob(name) for name in group])
+            names.append(intermediate.name)
+        intermediates.extend(names)
+
+    blob = bucket.blob(blob_name)
+    blob.content_type = content_type
+    blob.compose(
+        [bucket.blob(name) for name in names],
+        if_generation_match=if_generation_match,
+    )
+    return intermediates
+
+
+def delete_blobs(blob_names: list[str], bucket_name: str | None = None) -> None:
+    """Delete blobs, ignoring the ones that do not exist.
+
+    Args:
+        blob_names: The names of the blobs to delete.
+        bucket_name: The name of the GCP bucket
+            (default: None, uses `GCS_BUCKET` env var).
+
+    """
+    bucket = get_bucket(bucket_name)
+    bucket.delete_blobs(
+        [bucket.blob(name) for name in blob_names],
+        on_error=lambda _: None,
+    )
+
+
+def download_blob_to_file(
+    blob_name: str,
+    file: BinaryIO,
+    bucket_name: str | None = None,
+) -> None:
+    """Stream a GCP storage blob to a file object.
+
+    Args:
+        blob_name: The name of the blob to download.
+        file: The file object to write to, from its current position.
+        bucket_name: The name of the GCP bucket
+            (default: None, uses `GCS_BUCKET` env var).
+
+    """
+    get_bucket(bucket_name).blob(blob_name).download_to_file(file)
+
+
+def download_blob_range(
+    blob_name: str,
+    start: int,
+    size: int,
+    bucket_name: str | None = None,
+) -> bytes:
+    """Download a range of bytes of a blob, with an HTTP range request.
+
+    Args:
+        blob_name: The name of the blob to read.
+        start: The offset of the first byte to read.
+        size: The number of bytes to read.
+        bucket_name: The name of the GCP bucket
+            (default: None, uses `GCS_BUCKET` env var).
+
+    Returns:
+        The bytes read, fewer than `size` at the end of the blob.
+
+    """
+    blob = get_bucket(bucket_name).blob(blob_name)
+    try:
+        return blob.download_as_bytes(start=start, end=start + size - 1)
+    except RequestRangeNotSatisfiable:
+        # The range starts at or after the end of the blob
+        return b""
+
+
+async def upload_file_to_blob_composite(
+    blob_name: str,
     file: UploadFile,
-    blob_path: str,
-    *,
     bucket_name: str | None = None,
-    add_random_suffix: bool = True,
-    allow_overwrite: bool = False,
-) -> str:
-    """Upload a CSV file to a GCP storage blob.
+    content_type: str = "application/octet-stream",
+    part_size: int | None = None,
+    parallelism: int | None = None,
+    if_generation_match: int | None = None,
+) -> None:
+    """Upload a file as parts uploaded in parallel, then composed server-side.
+
+    A single upload stream is bound by the latency of each chunk round-trip:
+    uploading parts concurrently uses more of the available bandwidth. The file
+    is read from its current position, one part at a time: at most
+    `part_size * parallelism` bytes are held in memory. The parts are deleted
+    once composed, or if the upload fails.
 
     Args:
-        file: The uploaded file to be stored.
-        blob_path: The path in the blob storage where the file will be uploaded.
+        blob_name: The name of the blob to create or overwrite.
+        file: The file to upload.
         bucket_name: The name of the GCP bucket
             (default: None, uses `GCS_BUCKET` env var).
-        add_random_suffix: Whether to add a random suffix to the file name to avoid
-            conflicts (default: `True`).
-        allow_overwrite: Whether to allow overwriting an existing blob at the same path
-            (default: `False`).
+        content_type: The MIME type of the content
+            (default: "application/octet-stream").
+        part_size: The size of each part, in bytes
+            (default: None, uses `GCS_COMPOSITE_PART_SIZE` setting).
+        parallelism: The number of parts uploaded concurrently
+            (default: None, uses `GCS_COMPOSITE_PARALLELISM` setting).
+        if_generation_match: Only upload if the generation of the blob
+            matches, 0 to only create a new blob (default: None, no condition).
+
+    Raises:
+        PreconditionFailed: If `if_generation_match` does not match.
+
+    """
+    part_size = part_size or settings.GCS_COMPOSITE_PART_SIZE
+    slots = asyncio.Semaphore(parallelism or settings.GCS_COMPOSITE_PARALLELISM)
+    parts_prefix = f"{blob_name}.parts-{uuid4().hex[:8]}"
+    part_names: list[str] = []
+    uploads: list[asyncio.Task[None]] = []
+    temporary_names: list[str] = []
+
+    async def _upload_part(part_name: str, content: bytes) -> None:
+        try:
+            await storage_executor.run(
+                upload_content_to_blob,
+                blob_name=part_name,
+                content=content,
+                bucket_name=bucket_name,
+                content_type=content_type,
+            )
+        finally:
+            slots.release()
+
+    try:
+        while True:
+            await slots.acquire()
+            if any(upload.done() and upload.exception() for upload in uploads):
+                # Stop reading: the failure is raised below
+                slots.release()
+                break
+            content = await file.read(part_size)
+            if not content:
+                slots.release()
+                break
+            part_names.append(f"{parts_prefix}/{len(part_names):05d}")
+            uploads.append(
+                asyncio.create_task(_upload_part(part_names[-1], content)),
+            )
+        await asyncio.gather(*uploads)
+
+        temporary_names = await storage_executor.run(
+            compose_blobs,
+            blob_name=blob_name,
+            source_names=part_names,
+            bucket_name=bucket_name,
+            content_type=content_type,
+            if_generation_match=if_generation_match,
+        )
+    finally:
+        for upload in uploads:
+            upload.cancel()
+        await asyncio.gather(*uploads, return_exceptions=True)
+        if part_names:
+            await storage_executor.run(
+                delete_blobs,
+                part_names + temporary_names,
+                bucket_name=bucket_name,
+            )
+
+
+def compute_sha256(file: BinaryIO) -> str:
+    """Hash a file from its current position, one buffer at a time.
+
+    Args:
+        file: The file object to hash.
+
+    Returns:
+        The hexadecimal SHA-256 digest of the file.
+
+    """
+    return hashlib.file_digest(file, "sha256").hexdigest()
+
+
+@dataclass(frozen=True)
+class ContentBlob:
+    """Blob named after the hash of its content."""
+
+    name: str
+    sha256: str
+    size: int | None
+
+
+async def hash_csv_file(file: UploadFile, blob_path: str) -> ContentBlob:
+    """Hash an uploaded CSV file to get the name of its blob.
+
+    The blob of the file is `<directory>/<sha256>.csv`, the directory being
+    the one of `blob_path`: files of the same content share a blob.
+
+    Args:
+        file: The uploaded file to be stored.
+        blob_path: The path in the blob storage where the file will be uploaded.
+            Only its directory is kept.
 
     Returns:
-        The name of the uploaded blob.
+        The blob of the file, with the hash of its content.
 
     Raises:
-        ValueError: If the file type is not supported or upload fails.
+        ValueError: If the file type is not supported.
 
     """
-    if file.content_type not in ["text/csv", "application/csv"]:
+    if file.content_type not in CSV_CONTENT_TYPES:
         msg = (
             f"Unsupported file type: {file.content_type}. "
-            "Supported types are: text/csv, application/csv"
+            f"Supported types are: {', '.join(CSV_CONTENT_TYPES)}"
         )
         raise ValueError(msg)
 
-    contents = await file.read()
+    # Stream the spooled file instead of reading it all in memory
+    await file.seek(0)
+    sha256 = await storage_executor.run(compute_sha256, file.file)
+    return ContentBlob(
+        name=get_content_blob_name(blob_path, sha256),
+        sha256=sha256,
+        size=file.size,
+    )
 
-    blob_name = get_blob_name(blob_path, add_random_suffix=add_random_suffix)
 
-    if not allow_overwrite and check_blob_exists(blob_name, bucket_name=bucket_name):
-        msg = f"Blob {blob_name} already exists and overwrite is not allowed."
-        raise ValueError(msg)
+async def upload_csv_to_blob(
+    file: UploadFile,
+    blob: ContentBlob,
+    *,
+    bucket_name: str | None = None,
+) -> bool:
+    """Upload a CSV file to its content blob, unless it already exists.
 
-    upload_content_to_blob(
-        blob_name=blob_name,
-        content=contents,
-        bucket_name=bucket_name,
-        content_type=file.content_type,
-    )
+    Args:
+        file: The uploaded file to be stored.
+        blob: The blob of the file, from `hash_csv_file`.
+        bucket_name: The name of the GCP bucket
+            (default: None, uses `GCS_BUCKET` env var).
 
-    return blob_name
+    Returns:
+        Whether the blob was created, False if it already existed.
+
+    """
+    # Stream the spooled file instead of reading it all in memory
+    await file.seek(0)
+    try:
+        threshold = settings.GCS_COMPOSITE_UPLOAD_THRESHOLD
+        if threshold and file.size is not None and file.size >= threshold:
+            await upload_file_to_blob_composite(
+                blob_name=blob.name,
+                file=file,
+                bucket_name=bucket_name,
+                content_type=file.content_type,
+                if_generation_match=0,
+            )
+        else:
+            await storage_executor.run(
+                upload_file_to_blob,
+                blob_name=blob.name,
+                file=file.file,
+                bucket_name=bucket_name,
+                content_type=file.content_type,
+                size=file.size,
+                # Create-only precondition, instead of a separate exists() call
+                if_generation_match=0,
+            )
+    except PreconditionFailed:
+        # Same name, same content
+        return False
+    return True
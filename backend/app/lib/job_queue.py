@@ -0,0 +1,473 @@
+"""Job queue, backed by the `jobs` table.
+
+Jobs are enqueued as `pending` rows. Workers, any number of processes on any
+number of nodes sharing the database, claim the oldest pending job with
+`SELECT ... FOR UPDATE SKIP LOCKED`: rows locked by a concurrent claim are
+skipped instead of waited for, so each job is claimed exactly once without
+an external broker. The claimed job is marked `running` in the same statement,
+then `completed` or `failed` once its runner returns.
+
+A claimed job is leased to its worker for `JOB_LEASE_DURATION` seconds, and
+the lease is extended by heartbeats while the job runs. A worker which dies
+mid-run stops extending it: the reaper, run by every worker before claiming,
+requeues the jobs whose lease expired, or fails them after `JOB_MAX_RETRIES`
+retries. A worker which lost its lease cannot finish the job anymore: its
+runner is told to stop, and records the results of the job only while the
+worker owns the lease (see `lock_lease`).
+"""
+
+import os
+import socket
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, col, select, update
+
+from app.core import db
+from app.core.logging import get_logger
+from app.core.settings import settings
+from app.models.enums import JobStatus
+from app.models.job import Job
+from app.models.model import Model
+from app.validations.job_parameters import JobParams
+
+logger = get_logger(__name__)
+
+JobRunner = Callable[[Session, Job, threading.Event], None]
+"""Run a claimed job, raising an exception if it fails. The event is set once
+the worker lost the lease of the job: the runner should then stop, raising
+`LeaseLostError`."""
+
+
+class LeaseLostError(Exception):
+    """Raised by a runner whose worker lost the lease of its job."""
+
+
+def get_worker_id() -> str:
+    """Get the ID of the current worker process: `<hostname>:<pid>`."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def enqueue_job(
+    session: Session,
+    pipeline_id: str,
+    params: JobParams,
+    fingerprint: str | None = None,
+) -> Job:
+    """Add a pending training job to the queue.
+
+    Args:
+        session: The database session, committed by this function.
+        pipeline_id: The ID of the pipeline to train.
+        params: The sampling parameters of the training.
+        fingerprint: The fingerprint of the training inputs, recorded on the
+            trained model (default: None, the model is not cached).
+
+    Returns:
+        Job: The pending job.
+
+    """
+    job = Job(
+        pipeline_id=pipeline_id,
+        params=params.model_dump(),
+        fingerprint=fingerprint,
+    )
+    session.add(job)
+    session.commit()
+    session.refresh(job)
+    return job
+
+
+def submit_job(
+    session: Session,
+    pipeline_id: str,
+    params: JobParams,
+    fingerprint: str | None = None,
+    cached_model: Model | None = None,
+) -> Job:
+    """Queue a job, unless a model was already trained with the same inputs.
+
+    On a cache hit, the job is recorded as completed without being run. The
+    cached model is looked up beforehand, with the storage calls of the
+    lookup off the event loop (see `app.lib.training_cache`).
+
+    Args:
+        session: The database session, committed by this function.
+        pipeline_id: The ID of the pipeline to train.
+        params: The sampling parameters of the training.
+        fingerprint: The fingerprint of the training inputs
+            (default: None, the model is not cached).
+        cached_model: The model trained with the same fingerprint, if any.
+
+    Returns:
+        The job, pending, or completed on a cache hit.
+
+    """
+    if cached_model is None:
+        return enqueue_job(session, pipeline_id, params, fingerprint)
+
+    now = datetime.now(UTC)
+    job = Job(
+        pipeline_id=pipeline_id,
+        params=params.model_dump(),
+        fingerprint=fingerprint,
+        cache_hit=True,
+        status=JobStatus.COMPLETED,
+        started_at=now,
+        finished_at=now,
+    )
+    session.add(job)
+    session.commit()
+    session.refresh(job)
+    logger.info("Job %s reused the model %s", job.id, cached_model.id)
+    return job
+
+
+def _lease_end(lease_duration: float | None) -> datetime:
+    return datetime.now(UTC) + timedelta(
+        seconds=lease_duration or settings.JOB_LEASE_DURATION,
+    )
+
+
+def claim_job(
+    session: Session,
+    worker_id: str,
+    lease_duration: float | None = None,
+) -> Job | None:
+    """Claim the oldest pending job, and mark it as running.
+
+    Args:
+        session: The database session, committed by this function.
+        worker_id: The ID of the claiming worker, owner of the lease.
+        lease_duration: Seconds of the lease of the job
+            (default: None, uses `JOB_LEASE_DURATION` setting).
+
+    Returns:
+        The claimed job, or None if no job is pending.
+
+    """
+    next_job_id = (
+        select(Job.id)
+        .where(Job.status == JobStatus.PENDING)
+        .order_by(col(Job.created_at))
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    job = session.scalars(
+        update(Job)
+        .where(col(Job.id) == next_job_id)
+        .values(
+            status=JobStatus.RUNNING,
+            worker_id=worker_id,
+            lease_expires_at=_lease_end(lease_duration),
+            started_at=datetime.now(UTC),
+        )
+        .returning(Job),
+    ).one_or_none()
+    session.commit()
+    return job
+
+
+def extend_lease(
+    session: Session,
+    job_id: str,
+    worker_id: str,
+    lease_duration: float | None = None,
+) -> bool:
+    """Extend the lease of a running job.
+
+    Args:
+        session: The database session, committed by this function.
+        job_id: The ID of the job.
+        worker_id: The ID of the worker owning the lease.
+        lease_duration: Seconds of the lease from now
+            (default: None, uses `JOB_LEASE_DURATION` setting).
+
+    Returns:
+        Whether the lease was extended, False if the worker lost it.
+
+    """
+    result = session.exec(
+        update(Job)
+        .where(
+            col(Job.id) == job_id,
+            col(Job.worker_id) == worker_id,
+            col(Job.status) == JobStatus.RUNNING,
+        )
+        .values(lease_expires_at=_lease_end(lease_duration)),
+    )
+    session.commit()
+    return result.rowcount == 1
+
+
+def lock_lease(session: Session, job_id: str, worker_id: str | None) -> bool:
+    """Lock the row of a running job, if the worker still owns its lease.
+
+    The results of a job are recorded in the transaction holding the lock:
+    the reaper cannot requeue the job before they are committed, and a worker
+    which lost the lease records nothing.
+
+    Args:
+        session: The database session, whose transaction holds the lock.
+        job_id: The ID of the job.
+        worker_id: The ID of the worker which claimed the job.
+
+    Returns:
+        Whether the lease is owned by the worker, and the row locked.
+
+    """
+    statement = (
+        select(Job.id)
+        .where(
+            col(Job.id) == job_id,
+            col(Job.worker_id) == worker_id,
+            col(Job.status) == JobStatus.RUNNING,
+        )
+        .with_for_update()
+    )
+    return session.exec(statement).first() is not None
+
+
+def reap_expired_jobs(session: Session, max_retries: int | None = None) -> int:
+    """Requeue the running jobs whose lease expired, or fail them.
+
+    Jobs are requeued at most `max_retries` times, then failed: a job which
+    kills every worker running it is not retried forever.
+
+    Args:
+        session: The database session, committed by this function.
+        max_retries: Times a job is requeued before failing
+            (default: None, uses `JOB_MAX_RETRIES` setting).
+
+    Returns:
+        The number of requeued or failed jobs.
+
+    """
+    max_retries = settings.JOB_MAX_RETRIES if max_retries is None else max_retries
+    now = datetime.now(UTC)
+    expired = (
+        col(Job.status) == JobStatus.RUNNING,
+        col(Job.lease_expires_at) < now,
+    )
+    failed = session.exec(
+        update(Job)
+        .where(*expired, col(Job.retries) >= max_retries)
+        .values(
+            status=JobStatus.FAILED,
+            lease_expires_at=None,
+            finished_at=now,
+            error=f"Lease expired after {max_retries} retries",
+        ),
+    ).rowcount
+    requeued = session.exec(
+        update(Job)
+        .where(*expired, col(Job.retries) < max_retries)
+        .values(
+            status=JobStatus.PENDING,
+            worker_id=None,
+            lease_expires_at=None,
+            started_at=None,
+            retries=col(Job.retries) + 1,
+        ),
+    ).rowcount
+    session.commit()
+    if failed or requeued:
+        logger.warning(
+            "Reaped jobs with an expired lease: %d requeued, %d failed",
+            requeued,
+            failed,
+        )
+    return failed + requeued
+
+
+def _finish_job(
+    session: Session,
+    job_id: str,
+    worker_id: str,
+    status: JobStatus,
+    error: str | None = None,
+) -> bool:
+    result = session.exec(
+        update(Job)
+        .where(
+            col(Job.id) == job_id,
+            col(Job.worker_id) == worker_id,
+            col(Job.status) == JobStatus.RUNNING,
+        )
+        .values(
+            status=status,
+            lease_expires_at=None,
+            finished_at=datetime.now(UTC),
+            error=error,
+        ),
+    )
+    session.commit()
+    return result.rowcount == 1
+
+
+def complete_job(session: Session, job_id: str, worker_id: str) -> bool:
+    """Mark a running job as completed.
+
+    Args:
+        session: The database session, committed by this function.
+        job_id: The ID of the job.
+        worker_id: The ID of the worker owning the lease.
+
+    Returns:
+        Whether the job was completed, False if the worker lost its lease.
+
+    """
+    return _finish_job(session, job_id, worker_id, JobStatus.COMPLETED)
+
+
+def fail_job(session: Session, job_id: str, worker_id: str, error: str) -> bool:
+    """Mark a running job as failed.
+
+    Args:
+        session: The database session, committed by this function.
+        job_id: The ID of the job.
+        worker_id: The ID of the worker owning the lease.
+        error: The reason of the failure.
+
+    Returns:
+        Whether the job was failed, False if the worker lost its lease.
+
+    """
+    return _finish_job(session, job_id, worker_id, JobStatus.FAILED, error)
+
+
+@contextmanager
+def heartbeat(
+    engine: Engine,
+    job_id: str,
+    worker_id: str,
+    interval: float | None = None,
+    lease_duration: float | None = None,
+) -> Iterator[threading.Event]:
+    """Extend the lease of a job from a background thread, until exited.
+
+    Args:
+        engine: The database engine.
+        job_id: The ID of the running job.
+        worker_id: The ID of the worker owning the lease.
+        interval: Seconds between two extensions
+            (default: None, uses `JOB_HEARTBEAT_INTERVAL` setting).
+        lease_duration: Seconds of the lease from each extension
+            (default: None, uses `JOB_LEASE_DURATION` setting).
+
+    Yields:
+        An event set if the worker lost the lease.
+
+    """
+    interval = interval or settings.JOB_HEARTBEAT_INTERVAL
+    stopped = threading.Event()
+    lost = threading.Event()
+
+    def _beat() -> None:
+        while not stopped.wait(interval):
+            try:
+                with Session(engine) as session:
+                    extended = extend_lease(session, job_id, worker_id, lease_duration)
+            except Exception:
+                # The lease may still be extended by the next heartbeat
+                logger.exception("Heartbeat of job %s failed", job_id)
+                continue
+            if not extended:
+                logger.warning("Worker %s lost the lease of job %s", worker_id, job_id)
+                lost.set()
+                return
+
+    thread = threading.Thread(target=_beat, name=f"heartbeat-{job_id}", daemon=True)
+    thread.start()
+    try:
+        yield lost
+    finally:
+        stopped.set()
+        thread.join()
+
+
+def run_worker(
+    runner: JobRunner,
+    *,
+    engine: Engine | None = None,
+    worker_id: str | None = None,
+    poll_interval: float | None = None,
+    heartbeat_interval: float | None = None,
+    lease_duration: float | None = None,
+    exit_when_empty: bool = False,
+    stop: threading.Event | None = None,
+) -> int:
+    """Claim and run jobs until stopped.
+
+    Each job is claimed, run and finished in its own session: no transaction
+    is left open while the runner trains the model. Its lease is extended by
+    a heartbeat thread while it runs, and the expired leases of other workers
+    are reaped before each claim. A runner aborted after its worker lost the
+    lease leaves the job to the worker which claimed it again.
+
+    Args:
+        runner: The function running each claimed job.
+        engine: The database engine (default: None, uses `app.core.db.engine`).
+        worker_id: The ID of the worker (default: None, uses `get_worker_id`).
+        poll_interval: Seconds to wait when no job is pending
+            (default: None, uses `JOB_QUEUE_POLL_INTERVAL` setting).
+        heartbeat_interval: Seconds between the lease extensions of a job
+            (default: None, uses `JOB_HEARTBEAT_INTERVAL` setting).
+        lease_duration: Seconds of the lease of a job
+            (default: None, uses `JOB_LEASE_DURATION` setting).
+        exit_when_empty: Whether to return as soon as no job is pending,
+            instead of polling again.
+        stop: An event stopping the worker once set, after the running job.
+
+    Returns:
+        The number of jobs run.
+
+    """
+    engine = engine or db.engine
+    worker_id = worker_id or get_worker_id()
+    poll_interval = poll_interval or settings.JOB_QUEUE_POLL_INTERVAL
+    stop = stop or threading.Event()
+    logger.info("Worker %s started", worker_id)
+
+    count = 0
+    while not stop.is_set():
+        with Session(engine) as session:
+            reap_expired_jobs(session)
+            job = claim_job(session, worker_id, lease_duration)
+            if job is None:
+                if exit_when_empty:
+                    break
+                stop.wait(poll_interval)
+                continue
+
+            job_id = job.id
+            logger.info("Worker %s running job %s", worker_id, job_id)
+            try:
+                with heartbeat(
+                    engine,
+                    job_id,
+                    worker_id,
+                    heartbeat_interval,
+                    lease_duration,
+                ) as lost:
+                    runner(session, job, lost)
+            except LeaseLostError:
+                logger.warning("Job %s aborted, its worker lost the lease", job_id)
+                session.rollback()
+            except Exception as e:
+                logger.exception("Job %s failed", job_id)
+                session.rollback()
+                fail_job(session, job_id, worker_id, f"{type(e).__name__}: {e!s}")
+            else:
+                if complete_job(session, job_id, worker_id):
+                    logger.info("Job %s completed", job_id)
+                else:
+                    logger.warning("Job %s completed after its lease expired", job_id)
+            count += 1
+
+    logger.info("Worker %s stopped after %d jobs", worker_id, count)
+    return count
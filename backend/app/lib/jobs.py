@@ -0,0 +1,28 @@
+"""Runners of the queued jobs, by kind of job (see `app.lib.job_queue`)."""
+
+import threading
+
+from sqlmodel import Session
+
+from app.lib.job_queue import JobRunner
+from app.lib.parquet import run_dataset_conversion_job
+from app.lib.training import run_training_job
+from app.models.enums import JobKind
+from app.models.job import Job
+
+JOB_RUNNERS: dict[JobKind, JobRunner] = {
+    JobKind.TRAINING: run_training_job,
+    JobKind.DATASET_CONVERSION: run_dataset_conversion_job,
+}
+
+
+def run_job(session: Session, job: Job, lost: threading.Event) -> None:
+    """Run a claimed job with the runner of its kind.
+
+    Args:
+        session: The database session.
+        job: The claimed job.
+        lost: Event set once the worker lost the lease of the job.
+
+    """
+    JOB_RUNNERS[job.kind](session, job, lost)
@@ -0,0 +1,326 @@
+"""Serving of the deployed models, loaded once per worker process.
+
+Reading the outputs of a model, such as its ROI, needs its posterior draws.
+The worker which trained the model extracts the arrays served, with
+`meridian`, and stores them next to the model as a NumPy `.npz` file (see
+`training.serving` in the `ml` package): the API only loads these arrays,
+without `meridian`. Instead of loading them per request, they are kept as a
+`ServedModel` in a process-wide `SizedLRUCache` bounded by
+`MODEL_CACHE_MAX_BYTES`. Concurrent requests for a model being loaded wait
+for the same load.
+
+The served arrays include the response curve of each media channel, for each
+posterior draw: what-if scenarios of media spend are evaluated from them in
+batches, with NumPy, without running the model again.
+"""
+
+import tempfile
+from dataclasses import dataclass
+from pathlib import PurePosixPath
+from typing import BinaryIO
+
+import numpy as np
+
+from app.core.cache import SizedLRUCache
+from app.core.executor import BlockingExecutor
+from app.core.logging import get_logger
+from app.core.settings import settings
+from app.lib.gcp import download_blob_to_file
+from app.models.model import (
+    ChannelRoi,
+    Model,
+    PosteriorSummary,
+    Scenario,
+    ScenarioOutcome,
+)
+
+logger = get_logger(__name__)
+
+CREDIBLE_INTERVAL = 0.9
+"""Probability mass of the credible intervals of the served summaries."""
+
+MAX_SPEND_MULTIPLIER = 3.0
+"""Largest spend of a channel in a scenario, relative to its historical spend."""
+
+SPEND_MULTIPLIERS = np.linspace(0.0, MAX_SPEND_MULTIPLIER, 31)
+"""Spend multipliers at which the response curves of the channels are served,
+like in `training.serving`. The response of a scenario is interpolated
+linearly between them."""
+
+model_executor = BlockingExecutor(
+    name="models",
+    max_workers=settings.MODEL_EXECUTOR_MAX_WORKERS,
+)
+"""Thread pool loading the served models, and evaluating their scenarios."""
+
+SCENARIO_CHUNK = 16
+"""Scenarios evaluated per array operation. With thousands of draws, the arrays
+of a chunk fit in the CPU cache."""
+
+
+def summarize_draws(draws: np.ndarray) -> list[PosteriorSummary]:
+    """Summarize posterior draws, along the last axis.
+
+    Args:
+        draws: Draws of quantities, of shape (quantities, draws).
+
+    Returns:
+        The mean, median and central credible interval of each quantity.
+
+    """
+    # Quantiles interpolated between the sorted draws, like `np.quantile`,
+    # with a single sort for the three of them
+    tail = (1 - CREDIBLE_INTERVAL) / 2
+    position = np.array([tail, 0.5, 1 - tail]) * (draws.shape[-1] - 1)
+    below = np.floor(position).astype(np.intp)
+    above = np.minimum(below + 1, draws.shape[-1] - 1)
+    ordered = np.sort(draws, axis=-1)
+    quantiles = ordered[:, below] + (position - below) * (
+        ordered[:, above] - ordered[:, below]
+    )
+    lower, median, upper = quantiles.T
+    mean = draws.mean(axis=-1)
+    return [
+        PosteriorSummary(
+            mean=float(mean[i]),
+            median=float(median[i]),
+            ci_lower=float(lower[i]),
+            ci_upper=float(upper[i]),
+        )
+        for i in range(len(draws))
+    ]
+
+
+@dataclass(frozen=True)
+class ServedModel:
+    """Arrays of a trained model read by the serving endpoints.
+
+    Draws of all the chains are flattened on an axis of the arrays.
+    Instances are shared between requests, and must not be modified.
+    """
+
+    channels: tuple[str, ...]
+    """Media channels, an axis of the media arrays."""
+    roi: np.ndarray
+    """Draws of the ROI of each media channel, of shape (draws, channels)."""
+    spend: np.ndarray
+    """Historical spend of each media channel, of shape (channels,)."""
+    response: np.ndarray
+    """Draws of the incremental outcome of each media channel at each of the
+    `SPEND_MULTIPLIERS` of its spend, of shape (channels, multipliers, draws)."""
+    baseline: np.ndarray
+    """Draws of the outcome without media spend, of shape (draws,)."""
+
+    @classmethod
+    def from_npz(cls, file: BinaryIO) -> "ServedModel":
+        """Read the served arrays of a model, extracted by its worker.
+
+        Args:
+            file: The `.npz` file of the arrays, see `training.serving`.
+
+        Returns:
+            The arrays, as contiguous NumPy arrays.
+
+        Raises:
+            ValueError: If the response curves are served at other spend
+                multipliers than `SPEND_MULTIPLIERS`.
+
+        """
+        with np.load(file, allow_pickle=False) as arrays:
+            if not np.array_equal(arrays["multipliers"], SPEND_MULTIPLIERS):
+                msg = "Response curves served at unsupported spend multipliers"
+                raise ValueError(msg)
+            return cls(
+                channels=tuple(arrays["channels"].tolist()),
+                roi=np.ascontiguousarray(arrays["roi"], dtype=np.float64),
+                spend=arrays["spend"].astype(np.float64),
+                response=np.ascontiguousarray(arrays["response"], dtype=np.float64),
+                baseline=arrays["baseline"].astype(np.float64),
+            )
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the arrays, counted against the cache budget."""
+        return (
+            self.roi.nbytes
+            + self.spend.nbytes
+            + self.response.nbytes
+            + self.baseline.nbytes
+        )
+
+    def summarize_roi(self) -> list[ChannelRoi]:
+        """Summarize the posterior ROI of each media channel.
+
+        Returns:
+            The mean, median and central credible interval of each channel.
+
+        """
+        return [
+            ChannelRoi(channel=channel, **summary.model_dump())
+            for channel, summary in zip(
+                self.channels,
+                summarize_draws(self.roi.T),
+                strict=True,
+            )
+        ]
+
+    def get_spend_multipliers(self, scenarios: list[Scenario]) -> np.ndarray:
+        """Get the spend of each channel of scenarios, relative to its history.
+
+        Args:
+            scenarios: The scenarios. Channels left out keep their spend.
+
+        Returns:
+            The spend multipliers, of shape (scenarios, channels).
+
+        Raises:
+            ValueError: If a scenario has an unknown channel, or a spend
+                beyond `MAX_SPEND_MULTIPLIER` times the historical spend.
+
+        """
+        multipliers = np.ones((len(scenarios), len(self.channels)))
+        index = {channel: i for i, channel in enumerate(self.channels)}
+        for row, scenario in enumerate(scenarios):
+            for channel, spend in scenario.spend.items():
+                if channel not in index:
+                    msg = f"Unknown media channel: {channel}"
+                    raise ValueError(msg)
+                historical = self.spend[index[channel]]
+                if spend > historical * MAX_SPEND_MULTIPLIER:
+                    msg = (
+                        f"Spend of {channel} beyond {MAX_SPEND_MULTIPLIER:g} times "
+                        f"its historical spend ({historical:g})"
+                    )
+                    raise ValueError(msg)
+                multipliers[row, index[channel]] = spend / historical if spend else 0
+        return multipliers
+
+    def evaluate(self, multipliers: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Predict the outcome and ROI of scenarios, for every posterior draw.
+
+        All the scenarios are evaluated at once: the response of each channel
+        is interpolated between the served multipliers for all the scenarios
+        and all the draws, with a few array operations per channel. The
+        effects of the channels add up in the model.
+
+        Args:
+            multipliers: The spend multipliers of the scenarios, of shape
+                (scenarios, channels), see `get_spend_multipliers`.
+
+        Returns:
+            The draws of the outcome and of the ROI of the scenarios, of shape
+            (scenarios, draws). The ROI is NaN for scenarios without spend.
+
+        """
+        position = multipliers / SPEND_MULTIPLIERS[1]
+        lower = np.minimum(position.astype(np.intp), len(SPEND_MULTIPLIERS) - 2)
+        weight = (position - lower).T[:, :, None]
+        incremental = np.zeros((len(multipliers), self.response.shape[-1]))
+        below = np.empty_like(incremental)
+        above = np.empty_like(incremental)
+        for channel, curve in enumerate(self.response):
+            np.take(curve, lower[:, channel], axis=0, out=below)
+            np.take(curve, lower[:, channel] + 1, axis=0, out=above)
+            above -= below
+            above *= weight[channel]
+            incremental += below
+            incremental += above
+
+        spend = multipliers @ self.spend
+        with np.errstate(divide="ignore", invalid="ignore"):
+            roi = incremental / spend[:, None]
+        roi[spend == 0] = np.nan
+        incremental += self.baseline
+        return incremental, roi
+
+    def evaluate_scenarios(self, scenarios: list[Scenario]) -> list[ScenarioOutcome]:
+        """Summarize the predicted outcome and ROI of scenarios.
+
+        Scenarios are evaluated by chunks of `SCENARIO_CHUNK`, whose draws
+        stay in the CPU cache from their prediction to their summary.
+
+        Args:
+            scenarios: The scenarios.
+
+        Returns:
+            The outcome of each scenario, in order.
+
+        Raises:
+            ValueError: If a scenario is invalid, see `get_spend_multipliers`.
+
+        """
+        multipliers = self.get_spend_multipliers(scenarios)
+        spend = multipliers * self.spend
+        has_spend = spend.sum(axis=1) > 0
+        outcomes = []
+        for start in range(0, len(scenarios), SCENARIO_CHUNK):
+            chunk = slice(start, start + SCENARIO_CHUNK)
+            kpi, roi = self.evaluate(multipliers[chunk])
+            roi_summaries = iter(summarize_draws(roi[has_spend[chunk]]))
+            outcomes.extend(
+                ScenarioOutcome(
+                    name=scenario.name,
+                    spend=dict(zip(self.channels, scenario_spend, strict=True)),
+                    kpi=kpi_summary,
+                    roi=next(roi_summaries) if scenario_has_spend else None,
+                )
+                for scenario, scenario_spend, scenario_has_spend, kpi_summary in zip(
+                    scenarios[chunk],
+                    spend[chunk].tolist(),
+                    has_spend[chunk],
+                    summarize_draws(kpi),
+                    strict=True,
+                )
+            )
+        return outcomes
+
+
+model_cache: SizedLRUCache[str, ServedModel] = SizedLRUCache(
+    max_bytes=settings.MODEL_CACHE_MAX_BYTES,
+)
+"""Models loaded by this worker process, by model ID."""
+
+
+def get_served_blob_name(model_blob_name: str) -> str:
+    """Get the name of the blob of the served arrays of a model, next to it.
+
+    The arrays are extracted by the worker which trained the model, see
+    `training.serving` in the `ml` package.
+    """
+    return str(PurePosixPath(model_blob_name).with_suffix(".npz"))
+
+
+def load_served_model(uri: str) -> ServedModel:
+    """Download the served arrays of a model.
+
+    Args:
+        uri: The blob of the model, see `app.lib.training.get_model_blob_name`.
+
+    Returns:
+        The served arrays.
+
+    """
+    with tempfile.TemporaryFile() as f:
+        download_blob_to_file(get_served_blob_name(uri), f)
+        f.seek(0)
+        served = ServedModel.from_npz(f)
+    logger.info("Model %s loaded (%d bytes served)", uri, served.nbytes)
+    return served
+
+
+async def get_served_model(model: Model) -> ServedModel:
+    """Get the served arrays of a model, loading it on a cache miss.
+
+    Args:
+        model: The model, which should be deployed.
+
+    Returns:
+        The served arrays, shared with the other requests for the model.
+
+    """
+
+    async def _load() -> tuple[ServedModel, int]:
+        served = await model_executor.run(load_served_model, model.uri)
+        return served, served.nbytes
+
+    return await model_cache.get_or_load(model.id, _load)
@@ -0,0 +1,278 @@
+"""Columnar (Parquet) copies of the uploaded datasets.
+
+CSV is the slowest and largest format to read again: every training run would
+parse every value of the file. At ingestion, the CSV is streamed once, block
+by block, into a typed and compressed Parquet file stored next to it, and
+profiled on the way (see `app.lib.profile`). Readers use the Parquet copy
+when the dataset has one.
+
+Files uploaded directly to storage are not read by the API: their conversion
+is queued as a job, run by the workers with `run_dataset_conversion_job`.
+"""
+
+import tempfile
+import threading
+from pathlib import PurePosixPath
+from typing import BinaryIO
+
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+from fastapi import UploadFile
+from pydantic import BaseModel
+from sqlmodel import Session, col, select, update
+
+from app.core.logging import get_logger
+from app.lib.gcp import (
+    delete_blobs,
+    download_blob_to_file,
+    storage_executor,
+    upload_file_to_blob,
+)
+from app.lib.job_queue import LeaseLostError, lock_lease
+from app.lib.profile import DatasetProfiler
+from app.models.dataset import Dataset, DatasetColumn, DatasetProfile
+from app.models.enums import ColumnRole
+from app.models.job import Job
+
+logger = get_logger(__name__)
+
+PARQUET_CONTENT_TYPE = "application/vnd.apache.parquet"
+CSV_BLOCK_SIZE = 4 * 1024 * 1024
+"""Bytes of CSV parsed at once. Types are inferred from the first block."""
+PARQUET_COMPRESSION = "zstd"
+
+MEDIA_KEYWORDS = ("impression", "reach", "frequency", "click")
+SPEND_KEYWORDS = ("spend", "cost")
+
+
+class DatasetSchema(BaseModel):
+    """Inferred schema of a dataset."""
+
+    columns: list[DatasetColumn]
+
+    def to_arrow(self) -> pa.Schema:
+        """Get the Arrow schema of the Parquet copy."""
+        return pa.schema(
+            [(column.name, _ARROW_TYPES[column.type]) for column in self.columns],
+        )
+
+
+_ARROW_TYPES: dict[str, pa.DataType] = {
+    str(data_type): data_type
+    for data_type in (pa.float64(), pa.string(), pa.date32(), pa.timestamp("s"))
+}
+
+
+def _column_role(name: str, data_type: pa.DataType, *, has_geo: bool) -> ColumnRole:
+    lower_name = name.lower()
+    if pa.types.is_date(data_type) or pa.types.is_timestamp(data_type):
+        return ColumnRole.TIME
+    if pa.types.is_string(data_type):
+        return ColumnRole.CATEGORICAL if has_geo else ColumnRole.GEO
+    if any(keyword in lower_name for keyword in SPEND_KEYWORDS):
+        return ColumnRole.SPEND
+    if any(keyword in lower_name for keyword in MEDIA_KEYWORDS):
+        return ColumnRole.MEDIA
+    return ColumnRole.NUMERIC
+
+
+def infer_dataset_schema(source: BinaryIO) -> DatasetSchema:
+    """Infer the schema of a CSV file from its first block.
+
+    Numbers are all stored as float64: a column of integers in the first block
+    may hold decimals further down, and models read floats anyway. Columns
+    empty in the first block are stored as strings. The first text column is
+    the geo column.
+
+    Args:
+        source: The CSV file, read from its current position
+
+    Returns:
+        DatasetSchema: The columns with their type and role.
+
+    """
+    reader = pa_csv.open_csv(
+        source,
+        read_options=pa_csv.ReadOptions(block_size=CSV_BLOCK_SIZE),
+    )
+    columns = []
+    has_geo = False
+    for field in reader.schema:
+        if pa.types.is_integer(field.type) or pa.types.is_floating(field.type):
+            data_type = pa.float64()
+        elif pa.types.is_date(field.type):
+            data_type = pa.date32()
+        elif pa.types.is_timestamp(field.type):
+            data_type = pa.timestamp("s")
+        else:
+            data_type = pa.string()
+        role = _column_role(field.name, data_type, has_geo=has_geo)
+        has_geo = has_geo or role == ColumnRole.GEO
+        columns.append(
+            DatasetColumn(name=field.name, type=str(data_type), role=role),
+        )
+    reader.close()
+    return DatasetSchema(columns=columns)
+
+
+def convert_csv_to_parquet(source: BinaryIO, sink: BinaryIO) -> DatasetProfile:
+    """Stream a CSV file into a Parquet file, one block at a time.
+
+    The schema is inferred from the first block, then the file is read again
+    with explicit column types: each block becomes a row group, and is added
+    to the profile of the dataset.
+
+    Args:
+        source: The seekable CSV file, read from its start
+        sink: The file to write the Parquet data to
+
+    Returns:
+        DatasetProfile: The profile of the dataset, with the schema of the
+            Parquet file as columns.
+
+    Raises:
+        ValueError: If the CSV file cannot be parsed with the inferred schema.
+
+    """
+    try:
+        source.seek(0)
+        schema = infer_dataset_schema(source)
+        arrow_schema = schema.to_arrow()
+
+        profiler = DatasetProfiler(schema.columns)
+        source.seek(0)
+        reader = pa_csv.open_csv(
+            source,
+            read_options=pa_csv.ReadOptions(block_size=CSV_BLOCK_SIZE),
+            convert_options=pa_csv.ConvertOptions(
+                column_types=arrow_schema,
+                include_columns=arrow_schema.names,
+            ),
+        )
+        with pq.ParquetWriter(
+            sink,
+            arrow_schema,
+            compression=PARQUET_COMPRESSION,
+        ) as writer:
+            for batch in reader:
+                writer.write_batch(batch)
+                profiler.update(batch)
+    except pa.ArrowInvalid as e:
+        msg = f"Invalid CSV file: {e}"
+        raise ValueError(msg) from e
+    return profiler.profile()
+
+
+def get_parquet_blob_name(csv_blob_name: str) -> str:
+    """Get the name of the Parquet copy of a CSV blob."""
+    return str(PurePosixPath(csv_blob_name).with_suffix(".parquet"))
+
+
+def _convert_and_upload(
+    source: BinaryIO,
+    blob_name: str,
+    bucket_name: str | None,
+) -> DatasetProfile:
+    with tempfile.TemporaryFile() as sink:
+        profile = convert_csv_to_parquet(source, sink)
+        size = sink.tell()
+        sink.seek(0)
+        upload_file_to_blob(
+            blob_name=blob_name,
+            file=sink,
+            bucket_name=bucket_name,
+            content_type=PARQUET_CONTENT_TYPE,
+            size=size,
+            if_generation_match=0,
+        )
+    return profile
+
+
+async def upload_parquet_copy(
+    file: UploadFile,
+    csv_blob_name: str,
+    *,
+    bucket_name: str | None = None,
+) -> tuple[str, DatasetProfile]:
+    """Convert an uploaded CSV file to Parquet and store it next to the CSV blob.
+
+    The conversion and the upload run on the storage executor: Arrow releases
+    the GIL while parsing and compressing.
+
+    Args:
+        file: The uploaded CSV file.
+        csv_blob_name: The name of the blob of the CSV file.
+        bucket_name: The name of the GCP bucket
+            (default: None, uses `GCS_BUCKET` env var).
+
+    Returns:
+        The name of the Parquet blob, and the profile of the dataset.
+
+    Raises:
+        ValueError: If the CSV file cannot be parsed.
+
+    """
+    blob_name = get_parquet_blob_name(csv_blob_name)
+    profile = await storage_executor.run(
+        _convert_and_upload,
+        file.file,
+        blob_name,
+        bucket_name,
+    )
+    return blob_name, profile
+
+
+def run_dataset_conversion_job(
+    session: Session,
+    job: Job,
+    lost: threading.Event,
+) -> None:
+    """Convert the CSV file of a dataset to Parquet, and profile it.
+
+    The file is downloaded to a temporary file. A Parquet copy left by an
+    earlier attempt of the job is replaced. The copy is recorded only while
+    the worker owns the lease of the job, and deleted if the dataset was
+    deleted during the conversion. No transaction is left open during the
+    conversion.
+
+    Args:
+        session: The database session, committed by this function.
+        job: The claimed job.
+        lost: Event set once the worker lost the lease of the job.
+
+    Raises:
+        ValueError: If the CSV file cannot be parsed.
+        LeaseLostError: If the worker lost the lease of the job.
+
+    """
+    job_id, worker_id = job.id, job.worker_id
+    dataset = session.get_one(Dataset, job.dataset_id)
+    dataset_id, blob_path = dataset.id, dataset.blob_path
+    session.rollback()
+
+    blob_name = get_parquet_blob_name(blob_path)
+    with tempfile.TemporaryFile() as source:
+        download_blob_to_file(blob_path, source)
+        delete_blobs([blob_name])
+        profile = _convert_and_upload(source, blob_name, None)
+
+    # The dataset is locked before its job, like by the deletion of the
+    # dataset, which cascades to the job
+    statement = select(Dataset.id).where(Dataset.id == dataset_id).with_for_update()
+    if session.exec(statement).first() is None:
+        session.rollback()
+        delete_blobs([blob_name])
+        logger.warning("Dataset %s deleted during its conversion", dataset_id)
+        return
+    if lost.is_set() or not lock_lease(session, job_id, worker_id):
+        msg = f"Lease of job {job_id} lost"
+        raise LeaseLostError(msg)
+
+    session.exec(
+        update(Dataset)
+        .where(col(Dataset.id) == dataset_id)
+        .values(parquet_path=blob_name, profile=profile.model_dump(mode="json")),
+    )
+    session.commit()
+    logger.info("Dataset %s converted to Parquet: %s", dataset_id, blob_name)
@@ -0,0 +1,77 @@
+"""Previews of the uploaded datasets, read with HTTP range requests.
+
+A preview only needs the first lines of a dataset: instead of downloading
+the whole CSV file, its first bytes are read, then as many bytes again as
+read so far, until they hold the header and the requested rows.
+"""
+
+import csv
+import io
+
+from app.core.settings import settings
+from app.lib.gcp import download_blob_range
+from app.models.dataset import DatasetPreview
+
+
+def parse_csv_head(data: bytes, *, end_of_file: bool) -> list[list[str]]:
+    """Parse the complete records at the start of a CSV file.
+
+    Args:
+        data: The first bytes of the file
+        end_of_file: Whether `data` holds the whole file
+
+    Returns:
+        The records fully held by `data`, header included. Blank lines are
+        skipped.
+
+    """
+    if not end_of_file:
+        # Drop the last line, unless it ends in `data`
+        data = data[: data.rfind(b"\n") + 1]
+    reader = csv.reader(
+        io.StringIO(data.decode("utf-8-sig", errors="replace")),
+        # Raise at the end of data inside quotes: the record spans more lines
+        strict=True,
+    )
+    records = []
+    try:
+        records.extend(record for record in reader if record)
+    except csv.Error:
+        pass
+    return records
+
+
+def read_csv_head(
+    blob_name: str,
+    rows: int,
+    *,
+    bucket_name: str | None = None,
+) -> DatasetPreview:
+    """Read the header and the first rows of a CSV blob.
+
+    Args:
+        blob_name: The name of the CSV blob
+        rows: The number of rows to read
+        bucket_name: The name of the GCP bucket
+            (default: None, uses `GCS_BUCKET` env var).
+
+    Returns:
+        DatasetPreview: The header and the rows, fewer than `rows` at the end
+            of the file or when `DATASET_PREVIEW_MAX_SIZE` bytes were read.
+
+    """
+    max_size = settings.DATASET_PREVIEW_MAX_SIZE
+    data = b""
+    while True:
+        range_size = max(settings.DATASET_PREVIEW_RANGE_SIZE, len(data))
+        size = min(range_size, max_size - len(data))
+        chunk = download_blob_range(blob_name, len(data), size, bucket_name)
+        data += chunk
+        end_of_file = len(chunk) < size
+        records = parse_csv_head(data, end_of_file=end_of_file)
+        # The header, then the rows
+        if len(records) > rows or end_of_file or len(data) >= max_size:
+            break
+
+    header, *values = records or [[]]
+    return DatasetPreview(columns=header, rows=values[:rows])
@@ -0,0 +1,119 @@
+"""Streaming profile of the uploaded datasets.
+
+The profile (shape, time range, geos and per-column statistics) is computed
+while the dataset is converted to Parquet, one Arrow batch at a time, so
+that its metadata never requires downloading the dataset again.
+"""
+
+import datetime
+import math
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from app.models.dataset import ColumnProfile, DatasetColumn, DatasetProfile
+from app.models.enums import ColumnRole
+
+
+class _ColumnStats:
+    """Running statistics of a column."""
+
+    def __init__(self, column: DatasetColumn) -> None:
+        self.column = column
+        self.null_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min: float | datetime.date | None = None
+        self.max: float | datetime.date | None = None
+
+    def update(self, array: pa.Array) -> None:
+        self.null_count += array.null_count
+        if self.column.role in {ColumnRole.GEO, ColumnRole.CATEGORICAL}:
+            return
+
+        min_max = pc.min_max(array)
+        low, high = min_max["min"].as_py(), min_max["max"].as_py()
+        if low is not None:
+            self.min = low if self.min is None else min(self.min, low)
+            self.max = high if self.max is None else max(self.max, high)
+        if self.column.role != ColumnRole.TIME:
+            self.count += len(array) - array.null_count
+            self.sum += pc.sum(array).as_py() or 0.0
+
+    def profile(self) -> ColumnProfile:
+        return ColumnProfile(
+            **self.column.model_dump(),
+            null_count=self.null_count,
+            min=_serialize(self.min),
+            max=_serialize(self.max),
+            mean=self.sum / self.count if self.count else None,
+        )
+
+
+def _serialize(value: float | datetime.date | None) -> float | str | None:
+    """Store dates as ISO 8601 strings, and NaN or infinite values as None."""
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    if value is not None and not math.isfinite(value):
+        return None
+    return value
+
+
+class DatasetProfiler:
+    """Profile a dataset from its Arrow batches."""
+
+    def __init__(self, columns: list[DatasetColumn]) -> None:
+        """Initialize an empty profile.
+
+        Args:
+            columns: The columns of the dataset, in the order of the batches
+
+        """
+        self._stats = [_ColumnStats(column) for column in columns]
+        self._time = next(
+            (i for i, c in enumerate(columns) if c.role == ColumnRole.TIME),
+            None,
+        )
+        self._geo = next(
+            (i for i, c in enumerate(columns) if c.role == ColumnRole.GEO),
+            None,
+        )
+        self._row_count = 0
+        self._times: set[datetime.date] = set()
+        self._geos: set[str] = set()
+
+    def update(self, batch: pa.RecordBatch) -> None:
+        """Add a batch of rows to the profile.
+
+        Args:
+            batch: The rows, with the columns given at initialization
+
+        """
+        self._row_count += batch.num_rows
+        for stats, array in zip(self._stats, batch.columns, strict=True):
+            stats.update(array)
+        if self._time is not None:
+            self._times.update(
+                pc.unique(batch.column(self._time)).drop_null().to_pylist()
+            )
+        if self._geo is not None:
+            self._geos.update(
+                pc.unique(batch.column(self._geo)).drop_null().to_pylist()
+            )
+
+    def profile(self) -> DatasetProfile:
+        """Get the profile of the batches added so far.
+
+        Returns:
+            DatasetProfile: The shape and the statistics of the dataset.
+
+        """
+        time_stats = self._stats[self._time] if self._time is not None else None
+        return DatasetProfile(
+            row_count=self._row_count,
+            geos=sorted(self._geos),
+            time_periods=len(self._times),
+            time_start=_serialize(time_stats.min) if time_stats else None,
+            time_end=_serialize(time_stats.max) if time_stats else None,
+            columns=[stats.profile() for stats in self._stats],
+        )
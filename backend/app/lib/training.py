@@ -0,0 +1,282 @@
+"""Training of the queued jobs, with the `training` module of the `ml` package.
+
+The `ml` package is not a dependency of the API: workers run with the `ml`
+directory on their Python path (see `scripts/cli.py worker`), and the module
+is only imported when a job is run.
+"""
+
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import Any
+
+from sqlmodel import Session, select
+
+from app.core.logging import get_logger
+from app.lib.gcp import (
+    check_blob_exists,
+    delete_blobs,
+    download_blob_to_file,
+    upload_file_to_blob,
+)
+from app.lib.job_queue import LeaseLostError, lock_lease
+from app.lib.model_serving import get_served_blob_name
+from app.models.dataset import Dataset
+from app.models.enums import KpiType
+from app.models.job import Job
+from app.models.model import Model
+from app.models.pipeline import Pipeline
+from app.validations.column_mapping import ColumnMapping
+from app.validations.job_parameters import JobParams
+from app.validations.model_spec import ModelSpec
+from app.validations.priors import (
+    ROI_M_MEAN,
+    ROI_M_STDDEV,
+    LogNormalDistribution,
+)
+
+logger = get_logger(__name__)
+
+MODEL_CONTENT_TYPE = "application/octet-stream"
+
+CHECKPOINT_FILENAME = "posterior.nc"
+"""Name of the checkpoint file read by `training.checkpoint`."""
+
+
+def get_model_blob_name(project_id: str, job_id: str) -> str:
+    """Get the name of the blob of the model trained by a job."""
+    return f"{project_id}/models/{job_id}.pkl"
+
+
+def get_checkpoint_blob_name(project_id: str, job_id: str) -> str:
+    """Get the name of the blob of the sampling checkpoint of a job."""
+    return f"{project_id}/checkpoints/{job_id}.nc"
+
+
+@dataclass
+class BlobPriorStore:
+    """Store of the prior draws of a project, see `training.prior_cache`.
+
+    Draws are stored to `<project_id>/priors/<fingerprint>.nc`, and reused by
+    all the seeded jobs of the project with the same inputs.
+    """
+
+    project_id: str
+
+    def get_blob_name(self, key: str) -> str:
+        """Get the name of the blob of the prior draws of a fingerprint."""
+        return f"{self.project_id}/priors/{key}.nc"
+
+    def download(self, key: str, path: Path) -> bool:
+        """Download the draws of a fingerprint to a file, if stored."""
+        blob_name = self.get_blob_name(key)
+        if not check_blob_exists(blob_name):
+            return False
+        with path.open("wb") as f:
+            download_blob_to_file(blob_name, f)
+        return True
+
+    def upload(self, key: str, path: Path) -> None:
+        """Upload the draws of a file under a fingerprint."""
+        with path.open("rb") as f:
+            upload_file_to_blob(
+                self.get_blob_name(key),
+                f,
+                content_type=MODEL_CONTENT_TYPE,
+            )
+
+
+def get_warm_start_model(session: Session, project_id: str, model_id: str) -> Model:
+    """Get the model whose final state starts the sampling of a job.
+
+    Args:
+        session: The database session.
+        project_id: The project of the job.
+        model_id: The ID of the model.
+
+    Returns:
+        The model.
+
+    Raises:
+        ValueError: If the model does not exist in the project.
+
+    """
+    model = session.get(Model, model_id)
+    if model is not None:
+        job = session.get_one(Job, model.job_id)
+        pipeline = session.get_one(Pipeline, job.pipeline_id)
+        if pipeline.project_id == project_id:
+            return model
+    msg = f"Warm start model {model_id} not found in project {project_id}"
+    raise ValueError(msg)
+
+
+def build_training_args(
+    dataset: Dataset,
+    pipeline: Pipeline,
+    job: Job,
+) -> dict[str, Any]:
+    """Get the arguments of `training.main.main` for a job.
+
+    Args:
+        dataset: The dataset of the pipeline.
+        pipeline: The pipeline of the job.
+        job: The job to run.
+
+    Returns:
+        The keyword arguments of `training.main.main`, but the paths of the
+        input data and of the trained model.
+
+    Raises:
+        ValueError: If the ROI prior of the model specification is not a
+            LogNormal distribution, the only one supported by the training.
+
+    """
+    columns = ColumnMapping.model_validate(pipeline.columns)
+    model_spec = ModelSpec.model_validate(pipeline.model_spec)
+    params = JobParams.model_validate(job.params)
+
+    roi_m = model_spec.priors.roi_m if model_spec.priors else None
+    if roi_m is None:
+        roi_mu, roi_sigma = ROI_M_MEAN, ROI_M_STDDEV
+    elif isinstance(roi_m, LogNormalDistribution):
+        roi_mu, roi_sigma = roi_m.params.mean, roi_m.params.stddev
+    else:
+        msg = f"Unsupported ROI prior distribution: {roi_m.distribution}"
+        raise ValueError(msg)
+
+    return {
+        "kpi_type": KpiType(dataset.kpi_type).value,
+        **columns.model_dump(),
+        "roi_mu": roi_mu,
+        "roi_sigma": roi_sigma,
+        "max_lag": model_spec.max_lag,
+        "n_draws": params.prior.n_draws,
+        **params.posterior.model_dump(),
+        "seed": params.seed,
+    }
+
+
+def run_training_job(session: Session, job: Job, lost: threading.Event) -> None:
+    """Train the model of a job, and store it.
+
+    The dataset is downloaded to a temporary directory, from its Parquet copy
+    when it has one. The trained model is uploaded to
+    `<project_id>/models/<job_id>.pkl`, with its served arrays next to it, in
+    `<project_id>/models/<job_id>.npz`, and recorded as a `Model`.
+
+    With a `segment_size`, the posterior sampling is checkpointed to
+    `<project_id>/checkpoints/<job_id>.nc` after each segment. A job run again,
+    after its worker was lost, resumes from this checkpoint, deleted once the
+    model is stored.
+
+    With a `warm_start_model_id`, the artifact of this model is downloaded
+    too, and its final state starts the posterior sampling. The prior draws of
+    seeded jobs are cached in a `BlobPriorStore`.
+
+    Once its worker lost the lease, the job stops at the next checkpoint, or
+    once the model is trained: the model is recorded only while the worker
+    owns the lease, and once per job.
+
+    The inputs of the job are read in a transaction ended before the
+    training: no transaction is left open while the model is trained.
+
+    Args:
+        session: The database session, committed by this function.
+        job: The claimed job.
+        lost: Event set once the worker lost the lease of the job.
+
+    Raises:
+        LeaseLostError: If the worker lost the lease of the job.
+
+    """
+    from training.main import main as train
+
+    job_id, worker_id, fingerprint = job.id, job.worker_id, job.fingerprint
+    stored = session.exec(select(Model).where(Model.job_id == job_id)).first()
+    if stored is not None:
+        # Stored by a worker which lost the lease before completing the job
+        logger.info("Model of job %s already stored to %s", job_id, stored.uri)
+        session.rollback()
+        return
+
+    def _check_lease() -> None:
+        if lost.is_set():
+            msg = f"Lease of job {job_id} lost"
+            raise LeaseLostError(msg)
+
+    pipeline = session.get_one(Pipeline, job.pipeline_id)
+    dataset = session.get_one(Dataset, pipeline.dataset_id)
+    kwargs = build_training_args(dataset, pipeline, job)
+    project_id = pipeline.project_id
+    data_path = dataset.parquet_path or dataset.blob_path
+    warm_start_model_id = JobParams.model_validate(job.params).warm_start_model_id
+    warm_start_uri = (
+        get_warm_start_model(session, project_id, warm_start_model_id).uri
+        if warm_start_model_id is not None
+        else None
+    )
+    # Release the snapshot and the locks of the reads during the training
+    session.rollback()
+
+    blob_name = get_model_blob_name(project_id, job_id)
+    served_name = get_served_blob_name(blob_name)
+    checkpoint_name = get_checkpoint_blob_name(project_id, job_id)
+    checkpointed = kwargs["segment_size"] is not None
+
+    def _upload_checkpoint(path: Path) -> None:
+        _check_lease()
+        with path.open("rb") as f:
+            upload_file_to_blob(checkpoint_name, f, content_type=MODEL_CONTENT_TYPE)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / PurePosixPath(data_path).name
+        file_path = Path(tmp) / "model.pkl"
+        served_path = Path(tmp) / "model.npz"
+        with csv_path.open("wb") as f:
+            download_blob_to_file(data_path, f)
+
+        if warm_start_uri is not None:
+            warm_start_path = Path(tmp) / "warm_start.pkl"
+            with warm_start_path.open("wb") as f:
+                download_blob_to_file(warm_start_uri, f)
+            kwargs["warm_start_path"] = str(warm_start_path)
+
+        if checkpointed:
+            checkpoint_dir = Path(tmp) / "checkpoint"
+            checkpoint_dir.mkdir()
+            resume = check_blob_exists(checkpoint_name)
+            if resume:
+                logger.info("Resuming job %s from %s", job_id, checkpoint_name)
+                with (checkpoint_dir / CHECKPOINT_FILENAME).open("wb") as f:
+                    download_blob_to_file(checkpoint_name, f)
+            kwargs |= {
+                "checkpoint_dir": str(checkpoint_dir),
+                "resume": resume,
+                "on_checkpoint": _upload_checkpoint,
+            }
+
+        train(
+            csv_path=str(csv_path),
+            file_path=str(file_path),
+            served_path=str(served_path),
+            prior_store=BlobPriorStore(project_id),
+            **kwargs,
+        )
+
+        _check_lease()
+        # The model is only reused by the cache once its served arrays exist
+        with served_path.open("rb") as f:
+            upload_file_to_blob(served_name, f, content_type=MODEL_CONTENT_TYPE)
+        with file_path.open("rb") as f:
+            upload_file_to_blob(blob_name, f, content_type=MODEL_CONTENT_TYPE)
+
+    if not lock_lease(session, job_id, worker_id):
+        msg = f"Lease of job {job_id} lost before storing its model"
+        raise LeaseLostError(msg)
+    session.add(Model(job_id=job_id, uri=blob_name, fingerprint=fingerprint))
+    session.commit()
+    logger.info("Model of job %s stored to %s", job_id, blob_name)
+    if checkpointed:
+        delete_blobs([checkpoint_name])
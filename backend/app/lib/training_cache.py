@@ -0,0 +1,206 @@
+"""Cache of the trained models, keyed by a fingerprint of the training inputs.
+
+Two jobs with the same dataset content, column mapping, model specification
+and sampling parameters (seed included) train the same model. Before a job is
+queued, the fingerprint of its inputs is looked up in the `models` table: on a
+hit, the stored model is reused and no job is run. The fingerprint of a job
+is recorded on the model it trains.
+"""
+
+import hashlib
+import json
+
+from pydantic import BaseModel
+from sqlalchemy import func
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.lib.gcp import check_blob_exists, get_blob, storage_executor
+from app.lib.model_serving import get_served_blob_name
+from app.models.blob import Blob
+from app.models.dataset import Dataset
+from app.models.enums import JobKind, KpiType
+from app.models.job import Job
+from app.models.model import Model
+from app.models.pipeline import Pipeline
+from app.validations.column_mapping import ColumnMapping
+from app.validations.job_parameters import JobParams
+from app.validations.model_spec import ModelSpec
+
+FINGERPRINT_VERSION = 1
+"""Version of the training inputs, to increase when the training changes."""
+
+EXECUTION_PARAMS = {"posterior": {"n_processes", "segment_size"}}
+"""Sampling parameters which change how a model is trained, not the model:
+left out of the fingerprint."""
+
+
+def compute_fingerprint(
+    *,
+    content_hash: str,
+    kpi_type: KpiType,
+    columns: ColumnMapping,
+    model_spec: ModelSpec,
+    params: JobParams,
+) -> str:
+    """Hash the inputs of a training.
+
+    Models are serialized with their default values, so that an omitted
+    field and its default value give the same fingerprint. The
+    `EXECUTION_PARAMS` are left out.
+
+    Args:
+        content_hash: The hash of the content of the dataset.
+        kpi_type: The KPI type of the dataset.
+        columns: The column mapping of the pipeline.
+        model_spec: The model specification of the pipeline.
+        params: The sampling parameters of the job.
+
+    Returns:
+        The SHA-256 hex digest of the inputs.
+
+    """
+    inputs = {
+        "version": FINGERPRINT_VERSION,
+        "content_hash": content_hash,
+        "kpi_type": KpiType(kpi_type).value,
+        "columns": columns.model_dump(mode="json"),
+        "model_spec": model_spec.model_dump(mode="json"),
+        "params": params.model_dump(mode="json", exclude=EXECUTION_PARAMS),
+    }
+    payload = json.dumps(inputs, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+async def get_content_hash(session: AsyncSession, blob_path: str) -> str | None:
+    """Get the hash of the content of a dataset file.
+
+    Blobs uploaded through the API are hashed with SHA-256 at ingestion.
+    Others fall back to the MD5 hash computed by the storage, read on
+    `storage_executor`.
+
+    Args:
+        session: The database session.
+        blob_path: The path of the dataset file.
+
+    Returns:
+        The hash, prefixed with its algorithm, or None if unknown.
+
+    """
+    blob = await session.get(Blob, blob_path)
+    if blob is not None and blob.sha256:
+        return f"sha256:{blob.sha256}"
+    stored = await storage_executor.run(get_blob, blob_path)
+    if stored is not None and stored.md5_hash:
+        return f"md5:{stored.md5_hash}"
+    return None
+
+
+async def get_job_fingerprint(
+    session: AsyncSession,
+    pipeline: Pipeline,
+    params: JobParams,
+) -> str | None:
+    """Get the fingerprint of a job of a pipeline.
+
+    Args:
+        session: The database session.
+        pipeline: The pipeline to train.
+        params: The sampling parameters of the job.
+
+    Returns:
+        The fingerprint, or None if the content of the dataset is unknown.
+
+    """
+    dataset = await session.get_one(Dataset, pipeline.dataset_id)
+    content_hash = await get_content_hash(session, dataset.blob_path)
+    if content_hash is None:
+        return None
+    return compute_fingerprint(
+        content_hash=content_hash,
+        kpi_type=dataset.kpi_type,
+        columns=ColumnMapping.model_validate(pipeline.columns),
+        model_spec=ModelSpec.model_validate(pipeline.model_spec),
+        params=params,
+    )
+
+
+def check_model_stored(uri: str) -> bool:
+    """Check whether the artifact of a model and its served arrays are stored."""
+    return check_blob_exists(uri) and check_blob_exists(get_served_blob_name(uri))
+
+
+async def find_cached_model(
+    session: AsyncSession,
+    project_id: str,
+    fingerprint: str,
+) -> Model | None:
+    """Find the latest model of a project trained with a fingerprint.
+
+    Models of other projects are never reused, even with the same inputs.
+    The storage of the models is checked on `storage_executor`.
+
+    Args:
+        session: The database session.
+        project_id: The project of the job.
+        fingerprint: The fingerprint of the training inputs.
+
+    Returns:
+        The model, or None if no model with a stored artifact and stored
+        served arrays matches.
+
+    """
+    models = await session.exec(
+        select(Model)
+        .join(Job, Job.id == Model.job_id)
+        .join(Pipeline, Pipeline.id == Job.pipeline_id)
+        .where(Model.fingerprint == fingerprint, Pipeline.project_id == project_id)
+        .order_by(col(Model.created_at).desc()),
+    )
+    for model in models.all():
+        if await storage_executor.run(check_model_stored, model.uri):
+            return model
+    return None
+
+
+class TrainingCacheStats(BaseModel):
+    """Hit rate of the trained models cache, over all the submitted training jobs."""
+
+    lookups: int
+    """Jobs submitted with a fingerprint."""
+    hits: int
+    """Jobs which reused a cached model."""
+    uncacheable: int
+    """Jobs submitted without a fingerprint, since their dataset has no hash."""
+    hit_rate: float | None
+    """Hits per lookup (`None` before the first lookup)."""
+
+
+async def get_cache_stats(session: AsyncSession) -> TrainingCacheStats:
+    """Count the cache hits and misses of the submitted jobs.
+
+    Args:
+        session: The database session.
+
+    Returns:
+        TrainingCacheStats: The hit rate of the cache.
+
+    """
+    fingerprinted = col(Job.fingerprint).is_not(None)
+    total, lookups, hits = (
+        await session.exec(
+            select(
+                func.count(),
+                func.count().filter(fingerprinted),
+                func.count().filter(fingerprinted, col(Job.cache_hit)),
+            )
+            .select_from(Job)
+            .where(Job.kind == JobKind.TRAINING),
+        )
+    ).one()
+    return TrainingCacheStats(
+        lookups=lookups,
+        hits=hits,
+        uncacheable=total - lookups,
+        hit_rate=hits / lookups if lookups else None,
+    )
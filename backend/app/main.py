@@ -9,6 +9,7 @@ from fastapi import FastAPI
 from .core.middleware import add_middleware
 from .core.settings import settings
 from .routers.health import router as health_router
+from .routers.metrics import router as metrics_router
 from .routers.v1 import router as v1_router
 
 app = FastAPI(
@@ -25,6 +26,7 @@ add_middleware(app)
 # Include routers after middleware
 app.include_router(v1_router)
 app.include_router(health_router)
+app.include_router(metrics_router)
 
 
 @app.get("/", include_in_schema=False)
@@ -1,13 +1,23 @@
 """SQLModel database models for Baynext API."""
 
+from .blob import Blob
 from .dataset import Dataset
+from .dataset_upload import DatasetUpload
+from .job import Job
 from .membership import Membership
+from .model import Model
+from .pipeline import Pipeline
 from .project import Project
 from .user import User
 
 __all__ = [
+    "Blob",
     "Dataset",
+    "DatasetUpload",
+    "Job",
     "Membership",
+    "Model",
+    "Pipeline",
     "Project",
     "User",
 ]
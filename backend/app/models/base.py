@@ -3,7 +3,7 @@
 from datetime import UTC, datetime
 from uuid import uuid4
 
-from sqlmodel import Field
+from sqlmodel import DateTime, Field
 
 
 class TimestampMixin:
@@ -12,10 +12,12 @@ class TimestampMixin:
     created_at: datetime = Field(
         default_factory=lambda: datetime.now(UTC),
         index=True,
+        sa_type=DateTime(timezone=True),
     )
     updated_at: datetime | None = Field(
         default=None,
-        sa_column_kwargs={"onupdate": datetime.now(UTC)},
+        sa_type=DateTime(timezone=True),
+        sa_column_kwargs={"onupdate": lambda: datetime.now(UTC)},
     )
 
 
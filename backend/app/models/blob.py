@@ -0,0 +1,29 @@
+"""Blob model, counting the references to a stored dataset file."""
+
+from sqlmodel import BigInteger, Field, SQLModel
+
+from .base import TimestampMixin
+
+
+class Blob(SQLModel, TimestampMixin, table=True):
+    """Dataset file in blob storage, shared by the datasets of same content.
+
+    Datasets are stored under the hash of their content, so re-uploading a
+    file creates a dataset pointing at the existing blob. The blob (and its
+    Parquet copy) is deleted from storage with its last dataset, then its row,
+    kept without references until then.
+    """
+
+    __tablename__ = "blobs"
+
+    path: str = Field(primary_key=True, max_length=255)
+    """Path of the blob in storage, as in `Dataset.blob_path`."""
+
+    sha256: str | None = Field(default=None, max_length=64)
+    """Hash of the content, None for blobs uploaded before deduplication."""
+
+    size: int | None = Field(default=None, sa_type=BigInteger)
+    """Size of the blob in bytes, if known."""
+
+    ref_count: int = 0
+    """Number of datasets pointing at the blob."""
@@ -5,11 +5,15 @@ from typing import TYPE_CHECKING
 from uuid import uuid4
 
 from fastapi import UploadFile
+from pydantic import BaseModel, ConfigDict
 from pydantic import Field as PydanticField
-from sqlmodel import Field, Relationship, SQLModel
+from pydantic.alias_generators import to_camel
+from sqlalchemy import JSON
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlmodel import Column, Field, Index, Relationship, SQLModel, desc
 
 from .base import TimestampMixin, UUIDMixin
-from app.models.enums import KpiType
+from app.models.enums import ColumnRole, KpiType
 
 if TYPE_CHECKING:
     from .project import Project
@@ -18,6 +22,64 @@ if TYPE_CHECKING:
 from .user import UserPublic
 
 
+class DatasetColumn(BaseModel):
+    """Column of a dataset, as stored in its Parquet copy."""
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+    name: str
+    type: str = PydanticField(description="Arrow type of the column")
+    role: ColumnRole
+
+
+class ColumnProfile(DatasetColumn):
+    """Statistics of a dataset column."""
+
+    null_count: int
+    min: float | str | None = PydanticField(
+        default=None,
+        description="Minimum value of numeric and time (ISO 8601) columns",
+    )
+    max: float | str | None = PydanticField(
+        default=None,
+        description="Maximum value of numeric and time (ISO 8601) columns",
+    )
+    mean: float | None = PydanticField(
+        default=None,
+        description="Mean value of numeric columns",
+    )
+
+
+class DatasetProfile(BaseModel):
+    """Shape and statistics of a dataset, computed at ingestion."""
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+    row_count: int
+    geos: list[str] = PydanticField(description="Distinct values of the geo column")
+    time_periods: int = PydanticField(
+        description="Distinct values of the time column",
+    )
+    time_start: str | None = PydanticField(
+        default=None,
+        description="First value of the time column (ISO 8601)",
+    )
+    time_end: str | None = PydanticField(
+        default=None,
+        description="Last value of the time column (ISO 8601)",
+    )
+    columns: list[ColumnProfile]
+
+
+class DatasetPreview(BaseModel):
+    """First rows of a dataset, as stored in its CSV file."""
+
+    columns: list[str] = PydanticField(description="Header of the dataset")
+    rows: list[list[str]] = PydanticField(
+        description="First rows of the dataset, one value per column",
+    )
+
+
 class DatasetBase(SQLModel):
     """Base dataset model for shared attributes."""
 
@@ -39,6 +101,15 @@ class Dataset(DatasetBase, UUIDMixin, TimestampMixin, table=True):
     """Dataset model for database storage."""
 
     __tablename__ = "datasets"
+    __table_args__ = (
+        # Keyset pagination of the datasets of a project
+        Index(
+            "ix_datasets_project_id_created_at_id",
+            "project_id",
+            desc("created_at"),
+            desc("id"),
+        ),
+    )
 
     project_id: str = Field(
         foreign_key="projects.id",
@@ -56,12 +127,24 @@ class Dataset(DatasetBase, UUIDMixin, TimestampMixin, table=True):
         description="Path to the dataset blob storage",
     )
 
+    parquet_path: str | None = Field(
+        default=None,
+        max_length=255,
+        description="Path to the Parquet copy of the dataset in blob storage",
+    )
+
     last_modified_by: str | None = Field(
         default=None,
         foreign_key="users.id",
         description="User ID of the last modifier",
     )
 
+    profile: dict | None = Field(
+        default=None,
+        sa_column=Column(JSON().with_variant(JSONB(), "postgresql")),
+        description="Dataset profile, see `DatasetProfile`",
+    )
+
     # Relationships
     creator: "User" = Relationship(
         sa_relationship_kwargs={
@@ -76,6 +159,11 @@ class Dataset(DatasetBase, UUIDMixin, TimestampMixin, table=True):
     )
     project: "Project" = Relationship(back_populates="datasets")
 
+    @property
+    def data_path(self) -> str:
+        """Path of the copy of the dataset to read: Parquet, if available."""
+        return self.parquet_path or self.blob_path
+
     class Config:
         """Pydantic configuration."""
 
@@ -107,6 +195,15 @@ class DatasetCreated(DatasetBase):
         description="Path to the dataset blob storage",
         alias="blobPath",
     )
+    parquet_path: str | None = PydanticField(
+        default=None,
+        description="Path to the Parquet copy of the dataset in blob storage",
+        alias="parquetPath",
+    )
+    profile: DatasetProfile | None = PydanticField(
+        default=None,
+        description="Shape and statistics of the dataset",
+    )
     created_by: str = PydanticField(
         description="User ID of the dataset creator",
         alias="createdBy",
@@ -0,0 +1,93 @@
+"""Dataset upload model, for files uploaded directly to the blob storage."""
+
+import datetime
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict
+from pydantic import Field as PydanticField
+from pydantic.alias_generators import to_camel
+from sqlmodel import BigInteger, DateTime, Field
+
+from .base import TimestampMixin, UUIDMixin
+from .dataset import DatasetBase
+
+
+class DatasetUploadCreate(DatasetBase):
+    """Dataset upload creation model for API requests."""
+
+    content_type: Literal["text/csv", "application/csv"] = PydanticField(
+        description="MIME type of the dataset file",
+        alias="contentType",
+    )
+    size: int = PydanticField(gt=0, description="Size of the file, in bytes")
+    md5_hash: str = PydanticField(
+        pattern=r"^[A-Za-z0-9+/]{22}==$",
+        description="Base64-encoded MD5 hash of the file",
+        alias="md5Hash",
+        examples=["1B2M2Y8AsgTpgAmY7PhCfg=="],
+    )
+    resumable: bool = PydanticField(
+        default=True,
+        description=(
+            "Whether to start a resumable upload session, instead of sending "
+            "the file in a single request"
+        ),
+    )
+
+    class Config:
+        """Pydantic configuration."""
+
+        populate_by_name = True
+        use_enum_values = True
+
+
+class DatasetUpload(DatasetBase, UUIDMixin, TimestampMixin, table=True):
+    """Dataset file reserved for a direct upload, until it is completed."""
+
+    __tablename__ = "dataset_uploads"
+
+    project_id: str = Field(
+        foreign_key="projects.id",
+        index=True,
+        description="Parent project ID",
+    )
+
+    created_by: str = Field(
+        foreign_key="users.id",
+        description="User ID of the dataset creator",
+    )
+
+    blob_path: str = Field(
+        max_length=255,
+        description="Path reserved for the dataset in blob storage",
+    )
+
+    content_type: str = Field(max_length=255, description="Expected content type")
+
+    size: int = Field(sa_type=BigInteger, description="Expected size, in bytes")
+
+    md5_hash: str = Field(max_length=24, description="Expected base64 MD5 hash")
+
+    expires_at: datetime.datetime = Field(
+        sa_type=DateTime(timezone=True),
+        description="Expiration of the signed upload URL",
+    )
+
+
+class DatasetUploadCreated(BaseModel):
+    """Signed URL to upload a dataset file to, for API responses."""
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+    id: str = PydanticField(description="Unique identifier for the upload")
+    blob_path: str = PydanticField(description="Path reserved in blob storage")
+    upload_url: str = PydanticField(description="V4 signed URL to upload to")
+    method: Literal["POST", "PUT"] = PydanticField(
+        description="HTTP method of the request to the signed URL",
+    )
+    headers: dict[str, str] = PydanticField(
+        description="Headers to send with the request to the signed URL",
+    )
+    expires_at: datetime.datetime = PydanticField(
+        description="Expiration of the signed URL",
+    )
@@ -24,3 +24,34 @@ class KpiType(str, Enum):
 
     REVENUE = "revenue"
     NON_REVENUE = "non_revenue"
+
+
+class ColumnRole(str, Enum):
+    """Enumeration for the roles of dataset columns, inferred at ingestion."""
+
+    TIME = "time"
+    GEO = "geo"
+    MEDIA = "media"
+    SPEND = "spend"
+    NUMERIC = "numeric"
+    """Numeric column which is neither media nor spend: KPI, controls..."""
+    CATEGORICAL = "categorical"
+
+
+class JobKind(str, Enum):
+    """Enumeration for the kinds of jobs run by the workers."""
+
+    TRAINING = "training"
+    """Training of a pipeline, see `app.lib.training`."""
+    DATASET_CONVERSION = "dataset_conversion"
+    """Parquet copy and profile of an uploaded dataset, see `app.lib.parquet`."""
+
+
+class JobStatus(str, Enum):
+    """Enumeration for the statuses of jobs."""
+
+    PENDING = "pending"
+    """Queued, waiting for a worker."""
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
@@ -0,0 +1,102 @@
+"""Job model, a training run of a pipeline, or other work queued for the workers."""
+
+# Inspiration: https://cloud.google.com/vertex-ai/docs/reference/rest/v1/projects.locations.pipelineJobs
+
+import uuid
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from pydantic import BaseModel, ConfigDict
+from pydantic import Field as PydanticField
+from pydantic.alias_generators import to_camel
+from sqlalchemy import JSON
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlmodel import Column, DateTime, Field, Index, Relationship, SQLModel
+
+from .base import TimestampMixin
+from .enums import JobKind, JobStatus
+
+if TYPE_CHECKING:
+    from .model import Model
+    from .pipeline import Pipeline
+
+
+class Job(SQLModel, TimestampMixin, table=True):
+    """Job, claimed by a worker from the queue of pending jobs.
+
+    Most jobs train a pipeline. Others convert an uploaded dataset to Parquet
+    and profile it, see `JobKind`.
+    """
+
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # Oldest pending job first: the queue of the workers
+        Index("ix_jobs_status_created_at", "status", "created_at"),
+        # Running jobs whose lease expired, requeued by the reaper
+        Index("ix_jobs_status_lease_expires_at", "status", "lease_expires_at"),
+    )
+
+    # Attributes
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
+    kind: JobKind = JobKind.TRAINING
+    pipeline_id: str | None = Field(
+        default=None,
+        foreign_key="pipelines.id",
+        index=True,
+    )
+    """Pipeline trained by a training job."""
+    dataset_id: str | None = Field(
+        default=None,
+        foreign_key="datasets.id",
+        ondelete="CASCADE",
+        index=True,
+    )
+    """Dataset converted by a dataset conversion job."""
+
+    status: JobStatus = JobStatus.PENDING
+
+    params: dict = Field(
+        sa_column=Column(JSON().with_variant(JSONB(), "postgresql"), nullable=False),
+        description="Sampling parameters of a training job, see `JobParams`",
+    )
+    # metrics: dict | None = Field(default=None, sa_column=Column(JSONB))
+    fingerprint: str | None = Field(default=None, max_length=64)
+    """Hash of the training inputs, see `app.lib.training_cache`."""
+    cache_hit: bool = False
+    """Whether the job reused the model of an earlier job instead of training."""
+
+    worker_id: str | None = Field(default=None, max_length=255)
+    """Worker which claimed the job, owner of its lease."""
+    lease_expires_at: datetime | None = Field(
+        default=None,
+        sa_type=DateTime(timezone=True),
+    )
+    """End of the lease of the worker, extended by its heartbeats."""
+    started_at: datetime | None = Field(default=None, sa_type=DateTime(timezone=True))
+    finished_at: datetime | None = Field(default=None, sa_type=DateTime(timezone=True))
+
+    retries: int = 0
+    """Number of times the job was requeued after its lease expired."""
+    error: str | None = None
+
+    # Relationships
+    pipeline: "Pipeline" = Relationship(back_populates="jobs")
+    model: "Model" = Relationship(back_populates="job")
+
+
+class JobSubmitted(BaseModel):
+    """Training job submitted for a pipeline, for API responses."""
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+    id: str
+    pipeline_id: str
+    status: JobStatus
+    cache_hit: bool = PydanticField(
+        description="Whether the model of an earlier job was reused",
+    )
+    model_id: str | None = PydanticField(
+        default=None,
+        description="ID of the reused model, on a cache hit",
+    )
+    created_at: datetime
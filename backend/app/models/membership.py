@@ -3,7 +3,7 @@
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING
 
-from sqlmodel import Field, Relationship, SQLModel
+from sqlmodel import DateTime, Field, Index, Relationship, SQLModel
 
 from .base import UUIDMixin
 from .enums import UserRole
@@ -19,6 +19,10 @@ class Membership(SQLModel, UUIDMixin, table=True):
     """Project membership model."""
 
     __tablename__ = "memberships"
+    __table_args__ = (
+        # Projects of a user, read from the index only
+        Index("ix_memberships_user_id_project_id", "user_id", "project_id"),
+    )
 
     project_id: str = Field(foreign_key="projects.id", index=True)
     """ID of the project this membership belongs to."""
@@ -30,7 +34,11 @@ class Membership(SQLModel, UUIDMixin, table=True):
     """Role of the user in the project (e.g., viewer, editor, admin)."""
 
     invited_by: str = Field(foreign_key="users.id")
-    joined_at: datetime = Field(default_factory=lambda: datetime.now(UTC), index=True)
+    joined_at: datetime = Field(
+        default_factory=lambda: datetime.now(UTC),
+        index=True,
+        sa_type=DateTime(timezone=True),
+    )
 
     # Relationships
     project: "Project" = Relationship(back_populates="members")
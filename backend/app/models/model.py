@@ -0,0 +1,121 @@
+"""Model model, the trained model of a job."""
+
+import uuid
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Annotated
+
+from pydantic import BaseModel, ConfigDict
+from pydantic import Field as PydanticField
+from pydantic.alias_generators import to_camel
+from sqlmodel import DateTime, Field, Relationship, SQLModel
+
+if TYPE_CHECKING:
+    from .job import Job
+
+
+class ModelBase(SQLModel):
+    pass
+
+
+class Model(SQLModel, table=True):
+    """Trained model, stored in blob storage."""
+
+    __tablename__ = "models"
+
+    # Attributes
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
+    job_id: str = Field(foreign_key="jobs.id", index=True, unique=True)
+    """Job which trained the model: a job stores at most one model."""
+    uri: str = Field(max_length=255)
+    """Path of the model in blob storage."""
+    fingerprint: str | None = Field(default=None, max_length=64, index=True)
+    """Hash of the training inputs, see `app.lib.training_cache`."""
+
+    deployed: bool = False
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(UTC),
+        sa_type=DateTime(timezone=True),
+    )
+
+    # Relationships
+    job: "Job" = Relationship(back_populates="model")
+
+
+class ModelCreate(ModelBase):
+    pass
+
+
+class ModelUpdate(ModelBase):
+    """Model update, to deploy or undeploy a model."""
+
+    deployed: bool = PydanticField(
+        description="Whether the outputs of the model are served",
+    )
+
+
+class ModelPublic(ModelBase):
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+    id: str
+    job_id: str = PydanticField(description="ID of the job which trained the model")
+    created_at: datetime
+    deployed: bool
+
+
+class PosteriorSummary(BaseModel):
+    """Summary of the posterior draws of a quantity."""
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+    mean: float
+    median: float
+    ci_lower: float = PydanticField(description="Lower bound of the 90% interval")
+    ci_upper: float = PydanticField(description="Upper bound of the 90% interval")
+
+
+class ChannelRoi(PosteriorSummary):
+    """Posterior summary of the ROI of a media channel."""
+
+    channel: str
+
+
+MAX_SCENARIOS = 1000
+"""Maximum number of scenarios evaluated by a request."""
+
+
+class Scenario(BaseModel):
+    """Media spend scenario of a what-if analysis."""
+
+    name: str | None = PydanticField(default=None, max_length=255)
+    spend: dict[str, Annotated[float, PydanticField(ge=0)]] = PydanticField(
+        default_factory=dict,
+        description=(
+            "Total spend of media channels over the period of the dataset. "
+            "Channels left out keep their historical spend."
+        ),
+        examples=[{"tv": 120000.0, "search": 80000.0}],
+    )
+
+
+class ScenarioBatch(BaseModel):
+    """Batch of scenarios, evaluated at once."""
+
+    scenarios: list[Scenario] = PydanticField(min_length=1, max_length=MAX_SCENARIOS)
+
+
+class ScenarioOutcome(BaseModel):
+    """Predicted outcome of a media spend scenario."""
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+    name: str | None = None
+    spend: dict[str, float] = PydanticField(
+        description="Total spend of each media channel in the scenario",
+    )
+    kpi: PosteriorSummary = PydanticField(
+        description="Predicted KPI over the period, or revenue for revenue KPIs",
+    )
+    roi: PosteriorSummary | None = PydanticField(
+        description="Incremental outcome of the media per unit of spend, "
+        "None without spend",
+    )
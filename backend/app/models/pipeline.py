@@ -0,0 +1,87 @@
+"""Pipeline model, training a model specification on a dataset."""
+
+import datetime
+import uuid
+from typing import TYPE_CHECKING
+
+from pydantic import Field as PydanticField
+from sqlalchemy import JSON
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlmodel import Column, Field, Relationship, SQLModel
+
+from .base import TimestampMixin
+from app.validations.column_mapping import ColumnMapping
+from app.validations.model_spec import ModelSpec
+
+if TYPE_CHECKING:
+    from .dataset import Dataset
+    from .job import Job
+    from .project import Project
+
+
+_PREFIX = "pipe_"
+
+
+class PipelineBase(SQLModel):
+    """Base pipeline model for shared attributes."""
+
+    display_name: str = PydanticField(
+        min_length=1,
+        max_length=255,
+        description="Display name for the pipeline",
+        examples=["Q3 Media Performance Pipeline"],
+        alias="displayName",
+    )
+    dataset_id: str = PydanticField(
+        examples=[f"{uuid.uuid4()!s}"],
+        description="ID of the dataset this pipeline operates on",
+        alias="datasetId",
+    )
+
+
+class Pipeline(SQLModel, TimestampMixin, table=True):
+    """Pipeline model."""
+
+    __tablename__ = "pipelines"
+
+    id: str = Field(
+        default_factory=lambda: f"{_PREFIX}{uuid.uuid4()!s}",
+        primary_key=True,
+    )
+    display_name: str = Field(max_length=255)
+    project_id: str = Field(foreign_key="projects.id", index=True)
+    dataset_id: str = Field(foreign_key="datasets.id")
+
+    model_spec: dict = Field(
+        sa_column=Column(JSON().with_variant(JSONB(), "postgresql"), nullable=False),
+        description="Model specification, see `ModelSpec`",
+    )
+    columns: dict = Field(
+        sa_column=Column(JSON().with_variant(JSONB(), "postgresql"), nullable=False),
+        description="Columns of the dataset, see `ColumnMapping`",
+    )
+
+    # Relationships
+    project: "Project" = Relationship()
+    dataset: "Dataset" = Relationship()
+    jobs: list["Job"] = Relationship(back_populates="pipeline")
+
+
+class PipelineCreate(PipelineBase):
+    """Pipeline creation model."""
+
+    model_spec: ModelSpec = PydanticField(alias="modelSpec")
+    columns: ColumnMapping
+
+
+class PipelinePublic(PipelineBase):
+    """Public pipeline model for API responses."""
+
+    id: str = PydanticField(
+        examples=[f"{_PREFIX}{uuid.uuid4()!s}"],
+        description="Unique identifier for the pipeline",
+    )
+    created_at: datetime.datetime = PydanticField(
+        description="Timestamp when the pipeline was created",
+        alias="createdAt",
+    )
@@ -59,7 +59,10 @@ class Project(ProjectBase, UUIDMixin, TimestampMixin, table=True):
 
     # Relationships
     owner: "User" = Relationship(back_populates="created_projects")
-    members: list["Membership"] = Relationship(back_populates="project")
+    members: list["Membership"] = Relationship(
+        back_populates="project",
+        sa_relationship_kwargs={"cascade": "all, delete-orphan"},
+    )
     datasets: list["Dataset"] | None = Relationship(back_populates="project")
 
     class Config:
@@ -3,8 +3,8 @@
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from pydantic import EmailStr, field_validator
-from sqlmodel import Field, Relationship, SQLModel
+from pydantic import BaseModel, ConfigDict, EmailStr, field_validator
+from sqlmodel import DateTime, Field, Relationship, SQLModel
 
 from .base import TimestampMixin, UUIDMixin
 from .enums import UserStatus
@@ -42,7 +42,10 @@ class User(UserBase, UUIDMixin, TimestampMixin, table=True):
     first_name: str = Field(default=None, max_length=100)
     last_name: str = Field(default=None, max_length=100)
     status: UserStatus = Field(default=UserStatus.ACTIVE)
-    last_login: datetime | None = Field(default=None)
+    last_login: datetime | None = Field(
+        default=None,
+        sa_type=DateTime(timezone=True),
+    )
 
     # Relationships
     created_projects: list["Project"] | None = Relationship(back_populates="owner")
@@ -94,3 +97,21 @@ class UserDetails(UserBase):
         from_attributes = True
         orm_mode = True
         use_enum_values = True
+
+
+class UserSnapshot(BaseModel):
+    """Immutable copy of a user row, detached from any database session.
+
+    Used for the authenticated user, which is cached between requests.
+    """
+
+    model_config = ConfigDict(frozen=True, from_attributes=True)
+
+    id: str
+    email: str
+    username: str
+    first_name: str | None = None
+    last_name: str | None = None
+    status: UserStatus
+    last_login: datetime | None = None
+    created_at: datetime
@@ -0,0 +1,78 @@
+"""Internal metrics endpoints.
+
+These routes are meant to be scraped by internal services only, and require
+the secret API key in the `x-baynext-api-key` header.
+"""
+
+from fastapi import APIRouter, Depends
+
+from app.core.cache import CacheStats, SizedCacheStats
+from app.core.db import PoolStats, async_engine, get_pool_stats
+from app.core.dependencies import SessionDep, verify_internal_api_key
+from app.core.executor import ExecutorStats
+from app.lib.gcp import storage_executor
+from app.lib.model_serving import model_cache, model_executor
+from app.lib.training_cache import TrainingCacheStats, get_cache_stats
+from app.services.user import user_cache
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["metrics"],
+    include_in_schema=False,
+    dependencies=[Depends(verify_internal_api_key)],
+)
+
+
+@router.get("/db-pool")
+async def get_db_pool_metrics() -> PoolStats:
+    """Get live statistics of the database connection pool.
+
+    Statistics are per worker process: wait times and timeouts accumulate
+    since the process started.
+    """
+    return get_pool_stats(async_engine)
+
+
+@router.get("/user-cache")
+async def get_user_cache_metrics() -> CacheStats:
+    """Get statistics of the authenticated users cache.
+
+    Each hit is a query on the users table saved, for this worker process.
+    """
+    return user_cache.stats()
+
+
+@router.get("/storage-executor")
+async def get_storage_executor_metrics() -> ExecutorStats:
+    """Get statistics of the thread pool running blocking storage calls.
+
+    A growing queue time means `GCS_EXECUTOR_MAX_WORKERS` is too low for the
+    load of this worker process.
+    """
+    return storage_executor.stats()
+
+
+@router.get("/model-cache")
+async def get_model_cache_metrics() -> SizedCacheStats:
+    """Get statistics of the deployed models loaded in memory.
+
+    Frequent evictions mean `MODEL_CACHE_MAX_BYTES` is too low for the models
+    served by this worker process, which are then loaded again.
+    """
+    return model_cache.stats()
+
+
+@router.get("/model-executor")
+async def get_model_executor_metrics() -> ExecutorStats:
+    """Get statistics of the thread pool loading the served models."""
+    return model_executor.stats()
+
+
+@router.get("/training-cache")
+async def get_training_cache_metrics(session: SessionDep) -> TrainingCacheStats:
+    """Get the hit rate of the trained models cache.
+
+    Unlike the other metrics, hits are counted from the submitted jobs in the
+    database: the rate covers all the processes submitting jobs.
+    """
+    return await get_cache_stats(session)
@@ -40,7 +40,7 @@ async def get_access_token(
     """Login and return an access token."""
     auth_service = AuthService(session)
 
-    user = auth_service.authenticate_user(
+    user = await auth_service.authenticate_user(
         email=form_data.username,
         password=form_data.password,
     )
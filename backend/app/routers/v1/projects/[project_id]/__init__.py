@@ -7,10 +7,14 @@ from fastapi import APIRouter
 
 from .base import router as base_router
 from .datasets import router as datasets_router
+from .models import router as models_router
+from .pipelines import router as pipelines_router
 
 router = APIRouter(prefix="/{project_id}")
 router.include_router(base_router)
 router.include_router(datasets_router)
+router.include_router(models_router)
+router.include_router(pipelines_router)
 
 for route in router.routes:
     route.path = route.path.rstrip("/")
@@ -5,11 +5,10 @@ from typing import Annotated
 from fastapi import APIRouter, Depends, HTTPException, status
 
 from app.core.dependencies import (
+    CurrentProjectMembershipDep,
     SessionDep,
-    get_project_member_or_owner,
     require_project_admin,
 )
-from app.models.membership import Membership
 from app.models.project import Project, ProjectDetails
 from app.services import ProjectService
 
@@ -22,13 +21,12 @@ router = APIRouter(tags=["Project"], prefix="")
     response_model_exclude_none=True,
 )
 async def get_project(
-    project_member: Annotated[
-        tuple[Project, Membership],
-        Depends(get_project_member_or_owner),
-    ],
+    project_member: CurrentProjectMembershipDep,
+    session: SessionDep,
 ) -> ProjectDetails:
     """Get a specific project for the current authenticated user."""
-    return project_member[0]
+    project, _ = project_member
+    return await ProjectService(session).get_details(project.id)
 
 
 @router.delete(
@@ -44,7 +42,7 @@ async def delete_project(
     session: SessionDep,
 ) -> None:
     """Delete a specific project for the current authenticated user."""
-    deleted = ProjectService(session).delete(project.id)
+    deleted = await ProjectService(session).delete(project.id)
     if not deleted:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
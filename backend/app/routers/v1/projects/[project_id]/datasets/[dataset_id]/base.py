@@ -1,19 +1,23 @@
 """Datasets endpoints for managing datasets within a project."""
 
-from fastapi import APIRouter, HTTPException, status
+from typing import Annotated
+
+from fastapi import APIRouter, HTTPException, Query, status
 
 from app.core.dependencies import (
     CurrentProjectMembershipDep,
     SessionDep,
 )
 from app.core.logging import get_logger
-from app.models.dataset import DatasetDetails
+from app.models.dataset import DatasetDetails, DatasetPreview
 from app.services import DatasetService
 
 logger = get_logger(__name__)
 
 router = APIRouter(tags=["Dataset"], prefix="/{dataset_id}")
 
+PREVIEW_MAX_ROWS = 1000
+
 
 @router.get(
     "",
@@ -23,6 +27,9 @@ router = APIRouter(tags=["Dataset"], prefix="/{dataset_id}")
         status.HTTP_403_FORBIDDEN: {
             "description": "Forbidden - User does not have access to this project",
         },
+        status.HTTP_404_NOT_FOUND: {
+            "description": "Not Found - Dataset does not exist in this project",
+        },
     },
 )
 async def get_dataset_details(
@@ -39,7 +46,7 @@ async def get_dataset_details(
     """
     project, _ = current_project_membership
     try:
-        return DatasetService(session, project_id=project.id).get_by_id(
+        dataset = await DatasetService(session, project_id=project.id).get_details(
             dataset_id=dataset_id,
         )
     except Exception as exc:
@@ -53,3 +60,62 @@ async def get_dataset_details(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve dataset: {type(exc).__name__} - {str(exc)}",
         ) from exc
+
+    if not dataset:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Dataset not found",
+        )
+    return dataset
+
+
+@router.get(
+    "/preview",
+    summary="Preview the first rows of a dataset",
+    responses={
+        status.HTTP_403_FORBIDDEN: {
+            "description": "Forbidden - User does not have access to this project",
+        },
+        status.HTTP_404_NOT_FOUND: {
+            "description": "Not Found - Dataset does not exist in this project",
+        },
+    },
+)
+async def preview_dataset(
+    current_project_membership: CurrentProjectMembershipDep,
+    session: SessionDep,
+    dataset_id: str,
+    rows: Annotated[
+        int,
+        Query(examples=[20], gt=0, le=PREVIEW_MAX_ROWS, description="Rows to read"),
+    ] = 20,
+) -> DatasetPreview:
+    """Get the header and the first rows of a dataset, as uploaded.
+
+    Only the start of the dataset file is read, so previews stay fast for
+    large datasets. Values are returned as text.
+
+    """
+    project, _ = current_project_membership
+    try:
+        preview = await DatasetService(session, project_id=project.id).preview(
+            dataset_id=dataset_id,
+            rows=rows,
+        )
+    except Exception as exc:
+        logger.exception(
+            "Failed to preview dataset %s for project %s",
+            dataset_id,
+            project.id,
+        )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to preview dataset: {type(exc).__name__} - {exc!s}",
+        ) from exc
+
+    if preview is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Dataset not found",
+        )
+    return preview
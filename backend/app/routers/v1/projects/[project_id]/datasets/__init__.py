@@ -5,6 +5,7 @@ import importlib
 from fastapi import APIRouter
 
 from .base import router as base_router
+from .uploads import router as uploads_router
 
 # Dynamically import the dataset_id router
 dataset_id_router = importlib.import_module(
@@ -14,6 +15,8 @@ dataset_id_router = importlib.import_module(
 router = APIRouter(prefix="/datasets")
 # Include the base router for dataset management
 router.include_router(base_router)
+# Include the router for direct uploads, before the dataset_id routes
+router.include_router(uploads_router)
 # Include the dataset_id router for specific dataset operations
 router.include_router(dataset_id_router)
 
@@ -2,14 +2,16 @@
 
 from typing import Annotated
 
-from fastapi import APIRouter, File, HTTPException, status
+from fastapi import APIRouter, File, HTTPException, Request, Response, status
 
 from app.core.dependencies import (
     CurrentProjectMembershipDep,
     CurrentUserDep,
+    PaginationDep,
     SessionDep,
 )
 from app.core.logging import get_logger
+from app.core.pagination import set_next_page_headers
 from app.models.dataset import DatasetCreate, DatasetCreated, DatasetPublic
 from app.services import DatasetService
 
@@ -72,19 +74,23 @@ async def create_dataset(
     },
 )
 async def list_dataset_projects(
+    request: Request,
+    response: Response,
     current_project_membership: CurrentProjectMembershipDep,
     session: SessionDep,
-    limit: int | None = None,
-    offset: int | None = None,
+    pagination: PaginationDep,
 ) -> list[DatasetPublic]:
-    """List datasets for the current authenticated user."""
+    """List datasets for the current authenticated user.
+
+    Datasets are sorted from the most recent. When there are more datasets,
+    the cursor of the next page is returned in the `X-Next-Cursor` header.
+    """
     project, _ = current_project_membership
     try:
         dataset_service = DatasetService(session, project_id=project.id)
-        return dataset_service.list_project_datasets(
-            limit=limit or 100,
-            offset=offset or 0,
-        )
+        page = await dataset_service.list_project_datasets(pagination=pagination)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.exception(
             "Failed to list datasets for project %s",
@@ -94,3 +100,6 @@ async def list_dataset_projects(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to list datasets: {type(e).__name__} - {str(e)}",
         ) from e
+
+    set_next_page_headers(request, response, page.next_cursor)
+    return page.items
@@ -0,0 +1,112 @@
+"""Dataset endpoints for files uploaded directly to the blob storage."""
+
+from fastapi import APIRouter, HTTPException, status
+
+from app.core.dependencies import (
+    CurrentProjectMembershipDep,
+    CurrentUserDep,
+    SessionDep,
+)
+from app.core.logging import get_logger
+from app.models.dataset import DatasetCreated
+from app.models.dataset_upload import DatasetUploadCreate, DatasetUploadCreated
+from app.services import DatasetService
+
+logger = get_logger(__name__)
+
+router = APIRouter(tags=["Dataset"], prefix="/uploads")
+
+
+@router.post(
+    "",
+    status_code=201,
+    summary="Get a signed URL to upload a dataset file to",
+    responses={
+        status.HTTP_201_CREATED: {
+            "description": "Upload reserved successfully",
+        },
+        status.HTTP_500_INTERNAL_SERVER_ERROR: {
+            "description": "Internal server error - Failed to sign the upload URL",
+        },
+    },
+)
+async def create_dataset_upload(
+    current_user: CurrentUserDep,
+    current_project_membership: CurrentProjectMembershipDep,
+    upload_data: DatasetUploadCreate,
+    session: SessionDep,
+) -> DatasetUploadCreated:
+    """Reserve a dataset file, uploaded directly to storage with a signed URL.
+
+    Send the file to `uploadUrl`, with `method` and `headers`. A resumable
+    upload starts a session: send the file to the URL of its `Location`
+    response header, in one or more `PUT` requests. Then complete the upload
+    to create the dataset.
+
+    """
+    project, _ = current_project_membership
+
+    try:
+        return await DatasetService(session, project_id=project.id).create_upload(
+            upload_data,
+            user_id=current_user.id,
+        )
+    except Exception as e:
+        logger.exception("Failed to reserve a dataset upload in project %s", project.id)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to reserve dataset upload: {type(e).__name__} - {e!s}",
+        ) from e
+
+
+@router.post(
+    "/{upload_id}/complete",
+    status_code=201,
+    summary="Create the dataset of an uploaded file",
+    responses={
+        status.HTTP_201_CREATED: {
+            "description": "Dataset created successfully",
+        },
+        status.HTTP_400_BAD_REQUEST: {
+            "description": (
+                "Bad Request - Upload expired, or file missing or not matching it"
+            ),
+        },
+        status.HTTP_404_NOT_FOUND: {
+            "description": (
+                "Not Found - Upload does not exist in this project, or was completed"
+            ),
+        },
+    },
+)
+async def complete_dataset_upload(
+    current_project_membership: CurrentProjectMembershipDep,
+    session: SessionDep,
+    upload_id: str,
+) -> DatasetCreated:
+    """Create the dataset of a file uploaded to its signed URL.
+
+    The size, content type and MD5 hash of the file must match the ones given
+    when reserving the upload, before its expiration. The file is converted to
+    Parquet and profiled in the background: the `parquetPath` and `profile` of
+    the dataset are set once done.
+
+    """
+    project, _ = current_project_membership
+    try:
+        dataset = await DatasetService(
+            session,
+            project_id=project.id,
+        ).complete_upload(upload_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        ) from e
+
+    if dataset is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Dataset upload not found",
+        )
+    return dataset
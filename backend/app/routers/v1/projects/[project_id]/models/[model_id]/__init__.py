@@ -0,0 +1,9 @@
+"""API router for specific model-related endpoints."""
+
+from fastapi import APIRouter
+
+from .base import router as base_router
+
+router = APIRouter()
+# Include the base router for model operations
+router.include_router(base_router)
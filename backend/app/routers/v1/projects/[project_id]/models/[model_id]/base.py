@@ -0,0 +1,212 @@
+"""Models endpoints for reading, deploying and serving a trained model."""
+
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from app.core.dependencies import (
+    CurrentProjectMembershipDep,
+    SessionDep,
+    require_project_editor,
+)
+from app.core.logging import get_logger
+from app.models.model import (
+    ChannelRoi,
+    ModelPublic,
+    ModelUpdate,
+    ScenarioBatch,
+    ScenarioOutcome,
+)
+from app.models.project import Project
+from app.services import ModelService
+from app.services.model import ModelNotDeployedError
+
+logger = get_logger(__name__)
+
+router = APIRouter(tags=["Model"], prefix="/{model_id}")
+
+
+@router.get(
+    "",
+    summary="Retrieve model details",
+    responses={
+        status.HTTP_403_FORBIDDEN: {
+            "description": "Forbidden - User does not have access to this project",
+        },
+        status.HTTP_404_NOT_FOUND: {
+            "description": "Not Found - Model does not exist in this project",
+        },
+    },
+)
+async def get_model(
+    current_project_membership: CurrentProjectMembershipDep,
+    session: SessionDep,
+    model_id: str,
+) -> ModelPublic:
+    """Get a trained model of the project.
+
+    You can obtain a `model_id` by listing the project's models.
+
+    """
+    project, _ = current_project_membership
+    model = await ModelService(session, project_id=project.id).get_by_id(model_id)
+    if not model:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Model not found",
+        )
+    return model
+
+
+@router.patch(
+    "",
+    summary="Deploy or undeploy a model",
+    responses={
+        status.HTTP_403_FORBIDDEN: {
+            "description": "Forbidden - Editor access required",
+        },
+        status.HTTP_404_NOT_FOUND: {
+            "description": "Not Found - Model does not exist in this project",
+        },
+    },
+)
+async def update_model(
+    project: Annotated[Project, Depends(require_project_editor)],
+    session: SessionDep,
+    model_id: str,
+    model_data: ModelUpdate,
+) -> ModelPublic:
+    """Deploy a model, to serve its outputs, or undeploy it.
+
+    Undeployed models are no longer served, and are evicted from memory.
+
+    """
+    try:
+        model = await ModelService(session, project_id=project.id).update(
+            model_id,
+            model_data,
+        )
+    except Exception as e:
+        logger.exception("Failed to update model %s", model_id)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to update model: {type(e).__name__} - {e!s}",
+        ) from e
+
+    if not model:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Model not found",
+        )
+    return model
+
+
+@router.get(
+    "/roi",
+    summary="Summarize the ROI of the media channels of a model",
+    responses={
+        status.HTTP_403_FORBIDDEN: {
+            "description": "Forbidden - User does not have access to this project",
+        },
+        status.HTTP_404_NOT_FOUND: {
+            "description": "Not Found - Model does not exist in this project",
+        },
+        status.HTTP_409_CONFLICT: {
+            "description": "Conflict - Model is not deployed",
+        },
+    },
+)
+async def get_model_roi(
+    current_project_membership: CurrentProjectMembershipDep,
+    session: SessionDep,
+    model_id: str,
+) -> list[ChannelRoi]:
+    """Get the posterior mean, median and 90% interval of the ROI of each channel.
+
+    Only deployed models are served. The first request of a model loads it,
+    the next ones read it from memory.
+
+    """
+    project, _ = current_project_membership
+    try:
+        roi = await ModelService(session, project_id=project.id).get_roi(model_id)
+    except ModelNotDeployedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
+        ) from e
+    except Exception as e:
+        logger.exception("Failed to serve model %s", model_id)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to serve model: {type(e).__name__} - {e!s}",
+        ) from e
+
+    if roi is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Model not found",
+        )
+    return roi
+
+
+@router.post(
+    "/scenarios",
+    summary="Predict the outcome of media spend scenarios",
+    responses={
+        status.HTTP_403_FORBIDDEN: {
+            "description": "Forbidden - User does not have access to this project",
+        },
+        status.HTTP_404_NOT_FOUND: {
+            "description": "Not Found - Model does not exist in this project",
+        },
+        status.HTTP_409_CONFLICT: {
+            "description": "Conflict - Model is not deployed",
+        },
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {
+            "description": "Unprocessable - Unknown channel or spend out of range",
+        },
+    },
+)
+async def evaluate_model_scenarios(
+    current_project_membership: CurrentProjectMembershipDep,
+    session: SessionDep,
+    model_id: str,
+    batch: ScenarioBatch,
+) -> list[ScenarioOutcome]:
+    """Get the predicted KPI and ROI of a batch of media spend scenarios.
+
+    All the scenarios of a batch are evaluated at once, over the posterior
+    draws of the model: send many scenarios per request rather than one.
+    The spend of a channel can be up to 3 times its historical spend.
+
+    """
+    project, _ = current_project_membership
+    try:
+        outcomes = await ModelService(
+            session,
+            project_id=project.id,
+        ).evaluate_scenarios(model_id, batch.scenarios)
+    except ModelNotDeployedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
+        ) from e
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e),
+        ) from e
+    except Exception as e:
+        logger.exception("Failed to evaluate scenarios of model %s", model_id)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to evaluate scenarios: {type(e).__name__} - {e!s}",
+        ) from e
+
+    if outcomes is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Model not found",
+        )
+    return outcomes
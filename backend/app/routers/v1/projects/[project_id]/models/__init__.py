@@ -0,0 +1,21 @@
+"""API router for model-related endpoints."""
+
+import importlib
+
+from fastapi import APIRouter
+
+from .base import router as base_router
+
+# Dynamically import the model_id router
+model_id_router = importlib.import_module(
+    "app.routers.v1.projects.[project_id].models.[model_id]",
+).router
+
+router = APIRouter(prefix="/models")
+# Include the base router for model listing
+router.include_router(base_router)
+# Include the model_id router for specific model operations
+router.include_router(model_id_router)
+
+for route in router.routes:
+    route.path = route.path.rstrip("/")
@@ -0,0 +1,55 @@
+"""Models endpoints for listing the trained models of a project."""
+
+from fastapi import APIRouter, HTTPException, Request, Response, status
+
+from app.core.dependencies import (
+    CurrentProjectMembershipDep,
+    PaginationDep,
+    SessionDep,
+)
+from app.core.logging import get_logger
+from app.core.pagination import set_next_page_headers
+from app.models.model import ModelPublic
+from app.services import ModelService
+
+logger = get_logger(__name__)
+
+router = APIRouter(tags=["Model"])
+
+
+@router.get(
+    "/",
+    summary="List all models in the project",
+    responses={
+        status.HTTP_403_FORBIDDEN: {
+            "description": "Forbidden - User does not have access to this project",
+        },
+    },
+)
+async def list_project_models(
+    request: Request,
+    response: Response,
+    current_project_membership: CurrentProjectMembershipDep,
+    session: SessionDep,
+    pagination: PaginationDep,
+) -> list[ModelPublic]:
+    """List the models trained by the jobs of the project.
+
+    Models are sorted from the most recent. When there are more models,
+    the cursor of the next page is returned in the `X-Next-Cursor` header.
+    """
+    project, _ = current_project_membership
+    try:
+        model_service = ModelService(session, project_id=project.id)
+        page = await model_service.list_project_models(pagination=pagination)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Failed to list models for project %s", project.id)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to list models: {type(e).__name__} - {e!s}",
+        ) from e
+
+    set_next_page_headers(request, response, page.next_cursor)
+    return page.items
@@ -0,0 +1,9 @@
+"""API router for specific pipeline-related endpoints."""
+
+from fastapi import APIRouter
+
+from .jobs import router as jobs_router
+
+router = APIRouter(prefix="/{pipeline_id}")
+# Include the router for the training jobs of the pipeline
+router.include_router(jobs_router)
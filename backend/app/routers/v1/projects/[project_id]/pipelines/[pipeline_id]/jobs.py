@@ -0,0 +1,66 @@
+"""Jobs endpoints for submitting the training jobs of a pipeline."""
+
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from app.core.dependencies import SessionDep, require_project_editor
+from app.core.logging import get_logger
+from app.models.job import JobSubmitted
+from app.models.project import Project
+from app.services import JobService
+from app.validations.job_parameters import JobParams
+
+logger = get_logger(__name__)
+
+router = APIRouter(tags=["Job"], prefix="/jobs")
+
+
+@router.post(
+    "/",
+    status_code=201,
+    summary="Submit a training job of a pipeline",
+    responses={
+        status.HTTP_201_CREATED: {
+            "description": "Job queued, or completed with a cached model",
+        },
+        status.HTTP_403_FORBIDDEN: {
+            "description": "Forbidden - Editor access required",
+        },
+        status.HTTP_404_NOT_FOUND: {
+            "description": "Not Found - Pipeline does not exist in this project",
+        },
+    },
+)
+async def submit_pipeline_job(
+    project: Annotated[Project, Depends(require_project_editor)],
+    session: SessionDep,
+    pipeline_id: str,
+    params: JobParams,
+) -> JobSubmitted:
+    """Queue a training job of a pipeline, run by the workers.
+
+    When a model was already trained with the same dataset content, column
+    mapping, model specification and sampling parameters (seed included), it
+    is reused: the job is completed at once, with `cacheHit` and the
+    `modelId` of the reused model.
+
+    """
+    try:
+        submitted = await JobService(session, project_id=project.id).submit(
+            pipeline_id,
+            params,
+        )
+    except Exception as e:
+        logger.exception("Failed to submit a job of pipeline %s", pipeline_id)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to submit job: {type(e).__name__} - {e!s}",
+        ) from e
+
+    if submitted is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Pipeline not found",
+        )
+    return submitted
@@ -0,0 +1,17 @@
+"""API router for pipeline-related endpoints."""
+
+import importlib
+
+from fastapi import APIRouter
+
+# Dynamically import the pipeline_id router
+pipeline_id_router = importlib.import_module(
+    "app.routers.v1.projects.[project_id].pipelines.[pipeline_id]",
+).router
+
+router = APIRouter(prefix="/pipelines")
+# Include the pipeline_id router for specific pipeline operations
+router.include_router(pipeline_id_router)
+
+for route in router.routes:
+    route.path = route.path.rstrip("/")
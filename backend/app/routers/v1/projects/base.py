@@ -1,10 +1,9 @@
 """API v1 module for project management."""
 
-from typing import Annotated
+from fastapi import APIRouter, Request, Response
 
-from fastapi import APIRouter, Query
-
-from app.core.dependencies import CurrentUserDep, SessionDep
+from app.core.dependencies import CurrentUserDep, PaginationDep, SessionDep
+from app.core.pagination import set_next_page_headers
 from app.models.project import ProjectCreate, ProjectCreated, ProjectPublic
 from app.services import ProjectService
 
@@ -18,24 +17,24 @@ router = APIRouter(tags=["Project"])
     response_model_exclude_unset=True,
 )
 async def list_user_projects(
+    request: Request,
+    response: Response,
     current_user: CurrentUserDep,
     session: SessionDep,
-    limit: Annotated[
-        int | None,
-        Query(example=10, gt=0, lt=100, description="Number of projects to return"),
-    ] = None,
-    offset: Annotated[
-        int | None,
-        Query(example=0, description="Number of projects to skip"),
-    ] = None,
+    pagination: PaginationDep,
 ) -> list[ProjectPublic]:
-    """List projects for the current authenticated user."""
+    """List projects for the current authenticated user.
+
+    Projects are sorted from the most recent. When there are more projects,
+    the cursor of the next page is returned in the `X-Next-Cursor` header.
+    """
     project_service = ProjectService(session)
-    return project_service.list_user_projects(
+    page = await project_service.list_user_projects(
         user_id=current_user.id,
-        limit=limit or 100,
-        offset=offset or 0,
+        pagination=pagination,
     )
+    set_next_page_headers(request, response, page.next_cursor)
+    return page.items
 
 
 @router.post(
@@ -49,4 +48,4 @@ async def create(
     session: SessionDep,
 ) -> ProjectCreated:
     """Create a new project for the current authenticated user."""
-    return ProjectService(session).create(project_data, user_id=current_user.id)
+    return await ProjectService(session).create(project_data, user_id=current_user.id)
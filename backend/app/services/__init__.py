@@ -2,12 +2,16 @@
 
 from .auth import AuthService
 from .dataset import DatasetService
+from .job import JobService
+from .model import ModelService
 from .project import ProjectService
 from .user import UserService
 
 __all__ = [
     "AuthService",
     "DatasetService",
+    "JobService",
+    "ModelService",
     "ProjectService",
     "UserService",
 ]
@@ -6,7 +6,8 @@ from fastapi import HTTPException, status
 from jose import jwt
 from jwt import ExpiredSignatureError
 from passlib.context import CryptContext
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.logging import get_logger
 from app.core.settings import settings
@@ -20,7 +21,7 @@ logger = get_logger(__name__)
 class AuthService:
     """Service for handling authentication-related operations."""
 
-    def __init__(self, session: Session) -> None:
+    def __init__(self, session: AsyncSession) -> None:
         """Initialize AuthService with a database session."""
         self.session = session
 
@@ -75,10 +76,10 @@ class AuthService:
                 detail="Token has expired",
             ) from exc
 
-    def authenticate_user(self, email: str, password: str) -> User | None:
+    async def authenticate_user(self, email: str, password: str) -> User | None:
         """Authenticate user by email."""
         statement = select(User).where(User.email == email)
-        result = self.session.exec(statement)
+        result = await self.session.exec(statement)
         user = result.first()
 
         if not user:
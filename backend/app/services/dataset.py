@@ -1,23 +1,52 @@
 """Dataset service for managing dataset CRUD operations."""
 
-from sqlmodel import Session, desc, select
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import joinedload
+from sqlmodel import col, delete, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql.expression import SelectOfScalar
 
 from app.core.logging import get_logger
-from app.lib.gcp import upload_csv_to_blob
-from app.models.dataset import Dataset, DatasetCreate
-from app.models.project import Project
+from app.core.pagination import Page, Pagination, paginate
+from app.core.settings import settings
+from app.lib.gcp import (
+    ContentBlob,
+    delete_blobs,
+    generate_upload_url,
+    get_blob,
+    hash_csv_file,
+    storage_executor,
+    upload_csv_to_blob,
+)
+from app.lib.parquet import get_parquet_blob_name, upload_parquet_copy
+from app.lib.preview import read_csv_head
+from app.models.blob import Blob
+from app.models.dataset import Dataset, DatasetCreate, DatasetPreview
+from app.models.dataset_upload import (
+    DatasetUpload,
+    DatasetUploadCreate,
+    DatasetUploadCreated,
+)
+from app.models.enums import JobKind
+from app.models.job import Job
 
 logger = get_logger(__name__)
 
+DATASET_DETAILS_OPTIONS = (joinedload(Dataset.creator),)
+"""Loader options for the relationships serialized by `DatasetDetails`."""
+
 
 class DatasetService:
     """Service class for managing dataset CRUD operations."""
 
-    def __init__(self, session: Session, project_id: str) -> None:
+    def __init__(self, session: AsyncSession, project_id: str) -> None:
         """Initialize the dataset service with a database session.
 
         Args:
-            session: SQLModel database session for operations
+            session: SQLModel async database session for operations
             project_id: The ID of the project to which datasets belong
 
         """
@@ -44,14 +73,47 @@ class DatasetService:
             user_id,
         )
 
-        # Read file content directly into pandas
+        # Store the file under the hash of its content
         try:
             blob_path = f"{self.project_id}/datasets/{dataset_data.file.filename}"
-            blob_name = await upload_csv_to_blob(dataset_data.file, blob_path=blob_path)
+            blob = await hash_csv_file(dataset_data.file, blob_path=blob_path)
         except ValueError as e:
             logger.exception("Failed to read dataset file: %s", str(e))
             raise
 
+        # The blob is referenced first: its row stays locked until the dataset
+        # is committed, so the files of the last dataset of the same content,
+        # deleted meanwhile, are deleted before the upload, not after it (see
+        # `_delete_unreferenced_blob`). The upload is create-only.
+        await self._add_blob_reference(blob)
+        created = await upload_csv_to_blob(dataset_data.file, blob)
+
+        # Store a typed, columnar copy for the readers of the dataset, and its
+        # profile for the ones that only need its metadata. Both are shared by
+        # the datasets of the same content.
+        twin = None if created else await self._get_twin(blob.name)
+        if twin is not None:
+            logger.info("Dataset file already stored: %s", blob.name)
+            parquet_name, profile = twin.parquet_path, twin.profile
+        else:
+            try:
+                parquet_name, dataset_profile = await upload_parquet_copy(
+                    dataset_data.file,
+                    csv_blob_name=blob.name,
+                )
+            except ValueError:
+                logger.exception("Failed to convert dataset file")
+                paths = await self._release_blob_reference(
+                    blob.name,
+                    get_parquet_blob_name(blob.name),
+                )
+                await self.session.commit()
+                if paths:
+                    await self._delete_unreferenced_blob(blob.name, paths)
+                raise
+            profile = dataset_profile.model_dump(mode="json")
+            logger.info("Dataset converted to Parquet: %s", parquet_name)
+
         # Create database record
         logger.info("Creating dataset record in database...")
         db_dataset = Dataset.model_validate(
@@ -59,55 +121,359 @@ class DatasetService:
                 **dataset_data.model_dump(by_alias=True, exclude={"file"}),
                 "project_id": self.project_id,
                 "created_by": user_id,  # Set the creator ID from the current user
-                "blob_path": blob_name,  # Use the blob path from the upload
+                "blob_path": blob.name,  # Use the blob path from the upload
+                "parquet_path": parquet_name,
+                "profile": profile,
             },
         )
 
         self.session.add(db_dataset)
-        self.session.commit()
-        self.session.refresh(db_dataset)
+        await self.session.commit()
+        await self.session.refresh(db_dataset)
 
         logger.info("🆕 Dataset %s created!", db_dataset.id)
         return db_dataset
 
-    def get_by_id(self, dataset_id: str) -> Dataset | None:
-        """Retrieve a dataset by its ID.
+    async def create_upload(
+        self,
+        upload_data: DatasetUploadCreate,
+        user_id: str,
+    ) -> DatasetUploadCreated:
+        """Reserve a blob for a dataset file uploaded directly to storage.
+
+        The file is sent to a signed URL, without going through the API, then
+        `complete_upload` creates the dataset.
 
         Args:
-            dataset_id: The unique identifier for the dataset
+            upload_data: Dataset metadata, and the expected file
+            user_id: ID of the user creating the dataset
 
         Returns:
-            Dataset if found, None otherwise
+            DatasetUploadCreated: The signed URL, and how to send the file to it.
 
         """
-        return self.session.get(Dataset, dataset_id)
+        upload_id = str(uuid4())
+        blob_path = f"{self.project_id}/datasets/uploads/{upload_id}.csv"
+        expiration = timedelta(seconds=settings.DATASET_UPLOAD_URL_EXPIRATION)
+        url, method, headers = await storage_executor.run(
+            generate_upload_url,
+            blob_path,
+            content_type=upload_data.content_type,
+            md5_hash=upload_data.md5_hash,
+            expiration=expiration,
+            resumable=upload_data.resumable,
+        )
+
+        upload = DatasetUpload.model_validate(
+            {
+                **upload_data.model_dump(
+                    by_alias=True,
+                    include={"display_name", "kpi_type"},
+                ),
+                "id": upload_id,
+                "project_id": self.project_id,
+                "created_by": user_id,
+                "blob_path": blob_path,
+                "content_type": upload_data.content_type,
+                "size": upload_data.size,
+                "md5_hash": upload_data.md5_hash,
+                "expires_at": datetime.now(UTC) + expiration,
+            },
+        )
+        self.session.add(upload)
+        await self.session.commit()
+        logger.info("📤 Dataset upload %s reserved: %s", upload_id, blob_path)
+        return DatasetUploadCreated(
+            id=upload_id,
+            blob_path=blob_path,
+            upload_url=url,
+            method=method,
+            headers=headers,
+            expires_at=upload.expires_at,
+        )
+
+    async def complete_upload(self, upload_id: str) -> Dataset | None:
+        """Create the dataset of a file uploaded directly to storage.
+
+        Only the metadata of the uploaded file is read, to check it against
+        the reservation. Its conversion to Parquet and its profile are queued
+        as a job, run by the workers: readers use the CSV file until then.
+
+        The reservation is deleted in the transaction creating the dataset:
+        of concurrent completions of an upload, one creates the dataset, and
+        the others find no reservation.
+
+        Args:
+            upload_id: The unique identifier for the upload
+
+        Returns:
+            Dataset: The created dataset, or None if the upload is not found.
+
+        Raises:
+            ValueError: If the reservation expired, or if the file is missing
+                or does not match the upload.
+
+        """
+        # Compared by the database, which stores the timestamps in UTC
+        statement = select(
+            DatasetUpload,
+            col(DatasetUpload.expires_at) < datetime.now(UTC),
+        ).where(
+            DatasetUpload.id == upload_id,
+            DatasetUpload.project_id == self.project_id,
+        )
+        row = (await self.session.exec(statement)).first()
+        if row is None:
+            return None
+        upload, expired = row
+        if expired:
+            msg = f"Upload {upload_id} expired, reserve a new one."
+            raise ValueError(msg)
 
-    def list_project_datasets(
+        blob = await storage_executor.run(get_blob, upload.blob_path)
+        if blob is None:
+            msg = f"File of upload {upload_id} not found, upload it first."
+            raise ValueError(msg)
+        mismatches = [
+            f"{name} is {actual!r}, expected {expected!r}"
+            for name, actual, expected in (
+                ("size", blob.size, upload.size),
+                ("content type", blob.content_type, upload.content_type),
+                ("MD5 hash", blob.md5_hash, upload.md5_hash),
+            )
+            if actual != expected
+        ]
+        if mismatches:
+            msg = f"Uploaded file does not match: {', '.join(mismatches)}."
+            raise ValueError(msg)
+
+        # Deleting the reservation locks it until the commit: a concurrent
+        # completion waits, then deletes nothing
+        result = await self.session.exec(
+            delete(DatasetUpload)
+            .where(col(DatasetUpload.id) == upload_id)
+            .returning(col(DatasetUpload.id)),
+        )
+        if result.scalar_one_or_none() is None:
+            await self.session.rollback()
+            return None
+
+        db_dataset = Dataset.model_validate(
+            {
+                "displayName": upload.display_name,
+                "kpiType": upload.kpi_type,
+                "project_id": self.project_id,
+                "created_by": upload.created_by,
+                "blob_path": upload.blob_path,
+            },
+        )
+        self.session.add(db_dataset)
+        self.session.add(Blob(path=upload.blob_path, size=blob.size, ref_count=1))
+        self.session.add(
+            Job(
+                kind=JobKind.DATASET_CONVERSION,
+                dataset_id=db_dataset.id,
+                params={},
+            ),
+        )
+        await self.session.commit()
+        await self.session.refresh(db_dataset)
+
+        logger.info("🆕 Dataset %s created from upload %s!", db_dataset.id, upload_id)
+        return db_dataset
+
+    async def _add_blob_reference(self, blob: ContentBlob) -> int:
+        """Count a new reference to a blob, creating its row if needed.
+
+        Args:
+            blob: The blob referenced by the new dataset
+
+        Returns:
+            int: The number of references to the blob, 1 for a new blob.
+
+        """
+        dialect = self.session.get_bind().dialect.name
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        statement = insert(Blob).values(
+            path=blob.name,
+            sha256=blob.sha256,
+            size=blob.size,
+            ref_count=1,
+            created_at=datetime.now(UTC),
+        )
+        result = await self.session.exec(
+            statement.on_conflict_do_update(
+                index_elements=[Blob.path],
+                set_={"ref_count": Blob.ref_count + 1},
+            ).returning(col(Blob.ref_count)),
+        )
+        return result.scalar_one()
+
+    async def _release_blob_reference(
         self,
-        limit: int = 100,
-        offset: int = 0,
-    ) -> list[Dataset]:
-        """List datasets owned by a specific user.
+        blob_path: str,
+        parquet_path: str | None = None,
+    ) -> list[str]:
+        """Remove a reference to a blob.
+
+        The row and the files of the blob are not deleted here: the row is
+        kept without references, and the caller deletes both once the
+        transaction is committed, with `_delete_unreferenced_blob`, so that a
+        rolled back transaction never leaves a row without its files.
 
         Args:
-            limit: Maximum number of datasets to return (default: 100)
-            offset: Number of datasets to skip (default: 0)
+            blob_path: The path of the blob
+            parquet_path: The path of its Parquet copy, if any
 
         Returns:
-            List of Dataset objects owned by the user
+            list[str]: The paths of the files to delete, if any.
 
         """
-        query = (
+        result = await self.session.exec(
+            update(Blob)
+            .where(col(Blob.path) == blob_path)
+            .values(ref_count=Blob.ref_count - 1)
+            .returning(col(Blob.ref_count)),
+        )
+        ref_count = result.scalar_one_or_none()
+        if ref_count is None or ref_count > 0:
+            return []
+        return [blob_path] if parquet_path is None else [blob_path, parquet_path]
+
+    async def _delete_unreferenced_blob(self, blob_path: str, paths: list[str]) -> None:
+        """Delete a blob without references, its files, then its row.
+
+        The files are deleted while the row is locked: a dataset of the same
+        content, created concurrently, references the blob once they are
+        deleted, and uploads them again. A dataset created since the last
+        reference was released keeps the blob.
+
+        Args:
+            blob_path: The path of the blob
+            paths: The paths of its files
+
+        """
+        statement = (
+            select(Blob)
+            .where(col(Blob.path) == blob_path, Blob.ref_count == 0)
+            .with_for_update()
+        )
+        blob = (await self.session.exec(statement)).first()
+        if blob is None:
+            await self.session.commit()
+            logger.info("Blob %s referenced again, kept", blob_path)
+            return
+        await storage_executor.run(delete_blobs, paths)
+        await self.session.delete(blob)
+        await self.session.commit()
+        logger.info("🗑️ Blob %s deleted!", blob_path)
+
+    async def _get_twin(self, blob_path: str) -> Dataset | None:
+        """Get a dataset pointing at a blob, to reuse its Parquet copy."""
+        statement = (
+            select(Dataset)
+            .where(
+                Dataset.blob_path == blob_path, col(Dataset.parquet_path).is_not(None)
+            )
+            .limit(1)
+        )
+        return (await self.session.exec(statement)).first()
+
+    async def get_by_id(self, dataset_id: str) -> Dataset | None:
+        """Retrieve a dataset of the project by its ID.
+
+        Args:
+            dataset_id: The unique identifier for the dataset
+
+        Returns:
+            Dataset if found in the project, None otherwise
+
+        """
+        dataset = await self.session.get(Dataset, dataset_id)
+        if not dataset or dataset.project_id != self.project_id:
+            return None
+        return dataset
+
+    async def get_details(self, dataset_id: str) -> Dataset | None:
+        """Retrieve a dataset of the project with its creator loaded.
+
+        Args:
+            dataset_id: The unique identifier for the dataset
+
+        Returns:
+            Dataset if found in the project, None otherwise
+
+        """
+        statement = (
             select(Dataset)
-            .join(Project)
-            .where(Project.id == self.project_id)
-            .order_by(desc(Dataset.created_at))
+            .where(Dataset.id == dataset_id, Dataset.project_id == self.project_id)
+            .options(*DATASET_DETAILS_OPTIONS)
+            .execution_options(populate_existing=True)
+        )
+        return (await self.session.exec(statement)).first()
+
+    async def preview(self, dataset_id: str, rows: int) -> DatasetPreview | None:
+        """Read the first rows of a dataset of the project.
+
+        Only the first bytes of its CSV file are downloaded, with range
+        requests (see `app.lib.preview`).
+
+        Args:
+            dataset_id: The unique identifier for the dataset
+            rows: The number of rows to read
+
+        Returns:
+            The header and the rows if the dataset is found, None otherwise
+
+        """
+        dataset = await self.get_by_id(dataset_id)
+        if not dataset:
+            return None
+        return await storage_executor.run(read_csv_head, dataset.blob_path, rows)
+
+    @staticmethod
+    def project_datasets_query(project_id: str) -> SelectOfScalar[Dataset]:
+        """Build the query selecting the datasets of a project.
+
+        Sorted pages are read in order from the
+        `datasets(project_id, created_at DESC, id DESC)` index.
+
+        Args:
+            project_id: ID of the project
+
+        Returns:
+            The statement selecting the datasets, without ordering.
+
+        """
+        return select(Dataset).where(Dataset.project_id == project_id)
+
+    async def list_project_datasets(
+        self,
+        pagination: Pagination | None = None,
+    ) -> Page[Dataset]:
+        """List datasets of the project, from the most recent.
+
+        Args:
+            pagination: Page size and cursor, or deprecated offset
+                (default: first page of 100 items)
+
+        Returns:
+            Page of Dataset objects, with the cursor of the next page
+
+        """
+        return await paginate(
+            self.session,
+            self.project_datasets_query(self.project_id),
+            Dataset,
+            pagination or Pagination(),
         )
-        return self.session.exec(query.offset(offset).limit(limit)).all()
 
-    def delete(self, dataset_id: str) -> bool:
+    async def delete(self, dataset_id: str) -> bool:
         """Delete a dataset from the database.
 
+        Its file is deleted from storage too, unless another dataset of the
+        same content references it.
+
         Args:
             dataset_id: The unique identifier for the dataset
 
@@ -115,11 +481,15 @@ class DatasetService:
             True if dataset was deleted, False if not found
 
         """
-        dataset = self.get_by_id(dataset_id)
+        dataset = await self.get_by_id(dataset_id)
         if not dataset:
             return False
 
-        self.session.delete(dataset)
-        self.session.commit()
+        blob_path = dataset.blob_path
+        await self.session.delete(dataset)
+        paths = await self._release_blob_reference(blob_path, dataset.parquet_path)
+        await self.session.commit()
+        if paths:
+            await self._delete_unreferenced_blob(blob_path, paths)
         logger.info("🗑️ Dataset %s deleted!", dataset_id)
         return True
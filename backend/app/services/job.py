@@ -0,0 +1,76 @@
+"""Job service for submitting the training jobs of the pipelines of a project."""
+
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.logging import get_logger
+from app.lib.job_queue import submit_job
+from app.lib.training_cache import find_cached_model, get_job_fingerprint
+from app.models.job import JobSubmitted
+from app.models.pipeline import Pipeline
+from app.validations.job_parameters import JobParams
+
+logger = get_logger(__name__)
+
+
+class JobService:
+    """Service class for submitting training jobs."""
+
+    def __init__(self, session: AsyncSession, project_id: str) -> None:
+        """Initialize the job service with a database session.
+
+        Args:
+            session: SQLModel async database session for operations
+            project_id: The ID of the project to which pipelines belong
+
+        """
+        self.session = session
+        self.project_id = project_id
+
+    async def submit(
+        self,
+        pipeline_id: str,
+        params: JobParams,
+    ) -> JobSubmitted | None:
+        """Queue a training job of a pipeline of the project.
+
+        The job goes through the cache of the trained models (see
+        `app.lib.training_cache`): when a model of the project was already
+        trained with the same inputs, the job is completed at once, reusing
+        it. The storage is read on `storage_executor`, before the job is
+        recorded.
+
+        Args:
+            pipeline_id: The unique identifier for the pipeline
+            params: The sampling parameters of the training
+
+        Returns:
+            The submitted job if the pipeline is found, None otherwise
+
+        """
+        pipeline = await self.session.get(Pipeline, pipeline_id)
+        if not pipeline or pipeline.project_id != self.project_id:
+            return None
+
+        fingerprint = await get_job_fingerprint(self.session, pipeline, params)
+        model = (
+            await find_cached_model(self.session, self.project_id, fingerprint)
+            if fingerprint
+            else None
+        )
+        model_id = model.id if model else None
+
+        def _submit(session: Session) -> JobSubmitted:
+            job = submit_job(session, pipeline_id, params, fingerprint, model)
+            return JobSubmitted(
+                id=job.id,
+                pipeline_id=pipeline_id,
+                status=job.status,
+                cache_hit=job.cache_hit,
+                model_id=model_id,
+                created_at=job.created_at,
+            )
+
+        submitted = await self.session.run_sync(_submit)
+        logger.info("Job %s submitted for pipeline %s", submitted.id, pipeline_id)
+        return submitted
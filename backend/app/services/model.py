@@ -0,0 +1,178 @@
+"""Model service for reading and deploying the trained models of a project."""
+
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql.expression import SelectOfScalar
+
+from app.core.logging import get_logger
+from app.core.pagination import Page, Pagination, paginate
+from app.lib.model_serving import get_served_model, model_cache, model_executor
+from app.models.job import Job
+from app.models.model import (
+    ChannelRoi,
+    Model,
+    ModelUpdate,
+    Scenario,
+    ScenarioOutcome,
+)
+from app.models.pipeline import Pipeline
+
+logger = get_logger(__name__)
+
+
+class ModelNotDeployedError(Exception):
+    """Raised when reading the outputs of a model which is not deployed."""
+
+
+class ModelService:
+    """Service class for reading and deploying trained models."""
+
+    def __init__(self, session: AsyncSession, project_id: str) -> None:
+        """Initialize the model service with a database session.
+
+        Args:
+            session: SQLModel async database session for operations
+            project_id: The ID of the project to which models belong
+
+        """
+        self.session = session
+        self.project_id = project_id
+
+    @staticmethod
+    def project_models_query(project_id: str) -> SelectOfScalar[Model]:
+        """Build the query selecting the models of a project.
+
+        Models belong to a project through the pipeline of their job.
+
+        Args:
+            project_id: ID of the project
+
+        Returns:
+            The statement selecting the models, without ordering.
+
+        """
+        return (
+            select(Model)
+            .join(Job, Job.id == Model.job_id)
+            .join(Pipeline, Pipeline.id == Job.pipeline_id)
+            .where(Pipeline.project_id == project_id)
+        )
+
+    async def get_by_id(self, model_id: str) -> Model | None:
+        """Retrieve a model of the project by its ID.
+
+        Args:
+            model_id: The unique identifier for the model
+
+        Returns:
+            Model if found in the project, None otherwise
+
+        """
+        statement = self.project_models_query(self.project_id).where(
+            Model.id == model_id,
+        )
+        return (await self.session.exec(statement)).first()
+
+    async def list_project_models(
+        self,
+        pagination: Pagination | None = None,
+    ) -> Page[Model]:
+        """List models of the project, from the most recent.
+
+        Args:
+            pagination: Page size and cursor, or deprecated offset
+                (default: first page of 100 items)
+
+        Returns:
+            Page of Model objects, with the cursor of the next page
+
+        """
+        return await paginate(
+            self.session,
+            self.project_models_query(self.project_id),
+            Model,
+            pagination or Pagination(),
+        )
+
+    async def update(self, model_id: str, model_data: ModelUpdate) -> Model | None:
+        """Deploy or undeploy a model of the project.
+
+        An undeployed model is evicted from the models loaded by this worker
+        process. Other processes stop serving it too, since they check the
+        flag on each request, and evict it when it is least recently used.
+
+        Args:
+            model_id: The unique identifier for the model
+            model_data: The new deployment state
+
+        Returns:
+            The updated model if found in the project, None otherwise
+
+        """
+        model = await self.get_by_id(model_id)
+        if not model:
+            return None
+        model.deployed = model_data.deployed
+        await self.session.commit()
+        await self.session.refresh(model)
+        if not model.deployed:
+            model_cache.invalidate(model.id)
+        logger.info("Model %s deployed: %s", model.id, model.deployed)
+        return model
+
+    async def _get_deployed(self, model_id: str) -> Model | None:
+        model = await self.get_by_id(model_id)
+        if model and not model.deployed:
+            msg = f"Model {model_id} is not deployed"
+            raise ModelNotDeployedError(msg)
+        return model
+
+    async def get_roi(self, model_id: str) -> list[ChannelRoi] | None:
+        """Summarize the posterior ROI of the media channels of a model.
+
+        The model is loaded on the first request of this worker process, and
+        served from memory afterwards (see `app.lib.model_serving`).
+
+        Args:
+            model_id: The unique identifier for the model
+
+        Returns:
+            The ROI summary of each channel if the model is found, None otherwise
+
+        Raises:
+            ModelNotDeployedError: If the model is not deployed
+
+        """
+        model = await self._get_deployed(model_id)
+        if not model:
+            return None
+        served = await get_served_model(model)
+        return served.summarize_roi()
+
+    async def evaluate_scenarios(
+        self,
+        model_id: str,
+        scenarios: list[Scenario],
+    ) -> list[ScenarioOutcome] | None:
+        """Predict the outcome of media spend scenarios with a model.
+
+        The scenarios are evaluated together, over all the posterior draws,
+        on the thread pool of the served models.
+
+        Args:
+            model_id: The unique identifier for the model
+            scenarios: The scenarios to evaluate
+
+        Returns:
+            The outcome of each scenario if the model is found, None otherwise
+
+        Raises:
+            ModelNotDeployedError: If the model is not deployed
+            ValueError: If a scenario has an unknown channel or too high a spend
+
+        """
+        model = await self._get_deployed(model_id)
+        if not model:
+            return None
+        served = await get_served_model(model)
+        return await model_executor.run(served.evaluate_scenarios, scenarios)
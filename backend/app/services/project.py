@@ -1,28 +1,42 @@
 """Dataset service for managing dataset CRUD operations."""
 
-from sqlmodel import Session, or_, select
+from sqlalchemy.orm import joinedload, selectinload
+from sqlmodel import col, select, union
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql.expression import SelectOfScalar
 
 from app.core.logging import get_logger
+from app.core.pagination import Page, Pagination, paginate
 from app.models.membership import Membership
-from app.models.project import Project, ProjectCreate, ProjectPublic
+from app.models.project import Project, ProjectCreate
 
 logger = get_logger(__name__)
 
+PROJECT_DETAILS_OPTIONS = (
+    joinedload(Project.owner),
+    selectinload(Project.members).joinedload(Membership.user),
+)
+"""Loader options for the relationships serialized by `ProjectDetails`.
+
+The owner is joined to the project query, and members are fetched along
+with their user by a single additional query.
+"""
+
 
 class ProjectService:
     """Service class for managing project CRUD operations."""
 
-    def __init__(self, session: Session) -> None:
+    def __init__(self, session: AsyncSession) -> None:
         """Initialize the project service with a database session.
 
         Args:
-            session: SQLModel database session for operations
+            session: SQLModel async database session for operations
             project_id: Optional ID of the project to filter operations
 
         """
         self.session = session
 
-    def create(self, project_data: ProjectCreate, user_id: str) -> Project:
+    async def create(self, project_data: ProjectCreate, user_id: str) -> Project:
         """Create a new project in the database.
 
         Args:
@@ -44,12 +58,12 @@ class ProjectService:
         )
 
         self.session.add(db_project)
-        self.session.commit()
-        self.session.refresh(db_project)
+        await self.session.commit()
+        await self.session.refresh(db_project)
         logger.info("🆕 Project %s created!", db_project.id)
         return db_project
 
-    def get_by_id(self, project_id: str) -> Project | None:
+    async def get_by_id(self, project_id: str) -> Project | None:
         """Retrieve a project by its ID.
 
         Args:
@@ -59,38 +73,75 @@ class ProjectService:
             Project if found, None otherwise
 
         """
-        return self.session.get(Project, project_id)
+        return await self.session.get(Project, project_id)
+
+    async def get_details(self, project_id: str) -> Project | None:
+        """Retrieve a project with its owner and members loaded.
+
+        Relationships cannot be lazy-loaded from an async session, so everything
+        serialized by `ProjectDetails` is fetched up-front, even if the project is
+        already in the session identity map. This takes two queries, whatever
+        the number of members.
+
+        Args:
+            project_id: The unique identifier for the project
+
+        Returns:
+            Project if found, None otherwise
+
+        """
+        return await self.session.get(
+            Project,
+            project_id,
+            options=PROJECT_DETAILS_OPTIONS,
+            populate_existing=True,
+        )
+
+    @staticmethod
+    def user_projects_query(user_id: str) -> SelectOfScalar[Project]:
+        """Build the query selecting the projects a user owns or is a member of.
+
+        Owned and member project IDs are combined with a UNION, which removes
+        duplicates. Each side is served by an index: `projects(owner_id, ...)`
+        and `memberships(user_id, project_id)`.
+
+        Args:
+            user_id: ID of the user
+
+        Returns:
+            The statement selecting the projects, without ordering.
+
+        """
+        project_ids = union(
+            select(Project.id).where(Project.owner_id == user_id),
+            select(Membership.project_id).where(Membership.user_id == user_id),
+        )
+        return select(Project).where(col(Project.id).in_(project_ids))
 
-    def list_user_projects(
+    async def list_user_projects(
         self,
         user_id: str,
-        limit: int = 100,
-        offset: int = 0,
-    ) -> list[ProjectPublic]:
-        """List projects owned by a specific user.
+        pagination: Pagination | None = None,
+    ) -> Page[Project]:
+        """List projects a user owns or is a member of, from the most recent.
 
         Args:
-            user_id: User ID to filter projects by owner
-            limit: Maximum number of projects to return (default: 100)
-            offset: Number of projects to skip (default: 0)
+            user_id: ID of the user
+            pagination: Page size and cursor, or deprecated offset
+                (default: first page of 100 items)
 
         Returns:
-            List of ProjectPublic objects owned by the user
+            Page of Project objects, with the cursor of the next page
 
         """
-        query = (
-            select(Project)
-            .join(Membership)
-            .where(
-                or_(
-                    Membership.user_id == user_id,
-                    Project.owner_id == user_id,
-                ),
-            )
+        return await paginate(
+            self.session,
+            self.user_projects_query(user_id),
+            Project,
+            pagination or Pagination(),
         )
-        return self.session.exec(query.offset(offset).limit(limit)).all()
 
-    def delete(self, project_id: str) -> bool:
+    async def delete(self, project_id: str) -> bool:
         """Delete a project from the database.
 
         Args:
@@ -100,11 +151,11 @@ class ProjectService:
             True if project was deleted, False if not found
 
         """
-        project = self.get_by_id(project_id)
+        project = await self.get_by_id(project_id)
         if not project:
             return False
 
-        self.session.delete(project)
-        self.session.commit()
+        await self.session.delete(project)
+        await self.session.commit()
         logger.info("🗑️ Project %s deleted!", project_id)
         return True
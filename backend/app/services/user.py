@@ -1,18 +1,74 @@
 """User service for managing user CRUD operations."""
 
-from sqlmodel import Session, select
+from sqlalchemy import event
+from sqlalchemy.orm import Session, UOWTransaction
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.models.user import User
+from app.core.cache import TTLCache
+from app.core.settings import settings
+from app.models.user import User, UserSnapshot
+
+user_cache: TTLCache[str, UserSnapshot] = TTLCache(
+    max_size=settings.USER_CACHE_MAX_SIZE,
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+)
+"""Snapshots of authenticated users, keyed by user ID."""
+
+_PENDING_INVALIDATIONS = "invalidated_user_ids"
+
+
+def invalidate_cached_user(user_id: str) -> None:
+    """Remove a user from the cache.
+
+    Updates and deletes of `User` objects through a session invalidate the
+    cache automatically. This must be called after bulk `UPDATE` or `DELETE`
+    statements on the users table, which bypass the session.
+
+    Args:
+        user_id: The unique identifier for the user
+
+    """
+    user_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_flushed_users(session: Session, _: UOWTransaction) -> None:
+    """Invalidate users updated or deleted by a flush.
+
+    The IDs are kept until the transaction ends, and invalidated again on
+    commit, in case a concurrent request cached the previous row in between.
+    """
+    user_ids = {
+        obj.id for obj in (*session.dirty, *session.deleted) if isinstance(obj, User)
+    }
+    for user_id in user_ids:
+        invalidate_cached_user(user_id)
+    if user_ids:
+        session.info.setdefault(_PENDING_INVALIDATIONS, set()).update(user_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session: Session) -> None:
+    """Invalidate users updated or deleted by a committed transaction."""
+    for user_id in session.info.pop(_PENDING_INVALIDATIONS, ()):
+        invalidate_cached_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_invalidations(session: Session) -> None:
+    """Forget the users of a rolled back transaction."""
+    session.info.pop(_PENDING_INVALIDATIONS, None)
 
 
 class UserService:
     """Service class for managing user CRUD operations."""
 
-    def __init__(self, session: Session) -> None:
+    def __init__(self, session: AsyncSession) -> None:
         """Initialize the user service with a database session.
 
         Args:
-            session: SQLModel database session for operations
+            session: SQLModel async database session for operations
 
         """
         self.session = session
@@ -39,7 +95,7 @@ class UserService:
 
     #     return db_user
 
-    def get_by_id(self, user_id: str) -> User | None:
+    async def get_by_id(self, user_id: str) -> User | None:
         """Retrieve a user by their ID.
 
         Args:
@@ -49,9 +105,31 @@ class UserService:
             User if found, None otherwise
 
         """
-        return self.session.get(User, user_id)
+        return await self.session.get(User, user_id)
+
+    async def get_snapshot(self, user_id: str) -> UserSnapshot | None:
+        """Retrieve an immutable snapshot of a user, from the cache if possible.
+
+        Args:
+            user_id: The unique identifier for the user
+
+        Returns:
+            UserSnapshot if found, None otherwise
+
+        """
+        snapshot = user_cache.get(user_id)
+        if snapshot is not None:
+            return snapshot
+
+        user = await self.get_by_id(user_id)
+        if not user:
+            return None
+
+        snapshot = UserSnapshot.model_validate(user)
+        user_cache.set(user_id, snapshot)
+        return snapshot
 
-    def get_by_email(self, email: str) -> User | None:
+    async def get_by_email(self, email: str) -> User | None:
         """Retrieve a user by their email address.
 
         Args:
@@ -62,7 +140,7 @@ class UserService:
 
         """
         statement = select(User).where(User.email == email)
-        return self.session.exec(statement).first()
+        return (await self.session.exec(statement)).first()
 
     # def update(
     #     self,
@@ -95,7 +173,7 @@ class UserService:
 
     #     return db_user
 
-    def delete(self, user_id: str) -> bool:
+    async def delete(self, user_id: str) -> bool:
         """Delete a user from the database.
 
         Args:
@@ -105,16 +183,16 @@ class UserService:
             True if user was deleted, False if not found
 
         """
-        user = self.get_by_id(user_id)
+        user = await self.get_by_id(user_id)
         if not user:
             return False
 
-        self.session.delete(user)
-        self.session.commit()
+        await self.session.delete(user)
+        await self.session.commit()
 
         return True
 
-    def list(
+    async def list(
         self,
         limit: int = 100,
         offset: int = 0,
@@ -129,4 +207,5 @@ class UserService:
             List of User objects matching the criteria
 
         """
-        return self.session.exec(select(User).offset(offset).limit(limit)).all()
+        statement = select(User).offset(offset).limit(limit)
+        return (await self.session.exec(statement)).all()
@@ -0,0 +1,31 @@
+from pydantic import BaseModel, Field
+
+
+class ColumnMapping(BaseModel):
+    """Columns of the dataset for each input of the model.
+
+    See: https://developers.google.com/meridian/docs/user-guide/supported-data-types-formats
+    """
+
+    time: str = Field(description="Time column")
+    geo: str = Field(description="Geo column")
+    kpi: str = Field(description="KPI column")
+    population: str = Field(description="Population column")
+    controls: list[str] = Field(default_factory=list, description="Control columns")
+    revenue_per_kpi: str | None = Field(
+        default=None,
+        description="Revenue per KPI column, for non-revenue KPIs",
+    )
+    media: list[str] | None = Field(default=None, description="Media columns")
+    media_spend: list[str] | None = Field(
+        default=None,
+        description="Spend columns, in the order of the media columns",
+    )
+    organic_media: list[str] | None = Field(
+        default=None,
+        description="Organic media columns",
+    )
+    non_media_treatments: list[str] | None = Field(
+        default=None,
+        description="Non-media treatment columns",
+    )
@@ -10,9 +10,10 @@ class PosteriorParams(BaseModel):
     n_adapt: int = 2
     n_burnin: int = 5
     n_keep: int = 5
-    # current_state: Mapping[str, Tensor] | None = None,
-    # init_step_size: int | None = None,
-    # dual_averaging_kwargs: Mapping[str, int] | None = None,
+    n_processes: int = 1
+    segment_size: int | None = None
+    init_step_size: float | None = None
+    dual_averaging_kwargs: dict[str, float] | None = None
     # max_tree_depth: int = 10,
     # max_energy_diff: float = 500,
     # unrolled_leapfrog_steps: int = 1,
@@ -23,3 +24,6 @@ class PosteriorParams(BaseModel):
 class JobParams(BaseModel):
     prior: PriorParams
     posterior: PosteriorParams
+    seed: int | None = None
+    warm_start_model_id: str | None = None
+    """Model whose final state starts the posterior sampling, see `Model`."""
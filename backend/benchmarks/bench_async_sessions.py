@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Benchmark concurrent-request throughput with sync vs async database sessions.
+
+Two routes run the same query (`SELECT pg_sleep(...)`, standing in for a slow
+Postgres round-trip) inside an `async def` endpoint:
+
+- `/sync` uses the blocking `Session` from `get_session`, which is what every
+  route did before the async engine was introduced: the query blocks the event
+  loop, so in-flight requests are served one at a time.
+- `/async` uses the `AsyncSession` dependency, so requests overlap up to the
+  size of the connection pool.
+
+Requests are sent through an in-process ASGI transport, so the event loop of
+the benchmark is the event loop of the "worker".
+
+Usage (from the `backend` directory, with `DATABASE_URL` pointing to Postgres):
+    uv run python benchmarks/bench_async_sessions.py --requests 200 --concurrency 50
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Annotated
+
+import typer
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlmodel import Session, func, select
+
+# Add the backend directory to the Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.core.db import async_engine, engine, get_session
+from app.core.dependencies import SessionDep
+
+cli = typer.Typer(help="Sync vs async session throughput benchmark")
+
+bench_app = FastAPI()
+
+
+@bench_app.get("/sync")
+async def sync_route(
+    session: Annotated[Session, Depends(get_session)],
+    delay: float,
+) -> dict:
+    """Run a slow query through a blocking session."""
+    session.exec(select(func.pg_sleep(delay))).first()
+    return {"ok": True}
+
+
+@bench_app.get("/async")
+async def async_route(session: SessionDep, delay: float) -> dict:
+    """Run a slow query through an async session."""
+    (await session.exec(select(func.pg_sleep(delay)))).first()
+    return {"ok": True}
+
+
+async def _run(path: str, requests: int, concurrency: int, delay: float) -> float:
+    """Send `requests` requests to `path`, `concurrency` at a time.
+
+    Returns:
+        The throughput, in requests per second.
+
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with AsyncClient(
+        transport=ASGITransport(app=bench_app),
+        base_url="http://bench",
+    ) as client:
+
+        async def _request() -> None:
+            async with semaphore:
+                response = await client.get(path, params={"delay": delay})
+                response.raise_for_status()
+
+        # Warm up the connection pools
+        await asyncio.gather(*(_request() for _ in range(concurrency)))
+
+        start = time.perf_counter()
+        await asyncio.gather(*(_request() for _ in range(requests)))
+        elapsed = time.perf_counter() - start
+
+    return requests / elapsed
+
+
+@cli.command()
+def main(
+    requests: Annotated[int, typer.Option(help="Number of requests")] = 200,
+    concurrency: Annotated[int, typer.Option(help="In-flight requests")] = 50,
+    delay: Annotated[float, typer.Option(help="Query latency in seconds")] = 0.02,
+) -> None:
+    """Compare throughput of the sync and async session dependencies."""
+    typer.echo(
+        f"{requests} requests, concurrency={concurrency}, query latency={delay}s",
+    )
+
+    async def _compare() -> dict[str, float]:
+        results = {}
+        for label, path in (("sync Session", "/sync"), ("AsyncSession", "/async")):
+            results[label] = await _run(path, requests, concurrency, delay)
+            typer.echo(f"  {label:<14} {results[label]:>8.1f} req/s")
+        # Pooled asyncpg connections are bound to this event loop
+        await async_engine.dispose()
+        return results
+
+    results = asyncio.run(_compare())
+    engine.dispose()
+
+    speedup = results["AsyncSession"] / results["sync Session"]
+    typer.echo(f"  speedup        {speedup:>8.1f}x")
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""Benchmark single-stream vs parallel composite uploads of a large CSV file.
+
+A CSV file of `--size-mb` MiB is written to a temporary file, then uploaded
+`--repeat` times with each mode:
+
+- single stream: `upload_file_to_blob`, a resumable upload sending one chunk
+  of `GCS_UPLOAD_CHUNK_SIZE` at a time;
+- composite: `upload_file_to_blob_composite`, parts of `--part-size-mb` MiB
+  uploaded `--parallelism` at a time, then composed server-side.
+
+The uploads target the storage emulator at `STORAGE_EMULATOR_HOST`, or one
+started by the benchmark (`gcp-storage-emulator`, in memory). The emulator
+serves one request at a time and has no network latency to hide, so it
+understates the gain of concurrent parts: set `STORAGE_EMULATOR_HOST` to an
+empty value and `BUCKET_NAME` to a real bucket to measure it over a network.
+
+Usage (from the `backend` directory):
+    uv run python benchmarks/bench_composite_upload.py --size-mb 512
+"""
+
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Annotated
+
+import typer
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+
+# Add the backend directory to the Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.core.settings import settings
+from app.lib.gcp import (
+    delete_blobs,
+    get_bucket,
+    storage_executor,
+    upload_file_to_blob,
+    upload_file_to_blob_composite,
+)
+
+cli = typer.Typer(help="Single-stream vs composite upload benchmark")
+
+MiB = 1024 * 1024
+EMULATOR_BUCKET = "bench-bucket"
+
+
+def _start_emulator() -> subprocess.Popen:
+    """Start an in-memory storage emulator and point the client to it."""
+    with socket.socket() as sock:
+        sock.bind(("localhost", 0))
+        port = sock.getsockname()[1]
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "gcp_storage_emulator",
+            "start",
+            "--port",
+            str(port),
+            "--in-memory",
+            "--default-bucket",
+            EMULATOR_BUCKET,
+            "--quiet",
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    for _ in range(100):
+        try:
+            socket.create_connection(("localhost", port), timeout=0.1).close()
+            break
+        except OSError:
+            time.sleep(0.1)
+    os.environ["STORAGE_EMULATOR_HOST"] = f"http://localhost:{port}"
+    return process
+
+
+def _write_csv(path: Path, size: int) -> None:
+    """Write a CSV file of about `size` bytes."""
+    rows = b"".join(
+        f"2025-01-{i % 28 + 1:02d},GEO_{i % 50},{i * 1.5:.2f},{i % 997}\n".encode()
+        for i in range(10_000)
+    )
+    with path.open("wb") as f:
+        f.write(b"date,geo,revenue,impressions\n")
+        while f.tell() < size:
+            f.write(rows)
+
+
+async def _single_stream(path: Path, bucket_name: str, blob_name: str) -> None:
+    with path.open("rb") as f:
+        await storage_executor.run(
+            upload_file_to_blob,
+            blob_name=blob_name,
+            file=f,
+            bucket_name=bucket_name,
+            content_type="text/csv",
+            size=path.stat().st_size,
+        )
+
+
+async def _composite(
+    path: Path,
+    bucket_name: str,
+    blob_name: str,
+    part_size: int,
+    parallelism: int,
+) -> None:
+    with path.open("rb") as f:
+        file = UploadFile(
+            file=f,
+            size=path.stat().st_size,
+            headers=Headers({"content-type": "text/csv"}),
+        )
+        await upload_file_to_blob_composite(
+            blob_name=blob_name,
+            file=file,
+            bucket_name=bucket_name,
+            content_type="text/csv",
+            part_size=part_size,
+            parallelism=parallelism,
+        )
+
+
+@cli.command()
+def main(
+    size_mb: Annotated[int, typer.Option(help="File size, in MiB")] = 512,
+    part_size_mb: Annotated[int, typer.Option(help="Composite part size")] = 32,
+    parallelism: Annotated[int, typer.Option(help="Parts sent concurrently")] = 4,
+    repeat: Annotated[int, typer.Option(help="Uploads per mode")] = 3,
+) -> None:
+    """Compare the throughput of single-stream and composite uploads."""
+    emulator = None
+    if "STORAGE_EMULATOR_HOST" not in os.environ:
+        emulator = _start_emulator()
+        bucket_name = EMULATOR_BUCKET
+    else:
+        bucket_name = settings.BUCKET_NAME
+    if os.environ["STORAGE_EMULATOR_HOST"] == "":
+        del os.environ["STORAGE_EMULATOR_HOST"]
+
+    async def _compare(path: Path) -> None:
+        size = path.stat().st_size
+        typer.echo(
+            f"{size / MiB:.0f} MiB file, {part_size_mb} MiB parts, "
+            f"parallelism={parallelism}, "
+            f"chunk size={settings.GCS_UPLOAD_CHUNK_SIZE // MiB} MiB",
+        )
+        modes = {
+            "single stream": lambda name: _single_stream(path, bucket_name, name),
+            "composite": lambda name: _composite(
+                path,
+                bucket_name,
+                name,
+                part_size_mb * MiB,
+                parallelism,
+            ),
+        }
+        results = {}
+        for label, upload in modes.items():
+            timings = []
+            for i in range(repeat):
+                blob_name = f"benchmarks/{label.replace(' ', '-')}-{i}.csv"
+                start = time.perf_counter()
+                await upload(blob_name)
+                timings.append(time.perf_counter() - start)
+                assert get_bucket(bucket_name).get_blob(blob_name).size == size
+                await storage_executor.run(delete_blobs, [blob_name], bucket_name)
+            results[label] = size / MiB / statistics.median(timings)
+            typer.echo(f"  {label:<14} {results[label]:>8.1f} MiB/s")
+        speedup = results["composite"] / results["single stream"]
+        typer.echo(f"  speedup        {speedup:>8.2f}x")
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "bench.csv"
+            _write_csv(path, size_mb * MiB)
+            asyncio.run(_compare(path))
+    finally:
+        storage_executor.shutdown()
+        if emulator is not None:
+            emulator.terminate()
+            emulator.wait()
+
+
+if __name__ == "__main__":
+    cli()
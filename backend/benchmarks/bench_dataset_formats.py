@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Benchmark the load time of a dataset stored as CSV vs its Parquet copy.
+
+`ml/data/geo_all_channels.csv` is scaled up `--scale` times, each copy of the
+data getting its own geos, then converted to Parquet with the ingestion stage
+(`convert_csv_to_parquet`). Both files are then loaded `--repeat` times into
+an Arrow table, and into a pandas DataFrame when pandas is installed, which
+is what the training module does.
+
+Usage (from the `backend` directory):
+    uv run python benchmarks/bench_dataset_formats.py --scale 100
+"""
+
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Annotated
+
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+import typer
+
+# Add the backend directory to the Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.lib.parquet import convert_csv_to_parquet
+
+cli = typer.Typer(help="CSV vs Parquet dataset load benchmark")
+
+MiB = 1024 * 1024
+SOURCE = backend_dir.parent / "ml" / "data" / "geo_all_channels.csv"
+
+
+def _scale_csv(path: Path, scale: int) -> None:
+    """Write `scale` copies of the source dataset, with distinct geos."""
+    header, *rows = SOURCE.read_text().splitlines()
+    with path.open("w") as f:
+        f.write(f"{header}\n")
+        for i in range(scale):
+            # Rows look like `index,GeoN,...`: rename the geo of each copy
+            f.writelines(f"{row.replace(',Geo', f',Copy{i}_Geo', 1)}\n" for row in rows)
+
+
+def _time(load: Callable[[], object], repeat: int) -> float:
+    """Run `load` `repeat` times.
+
+    Returns:
+        The median latency, in milliseconds.
+
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        load()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+@cli.command()
+def main(
+    scale: Annotated[int, typer.Option(help="Copies of the source dataset")] = 100,
+    repeat: Annotated[int, typer.Option(help="Loads per format")] = 5,
+) -> None:
+    """Compare the load time of the CSV and Parquet copies of a dataset."""
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / "dataset.csv"
+        parquet_path = Path(tmp) / "dataset.parquet"
+        _scale_csv(csv_path, scale)
+
+        start = time.perf_counter()
+        with csv_path.open("rb") as source, parquet_path.open("wb") as sink:
+            convert_csv_to_parquet(source, sink)
+        conversion_s = time.perf_counter() - start
+
+        rows = pq.read_metadata(parquet_path).num_rows
+        csv_size = csv_path.stat().st_size / MiB
+        parquet_size = parquet_path.stat().st_size / MiB
+        typer.echo(f"{rows} rows, converted in {conversion_s:.2f}s")
+        typer.echo(f"{'':<8} {'size (MiB)':>11} {'arrow (ms)':>11} {'pandas (ms)':>12}")
+
+        loaders: dict[str, tuple[float, Callable[[], object]]] = {
+            "CSV": (csv_size, lambda: pa_csv.read_csv(csv_path)),
+            "Parquet": (parquet_size, lambda: pq.read_table(parquet_path)),
+        }
+        try:
+            import pandas as pd
+        except ImportError:
+            pd = None
+
+        results = {}
+        for label, (size, load) in loaders.items():
+            arrow_ms = _time(load, repeat)
+            pandas_ms = float("nan")
+            if pd is not None:
+                read = pd.read_csv if label == "CSV" else pd.read_parquet
+                path = csv_path if label == "CSV" else parquet_path
+                pandas_ms = _time(lambda read=read, path=path: read(path), repeat)
+            results[label] = (arrow_ms, pandas_ms)
+            typer.echo(f"{label:<8} {size:>11.1f} {arrow_ms:>11.1f} {pandas_ms:>12.1f}")
+
+        speedup = results["CSV"][0] / results["Parquet"][0]
+        typer.echo(f"Parquet loads {speedup:.1f}x faster (Arrow)")
+        if pd is not None:
+            speedup = results["CSV"][1] / results["Parquet"][1]
+            typer.echo(f"Parquet loads {speedup:.1f}x faster (pandas)")
+
+
+if __name__ == "__main__":
+    cli()
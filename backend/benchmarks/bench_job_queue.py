@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""Benchmark the throughput of the training job queue with 1 to N workers.
+
+For each number of workers, `--jobs` jobs are enqueued in the database pointed
+by `DATABASE_URL`, then drained by worker processes claiming them with
+`SELECT ... FOR UPDATE SKIP LOCKED`. Each job sleeps `--job-ms` milliseconds
+instead of training a model: with `--job-ms 0`, the benchmark measures the
+overhead of the queue itself. Workers are started before the clock, so that
+the import time of the processes is not measured. The benchmark rows are
+deleted at the end.
+
+Usage (from the `backend` directory, with `DATABASE_URL` pointing to Postgres):
+    uv run python benchmarks/bench_job_queue.py --jobs 200 --job-ms 50
+"""
+
+import multiprocessing
+import sys
+import time
+from pathlib import Path
+from typing import Annotated
+from uuid import uuid4
+
+import typer
+from sqlmodel import Session, SQLModel, col, delete, select
+
+# Add the backend directory to the Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.core.db import engine
+from app.lib.job_queue import enqueue_job, run_worker
+from app.models import Dataset, Job, Pipeline, Project, User
+from app.models.enums import JobStatus, KpiType
+from app.validations.job_parameters import JobParams, PosteriorParams, PriorParams
+
+cli = typer.Typer(help="Job queue throughput benchmark")
+
+PARAMS = JobParams(prior=PriorParams(), posterior=PosteriorParams())
+
+
+def _seed() -> tuple[str, str, str, str]:
+    """Create a user, a project, a dataset and a pipeline.
+
+    Returns:
+        The IDs of the user, of the project, of the dataset and of the pipeline.
+
+    """
+    SQLModel.metadata.create_all(engine)
+    suffix = uuid4().hex[:8]
+    with Session(engine) as session:
+        user = User(
+            email=f"bench-{suffix}@example.com",
+            username=f"bench-{suffix}",
+            first_name="Bench",
+            last_name="Mark",
+            hashed_password="not-a-real-hash",
+        )
+        project = Project(name=f"Benchmark {suffix}", owner_id=user.id)
+        dataset = Dataset(
+            display_name="Benchmark",
+            kpi_type=KpiType.REVENUE,
+            project_id=project.id,
+            created_by=user.id,
+            blob_path="benchmarks/sales.csv",
+        )
+        pipeline = Pipeline(
+            display_name="Benchmark",
+            project_id=project.id,
+            dataset_id=dataset.id,
+            model_spec={},
+            columns={},
+        )
+        session.add_all([user, project, dataset, pipeline])
+        session.commit()
+        return user.id, project.id, dataset.id, pipeline.id
+
+
+def _cleanup(user_id: str, project_id: str, dataset_id: str, pipeline_id: str) -> None:
+    """Delete the benchmark rows."""
+    with Session(engine) as session:
+        session.exec(delete(Job).where(col(Job.pipeline_id) == pipeline_id))
+        session.exec(delete(Pipeline).where(col(Pipeline.id) == pipeline_id))
+        session.exec(delete(Dataset).where(col(Dataset.id) == dataset_id))
+        session.exec(delete(Project).where(col(Project.id) == project_id))
+        session.exec(delete(User).where(col(User.id) == user_id))
+        session.commit()
+
+
+def _run_worker_process(
+    job_ms: int,
+    barrier: "multiprocessing.synchronize.Barrier",
+) -> None:
+    def _sleep(*_: object) -> None:
+        time.sleep(job_ms / 1000)
+
+    barrier.wait()
+    run_worker(_sleep, exit_when_empty=True)
+    engine.dispose()
+
+
+def _drain(pipeline_id: str, jobs: int, workers: int, job_ms: int) -> float:
+    """Enqueue `jobs` jobs and drain them with `workers` processes.
+
+    Returns:
+        The time to drain the queue, in seconds.
+
+    """
+    with Session(engine) as session:
+        for _ in range(jobs):
+            enqueue_job(session, pipeline_id, PARAMS)
+
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(workers + 1)
+    processes = [
+        context.Process(target=_run_worker_process, args=(job_ms, barrier))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for process in processes:
+        process.join()
+    elapsed = time.perf_counter() - start
+
+    with Session(engine) as session:
+        done = session.exec(
+            select(Job).where(
+                col(Job.pipeline_id) == pipeline_id,
+                col(Job.status) == JobStatus.COMPLETED,
+            ),
+        ).all()
+        assert len(done) == jobs, "Some jobs were not run"
+        session.exec(delete(Job).where(col(Job.pipeline_id) == pipeline_id))
+        session.commit()
+    return elapsed
+
+
+@cli.command()
+def main(
+    jobs: Annotated[int, typer.Option(help="Jobs enqueued per run")] = 200,
+    job_ms: Annotated[int, typer.Option(help="Duration of a job, in ms")] = 50,
+    workers: Annotated[
+        list[int] | None,
+        typer.Option(help="Numbers of workers to compare"),
+    ] = None,
+) -> None:
+    """Compare the throughput of the job queue for increasing numbers of workers."""
+    workers = workers or [1, 2, 4, 8]
+    ids = _seed()
+    pipeline_id = ids[-1]
+
+    try:
+        typer.echo(f"{jobs} jobs of {job_ms} ms")
+        typer.echo(f"{'workers':>8} {'time (s)':>9} {'jobs/s':>8} {'speedup':>8}")
+        baseline = None
+        for count in workers:
+            elapsed = _drain(pipeline_id, jobs, count, job_ms)
+            throughput = jobs / elapsed
+            baseline = baseline or throughput
+            typer.echo(
+                f"{count:>8} {elapsed:>9.2f} {throughput:>8.1f} "
+                f"{throughput / baseline:>7.2f}x",
+            )
+    finally:
+        _cleanup(*ids)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""Benchmark offset vs keyset (cursor) pagination of a project's datasets.
+
+A project with `--rows` datasets (1M by default) is created in the database
+pointed by `DATABASE_URL`, then the same page is fetched at increasing depths,
+once with the deprecated `offset` and once with the cursor of the previous
+item. The benchmark rows are deleted at the end.
+
+Usage (from the `backend` directory, with `DATABASE_URL` pointing to Postgres):
+    uv run python benchmarks/bench_pagination.py --rows 1000000
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Annotated
+from uuid import uuid4
+
+import typer
+from sqlmodel import Session, SQLModel, delete, select, text
+
+# Add the backend directory to the Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.core.db import async_engine, async_session_factory, engine
+from app.core.pagination import Pagination, encode_cursor
+from app.models import Dataset, Project, User
+from app.services import DatasetService
+
+cli = typer.Typer(help="Offset vs cursor pagination benchmark")
+
+SEED_DATASETS = text(
+    """
+    INSERT INTO datasets (
+        id, created_at, display_name, kpi_type, project_id, created_by, blob_path
+    )
+    SELECT
+        gen_random_uuid()::text,
+        now() - make_interval(secs => i),
+        'Dataset ' || i,
+        'REVENUE',
+        :project_id,
+        :user_id,
+        'benchmarks/' || i || '.csv'
+    FROM generate_series(1, :rows) AS i
+    """,
+)
+
+
+def _seed(rows: int) -> tuple[str, str]:
+    """Create a user and a project with `rows` datasets.
+
+    Returns:
+        The IDs of the user and of the project.
+
+    """
+    SQLModel.metadata.create_all(engine)
+    suffix = uuid4().hex[:8]
+    with Session(engine) as session:
+        user = User(
+            email=f"bench-{suffix}@example.com",
+            username=f"bench-{suffix}",
+            first_name="Bench",
+            last_name="Mark",
+            hashed_password="not-a-real-hash",
+        )
+        session.add(user)
+        session.commit()
+        project = Project(name=f"Benchmark {suffix}", owner_id=user.id)
+        session.add(project)
+        session.commit()
+
+        session.exec(
+            SEED_DATASETS,
+            params={"project_id": project.id, "user_id": user.id, "rows": rows},
+        )
+        session.commit()
+        session.exec(text("ANALYZE datasets"))
+        return user.id, project.id
+
+
+def _cleanup(user_id: str, project_id: str) -> None:
+    """Delete the benchmark rows."""
+    with Session(engine) as session:
+        session.exec(delete(Dataset).where(Dataset.project_id == project_id))
+        session.exec(delete(Project).where(Project.id == project_id))
+        session.exec(delete(User).where(User.id == user_id))
+        session.commit()
+
+
+def _cursor_at(project_id: str, depth: int) -> str | None:
+    """Get the cursor a client would hold after reading `depth` datasets."""
+    if not depth:
+        return None
+    with Session(engine) as session:
+        last = session.exec(
+            select(Dataset)
+            .where(Dataset.project_id == project_id)
+            .order_by(Dataset.created_at.desc(), Dataset.id.desc())
+            .offset(depth - 1)
+            .limit(1),
+        ).one()
+        return encode_cursor(last.created_at, last.id)
+
+
+async def _time_page(
+    project_id: str,
+    pagination: Pagination,
+    repeat: int,
+) -> float:
+    """Fetch a page `repeat` times.
+
+    Returns:
+        The median latency, in milliseconds.
+
+    """
+    timings = []
+    async with async_session_factory() as session:
+        service = DatasetService(session, project_id=project_id)
+        for _ in range(repeat):
+            start = time.perf_counter()
+            page = await service.list_project_datasets(pagination=pagination)
+            timings.append((time.perf_counter() - start) * 1000)
+            session.expunge_all()
+    assert len(page.items) == pagination.limit
+    return statistics.median(timings)
+
+
+@cli.command()
+def main(
+    rows: Annotated[int, typer.Option(help="Datasets in the project")] = 1_000_000,
+    limit: Annotated[int, typer.Option(help="Page size")] = 50,
+    repeat: Annotated[int, typer.Option(help="Runs per measure")] = 5,
+) -> None:
+    """Compare page latency of offset and cursor pagination at increasing depths."""
+    typer.echo(f"Seeding {rows} datasets...")
+    user_id, project_id = _seed(rows)
+
+    depths = [0, 1_000, 10_000, 100_000, rows // 2, rows - limit]
+    depths = sorted({depth for depth in depths if depth <= rows - limit})
+
+    async def _compare() -> None:
+        typer.echo(f"{'depth':>10} {'offset (ms)':>12} {'cursor (ms)':>12}")
+        for depth in depths:
+            offset_ms = await _time_page(
+                project_id,
+                Pagination(limit=limit, offset=depth),
+                repeat,
+            )
+            cursor_ms = await _time_page(
+                project_id,
+                Pagination(limit=limit, cursor=_cursor_at(project_id, depth)),
+                repeat,
+            )
+            typer.echo(f"{depth:>10} {offset_ms:>12.2f} {cursor_ms:>12.2f}")
+        await async_engine.dispose()
+
+    try:
+        asyncio.run(_compare())
+    finally:
+        _cleanup(user_id, project_id)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    cli()
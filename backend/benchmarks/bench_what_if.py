@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""Benchmark the throughput of what-if scenarios, one per request vs in batches.
+
+A deployed model is created in the database pointed by `DATABASE_URL`, and
+its served arrays are put in the model cache, as after its first load: they
+have `--channels` media channels and `--draws` posterior draws, whose response
+curves are Hill curves of random parameters per draw. `--scenarios` random
+spend scenarios are then sent to the scenarios endpoint through an in-process
+ASGI transport: one scenario per request, as when analysts evaluate them one
+at a time, then in batches of each `--batch-sizes`. The benchmark rows are
+deleted at the end.
+
+Usage (from the `backend` directory, with `DATABASE_URL` pointing to Postgres):
+    uv run python benchmarks/bench_what_if.py --draws 4000 --batch-sizes 1 10 100 1000
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Annotated
+from uuid import uuid4
+
+import numpy as np
+import typer
+from httpx import ASGITransport, AsyncClient
+from sqlmodel import Session, SQLModel, delete
+
+# Add the backend directory to the Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.core.db import async_engine, engine
+from app.lib.model_serving import (
+    MAX_SPEND_MULTIPLIER,
+    SPEND_MULTIPLIERS,
+    ServedModel,
+    model_cache,
+)
+from app.main import app
+from app.models import Dataset, Job, Model, Pipeline, Project, User
+from app.models.enums import KpiType
+from app.services import AuthService
+
+cli = typer.Typer(help="What-if scenarios throughput benchmark")
+
+
+def _served_model(channels: int, draws: int, rng: np.random.Generator) -> ServedModel:
+    """Build a served model of Hill response curves."""
+    spend = rng.uniform(1e4, 1e6, channels)
+    roi = rng.lognormal(0.2, 0.5, (draws, channels))
+    ec = rng.uniform(0.5, 1.5, (channels, 1, draws))
+    slope = rng.uniform(1.0, 3.0, (channels, 1, draws))
+    multipliers = SPEND_MULTIPLIERS[None, :, None]
+    hill = multipliers**slope / (multipliers**slope + ec**slope)
+    # Scaled so that the incremental outcome at the historical spend is ROI * spend
+    at_spend = 1 / (1 + ec**slope)
+    response = hill / at_spend * (roi.T * spend[:, None])[:, None, :]
+    return ServedModel(
+        channels=tuple(f"channel_{i}" for i in range(channels)),
+        roi=roi,
+        spend=spend,
+        response=response,
+        baseline=rng.normal(1e7, 1e5, draws),
+    )
+
+
+def _scenarios(
+    served: ServedModel,
+    count: int,
+    rng: np.random.Generator,
+) -> list[dict]:
+    multipliers = rng.uniform(0, MAX_SPEND_MULTIPLIER, (count, len(served.channels)))
+    spend = (multipliers * served.spend).tolist()
+    return [{"spend": dict(zip(served.channels, row, strict=True))} for row in spend]
+
+
+def _seed() -> tuple[User, Project, Model]:
+    """Create a user, and a project with a deployed model."""
+    SQLModel.metadata.create_all(engine)
+    suffix = uuid4().hex[:8]
+    with Session(engine, expire_on_commit=False) as session:
+        user = User(
+            email=f"bench-{suffix}@example.com",
+            username=f"bench-{suffix}",
+            first_name="Bench",
+            last_name="Mark",
+            hashed_password="not-a-real-hash",
+        )
+        project = Project(name=f"Benchmark {suffix}", owner_id=user.id)
+        dataset = Dataset(
+            display_name="Benchmark",
+            kpi_type=KpiType.REVENUE,
+            project_id=project.id,
+            created_by=user.id,
+            blob_path=f"benchmarks/{suffix}.csv",
+        )
+        pipeline = Pipeline(
+            display_name="Benchmark",
+            project_id=project.id,
+            dataset_id=dataset.id,
+            model_spec={},
+            columns={},
+        )
+        job = Job(pipeline_id=pipeline.id, params={"prior": {}, "posterior": {}})
+        model = Model(job_id=job.id, uri=f"benchmarks/{suffix}.pkl", deployed=True)
+        for row in (user, project, dataset, pipeline, job, model):
+            session.add(row)
+            session.commit()
+        return user, project, model
+
+
+def _cleanup(user: User, project: Project, model: Model) -> None:
+    """Delete the benchmark rows."""
+    with Session(engine) as session:
+        job = session.get_one(Job, model.job_id)
+        pipeline = session.get_one(Pipeline, job.pipeline_id)
+        session.exec(delete(Model).where(Model.id == model.id))
+        session.exec(delete(Job).where(Job.id == job.id))
+        session.exec(delete(Pipeline).where(Pipeline.id == pipeline.id))
+        session.exec(delete(Dataset).where(Dataset.id == pipeline.dataset_id))
+        session.exec(delete(Project).where(Project.id == project.id))
+        session.exec(delete(User).where(User.id == user.id))
+        session.commit()
+
+
+@cli.command()
+def main(
+    channels: Annotated[int, typer.Option(help="Media channels of the model")] = 8,
+    draws: Annotated[int, typer.Option(help="Posterior draws of the model")] = 4000,
+    scenarios: Annotated[int, typer.Option(help="Scenarios per measure")] = 1000,
+    batch_sizes: Annotated[
+        list[int] | None,
+        typer.Option(help="Scenarios per request to compare"),
+    ] = None,
+) -> None:
+    """Compare the scenarios per second of single and batched requests."""
+    batch_sizes = batch_sizes or [1, 10, 100, 1000]
+    rng = np.random.default_rng(0)
+    served = _served_model(channels, draws, rng)
+    batch = _scenarios(served, scenarios, rng)
+    user, project, model = _seed()
+    model_cache.set(model.id, served, served.nbytes)
+    token = AuthService.create_access_token({"sub": user.id, "email": user.email})
+    url = f"/v1/projects/{project.id}/models/{model.id}/scenarios"
+    typer.echo(
+        f"{channels} channels, {draws} draws, "
+        f"{served.nbytes / 1024 / 1024:.1f} MiB served, {scenarios} scenarios",
+    )
+
+    async def _compare() -> None:
+        typer.echo(
+            f"{'batch':>6} {'requests':>9} {'time (s)':>9} "
+            f"{'scenarios/s':>12} {'speedup':>8}",
+        )
+        baseline: float | None = None
+        async with AsyncClient(
+            transport=ASGITransport(app=app),
+            base_url="http://bench",
+            headers={"Authorization": f"Bearer {token}"},
+        ) as client:
+            # Warm up the connection pool and the user cache
+            response = await client.post(url, json={"scenarios": batch[:1]})
+            response.raise_for_status()
+            for size in batch_sizes:
+                start = time.perf_counter()
+                requests = 0
+                for i in range(0, scenarios, size):
+                    response = await client.post(
+                        url,
+                        json={"scenarios": batch[i : i + size]},
+                    )
+                    response.raise_for_status()
+                    requests += 1
+                elapsed = time.perf_counter() - start
+                throughput = scenarios / elapsed
+                baseline = baseline or throughput
+                typer.echo(
+                    f"{size:>6} {requests:>9} {elapsed:>9.2f} "
+                    f"{throughput:>12.1f} {throughput / baseline:>7.1f}x",
+                )
+        await async_engine.dispose()
+
+    try:
+        asyncio.run(_compare())
+    finally:
+        _cleanup(user, project, model)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    cli()
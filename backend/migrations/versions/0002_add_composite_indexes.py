@@ -0,0 +1,60 @@
+"""Add composite indexes for project and dataset listings.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 00:12:56.010813
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: str | Sequence[str] | None = "0001"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    On Postgres, indexes are built concurrently, outside of the migration
+    transaction, so that writes to the tables are not blocked meanwhile.
+    """
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_datasets_project_id_created_at_id",
+            "datasets",
+            [
+                "project_id",
+                sa.literal_column("created_at DESC"),
+                sa.literal_column("id DESC"),
+            ],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_memberships_user_id_project_id",
+            "memberships",
+            ["user_id", "project_id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_memberships_user_id_project_id",
+            table_name="memberships",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_datasets_project_id_created_at_id",
+            table_name="datasets",
+            postgresql_concurrently=True,
+        )
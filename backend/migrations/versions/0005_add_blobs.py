@@ -0,0 +1,52 @@
+"""Add blobs, counting the references to dataset files.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 04:08:19.275604
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: str | Sequence[str] | None = "0004"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Files uploaded before deduplication get a blob row too, referenced by
+    their datasets, so they are deleted with the last one.
+    """
+    op.create_table(
+        "blobs",
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("path", sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+        sa.Column("sha256", sqlmodel.sql.sqltypes.AutoString(length=64), nullable=True),
+        sa.Column("size", sa.BigInteger(), nullable=True),
+        sa.Column("ref_count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("path"),
+    )
+    op.create_index(op.f("ix_blobs_created_at"), "blobs", ["created_at"], unique=False)
+    op.execute(
+        """
+        INSERT INTO blobs (path, ref_count, created_at)
+        SELECT blob_path, count(*), min(created_at)
+        FROM datasets
+        GROUP BY blob_path
+        """,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_blobs_created_at"), table_name="blobs")
+    op.drop_table("blobs")
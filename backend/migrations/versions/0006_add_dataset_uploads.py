@@ -0,0 +1,92 @@
+"""Add dataset uploads, reserving the files uploaded directly to storage.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 05:12:44.918305
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: str | Sequence[str] | None = "0005"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "dataset_uploads",
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("id", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column(
+            "display_name",
+            sqlmodel.sql.sqltypes.AutoString(length=255),
+            nullable=False,
+        ),
+        sa.Column(
+            "kpi_type",
+            # Created with the datasets table
+            sa.Enum("REVENUE", "NON_REVENUE", name="kpitype").with_variant(
+                postgresql.ENUM(name="kpitype", create_type=False),
+                "postgresql",
+            ),
+            nullable=False,
+        ),
+        sa.Column("project_id", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("created_by", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column(
+            "blob_path",
+            sqlmodel.sql.sqltypes.AutoString(length=255),
+            nullable=False,
+        ),
+        sa.Column(
+            "content_type",
+            sqlmodel.sql.sqltypes.AutoString(length=255),
+            nullable=False,
+        ),
+        sa.Column("size", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "md5_hash",
+            sqlmodel.sql.sqltypes.AutoString(length=24),
+            nullable=False,
+        ),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["created_by"], ["users.id"]),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_dataset_uploads_created_at"),
+        "dataset_uploads",
+        ["created_at"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_dataset_uploads_id"),
+        "dataset_uploads",
+        ["id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_dataset_uploads_project_id"),
+        "dataset_uploads",
+        ["project_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_dataset_uploads_project_id"), table_name="dataset_uploads")
+    op.drop_index(op.f("ix_dataset_uploads_id"), table_name="dataset_uploads")
+    op.drop_index(op.f("ix_dataset_uploads_created_at"), table_name="dataset_uploads")
+    op.drop_table("dataset_uploads")
@@ -0,0 +1,42 @@
+"""Add the leases and the retry counts of the jobs.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 00:52:36.086220
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: str | Sequence[str] | None = "0007"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "jobs", sa.Column("lease_expires_at", sa.DateTime(timezone=True), nullable=True)
+    )
+    op.add_column(
+        "jobs",
+        sa.Column("retries", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.create_index(
+        "ix_jobs_status_lease_expires_at",
+        "jobs",
+        ["status", "lease_expires_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_jobs_status_lease_expires_at", table_name="jobs")
+    op.drop_column("jobs", "retries")
+    op.drop_column("jobs", "lease_expires_at")
@@ -0,0 +1,50 @@
+"""Add the fingerprints of the training inputs to the jobs and models.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17 00:56:13.359227
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0009"
+down_revision: str | Sequence[str] | None = "0008"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "jobs",
+        sa.Column(
+            "fingerprint", sqlmodel.sql.sqltypes.AutoString(length=64), nullable=True
+        ),
+    )
+    op.add_column(
+        "jobs",
+        sa.Column("cache_hit", sa.Boolean(), nullable=False, server_default=sa.false()),
+    )
+    op.add_column(
+        "models",
+        sa.Column(
+            "fingerprint", sqlmodel.sql.sqltypes.AutoString(length=64), nullable=True
+        ),
+    )
+    op.create_index(
+        op.f("ix_models_fingerprint"), "models", ["fingerprint"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_models_fingerprint"), table_name="models")
+    op.drop_column("models", "fingerprint")
+    op.drop_column("jobs", "cache_hit")
+    op.drop_column("jobs", "fingerprint")
@@ -0,0 +1,65 @@
+"""Add the kinds of jobs, and the conversion jobs of the uploaded datasets.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-17 01:32:38.483895
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0010"
+down_revision: str | Sequence[str] | None = "0009"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+job_kind = sa.Enum("TRAINING", "DATASET_CONVERSION", name="jobkind")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    job_kind.create(op.get_bind(), checkfirst=True)
+    op.add_column(
+        "jobs",
+        sa.Column("kind", job_kind, nullable=False, server_default="TRAINING"),
+    )
+    op.add_column(
+        "jobs",
+        sa.Column("dataset_id", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    )
+    op.create_index(op.f("ix_jobs_dataset_id"), "jobs", ["dataset_id"], unique=False)
+    # Batch operations, since SQLite cannot alter columns and constraints
+    with op.batch_alter_table("jobs") as batch_op:
+        batch_op.alter_column(
+            "pipeline_id",
+            existing_type=sa.VARCHAR(),
+            nullable=True,
+        )
+        batch_op.create_foreign_key(
+            "jobs_dataset_id_fkey",
+            "datasets",
+            ["dataset_id"],
+            ["id"],
+            ondelete="CASCADE",
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(sa.text("DELETE FROM jobs WHERE kind = 'DATASET_CONVERSION'"))
+    with op.batch_alter_table("jobs") as batch_op:
+        batch_op.drop_constraint("jobs_dataset_id_fkey", type_="foreignkey")
+        batch_op.alter_column(
+            "pipeline_id",
+            existing_type=sa.VARCHAR(),
+            nullable=False,
+        )
+    op.drop_index(op.f("ix_jobs_dataset_id"), table_name="jobs")
+    op.drop_column("jobs", "dataset_id")
+    op.drop_column("jobs", "kind")
+    job_kind.drop(op.get_bind(), checkfirst=True)
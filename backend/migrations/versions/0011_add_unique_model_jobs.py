@@ -0,0 +1,47 @@
+"""Store at most one model per job.
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-17 01:48:05.214377
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0011"
+down_revision: str | Sequence[str] | None = "0010"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Models stored again by workers which had lost the lease of their job
+    # point at the same blob: keep the first one of each job
+    op.execute(
+        sa.text(
+            """
+            DELETE FROM models
+            WHERE EXISTS (
+                SELECT 1 FROM models AS first
+                WHERE first.job_id = models.job_id
+                AND (
+                    first.created_at < models.created_at
+                    OR (first.created_at = models.created_at AND first.id < models.id)
+                )
+            )
+            """,
+        ),
+    )
+    op.drop_index(op.f("ix_models_job_id"), table_name="models")
+    op.create_index(op.f("ix_models_job_id"), "models", ["job_id"], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_models_job_id"), table_name="models")
+    op.create_index(op.f("ix_models_job_id"), "models", ["job_id"], unique=False)
@@ -2,7 +2,10 @@
 """CLI script to manage database operations."""
 
 import logging
+import multiprocessing
+import signal
 import sys
+import threading
 from pathlib import Path
 from typing import Annotated
 
@@ -12,10 +15,13 @@ from sqlmodel import Session, SQLModel, text
 # Add the backend directory to the Python path
 backend_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(backend_dir))
+ml_dir = backend_dir.parent / "ml"
 
 from scripts.seed import clear_seed_data, seed_database  # noqa: E402
 
 from app.core.db import engine  # noqa: E402
+from app.lib.job_queue import run_worker  # noqa: E402
+from app.lib.jobs import run_job  # noqa: E402
 from app.models.membership import Membership  # noqa: E402, F401
 from app.models.project import Project  # noqa: E402, F401
 from app.models.user import User  # noqa: E402, F401
@@ -228,5 +234,50 @@ def reset_db() -> None:
         raise typer.Exit(1) from e
 
 
+# =============================================================================
+# WORKER COMMANDS
+# =============================================================================
+
+
+def _run_worker_process() -> None:
+    """Run the queued jobs until the process is interrupted."""
+    # The training module is imported from the ml package
+    sys.path.insert(0, str(ml_dir))
+    stop = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop.set())
+    run_worker(run_job, stop=stop)
+
+
+@app.command(name="worker")
+def worker(
+    concurrency: Annotated[
+        int,
+        typer.Option("--concurrency", "-n", min=1, help="Number of worker processes"),
+    ] = 1,
+) -> None:
+    """Run training workers, claiming the pending jobs of the queue.
+
+    Workers can run on any number of nodes sharing the database. Each worker
+    finishes its running job before stopping on SIGINT or SIGTERM.
+    """
+    typer.echo(f"👷 Starting {concurrency} training worker(s)...")
+    if concurrency == 1:
+        _run_worker_process()
+        return
+
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=_run_worker_process, name=f"worker-{i}")
+        for i in range(concurrency)
+    ]
+    # Interruptions are handled by each worker
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+
 if __name__ == "__main__":
     app()
@@ -0,0 +1,67 @@
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.settings import settings
+from app.models import User
+from app.services.user import user_cache
+
+
+@pytest.mark.asyncio
+async def test_current_user_is_cached(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    user: User,
+):
+    for _ in range(3):
+        response = await client.get("/v1/me", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+
+    stats = user_cache.stats()
+    assert stats.misses == 1
+    assert stats.hits == 2
+
+    response = await client.get(
+        "/metrics/user-cache",
+        headers={
+            settings.API_KEY_HEADER: settings.ml_api_secret_api_key.get_secret_value(),
+        },
+    )
+    assert response.json()["hits"] == 2
+    assert response.json()["hit_rate"] == pytest.approx(2 / 3)
+
+
+@pytest.mark.asyncio
+async def test_cached_user_is_invalidated_on_update(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    session: AsyncSession,
+    user: User,
+):
+    await client.get("/v1/me", headers=auth_headers)
+    assert user_cache.get(user.id).username == "johndoe"
+
+    user.username = "janedoe"
+    session.add(user)
+    await session.commit()
+    assert user_cache.get(user.id) is None
+
+    response = await client.get("/v1/me", headers=auth_headers)
+    assert response.json()["username"] == "janedoe"
+
+
+@pytest.mark.asyncio
+async def test_cached_user_is_invalidated_on_delete(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    session: AsyncSession,
+    user: User,
+):
+    await client.get("/v1/me", headers=auth_headers)
+
+    await session.delete(user)
+    await session.commit()
+
+    response = await client.get("/v1/me", headers=auth_headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
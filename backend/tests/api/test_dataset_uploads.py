@@ -0,0 +1,241 @@
+import base64
+import hashlib
+from collections.abc import Generator
+from datetime import UTC, datetime, timedelta
+
+import httpx
+import pytest
+import pytest_asyncio
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import status
+from google.oauth2 import service_account
+from httpx import AsyncClient
+from sqlmodel import select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.lib import gcp
+from app.models import Blob, DatasetUpload, Job, Project, User
+from app.models.enums import JobKind, JobStatus
+
+CONTENT = b"time,geo,revenue\n2025-01-06,FR,1000\n2025-01-13,FR,1200\n"
+
+
+def _md5(content: bytes) -> str:
+    return base64.b64encode(hashlib.md5(content).digest()).decode()
+
+
+@pytest.fixture(autouse=True)
+def signing_credentials(monkeypatch: pytest.MonkeyPatch) -> Generator[None]:
+    """Sign the upload URLs with a throwaway service account key."""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    credentials = service_account.Credentials.from_service_account_info(
+        {
+            "client_email": "uploader@baynext.iam.gserviceaccount.com",
+            "private_key": pem.decode(),
+            "token_uri": "https://oauth2.googleapis.com/token",
+        },
+    )
+    monkeypatch.setattr(gcp, "get_signing_credentials", lambda: credentials)
+    yield
+
+
+@pytest_asyncio.fixture
+async def project(session: AsyncSession, user: User) -> Project:
+    project = Project(name="Uploads project", owner_id=user.id)
+    session.add(project)
+    await session.commit()
+    return project
+
+
+async def _reserve(
+    client: AsyncClient,
+    headers: dict[str, str],
+    project: Project,
+    *,
+    content: bytes = CONTENT,
+    resumable: bool = False,
+) -> dict:
+    response = await client.post(
+        f"/v1/projects/{project.id}/datasets/uploads",
+        json={
+            "displayName": "Direct upload",
+            "kpiType": "revenue",
+            "contentType": "text/csv",
+            "size": len(content),
+            "md5Hash": _md5(content),
+            "resumable": resumable,
+        },
+        headers=headers,
+    )
+    assert response.status_code == status.HTTP_201_CREATED, response.text
+    return response.json()
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("storage_emulator")
+async def test_upload_dataset_with_signed_url(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    session: AsyncSession,
+    project: Project,
+):
+    upload = await _reserve(client, auth_headers, project)
+    assert upload["method"] == "PUT"
+    assert upload["headers"] == {
+        "Content-Type": "text/csv",
+        "Content-MD5": _md5(CONTENT),
+    }
+    assert upload["blobPath"].startswith(f"{project.id}/datasets/uploads/")
+
+    # The bytes go to the storage, not to the API
+    async with httpx.AsyncClient() as storage:
+        response = await storage.put(
+            upload["uploadUrl"],
+            content=CONTENT,
+            headers=upload["headers"],
+        )
+        assert response.is_success, response.text
+
+    url = f"/v1/projects/{project.id}/datasets/uploads/{upload['id']}/complete"
+    response = await client.post(url, headers=auth_headers)
+
+    assert response.status_code == status.HTTP_201_CREATED, response.text
+    dataset = response.json()
+    assert dataset["blobPath"] == upload["blobPath"]
+    assert dataset["displayName"] == "Direct upload"
+    assert await session.get(DatasetUpload, upload["id"]) is None
+    blob = await session.get(Blob, upload["blobPath"])
+    assert (blob.size, blob.ref_count) == (len(CONTENT), 1)
+
+    # The file is converted to Parquet by a worker
+    assert dataset["parquetPath"] is None
+    job = (await session.exec(select(Job).where(Job.dataset_id == dataset["id"]))).one()
+    assert (job.kind, job.status) == (JobKind.DATASET_CONVERSION, JobStatus.PENDING)
+
+    preview = await client.get(
+        f"/v1/projects/{project.id}/datasets/{dataset['id']}/preview",
+        headers=auth_headers,
+    )
+    assert preview.json()["rows"] == [
+        ["2025-01-06", "FR", "1000"],
+        ["2025-01-13", "FR", "1200"],
+    ]
+
+    # An upload is completed once
+    response = await client.post(url, headers=auth_headers)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("storage_emulator")
+async def test_resumable_upload_url_is_signed(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    project: Project,
+):
+    upload = await _reserve(client, auth_headers, project, resumable=True)
+
+    assert upload["method"] == "POST"
+    assert upload["headers"] == {
+        "Content-Type": "text/csv",
+        "x-goog-resumable": "start",
+    }
+    query = httpx.URL(upload["uploadUrl"]).params
+    assert query["X-Goog-Algorithm"] == "GOOG4-RSA-SHA256"
+    assert query["X-Goog-SignedHeaders"] == "content-type;host;x-goog-resumable"
+    assert query["X-Goog-Expires"] == "3600"
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("storage_emulator")
+async def test_complete_upload_checks_the_file(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    project: Project,
+):
+    upload = await _reserve(client, auth_headers, project)
+    url = f"/v1/projects/{project.id}/datasets/uploads/{upload['id']}/complete"
+
+    response = await client.post(url, headers=auth_headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "not found" in response.json()["detail"]
+
+    other = CONTENT.replace(b"1200", b"1300")
+    gcp.get_bucket().blob(upload["blobPath"]).upload_from_string(
+        other,
+        content_type="text/csv",
+    )
+    response = await client.post(url, headers=auth_headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "MD5 hash" in response.json()["detail"]
+    assert "size" not in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("storage_emulator")
+async def test_complete_expired_upload(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    session: AsyncSession,
+    project: Project,
+):
+    upload = await _reserve(client, auth_headers, project)
+    gcp.get_bucket().blob(upload["blobPath"]).upload_from_string(
+        CONTENT,
+        content_type="text/csv",
+    )
+    await session.exec(
+        update(DatasetUpload)
+        .where(DatasetUpload.id == upload["id"])
+        .values(expires_at=datetime.now(UTC) - timedelta(seconds=1)),
+    )
+    await session.commit()
+
+    response = await client.post(
+        f"/v1/projects/{project.id}/datasets/uploads/{upload['id']}/complete",
+        headers=auth_headers,
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "expired" in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_complete_unknown_upload(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    project: Project,
+):
+    response = await client.post(
+        f"/v1/projects/{project.id}/datasets/uploads/unknown/complete",
+        headers=auth_headers,
+    )
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_create_upload_rejects_other_types(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    project: Project,
+):
+    response = await client.post(
+        f"/v1/projects/{project.id}/datasets/uploads",
+        json={
+            "displayName": "Direct upload",
+            "kpiType": "revenue",
+            "contentType": "application/json",
+            "size": 2,
+            "md5Hash": _md5(b"{}"),
+        },
+        headers=auth_headers,
+    )
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
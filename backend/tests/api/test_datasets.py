@@ -0,0 +1,140 @@
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from fastapi import status
+from httpx import AsyncClient
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.lib.gcp import get_bucket
+from app.models import Dataset, Project, User
+
+GEO_ALL_CHANNELS = Path(__file__).parents[3] / "ml" / "data" / "geo_all_channels.csv"
+
+
+@pytest_asyncio.fixture
+async def project(session: AsyncSession, user: User) -> Project:
+    project = Project(name="Datasets project", owner_id=user.id)
+    session.add(project)
+    await session.commit()
+    return project
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("storage_emulator")
+async def test_create_dataset_stores_parquet_copy(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    session: AsyncSession,
+    project: Project,
+):
+    response = await client.post(
+        f"/v1/projects/{project.id}/datasets",
+        data={"displayName": "Geo all channels", "kpiType": "revenue"},
+        files={"file": ("geo.csv", GEO_ALL_CHANNELS.read_bytes(), "text/csv")},
+        headers=auth_headers,
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED, response.text
+    result = response.json()
+    assert result["parquetPath"] == result["blobPath"].replace(".csv", ".parquet")
+    assert get_bucket().get_blob(result["parquetPath"]) is not None
+    dataset = await session.get(Dataset, result["id"])
+    assert dataset.data_path == result["parquetPath"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("storage_emulator")
+async def test_dataset_profile_is_returned(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    project: Project,
+):
+    url = f"/v1/projects/{project.id}/datasets"
+    response = await client.post(
+        url,
+        data={"displayName": "Geo all channels", "kpiType": "revenue"},
+        files={"file": ("geo.csv", GEO_ALL_CHANNELS.read_bytes(), "text/csv")},
+        headers=auth_headers,
+    )
+    assert response.status_code == status.HTTP_201_CREATED, response.text
+    profile = response.json()["profile"]
+    assert profile["rowCount"] == 6240
+    assert len(profile["geos"]) == 40
+    assert profile["timePeriods"] == 156
+    assert (profile["timeStart"], profile["timeEnd"]) == ("2021-01-25", "2024-01-15")
+    spend = next(c for c in profile["columns"] if c["name"] == "Channel0_spend")
+    assert spend["role"] == "spend"
+    assert spend["nullCount"] == 0
+
+    # The details and list endpoints exclude None values
+    dataset_id = response.json()["id"]
+    details = await client.get(f"{url}/{dataset_id}", headers=auth_headers)
+    listing = await client.get(url, headers=auth_headers)
+    for returned in (details.json()["profile"], listing.json()[0]["profile"]):
+        assert returned["rowCount"] == profile["rowCount"]
+        assert returned["geos"] == profile["geos"]
+        assert len(returned["columns"]) == len(profile["columns"])
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("storage_emulator")
+async def test_create_dataset_rejects_invalid_csv(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    project: Project,
+):
+    response = await client.post(
+        f"/v1/projects/{project.id}/datasets",
+        data={"displayName": "Broken", "kpiType": "revenue"},
+        files={"file": ("broken.csv", b"time,geo\n2025-01-06,FR,1000\n", "text/csv")},
+        headers=auth_headers,
+    )
+
+    assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+    assert "Invalid CSV file" in response.json()["detail"]
+    blobs = get_bucket().list_blobs(prefix=f"{project.id}/datasets/")
+    assert [blob.name for blob in blobs] == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("storage_emulator")
+async def test_preview_dataset(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    project: Project,
+):
+    url = f"/v1/projects/{project.id}/datasets"
+    response = await client.post(
+        url,
+        data={"displayName": "Geo all channels", "kpiType": "revenue"},
+        files={"file": ("geo.csv", GEO_ALL_CHANNELS.read_bytes(), "text/csv")},
+        headers=auth_headers,
+    )
+    dataset_id = response.json()["id"]
+
+    response = await client.get(
+        f"{url}/{dataset_id}/preview",
+        params={"rows": 3},
+        headers=auth_headers,
+    )
+
+    assert response.status_code == status.HTTP_200_OK, response.text
+    preview = response.json()
+    header, *lines = GEO_ALL_CHANNELS.read_text().splitlines()[:4]
+    assert preview["columns"] == header.split(",")
+    assert preview["rows"] == [line.split(",") for line in lines]
+
+
+@pytest.mark.asyncio
+async def test_preview_dataset_not_found(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    project: Project,
+):
+    response = await client.get(
+        f"/v1/projects/{project.id}/datasets/ds-unknown/preview",
+        headers=auth_headers,
+    )
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
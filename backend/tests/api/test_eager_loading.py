@@ -0,0 +1,118 @@
+import pytest
+import pytest_asyncio
+from fastapi import status
+from httpx import AsyncClient
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import Dataset, Membership, Project, User
+from app.models.enums import KpiType
+
+MEMBERS_COUNT = 50
+
+
+@pytest_asyncio.fixture
+async def project(session: AsyncSession, user: User) -> Project:
+    """Create a project with many members."""
+    project = Project(name="Crowded project", owner_id=user.id)
+    members = [
+        User(
+            email=f"member{i}@example.com",
+            username=f"member{i}",
+            first_name="Member",
+            last_name=str(i),
+            hashed_password="not-a-real-hash",
+        )
+        for i in range(MEMBERS_COUNT)
+    ]
+    session.add(project)
+    session.add_all(members)
+    await session.commit()
+    session.add_all(
+        Membership(project_id=project.id, user_id=member.id, invited_by=user.id)
+        for member in members
+    )
+    await session.commit()
+    return project
+
+
+@pytest.mark.asyncio
+# User, project access, then the project with its owner and its members
+@pytest.mark.max_queries(4)
+async def test_project_details_query_count_does_not_grow_with_members(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    project: Project,
+):
+    response = await client.get(f"/v1/projects/{project.id}", headers=auth_headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.json()["members"]) == MEMBERS_COUNT
+
+
+@pytest.mark.asyncio
+# User, project access, then the dataset with its creator
+@pytest.mark.max_queries(3)
+async def test_dataset_details_loads_creator(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    session: AsyncSession,
+    user: User,
+    project: Project,
+):
+    dataset = Dataset(
+        display_name="Media performance",
+        kpi_type=KpiType.REVENUE,
+        project_id=project.id,
+        created_by=user.id,
+        blob_path="datasets/media.csv",
+    )
+    session.add(dataset)
+    await session.commit()
+
+    response = await client.get(
+        f"/v1/projects/{project.id}/datasets/{dataset.id}",
+        headers=auth_headers,
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["createdBy"]["id"] == user.id
+
+
+@pytest.mark.asyncio
+async def test_dataset_details_of_another_project(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    session: AsyncSession,
+    user: User,
+    project: Project,
+):
+    other_project = Project(name="Other project", owner_id=user.id)
+    session.add(other_project)
+    await session.commit()
+    dataset = Dataset(
+        display_name="Media performance",
+        kpi_type=KpiType.REVENUE,
+        project_id=other_project.id,
+        created_by=user.id,
+        blob_path="datasets/media.csv",
+    )
+    session.add(dataset)
+    await session.commit()
+
+    response = await client.get(
+        f"/v1/projects/{project.id}/datasets/{dataset.id}",
+        headers=auth_headers,
+    )
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.asyncio
+@pytest.mark.max_queries(1)
+async def test_requests_over_query_budget_fail(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    project: Project,
+):
+    with pytest.raises(pytest.fail.Exception, match="N\\+1"):
+        await client.get(f"/v1/projects/{project.id}", headers=auth_headers)
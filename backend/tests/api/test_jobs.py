@@ -0,0 +1,107 @@
+import pytest
+import pytest_asyncio
+from fastapi import status
+from httpx import AsyncClient
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.lib.gcp import get_bucket
+from app.lib.model_serving import get_served_blob_name
+from app.models import Blob, Dataset, Job, Model, Pipeline, Project, User
+from app.models.enums import JobStatus, KpiType
+
+PARAMS = {"prior": {"n_draws": 10}, "posterior": {"n_chains": 2}, "seed": 42}
+
+
+@pytest_asyncio.fixture
+async def project(session: AsyncSession, user: User) -> Project:
+    project = Project(name="Jobs project", owner_id=user.id)
+    session.add(project)
+    await session.commit()
+    return project
+
+
+@pytest_asyncio.fixture
+async def pipeline(session: AsyncSession, user: User, project: Project) -> Pipeline:
+    dataset = Dataset(
+        display_name="Sales",
+        kpi_type=KpiType.REVENUE,
+        project_id=project.id,
+        created_by=user.id,
+        blob_path=f"{project.id}/datasets/abc.csv",
+    )
+    pipeline = Pipeline(
+        display_name="Pipeline",
+        project_id=project.id,
+        dataset_id=dataset.id,
+        model_spec={},
+        columns={"time": "time", "geo": "geo", "kpi": "revenue", "population": "pop"},
+    )
+    blob = Blob(path=dataset.blob_path, sha256="abc", ref_count=1)
+    session.add_all([dataset, pipeline, blob])
+    await session.commit()
+    return pipeline
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("storage_emulator")
+async def test_submit_job_reuses_cached_models(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    session: AsyncSession,
+    project: Project,
+    pipeline: Pipeline,
+):
+    url = f"/v1/projects/{project.id}/pipelines/{pipeline.id}/jobs"
+
+    response = await client.post(url, json=PARAMS, headers=auth_headers)
+
+    assert response.status_code == status.HTTP_201_CREATED, response.text
+    first = response.json()
+    assert (first["status"], first["cacheHit"], first["modelId"]) == (
+        "pending",
+        False,
+        None,
+    )
+    job = await session.get(Job, first["id"])
+    assert job.fingerprint is not None
+
+    # Trained by a worker
+    model = Model(
+        job_id=job.id,
+        uri=f"{project.id}/models/{job.id}.pkl",
+        fingerprint=job.fingerprint,
+    )
+    session.add(model)
+    await session.commit()
+    get_bucket().blob(model.uri).upload_from_string(b"model")
+    get_bucket().blob(get_served_blob_name(model.uri)).upload_from_string(b"served")
+
+    # Running on more processes trains the same model
+    params = {**PARAMS, "posterior": {"n_chains": 2, "n_processes": 2}}
+    response = await client.post(url, json=params, headers=auth_headers)
+
+    assert response.status_code == status.HTTP_201_CREATED, response.text
+    second = response.json()
+    assert (second["status"], second["cacheHit"], second["modelId"]) == (
+        "completed",
+        True,
+        model.id,
+    )
+    pending = await session.exec(select(Job).where(Job.status == JobStatus.PENDING))
+    assert [job.id for job in pending] == [first["id"]]
+
+
+@pytest.mark.asyncio
+async def test_submit_job_of_unknown_pipeline(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    project: Project,
+):
+    response = await client.post(
+        f"/v1/projects/{project.id}/pipelines/unknown/jobs",
+        json=PARAMS,
+        headers=auth_headers,
+    )
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
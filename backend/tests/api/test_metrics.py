@@ -0,0 +1,97 @@
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.settings import settings
+from app.models import Job
+
+
+@pytest.mark.asyncio
+async def test_db_pool_metrics_requires_api_key(client: AsyncClient):
+    response = await client.get("/metrics/db-pool")
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    response = await client.get(
+        "/metrics/db-pool",
+        headers={settings.API_KEY_HEADER: "wrong-key"},
+    )
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.asyncio
+async def test_db_pool_metrics(client: AsyncClient):
+    response = await client.get(
+        "/metrics/db-pool",
+        headers={
+            settings.API_KEY_HEADER: settings.ml_api_secret_api_key.get_secret_value(),
+        },
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    result = response.json()
+    assert result["pool_class"] == "InstrumentedAsyncAdaptedQueuePool"
+    assert result["size"] == settings.DB_POOL_SIZE
+    assert result["checkout_timeouts"] == 0
+    assert "+Inf" in result["wait_time"]["buckets"]
+
+
+@pytest.mark.asyncio
+async def test_storage_executor_metrics(client: AsyncClient):
+    response = await client.get(
+        "/metrics/storage-executor",
+        headers={
+            settings.API_KEY_HEADER: settings.ml_api_secret_api_key.get_secret_value(),
+        },
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    result = response.json()
+    assert result["name"] == "gcs"
+    assert result["max_workers"] == settings.GCS_EXECUTOR_MAX_WORKERS
+    assert "+Inf" in result["queue_time"]["buckets"]
+
+
+@pytest.mark.asyncio
+async def test_model_cache_metrics(client: AsyncClient):
+    response = await client.get(
+        "/metrics/model-cache",
+        headers={
+            settings.API_KEY_HEADER: settings.ml_api_secret_api_key.get_secret_value(),
+        },
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    result = response.json()
+    assert result["max_bytes"] == settings.MODEL_CACHE_MAX_BYTES
+    assert "coalesced" in result
+
+
+@pytest.mark.asyncio
+async def test_training_cache_metrics(client: AsyncClient, session: AsyncSession):
+    params = {"prior": {}, "posterior": {}}
+    session.add_all(
+        [
+            Job(pipeline_id="pipeline", params=params),
+            Job(pipeline_id="pipeline", params=params, fingerprint="a"),
+            Job(pipeline_id="pipeline", params=params, fingerprint="a", cache_hit=True),
+            Job(pipeline_id="pipeline", params=params, fingerprint="a", cache_hit=True),
+            Job(pipeline_id="pipeline", params=params, fingerprint="b"),
+        ],
+    )
+    await session.commit()
+
+    response = await client.get(
+        "/metrics/training-cache",
+        headers={
+            settings.API_KEY_HEADER: settings.ml_api_secret_api_key.get_secret_value(),
+        },
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {
+        "lookups": 4,
+        "hits": 2,
+        "uncacheable": 1,
+        "hit_rate": 0.5,
+    }
@@ -0,0 +1,306 @@
+import io
+
+import numpy as np
+import pytest
+import pytest_asyncio
+from fastapi import status
+from httpx import AsyncClient
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.lib import model_serving
+from app.lib.gcp import get_bucket
+from app.lib.model_serving import (
+    SPEND_MULTIPLIERS,
+    ServedModel,
+    get_served_blob_name,
+    load_served_model,
+    model_cache,
+)
+from app.models import Dataset, Job, Membership, Model, Pipeline, Project, User
+from app.models.enums import KpiType, UserRole
+from app.services import AuthService
+
+
+@pytest.fixture(autouse=True)
+def clear_model_cache() -> None:
+    model_cache.clear()
+
+
+def _served_model() -> ServedModel:
+    """Model of two channels with linear responses, of ROI 2 (tv) and 1 (search)."""
+    roi = np.stack([np.linspace(0, 2, 101), np.linspace(1, 3, 101)], axis=1)
+    spend = np.array([100.0, 50.0])
+    scale = np.linspace(0.5, 1.5, 101)
+    response = (
+        np.array([2.0, 1.0])[:, None, None]
+        * spend[:, None, None]
+        * SPEND_MULTIPLIERS[None, :, None]
+        * scale[None, None, :]
+    )
+    return ServedModel(
+        channels=("tv", "search"),
+        roi=roi,
+        spend=spend,
+        response=response,
+        baseline=np.full(101, 1000.0),
+    )
+
+
+def _upload_served_model(uri: str, multipliers: np.ndarray) -> ServedModel:
+    """Store the served arrays of a model, like the worker which trained it."""
+    served = _served_model()
+    buffer = io.BytesIO()
+    np.savez(
+        buffer,
+        channels=np.array(served.channels),
+        multipliers=multipliers,
+        roi=served.roi,
+        spend=served.spend,
+        response=served.response,
+        baseline=served.baseline,
+    )
+    get_bucket().blob(get_served_blob_name(uri)).upload_from_string(
+        buffer.getvalue(),
+    )
+    return served
+
+
+@pytest.mark.usefixtures("storage_emulator")
+def test_load_served_model():
+    uri = "project/models/job.pkl"
+    served = _upload_served_model(uri, SPEND_MULTIPLIERS)
+
+    loaded = load_served_model(uri)
+
+    assert loaded.channels == served.channels
+    np.testing.assert_array_equal(loaded.response, served.response)
+    np.testing.assert_array_equal(loaded.baseline, served.baseline)
+    assert loaded.nbytes == served.nbytes
+
+    _upload_served_model(uri, SPEND_MULTIPLIERS[::2])
+    with pytest.raises(ValueError, match="unsupported spend multipliers"):
+        load_served_model(uri)
+
+
+@pytest.fixture
+def loads(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Replace the loading of the pickled models, recording the loaded URIs."""
+    uris: list[str] = []
+
+    def _load(uri: str) -> ServedModel:
+        uris.append(uri)
+        return _served_model()
+
+    monkeypatch.setattr(model_serving, "load_served_model", _load)
+    return uris
+
+
+@pytest_asyncio.fixture
+async def project(session: AsyncSession, user: User) -> Project:
+    project = Project(name="Models project", owner_id=user.id)
+    session.add(project)
+    await session.commit()
+    return project
+
+
+@pytest_asyncio.fixture
+async def model(session: AsyncSession, user: User, project: Project) -> Model:
+    dataset = Dataset(
+        display_name="Sales",
+        kpi_type=KpiType.NON_REVENUE,
+        project_id=project.id,
+        created_by=user.id,
+        blob_path=f"{project.id}/datasets/sales.csv",
+    )
+    pipeline = Pipeline(
+        display_name="Pipeline",
+        project_id=project.id,
+        dataset_id=dataset.id,
+        model_spec={},
+        columns={},
+    )
+    job = Job(pipeline_id=pipeline.id, params={"prior": {}, "posterior": {}})
+    model = Model(job_id=job.id, uri=f"{project.id}/models/{job.id}.pkl")
+    session.add_all([dataset, pipeline, job, model])
+    await session.commit()
+    return model
+
+
+@pytest.mark.asyncio
+async def test_list_and_get_models(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    project: Project,
+    model: Model,
+):
+    url = f"/v1/projects/{project.id}/models"
+    response = await client.get(url, headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert [item["id"] for item in response.json()] == [model.id]
+
+    response = await client.get(f"{url}/{model.id}", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert response.json()["jobId"] == model.job_id
+    assert response.json()["deployed"] is False
+
+    response = await client.get(f"{url}/unknown", headers=auth_headers)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_roi_of_undeployed_model_is_not_served(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    project: Project,
+    model: Model,
+    loads: list[str],
+):
+    response = await client.get(
+        f"/v1/projects/{project.id}/models/{model.id}/roi",
+        headers=auth_headers,
+    )
+
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert loads == []
+
+
+@pytest.mark.asyncio
+async def test_deployed_model_is_loaded_once(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    project: Project,
+    model: Model,
+    loads: list[str],
+):
+    url = f"/v1/projects/{project.id}/models/{model.id}"
+    response = await client.patch(url, json={"deployed": True}, headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert response.json()["deployed"] is True
+
+    for _ in range(3):
+        response = await client.get(f"{url}/roi", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK, response.text
+    assert loads == [model.uri]
+    tv, search = response.json()
+    assert tv["channel"] == "tv"
+    assert tv["mean"] == pytest.approx(1.0)
+    assert tv["ciLower"] == pytest.approx(0.1)
+    assert search["median"] == pytest.approx(2.0)
+    assert search["ciUpper"] == pytest.approx(2.9)
+
+    # Undeploying a model evicts it
+    response = await client.patch(url, json={"deployed": False}, headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert model_cache.stats().size == 0
+    response = await client.get(f"{url}/roi", headers=auth_headers)
+    assert response.status_code == status.HTTP_409_CONFLICT
+
+
+@pytest.mark.asyncio
+async def test_viewer_cannot_deploy_a_model(
+    client: AsyncClient,
+    session: AsyncSession,
+    project: Project,
+    model: Model,
+):
+    viewer = User(
+        email="viewer@example.com",
+        username="viewer",
+        first_name="Jane",
+        last_name="Doe",
+        hashed_password="not-a-real-hash",
+    )
+    session.add(viewer)
+    await session.commit()
+    session.add(
+        Membership(
+            project_id=project.id,
+            user_id=viewer.id,
+            role=UserRole.VIEWER,
+            invited_by=project.owner_id,
+        ),
+    )
+    await session.commit()
+    token = AuthService.create_access_token({"sub": viewer.id, "email": viewer.email})
+
+    response = await client.patch(
+        f"/v1/projects/{project.id}/models/{model.id}",
+        json={"deployed": True},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    await session.refresh(model)
+    assert model.deployed is False
+
+
+@pytest.mark.asyncio
+async def test_evaluate_scenarios(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    project: Project,
+    model: Model,
+    loads: list[str],
+):
+    url = f"/v1/projects/{project.id}/models/{model.id}/scenarios"
+    batch = {
+        "scenarios": [
+            {"name": "current"},
+            {"name": "more tv", "spend": {"tv": 125.0}},
+            {"name": "no media", "spend": {"tv": 0.0, "search": 0.0}},
+        ],
+    }
+
+    # Not deployed yet
+    response = await client.post(url, json=batch, headers=auth_headers)
+    assert response.status_code == status.HTTP_409_CONFLICT
+
+    response = await client.patch(
+        f"/v1/projects/{project.id}/models/{model.id}",
+        json={"deployed": True},
+        headers=auth_headers,
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+    response = await client.post(url, json=batch, headers=auth_headers)
+
+    assert response.status_code == status.HTTP_200_OK, response.text
+    current, more_tv, no_media = response.json()
+    assert current["spend"] == {"tv": 100.0, "search": 50.0}
+    assert current["kpi"]["mean"] == pytest.approx(1250.0)
+    assert current["roi"]["mean"] == pytest.approx(250.0 / 150.0)
+    # Interpolated between the served multipliers
+    assert more_tv["kpi"]["mean"] == pytest.approx(1300.0)
+    assert more_tv["kpi"]["ciLower"] == pytest.approx(1000.0 + 300.0 * 0.55)
+    assert more_tv["roi"]["median"] == pytest.approx(300.0 / 175.0)
+    assert no_media["name"] == "no media"
+    assert no_media["kpi"]["mean"] == pytest.approx(1000.0)
+    assert no_media["roi"] is None
+    assert loads == [model.uri]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "spend",
+    [{"radio": 10.0}, {"tv": 301.0}],
+    ids=["unknown channel", "spend too high"],
+)
+async def test_evaluate_invalid_scenarios(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    session: AsyncSession,
+    project: Project,
+    model: Model,
+    loads: list[str],
+    spend: dict[str, float],
+):
+    model.deployed = True
+    session.add(model)
+    await session.commit()
+
+    response = await client.post(
+        f"/v1/projects/{project.id}/models/{model.id}/scenarios",
+        json={"scenarios": [{"spend": spend}]},
+        headers=auth_headers,
+    )
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
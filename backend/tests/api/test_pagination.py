@@ -0,0 +1,156 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from fastapi import status
+from httpx import AsyncClient
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import Dataset, Membership, Project, User
+from app.models.enums import KpiType
+
+NOW = datetime(2025, 7, 1, tzinfo=UTC)
+
+
+@pytest_asyncio.fixture
+async def project(session: AsyncSession, user: User) -> Project:
+    project = Project(name="Paginated project", owner_id=user.id)
+    session.add(project)
+    await session.commit()
+    return project
+
+
+@pytest_asyncio.fixture
+async def datasets(
+    session: AsyncSession,
+    user: User,
+    project: Project,
+) -> list[Dataset]:
+    """Create datasets, two of them sharing the same creation date."""
+    offsets = [0, 1, 1, 2, 3]
+    datasets = [
+        Dataset(
+            display_name=f"Dataset {i}",
+            kpi_type=KpiType.REVENUE,
+            project_id=project.id,
+            created_by=user.id,
+            blob_path=f"datasets/{i}.csv",
+            created_at=NOW + timedelta(minutes=offset),
+        )
+        for i, offset in enumerate(offsets)
+    ]
+    session.add_all(datasets)
+    await session.commit()
+    # Most recent first, ties broken by ID
+    return sorted(datasets, key=lambda d: (d.created_at, d.id), reverse=True)
+
+
+@pytest.mark.asyncio
+async def test_list_datasets_with_cursor(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    project: Project,
+    datasets: list[Dataset],
+):
+    url = f"/v1/projects/{project.id}/datasets"
+    params: dict[str, str | int] = {"limit": 2}
+    pages = []
+    while True:
+        response = await client.get(url, params=params, headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        pages.append([dataset["id"] for dataset in response.json()])
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            assert "Link" not in response.headers
+            break
+        assert f"cursor={cursor}" in response.headers["Link"]
+        params["cursor"] = cursor
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert [id_ for page in pages for id_ in page] == [d.id for d in datasets]
+
+
+@pytest.mark.asyncio
+async def test_list_datasets_with_deprecated_offset(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    project: Project,
+    datasets: list[Dataset],
+):
+    response = await client.get(
+        f"/v1/projects/{project.id}/datasets",
+        params={"limit": 2, "offset": 2},
+        headers=auth_headers,
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [dataset["id"] for dataset in response.json()] == [
+        dataset.id for dataset in datasets[2:4]
+    ]
+    # The next page can be fetched with a cursor
+    assert "X-Next-Cursor" in response.headers
+
+
+@pytest.mark.asyncio
+async def test_list_datasets_with_invalid_cursor(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    project: Project,
+):
+    response = await client.get(
+        f"/v1/projects/{project.id}/datasets",
+        params={"cursor": "invalid"},
+        headers=auth_headers,
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_list_projects_with_cursor(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    session: AsyncSession,
+    user: User,
+):
+    owner = User(
+        email="owner@example.com",
+        username="owner",
+        first_name="Jane",
+        last_name="Doe",
+        hashed_password="not-a-real-hash",
+    )
+    session.add(owner)
+    await session.commit()
+    projects = [
+        Project(
+            name=f"Project {i}",
+            owner_id=owner.id,
+            created_at=NOW + timedelta(minutes=i),
+        )
+        for i in range(3)
+    ]
+    session.add_all(projects)
+    await session.commit()
+    session.add_all(
+        Membership(project_id=project.id, user_id=user.id, invited_by=owner.id)
+        for project in projects
+    )
+    await session.commit()
+
+    response = await client.get(
+        "/v1/projects",
+        params={"limit": 2},
+        headers=auth_headers,
+    )
+    first_page = [project["name"] for project in response.json()]
+    response = await client.get(
+        "/v1/projects",
+        params={"limit": 2, "cursor": response.headers["X-Next-Cursor"]},
+        headers=auth_headers,
+    )
+    second_page = [project["name"] for project in response.json()]
+
+    assert first_page == ["Project 2", "Project 1"]
+    assert second_page == ["Project 0"]
+    assert "X-Next-Cursor" not in response.headers
@@ -0,0 +1,127 @@
+import pytest
+import pytest_asyncio
+from fastapi import status
+from httpx import AsyncClient
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import Membership, Project, User
+from app.models.enums import UserRole
+from app.services import AuthService
+from tests.conftest import QueryCounter
+
+
+@pytest_asyncio.fixture
+async def project(session: AsyncSession, user: User) -> Project:
+    project = Project(name="Shared project", owner_id=user.id)
+    session.add(project)
+    await session.commit()
+    return project
+
+
+async def _member_headers(
+    session: AsyncSession,
+    project: Project,
+    role: UserRole | None,
+) -> dict[str, str]:
+    """Create a user with the given role on the project (None for no access)."""
+    member = User(
+        email=f"{role}@example.com",
+        username=f"member-{role}",
+        first_name="Jane",
+        last_name="Doe",
+        hashed_password="not-a-real-hash",
+    )
+    session.add(member)
+    await session.commit()
+    if role:
+        session.add(
+            Membership(
+                project_id=project.id,
+                user_id=member.id,
+                role=role,
+                invited_by=project.owner_id,
+            ),
+        )
+        await session.commit()
+
+    token = AuthService.create_access_token({"sub": member.id, "email": member.email})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("role", "expected_status"),
+    [
+        (UserRole.VIEWER, status.HTTP_200_OK),
+        (UserRole.EDITOR, status.HTTP_200_OK),
+        (None, status.HTTP_403_FORBIDDEN),
+    ],
+)
+async def test_project_access_by_role(
+    client: AsyncClient,
+    session: AsyncSession,
+    project: Project,
+    role: UserRole | None,
+    expected_status: int,
+):
+    headers = await _member_headers(session, project, role)
+
+    response = await client.get(f"/v1/projects/{project.id}/datasets", headers=headers)
+
+    assert response.status_code == expected_status
+
+
+@pytest.mark.asyncio
+async def test_delete_project_requires_admin(
+    client: AsyncClient,
+    session: AsyncSession,
+    project: Project,
+):
+    headers = await _member_headers(session, project, UserRole.EDITOR)
+
+    response = await client.delete(f"/v1/projects/{project.id}", headers=headers)
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.asyncio
+async def test_project_access_is_resolved_with_one_query(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    project: Project,
+    query_counter: QueryCounter,
+):
+    # Warm the authenticated users cache
+    await client.get("/v1/me", headers=auth_headers)
+    query_counter.reset()
+
+    response = await client.get(
+        f"/v1/projects/{project.id}/datasets",
+        headers=auth_headers,
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    # Project and membership, then the datasets
+    assert query_counter.count == 2, query_counter.statements
+
+
+@pytest.mark.asyncio
+async def test_require_project_admin_shares_the_resolved_access(
+    client: AsyncClient,
+    session: AsyncSession,
+    project: Project,
+    query_counter: QueryCounter,
+):
+    headers = await _member_headers(session, project, UserRole.ADMIN)
+    await client.get("/v1/me", headers=headers)
+    query_counter.reset()
+
+    response = await client.delete(f"/v1/projects/{project.id}", headers=headers)
+
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    access_queries = [
+        statement
+        for statement in query_counter.statements
+        if statement.lstrip().startswith("SELECT") and "JOIN memberships" in statement
+    ]
+    assert len(access_queries) == 1
@@ -0,0 +1,106 @@
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import Membership, Project, User
+
+
+@pytest.mark.asyncio
+async def test_me_requires_token(client: AsyncClient):
+    response = await client.get("/v1/me")
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.asyncio
+async def test_me(client: AsyncClient, auth_headers: dict[str, str], user):
+    response = await client.get("/v1/me", headers=auth_headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["id"] == user.id
+
+
+@pytest.mark.asyncio
+async def test_create_and_get_project(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    user,
+):
+    response = await client.post(
+        "/v1/projects",
+        json={"name": "My MMM project"},
+        headers=auth_headers,
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    project_id = response.json()["id"]
+
+    response = await client.get(f"/v1/projects/{project_id}", headers=auth_headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    result = response.json()
+    assert result["name"] == "My MMM project"
+    assert result["owner"]["id"] == user.id
+    assert result["members"] == []
+
+
+@pytest.mark.asyncio
+async def test_get_unknown_project(client: AsyncClient, auth_headers: dict[str, str]):
+    response = await client.get("/v1/projects/unknown", headers=auth_headers)
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_delete_project(client: AsyncClient, auth_headers: dict[str, str]):
+    response = await client.post(
+        "/v1/projects",
+        json={"name": "Project to delete"},
+        headers=auth_headers,
+    )
+    project_id = response.json()["id"]
+
+    response = await client.delete(f"/v1/projects/{project_id}", headers=auth_headers)
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    response = await client.get(f"/v1/projects/{project_id}", headers=auth_headers)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_list_projects_owned_and_shared(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    session: AsyncSession,
+    user: User,
+):
+    other = User(
+        email="jane.doe@example.com",
+        username="janedoe",
+        first_name="Jane",
+        last_name="Doe",
+        hashed_password="not-a-real-hash",
+    )
+    session.add(other)
+    await session.commit()
+    owned = Project(name="Owned without members", owner_id=user.id)
+    shared = Project(name="Owned with members", owner_id=user.id)
+    member_of = Project(name="Shared with the user", owner_id=other.id)
+    not_shared = Project(name="Not shared", owner_id=other.id)
+    session.add_all([owned, shared, member_of, not_shared])
+    await session.commit()
+    session.add_all(
+        [
+            Membership(project_id=shared.id, user_id=other.id, invited_by=user.id),
+            Membership(project_id=shared.id, user_id=user.id, invited_by=user.id),
+            Membership(project_id=member_of.id, user_id=user.id, invited_by=other.id),
+        ],
+    )
+    await session.commit()
+
+    response = await client.get("/v1/projects", headers=auth_headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert sorted(project["id"] for project in response.json()) == sorted(
+        [owned.id, shared.id, member_of.id],
+    )
@@ -0,0 +1,254 @@
+"""Shared fixtures for the API test suite.
+
+Tests run against an in-memory SQLite database through aiosqlite, so the
+async session path used by the routes is exercised without a Postgres server.
+
+Requests sent with the `client` fixture fail when they execute more SQL
+statements than `max_queries_per_request` (see `pyproject.toml`), which
+catches N+1 queries. Use `@pytest.mark.max_queries(n)` to set a tighter or
+looser budget for a test.
+
+Tests using the `storage_emulator` fixture run against `gcp-storage-emulator`,
+whose bucket is the `BUCKET_NAME` setting.
+"""
+
+import os
+import socket
+import subprocess
+import sys
+import time
+from collections.abc import AsyncGenerator, Generator
+from typing import Any
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient, Request, Response
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.db import get_async_session
+from app.core.settings import settings
+from app.lib.gcp import get_bucket, get_storage_client
+from app.main import app
+from app.models import User
+from app.services import AuthService
+from app.services.user import user_cache
+
+EMULATOR_BUCKET = settings.BUCKET_NAME
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("localhost", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture(scope="session")
+def storage_emulator() -> Generator[str, None, None]:
+    """Run the storage emulator in a separate process.
+
+    Yields:
+        The emulator host, also set in `STORAGE_EMULATOR_HOST`.
+
+    """
+    port = _free_port()
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "gcp_storage_emulator",
+            "start",
+            "--port",
+            str(port),
+            "--in-memory",
+            "--default-bucket",
+            EMULATOR_BUCKET,
+            "--quiet",
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 10
+    while True:
+        try:
+            socket.create_connection(("localhost", port), timeout=0.1).close()
+            break
+        except OSError:
+            if time.monotonic() > deadline:
+                process.kill()
+                pytest.fail("The storage emulator did not start")
+            time.sleep(0.1)
+
+    host = f"http://localhost:{port}"
+    previous_host = os.environ.get("STORAGE_EMULATOR_HOST")
+    os.environ["STORAGE_EMULATOR_HOST"] = host
+    get_storage_client.cache_clear()
+    get_bucket.cache_clear()
+    yield host
+
+    process.terminate()
+    process.wait()
+    if previous_host is None:
+        del os.environ["STORAGE_EMULATOR_HOST"]
+    else:
+        os.environ["STORAGE_EMULATOR_HOST"] = previous_host
+    get_storage_client.cache_clear()
+    get_bucket.cache_clear()
+
+
+class QueryCounter:
+    """Record the SQL statements sent to the database."""
+
+    def __init__(self) -> None:
+        self.statements: list[str] = []
+
+    def __call__(self, *args: Any) -> None:
+        # before_cursor_execute(conn, cursor, statement, parameters, context, many)
+        self.statements.append(args[2])
+
+    @property
+    def count(self) -> int:
+        """Number of statements executed since the last reset."""
+        return len(self.statements)
+
+    def reset(self) -> None:
+        """Forget the statements recorded so far."""
+        self.statements.clear()
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addini(
+        "max_queries_per_request",
+        "Maximum number of SQL statements a test API request may execute",
+        default="10",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line(
+        "markers",
+        "max_queries(n): maximum number of SQL statements per API request",
+    )
+
+
+class QueryBudgetTransport(ASGITransport):
+    """ASGI transport failing requests that execute too many SQL statements."""
+
+    def __init__(self, counter: QueryCounter, max_queries: int, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.counter = counter
+        self.max_queries = max_queries
+
+    async def handle_async_request(self, request: Request) -> Response:
+        self.counter.reset()
+        response = await super().handle_async_request(request)
+        if self.counter.count > self.max_queries:
+            statements = "\n\n".join(self.counter.statements)
+            pytest.fail(
+                f"{request.method} {request.url.path} executed "
+                f"{self.counter.count} SQL statements (max {self.max_queries}), "
+                f"check for N+1 queries:\n\n{statements}",
+            )
+        return response
+
+
+@pytest.fixture(autouse=True)
+def clear_user_cache() -> None:
+    """Start each test with an empty authenticated users cache."""
+    user_cache.clear()
+
+
+@pytest_asyncio.fixture
+async def db_engine() -> AsyncGenerator[AsyncEngine, None]:
+    """Create an in-memory database with all tables."""
+    engine = create_async_engine(
+        "sqlite+aiosqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as connection:
+        await connection.run_sync(SQLModel.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def query_counter(db_engine: AsyncEngine) -> Generator[QueryCounter, None, None]:
+    """Count the statements executed on the test database."""
+    counter = QueryCounter()
+    event.listen(db_engine.sync_engine, "before_cursor_execute", counter)
+    yield counter
+    event.remove(db_engine.sync_engine, "before_cursor_execute", counter)
+
+
+@pytest_asyncio.fixture
+async def session(db_engine: AsyncEngine) -> AsyncGenerator[AsyncSession, None]:
+    """Get an async session bound to the test database."""
+    factory = async_sessionmaker(
+        db_engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+    )
+    async with factory() as session:
+        yield session
+
+
+@pytest_asyncio.fixture
+async def client(
+    db_engine: AsyncEngine,
+    request: pytest.FixtureRequest,
+) -> AsyncGenerator[AsyncClient, None]:
+    """Get an HTTP client for the app, using the test database."""
+    factory = async_sessionmaker(
+        db_engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+    )
+
+    async def _get_test_session() -> AsyncGenerator[AsyncSession, None]:
+        async with factory() as session:
+            yield session
+
+    marker = request.node.get_closest_marker("max_queries")
+    max_queries = (
+        marker.args[0]
+        if marker
+        else int(request.config.getini("max_queries_per_request"))
+    )
+    counter = QueryCounter()
+    event.listen(db_engine.sync_engine, "before_cursor_execute", counter)
+
+    app.dependency_overrides[get_async_session] = _get_test_session
+    async with AsyncClient(
+        transport=QueryBudgetTransport(counter, max_queries, app=app),
+        base_url="http://test",
+    ) as client:
+        yield client
+    app.dependency_overrides.clear()
+    event.remove(db_engine.sync_engine, "before_cursor_execute", counter)
+
+
+@pytest_asyncio.fixture
+async def user(session: AsyncSession) -> User:
+    """Create a user in the test database."""
+    user = User(
+        email="john.doe@example.com",
+        username="johndoe",
+        first_name="John",
+        last_name="Doe",
+        hashed_password="not-a-real-hash",
+    )
+    session.add(user)
+    await session.commit()
+    await session.refresh(user)
+    return user
+
+
+@pytest_asyncio.fixture
+async def auth_headers(user: User) -> dict[str, str]:
+    """Get authorization headers for the test user."""
+    token = AuthService.create_access_token({"sub": user.id, "email": user.email})
+    return {"Authorization": f"Bearer {token}"}
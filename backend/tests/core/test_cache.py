@@ -0,0 +1,158 @@
+"""Tests for the in-process TTL/LRU cache."""
+
+import asyncio
+
+import pytest
+
+from app.core.cache import SizedLRUCache, TTLCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_cache_hit_and_miss():
+    cache: TTLCache[str, int] = TTLCache(max_size=10, ttl_seconds=60)
+
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+
+    stats = cache.stats()
+    assert stats.hits == 1
+    assert stats.misses == 1
+    assert stats.hit_rate == 0.5
+
+
+def test_cache_entries_expire():
+    clock = FakeClock()
+    cache: TTLCache[str, int] = TTLCache(max_size=10, ttl_seconds=60, timer=clock)
+    cache.set("a", 1)
+
+    clock.now = 59
+    assert cache.get("a") == 1
+    clock.now = 60
+    assert cache.get("a") is None
+    assert cache.stats().size == 0
+
+
+def test_cache_evicts_least_recently_used():
+    cache: TTLCache[str, int] = TTLCache(max_size=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats().evictions == 1
+
+
+def test_cache_invalidate():
+    cache: TTLCache[str, int] = TTLCache(max_size=10, ttl_seconds=60)
+    cache.set("a", 1)
+
+    cache.invalidate("a")
+    cache.invalidate("unknown")
+
+    assert cache.get("a") is None
+    assert cache.stats().invalidations == 1
+
+
+def test_cache_disabled():
+    cache: TTLCache[str, int] = TTLCache(max_size=0, ttl_seconds=60)
+    cache.set("a", 1)
+
+    assert cache.get("a") is None
+
+
+def test_sized_cache_evicts_least_recently_used_beyond_budget():
+    cache: SizedLRUCache[str, int] = SizedLRUCache(max_bytes=100)
+    cache.set("a", 1, size=40)
+    cache.set("b", 2, size=40)
+    cache.get("a")
+    cache.set("c", 3, size=40)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    stats = cache.stats()
+    assert stats.total_bytes == 80
+    assert stats.evictions == 1
+
+
+def test_sized_cache_skips_entries_larger_than_budget():
+    cache: SizedLRUCache[str, int] = SizedLRUCache(max_bytes=100)
+    cache.set("a", 1, size=40)
+    cache.set("b", 2, size=101)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats().evictions == 0
+
+
+@pytest.mark.asyncio
+async def test_sized_cache_coalesces_concurrent_loads():
+    cache: SizedLRUCache[str, int] = SizedLRUCache(max_bytes=100)
+    released = asyncio.Event()
+    loads = 0
+
+    async def _load() -> tuple[int, int]:
+        nonlocal loads
+        loads += 1
+        await released.wait()
+        return 1, 10
+
+    lookups = [asyncio.create_task(cache.get_or_load("a", _load)) for _ in range(5)]
+    await asyncio.sleep(0)
+    released.set()
+
+    assert await asyncio.gather(*lookups) == [1] * 5
+    assert await cache.get_or_load("a", _load) == 1
+    assert loads == 1
+    stats = cache.stats()
+    assert stats.loads == 1
+    assert stats.coalesced == 4
+    assert stats.total_bytes == 10
+
+
+@pytest.mark.asyncio
+async def test_sized_cache_does_not_cache_failed_loads():
+    cache: SizedLRUCache[str, int] = SizedLRUCache(max_bytes=100)
+
+    async def _fail() -> tuple[int, int]:
+        raise RuntimeError("unavailable")
+
+    async def _load() -> tuple[int, int]:
+        return 1, 10
+
+    with pytest.raises(RuntimeError, match="unavailable"):
+        await cache.get_or_load("a", _fail)
+    assert await cache.get_or_load("a", _load) == 1
+    assert cache.stats().loads == 1
+
+
+@pytest.mark.asyncio
+async def test_sized_cache_does_not_cache_loads_invalidated_meanwhile():
+    cache: SizedLRUCache[str, int] = SizedLRUCache(max_bytes=100)
+    released = asyncio.Event()
+
+    async def _load() -> tuple[int, int]:
+        await released.wait()
+        return 1, 10
+
+    lookup = asyncio.create_task(cache.get_or_load("a", _load))
+    await asyncio.sleep(0)
+    cache.invalidate("a")
+    released.set()
+
+    assert await lookup == 1
+    assert cache.get("a") is None
+    assert cache.stats().total_bytes == 0
+    assert await cache.get_or_load("a", _load) == 1
+    assert cache.get("a") == 1
@@ -0,0 +1,85 @@
+"""Tests for the database engines and pool instrumentation."""
+
+import pytest
+from sqlalchemy import exc, text
+from sqlmodel import create_engine
+
+from app.core import db
+from app.core.db import (
+    InstrumentedAsyncAdaptedQueuePool,
+    InstrumentedNullPool,
+    InstrumentedQueuePool,
+    get_database_url,
+    get_engine_options,
+    get_pool_stats,
+)
+from app.core.settings import settings
+
+
+def test_get_database_url_drivers(monkeypatch):
+    monkeypatch.setattr(
+        settings,
+        "database_url",
+        settings.database_url.__class__("postgres://user:pw@host/db?sslmode=require"),
+    )
+
+    assert get_database_url() == "postgresql://user:pw@host/db?sslmode=require"
+    assert (
+        get_database_url(driver="postgresql+asyncpg")
+        == "postgresql+asyncpg://user:pw@host/db?ssl=require"
+    )
+
+
+def test_get_engine_options_from_settings(monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 20)
+    monkeypatch.setattr(settings, "DB_POOL_TIMEOUT", 2.5)
+
+    options = get_engine_options(is_async=True)
+
+    assert options["poolclass"] is InstrumentedAsyncAdaptedQueuePool
+    assert options["pool_size"] == 20
+    assert options["pool_timeout"] == 2.5
+    assert get_engine_options(is_async=False)["poolclass"] is InstrumentedQueuePool
+
+
+def test_get_engine_options_serverless(monkeypatch):
+    monkeypatch.setattr(settings, "DB_SERVERLESS", True)
+
+    options = get_engine_options(is_async=True)
+
+    assert options["poolclass"] is InstrumentedNullPool
+    assert "pool_size" not in options
+    assert options["connect_args"]["statement_cache_size"] == 0
+    assert "connect_args" not in get_engine_options(is_async=False)
+
+
+def test_pool_stats_record_checkouts_and_timeouts():
+    engine = create_engine(
+        "sqlite://",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.01,
+    )
+
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        stats = get_pool_stats(engine)
+        assert stats.checked_out == 1
+
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    stats = get_pool_stats(engine)
+    assert stats.checked_out == 0
+    assert stats.checkout_timeouts == 1
+    assert stats.wait_time is not None
+    assert stats.wait_time.count == 2
+
+    # Metrics survive the pool being recreated
+    engine.dispose()
+    assert get_pool_stats(engine).checkout_timeouts == 1
+
+
+def test_api_engine_is_instrumented():
+    assert isinstance(db.async_engine.pool, InstrumentedAsyncAdaptedQueuePool)
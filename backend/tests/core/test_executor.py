@@ -0,0 +1,64 @@
+"""Tests for the bounded executor of blocking calls."""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.core.executor import BlockingExecutor
+
+
+@pytest.mark.asyncio
+async def test_run_returns_result_and_raises():
+    executor = BlockingExecutor(name="test", max_workers=2)
+
+    assert await executor.run(pow, 2, exp=3) == 8
+    with pytest.raises(ZeroDivisionError):
+        await executor.run(divmod, 1, 0)
+
+    stats = executor.stats()
+    assert stats.completed == 2
+    assert stats.failed == 1
+    assert stats.run_time.count == 2
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_run_is_bounded_and_queues():
+    executor = BlockingExecutor(name="test", max_workers=2)
+    release = threading.Event()
+
+    tasks = [asyncio.create_task(executor.run(release.wait)) for _ in range(5)]
+    while executor.stats().running < 2:
+        await asyncio.sleep(0.01)
+
+    stats = executor.stats()
+    assert stats.running == 2
+    assert stats.queued == 3
+
+    release.set()
+    await asyncio.gather(*tasks)
+    stats = executor.stats()
+    assert (stats.running, stats.queued, stats.completed) == (0, 0, 5)
+    assert stats.queue_time.count == 5
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_call_leaves_the_queue():
+    executor = BlockingExecutor(name="test", max_workers=1)
+    release = threading.Event()
+
+    running = asyncio.create_task(executor.run(release.wait))
+    queued = asyncio.create_task(executor.run(release.wait))
+    while executor.stats().queued < 1 or executor.stats().running < 1:
+        await asyncio.sleep(0.01)
+
+    queued.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await queued
+    assert executor.stats().queued == 0
+
+    release.set()
+    await running
+    executor.shutdown()
@@ -0,0 +1,23 @@
+"""Tests for the in-process metrics collectors."""
+
+from app.core.metrics import Counter, Histogram
+
+
+def test_counter():
+    counter = Counter()
+    counter.inc()
+    counter.inc(2)
+
+    assert counter.value == 3
+
+
+def test_histogram_snapshot_is_cumulative():
+    histogram = Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value)
+
+    snapshot = histogram.snapshot()
+
+    assert snapshot.buckets == {"0.1": 2, "1": 3, "+Inf": 4}
+    assert snapshot.count == 4
+    assert snapshot.sum == 2.65
@@ -0,0 +1,25 @@
+"""Tests for keyset pagination cursors."""
+
+from datetime import UTC, datetime
+
+import pytest
+
+from app.core.exceptions import InvalidCursorError
+from app.core.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2025, 7, 1, 12, 30, tzinfo=UTC)
+
+    cursor = encode_cursor(created_at, "dataset-id")
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (created_at, "dataset-id")
+
+
+@pytest.mark.parametrize(
+    "cursor", ["not-a-cursor", "e30", "WyJub3QtYS1kYXRlIiwiaWQiXQ"]
+)
+def test_decode_invalid_cursor(cursor: str):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
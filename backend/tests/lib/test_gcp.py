@@ -0,0 +1,219 @@
+"""Tests for the GCP storage helpers."""
+
+import hashlib
+import io
+import json
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+from fastapi import UploadFile
+from google.api_core.exceptions import PreconditionFailed
+from starlette.datastructures import Headers
+
+from app.core.settings import settings
+from app.lib import gcp
+from app.lib.gcp import (
+    get_bucket,
+    hash_csv_file,
+    storage_executor,
+    upload_csv_to_blob,
+    upload_file_to_blob_composite,
+)
+from tests.conftest import EMULATOR_BUCKET
+
+BACKEND_DIR = Path(__file__).parents[2]
+MiB = 1024 * 1024
+
+
+def _csv_upload(content: bytes, filename: str = "sales.csv") -> UploadFile:
+    return UploadFile(
+        file=io.BytesIO(content),
+        size=len(content),
+        filename=filename,
+        headers=Headers({"content-type": "text/csv"}),
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("storage_emulator")
+async def test_upload_csv_to_blob():
+    content = b"date,geo,revenue\n2025-01-06,FR,1000\n"
+
+    file = _csv_upload(content)
+    blob = await hash_csv_file(file, "project/datasets/sales.csv")
+    created = await upload_csv_to_blob(file, blob, bucket_name=EMULATOR_BUCKET)
+
+    sha256 = hashlib.sha256(content).hexdigest()
+    assert blob.name == f"project/datasets/{sha256}.csv"
+    assert blob.sha256 == sha256
+    assert blob.size == len(content)
+    assert created
+    stored = get_bucket(EMULATOR_BUCKET).blob(blob.name)
+    assert stored.download_as_bytes() == content
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("storage_emulator")
+async def test_upload_file_to_blob_composite():
+    # More parts than a compose request takes, to compose by groups
+    content = b"".join(f"{i},FR,{i * 10}\n".encode() for i in range(10_000))
+    part_size = len(content) // 70 + 1
+
+    await upload_file_to_blob_composite(
+        "project/datasets/composite.csv",
+        _csv_upload(content),
+        bucket_name=EMULATOR_BUCKET,
+        content_type="text/csv",
+        part_size=part_size,
+        parallelism=3,
+    )
+
+    bucket = get_bucket(EMULATOR_BUCKET)
+    blob = bucket.get_blob("project/datasets/composite.csv")
+    assert blob.download_as_bytes() == content
+    assert blob.content_type == "text/csv"
+    leftovers = bucket.list_blobs(prefix="project/datasets/composite.csv.")
+    assert [blob.name for blob in leftovers] == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("storage_emulator")
+async def test_upload_csv_to_blob_composite_above_threshold(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    content = b"date,geo,revenue\n" + b"2025-01-06,FR,1000\n" * 1_000
+    monkeypatch.setattr(settings, "GCS_COMPOSITE_UPLOAD_THRESHOLD", 1024)
+    monkeypatch.setattr(settings, "GCS_COMPOSITE_PART_SIZE", 4096)
+    file = _csv_upload(content)
+    blob = await hash_csv_file(file, "project/datasets/sales.csv")
+    completed = storage_executor.completed.value
+
+    await upload_csv_to_blob(file, blob, bucket_name=EMULATOR_BUCKET)
+
+    stored = get_bucket(EMULATOR_BUCKET).blob(blob.name)
+    assert stored.download_as_bytes() == content
+    # 5 parts, a compose and a delete of the parts
+    assert storage_executor.completed.value == completed + 7
+
+
+# The emulator ignores preconditions: check the one sent and its failure
+@pytest.mark.asyncio
+async def test_upload_csv_to_blob_create_only_precondition(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    calls = []
+    monkeypatch.setattr(gcp, "upload_file_to_blob", lambda **kw: calls.append(kw))
+
+    file = _csv_upload(b"a\n1\n")
+    blob = await hash_csv_file(file, "project/datasets/sales.csv")
+
+    assert await upload_csv_to_blob(file, blob)
+    assert calls[0]["if_generation_match"] == 0
+
+
+@pytest.mark.asyncio
+async def test_upload_csv_to_blob_keeps_existing_content(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    def _upload(**_: object) -> None:
+        raise PreconditionFailed("At least one of the pre-conditions did not hold.")
+
+    monkeypatch.setattr(gcp, "upload_file_to_blob", _upload)
+
+    file = _csv_upload(b"a\n1\n")
+    blob = await hash_csv_file(file, "project/datasets/sales.csv")
+
+    assert not await upload_csv_to_blob(file, blob)
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("storage_emulator")
+async def test_upload_csv_to_blob_runs_on_storage_executor():
+    completed = storage_executor.completed.value
+
+    file = _csv_upload(b"a\n1\n")
+    blob = await hash_csv_file(file, "project/datasets/sales.csv")
+    await upload_csv_to_blob(file, blob, bucket_name=EMULATOR_BUCKET)
+
+    # The hash, then the upload
+    assert storage_executor.completed.value == completed + 2
+
+
+@pytest.mark.asyncio
+async def test_hash_csv_file_rejects_other_types():
+    file = UploadFile(
+        file=io.BytesIO(b"{}"),
+        filename="data.json",
+        headers=Headers({"content-type": "application/json"}),
+    )
+
+    with pytest.raises(ValueError, match="Unsupported file type"):
+        await hash_csv_file(file, "project/datasets/data.json")
+
+
+# Run in a fresh process, so that its peak RSS only covers the upload
+UPLOAD_SCRIPT = textwrap.dedent(
+    """
+    import asyncio, json, resource, sys
+
+    from fastapi import UploadFile
+    from starlette.datastructures import Headers
+
+    from app.lib.gcp import get_bucket, hash_csv_file, upload_csv_to_blob
+
+    path, bucket_name, size = sys.argv[1], sys.argv[2], int(sys.argv[3])
+    get_bucket(bucket_name)  # Import and initialize everything beforehand
+    with open(path, "rb") as f:
+        file = UploadFile(
+            file=f,
+            size=size,
+            filename="large.csv",
+            headers=Headers({"content-type": "text/csv"}),
+        )
+        baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        blob = asyncio.run(hash_csv_file(file, "project/datasets/large.csv"))
+        asyncio.run(upload_csv_to_blob(file, blob, bucket_name=bucket_name))
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KiB on Linux
+    print(json.dumps({"blob_name": blob.name, "growth": (peak - baseline) * 1024}))
+    """,
+)
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="ru_maxrss is in KiB on Linux")
+def test_upload_csv_to_blob_memory_is_bounded(storage_emulator: str, tmp_path: Path):
+    size = 128 * MiB
+    chunk_size = 4 * MiB
+    path = tmp_path / "large.csv"
+    row = b"2025-01-06,FR,1000.0,250.5,42\n"
+    with path.open("wb") as f:
+        f.write(b"date,geo,revenue,spend,impressions\n")
+        while f.tell() < size:
+            f.write(row * 10_000)
+    file_size = path.stat().st_size
+
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            UPLOAD_SCRIPT,
+            str(path),
+            EMULATOR_BUCKET,
+            str(file_size),
+        ],
+        cwd=BACKEND_DIR,
+        env={**os.environ, "GCS_UPLOAD_CHUNK_SIZE": str(chunk_size)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    upload = json.loads(result.stdout.strip().splitlines()[-1])
+
+    # A few chunks may be alive at once (read buffer, request body), never the file
+    assert upload["growth"] < 8 * chunk_size, upload
+    blob = get_bucket(EMULATOR_BUCKET).get_blob(upload["blob_name"])
+    assert blob.size == file_size
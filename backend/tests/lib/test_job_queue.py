@@ -0,0 +1,339 @@
+"""Tests for the training job queue.
+
+The queue is tested on SQLite, which has no row locks. Set `TEST_POSTGRES_URL`
+to also run several worker processes against Postgres, and check that each
+job is run exactly once, even when a worker is killed mid-run: the migrations
+run in a temporary schema, dropped afterwards.
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from collections.abc import Generator
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from urllib.parse import quote
+from uuid import uuid4
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import Engine, create_engine, text
+from sqlmodel import Session, SQLModel, select, update
+
+from app.lib.job_queue import (
+    LeaseLostError,
+    claim_job,
+    complete_job,
+    enqueue_job,
+    extend_lease,
+    reap_expired_jobs,
+    run_worker,
+)
+from app.models import Dataset, Job, Pipeline, Project, User
+from app.models.enums import JobStatus, KpiType
+from app.validations.job_parameters import JobParams, PosteriorParams, PriorParams
+
+BACKEND_DIR = Path(__file__).parents[2]
+PARAMS = JobParams(prior=PriorParams(), posterior=PosteriorParams())
+
+
+@pytest.fixture
+def engine(tmp_path: Path) -> Generator[Engine]:
+    engine = create_engine(f"sqlite:///{tmp_path / 'queue.db'}")
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def _add_pipeline(
+    session: Session,
+    project_id: str = "project",
+    dataset_id: str = "dataset",
+) -> str:
+    # Foreign keys are not enforced by SQLite
+    pipeline = Pipeline(
+        display_name="Pipeline",
+        project_id=project_id,
+        dataset_id=dataset_id,
+        model_spec={},
+        columns={},
+    )
+    session.add(pipeline)
+    session.commit()
+    return pipeline.id
+
+
+def test_claim_oldest_pending_job(engine: Engine):
+    with Session(engine) as session:
+        pipeline_id = _add_pipeline(session)
+        first = enqueue_job(session, pipeline_id, PARAMS)
+        second = enqueue_job(session, pipeline_id, PARAMS)
+
+        claimed = claim_job(session, "worker-1")
+        assert claimed.id == first.id
+        assert claimed.status == JobStatus.RUNNING
+        assert claimed.worker_id == "worker-1"
+        assert claimed.started_at is not None
+
+        assert claim_job(session, "worker-2").id == second.id
+        assert claim_job(session, "worker-3") is None
+
+
+def test_worker_records_status_transitions(engine: Engine):
+    with Session(engine) as session:
+        pipeline_id = _add_pipeline(session)
+        ok_id = enqueue_job(session, pipeline_id, PARAMS).id
+        ko_id = enqueue_job(session, pipeline_id, PARAMS).id
+
+    def _runner(_: Session, job: Job, __: threading.Event) -> None:
+        if job.id == ko_id:
+            msg = "Sampling diverged"
+            raise RuntimeError(msg)
+
+    assert run_worker(_runner, engine=engine, exit_when_empty=True) == 2
+
+    with Session(engine) as session:
+        ok, ko = session.get(Job, ok_id), session.get(Job, ko_id)
+    assert ok.status == JobStatus.COMPLETED
+    assert ok.finished_at is not None
+    assert ok.error is None
+    assert ko.status == JobStatus.FAILED
+    assert ko.error == "RuntimeError: Sampling diverged"
+
+
+def _expire_leases(session: Session) -> None:
+    session.exec(
+        update(Job).values(lease_expires_at=datetime.now(UTC) - timedelta(seconds=1)),
+    )
+    session.commit()
+
+
+def test_lease_is_owned_by_the_claiming_worker(engine: Engine):
+    with Session(engine) as session:
+        job_id = enqueue_job(session, _add_pipeline(session), PARAMS).id
+        lease = claim_job(session, "worker-1", lease_duration=60).lease_expires_at
+
+        assert extend_lease(session, job_id, "worker-1", lease_duration=120)
+        assert session.get(Job, job_id).lease_expires_at > lease
+        assert not extend_lease(session, job_id, "worker-2")
+        assert not complete_job(session, job_id, "worker-2")
+        assert complete_job(session, job_id, "worker-1")
+        assert not extend_lease(session, job_id, "worker-1")
+
+
+def test_expired_leases_are_requeued_then_failed(engine: Engine):
+    with Session(engine) as session:
+        job_id = enqueue_job(session, _add_pipeline(session), PARAMS).id
+        claim_job(session, "worker-1")
+        assert reap_expired_jobs(session, max_retries=1) == 0
+
+        _expire_leases(session)
+        assert reap_expired_jobs(session, max_retries=1) == 1
+        job = session.get(Job, job_id)
+        assert (job.status, job.retries, job.worker_id) == (JobStatus.PENDING, 1, None)
+
+        # The worker which lost the lease cannot finish the job anymore
+        assert not complete_job(session, job_id, "worker-1")
+        claim_job(session, "worker-2")
+        _expire_leases(session)
+        assert reap_expired_jobs(session, max_retries=1) == 1
+        session.refresh(job)
+        assert job.status == JobStatus.FAILED
+        assert job.error == "Lease expired after 1 retries"
+
+
+def test_heartbeat_keeps_the_lease_of_a_running_job(engine: Engine):
+    with Session(engine) as session:
+        job_id = enqueue_job(session, _add_pipeline(session), PARAMS).id
+
+    def _runner(*_: object) -> None:
+        # Outlive the initial lease, while other workers reap expired leases
+        for _ in range(4):
+            time.sleep(0.1)
+            with Session(engine) as session:
+                assert reap_expired_jobs(session) == 0
+
+    run_worker(
+        _runner,
+        engine=engine,
+        heartbeat_interval=0.05,
+        lease_duration=0.2,
+        exit_when_empty=True,
+    )
+
+    with Session(engine) as session:
+        job = session.get(Job, job_id)
+    assert job.status == JobStatus.COMPLETED
+    assert job.retries == 0
+
+
+def test_runner_stops_once_the_lease_is_lost(engine: Engine):
+    with Session(engine) as session:
+        job_id = enqueue_job(session, _add_pipeline(session), PARAMS).id
+    runs: list[bool] = []
+
+    def _runner(_: Session, __: Job, lost: threading.Event) -> None:
+        runs.append(lost.is_set())
+        if len(runs) > 1:
+            return
+        # Requeued by another worker, while the job runs
+        with Session(engine) as session:
+            _expire_leases(session)
+            assert reap_expired_jobs(session) == 1
+        assert lost.wait(1)
+        msg = "Lease lost"
+        raise LeaseLostError(msg)
+
+    assert (
+        run_worker(
+            _runner, engine=engine, heartbeat_interval=0.05, exit_when_empty=True
+        )
+        == 2
+    )
+
+    with Session(engine) as session:
+        job = session.get(Job, job_id)
+    assert runs == [False, False]
+    assert (job.status, job.retries, job.error) == (JobStatus.COMPLETED, 1, None)
+
+
+@pytest.fixture(scope="module")
+def postgres_url() -> Generator[str]:
+    base_url = os.environ.get("TEST_POSTGRES_URL")
+    if not base_url:
+        pytest.skip("TEST_POSTGRES_URL is not set")
+
+    schema = f"job_queue_{uuid4().hex[:8]}"
+    separator = "&" if "?" in base_url else "?"
+    url = f"{base_url}{separator}options={quote(f'-csearch_path={schema}')}"
+    engine = create_engine(url)
+    with engine.begin() as connection:
+        connection.execute(text(f"CREATE SCHEMA {schema}"))
+    try:
+        config = Config(BACKEND_DIR / "alembic.ini")
+        config.set_main_option("script_location", str(BACKEND_DIR / "migrations"))
+        config.set_main_option("sqlalchemy.url", url.replace("%", "%%"))
+        command.upgrade(config, "head")
+        yield url
+    finally:
+        with engine.begin() as connection:
+            connection.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+        engine.dispose()
+
+
+def _sleep(*_: object) -> None:
+    time.sleep(0.05)
+
+
+def _run_worker_process(url: str, counts: "multiprocessing.Queue[int]") -> None:
+    engine = create_engine(url)
+    counts.put(run_worker(_sleep, engine=engine, exit_when_empty=True))
+    engine.dispose()
+
+
+def _hang(*_: object) -> None:
+    time.sleep(60)
+
+
+def _run_hanging_worker_process(url: str) -> None:
+    engine = create_engine(url)
+    run_worker(_hang, engine=engine, heartbeat_interval=0.1, lease_duration=0.5)
+
+
+@pytest.fixture(scope="module")
+def postgres_engine(postgres_url: str) -> Generator[Engine]:
+    engine = create_engine(postgres_url)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def postgres_pipeline(postgres_engine: Engine) -> str:
+    with Session(postgres_engine) as session:
+        user = User(
+            email=f"{uuid4().hex[:8]}@example.com",
+            username=uuid4().hex[:8],
+            first_name="Jane",
+            last_name="Doe",
+            hashed_password="not-a-real-hash",
+        )
+        project = Project(name="Queue", owner_id=user.id)
+        dataset = Dataset(
+            display_name="Sales",
+            kpi_type=KpiType.REVENUE,
+            project_id=project.id,
+            created_by=user.id,
+            blob_path="sales.csv",
+        )
+        session.add_all([user, project, dataset])
+        session.commit()
+        return _add_pipeline(session, project.id, dataset.id)
+
+
+def _pipeline_jobs(engine: Engine, pipeline_id: str) -> list[Job]:
+    with Session(engine) as session:
+        return session.exec(select(Job).where(Job.pipeline_id == pipeline_id)).all()
+
+
+def test_workers_run_each_job_once(
+    postgres_url: str,
+    postgres_engine: Engine,
+    postgres_pipeline: str,
+):
+    jobs, workers = 40, 4
+    with Session(postgres_engine) as session:
+        for _ in range(jobs):
+            enqueue_job(session, postgres_pipeline, PARAMS)
+
+    context = multiprocessing.get_context("spawn")
+    counts = context.Queue()
+    processes = [
+        context.Process(target=_run_worker_process, args=(postgres_url, counts))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=60)
+
+    run_counts = [counts.get(timeout=1) for _ in processes]
+    done = _pipeline_jobs(postgres_engine, postgres_pipeline)
+
+    assert sum(run_counts) == jobs
+    assert all(job.status == JobStatus.COMPLETED for job in done)
+    assert len({job.worker_id for job in done}) > 1
+
+
+def test_job_of_a_killed_worker_is_run_again(
+    postgres_url: str,
+    postgres_engine: Engine,
+    postgres_pipeline: str,
+):
+    with Session(postgres_engine) as session:
+        job_id = enqueue_job(session, postgres_pipeline, PARAMS).id
+
+    context = multiprocessing.get_context("spawn")
+    process = context.Process(target=_run_hanging_worker_process, args=(postgres_url,))
+    process.start()
+    with Session(postgres_engine) as session:
+        job = session.get_one(Job, job_id)
+        for _ in range(100):
+            if job.status == JobStatus.RUNNING:
+                break
+            time.sleep(0.1)
+            session.refresh(job)
+        dead_worker_id = job.worker_id
+    process.kill()
+    process.join()
+    # The heartbeats stopped with the worker
+    time.sleep(0.6)
+
+    assert run_worker(_sleep, engine=postgres_engine, exit_when_empty=True) == 1
+
+    with Session(postgres_engine) as session:
+        job = session.get_one(Job, job_id)
+    assert job.status == JobStatus.COMPLETED
+    assert job.retries == 1
+    assert job.worker_id not in {None, dead_worker_id}
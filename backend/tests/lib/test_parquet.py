@@ -0,0 +1,167 @@
+"""Tests for the Parquet copies of the datasets."""
+
+import io
+import threading
+from collections.abc import Generator
+from pathlib import Path
+from typing import Any
+
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+import pytest
+from fastapi import UploadFile
+from sqlalchemy import Engine, create_engine
+from sqlmodel import Session, SQLModel
+from starlette.datastructures import Headers
+
+from app.lib import parquet
+from app.lib.gcp import get_bucket
+from app.lib.parquet import (
+    DatasetSchema,
+    convert_csv_to_parquet,
+    infer_dataset_schema,
+    run_dataset_conversion_job,
+    upload_parquet_copy,
+)
+from app.models import Dataset, Job
+from app.models.dataset import DatasetProfile
+from app.models.enums import ColumnRole, JobKind, JobStatus, KpiType
+
+GEO_ALL_CHANNELS = Path(__file__).parents[3] / "ml" / "data" / "geo_all_channels.csv"
+
+
+def test_infer_dataset_schema():
+    with GEO_ALL_CHANNELS.open("rb") as f:
+        schema = infer_dataset_schema(f)
+
+    roles = {column.name: column.role for column in schema.columns}
+    assert roles["time"] == ColumnRole.TIME
+    assert roles["geo"] == ColumnRole.GEO
+    assert roles["Channel0_impression"] == ColumnRole.MEDIA
+    assert roles["Organic_channel0_impression"] == ColumnRole.MEDIA
+    assert roles["Channel0_spend"] == ColumnRole.SPEND
+    assert roles["conversions"] == ColumnRole.NUMERIC
+    types = {column.name: column.type for column in schema.columns}
+    assert types["time"] == "date32[day]"
+    assert types["Channel0_impression"] == "double"
+
+
+def test_convert_csv_to_parquet():
+    sink = io.BytesIO()
+    with GEO_ALL_CHANNELS.open("rb") as f:
+        profile = convert_csv_to_parquet(f, sink)
+
+    sink.seek(0)
+    table = pq.read_table(sink)
+    expected = pa_csv.read_csv(GEO_ALL_CHANNELS)
+    assert table.schema == DatasetSchema(columns=profile.columns).to_arrow()
+    assert table.num_rows == expected.num_rows
+    assert table["geo"].equals(expected["geo"])
+    assert table["Channel1_spend"].equals(expected["Channel1_spend"])
+    assert table["Channel0_impression"].equals(
+        expected["Channel0_impression"].cast(pa.float64()),
+    )
+
+
+def test_convert_csv_to_parquet_promotes_integers(monkeypatch: pytest.MonkeyPatch):
+    # Integers in the first block, decimals in the next ones
+    monkeypatch.setattr(parquet, "CSV_BLOCK_SIZE", 64)
+    rows = [f"2025-01-{day:02d},FR,{day}\n" for day in range(1, 29)]
+    content = b"time,geo,spend\n" + "".join(rows).encode() + b"2025-01-29,FR,1.5\n"
+    sink = io.BytesIO()
+
+    convert_csv_to_parquet(io.BytesIO(content), sink)
+
+    sink.seek(0)
+    assert pq.read_table(sink)["spend"].to_pylist()[-1] == 1.5
+
+
+def test_convert_csv_to_parquet_rejects_invalid_values(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(parquet, "CSV_BLOCK_SIZE", 64)
+    rows = [f"2025-01-{day:02d},FR,{day}\n" for day in range(1, 29)]
+    content = b"time,geo,spend\n" + "".join(rows).encode() + b"2025-01-29,FR,unknown\n"
+
+    with pytest.raises(ValueError, match="Invalid CSV file"):
+        convert_csv_to_parquet(io.BytesIO(content), io.BytesIO())
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("storage_emulator")
+async def test_upload_parquet_copy():
+    content = GEO_ALL_CHANNELS.read_bytes()
+    file = UploadFile(
+        file=io.BytesIO(content),
+        size=len(content),
+        headers=Headers({"content-type": "text/csv"}),
+    )
+
+    blob_name, profile = await upload_parquet_copy(file, "project/datasets/geo.csv")
+
+    assert blob_name == "project/datasets/geo.parquet"
+    blob = get_bucket().get_blob(blob_name)
+    assert blob.content_type == "application/vnd.apache.parquet"
+    assert blob.size < len(content)
+    table = pq.read_table(io.BytesIO(blob.download_as_bytes()))
+    assert table.num_rows == profile.row_count
+
+
+@pytest.fixture
+def engine(tmp_path: Path) -> Generator[Engine]:
+    engine = create_engine(f"sqlite:///{tmp_path / 'conversion.db'}")
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.mark.usefixtures("storage_emulator")
+def test_run_dataset_conversion_job(
+    engine: Engine,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    # Foreign keys are not enforced by SQLite
+    dataset = Dataset(
+        display_name="Uploaded",
+        kpi_type=KpiType.NON_REVENUE,
+        project_id="project",
+        created_by="user",
+        blob_path="project/datasets/uploads/upload.csv",
+    )
+    job = Job(
+        kind=JobKind.DATASET_CONVERSION,
+        dataset_id=dataset.id,
+        params={},
+        status=JobStatus.RUNNING,
+        worker_id="worker",
+    )
+    get_bucket().blob(dataset.blob_path).upload_from_filename(GEO_ALL_CHANNELS)
+    # Left by an earlier attempt of the job
+    parquet_name = "project/datasets/uploads/upload.parquet"
+    get_bucket().blob(parquet_name).upload_from_string(b"partial")
+
+    convert = parquet._convert_and_upload
+
+    def _convert(*args: Any) -> DatasetProfile:
+        # No transaction is left open during the conversion
+        assert not session.in_transaction()
+        return convert(*args)
+
+    monkeypatch.setattr(parquet, "_convert_and_upload", _convert)
+
+    with Session(engine) as session:
+        session.add_all([dataset, job])
+        session.commit()
+
+        run_dataset_conversion_job(session, job, threading.Event())
+
+        session.refresh(dataset)
+        assert dataset.parquet_path == parquet_name
+        assert (
+            dataset.profile["row_count"] == pa_csv.read_csv(GEO_ALL_CHANNELS).num_rows
+        )
+    table = pq.read_table(
+        io.BytesIO(get_bucket().blob(parquet_name).download_as_bytes())
+    )
+    assert table.num_rows == dataset.profile["row_count"]
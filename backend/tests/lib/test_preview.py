@@ -0,0 +1,107 @@
+"""Tests for the range-read previews of the datasets."""
+
+import pytest
+
+from app.core.settings import settings
+from app.lib import preview
+from app.lib.gcp import get_bucket
+from app.lib.preview import parse_csv_head, read_csv_head
+from tests.conftest import EMULATOR_BUCKET
+
+HEADER = b"time,geo,revenue\n"
+ROWS = [f"2025-01-{day:02d},FR,{day * 100}\n".encode() for day in range(1, 29)]
+
+
+def test_parse_csv_head_drops_incomplete_line():
+    data = HEADER + ROWS[0] + ROWS[1][:5]
+
+    assert parse_csv_head(data, end_of_file=False) == [
+        ["time", "geo", "revenue"],
+        ["2025-01-01", "FR", "100"],
+    ]
+    assert parse_csv_head(data, end_of_file=True)[-1] == ["2025-"]
+
+
+def test_parse_csv_head_drops_incomplete_quoted_record():
+    data = b'time,geo,comment\n2025-01-01,FR,"first\nline\n2025'
+
+    assert parse_csv_head(data, end_of_file=False) == [["time", "geo", "comment"]]
+    assert parse_csv_head(data + b'",x\n', end_of_file=False)[1] == [
+        "2025-01-01",
+        "FR",
+        "first\nline\n2025",
+        "x",
+    ]
+
+
+def test_parse_csv_head_skips_bom_and_blank_lines():
+    data = b"\xef\xbb\xbf" + HEADER + b"\n" + ROWS[0]
+
+    assert parse_csv_head(data, end_of_file=True) == [
+        ["time", "geo", "revenue"],
+        ["2025-01-01", "FR", "100"],
+    ]
+
+
+@pytest.fixture
+def ranges(monkeypatch: pytest.MonkeyPatch) -> list[tuple[int, int]]:
+    """Record the (start, size) of the range requests of the previews."""
+    calls = []
+    download = preview.download_blob_range
+
+    def _download(blob_name: str, start: int, size: int, *args: object) -> bytes:
+        calls.append((start, size))
+        return download(blob_name, start, size, *args)
+
+    monkeypatch.setattr(preview, "download_blob_range", _download)
+    return calls
+
+
+@pytest.mark.usefixtures("storage_emulator")
+def test_read_csv_head_expands_range(
+    monkeypatch: pytest.MonkeyPatch,
+    ranges: list[tuple[int, int]],
+):
+    get_bucket(EMULATOR_BUCKET).blob("preview/sales.csv").upload_from_string(
+        HEADER + b"".join(ROWS),
+    )
+    # A line is 20 bytes at most: the first range holds about a row
+    monkeypatch.setattr(settings, "DATASET_PREVIEW_RANGE_SIZE", 32)
+
+    result = read_csv_head("preview/sales.csv", 5, bucket_name=EMULATOR_BUCKET)
+
+    assert result.columns == ["time", "geo", "revenue"]
+    assert result.rows == [
+        [f"2025-01-0{day}", "FR", f"{day * 100}"] for day in range(1, 6)
+    ]
+    # Each range reads as many bytes as read before
+    assert ranges == [(0, 32), (32, 32), (64, 64)]
+
+
+@pytest.mark.usefixtures("storage_emulator")
+def test_read_csv_head_stops_at_end_of_file(ranges: list[tuple[int, int]]):
+    content = HEADER + b"".join(ROWS[:3])
+    get_bucket(EMULATOR_BUCKET).blob("preview/short.csv").upload_from_string(content)
+
+    result = read_csv_head("preview/short.csv", 10, bucket_name=EMULATOR_BUCKET)
+
+    assert len(result.rows) == 3
+    assert ranges == [(0, settings.DATASET_PREVIEW_RANGE_SIZE)]
+
+
+@pytest.mark.usefixtures("storage_emulator")
+def test_read_csv_head_stops_at_max_size(
+    monkeypatch: pytest.MonkeyPatch,
+    ranges: list[tuple[int, int]],
+):
+    get_bucket(EMULATOR_BUCKET).blob("preview/large.csv").upload_from_string(
+        HEADER + b"".join(ROWS),
+    )
+    monkeypatch.setattr(settings, "DATASET_PREVIEW_RANGE_SIZE", 32)
+    monkeypatch.setattr(settings, "DATASET_PREVIEW_MAX_SIZE", 100)
+
+    result = read_csv_head("preview/large.csv", 20, bucket_name=EMULATOR_BUCKET)
+
+    assert ranges == [(0, 32), (32, 32), (64, 36)]
+    # The header and the rows held by the first 100 bytes
+    assert len(result.rows) == 4
@@ -0,0 +1,68 @@
+"""Tests for the streaming profile of the datasets."""
+
+import io
+from pathlib import Path
+
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pytest
+
+from app.lib import parquet
+from app.lib.parquet import convert_csv_to_parquet
+
+GEO_ALL_CHANNELS = Path(__file__).parents[3] / "ml" / "data" / "geo_all_channels.csv"
+
+
+def test_profile():
+    with GEO_ALL_CHANNELS.open("rb") as f:
+        profile = convert_csv_to_parquet(f, io.BytesIO())
+
+    table = pa_csv.read_csv(GEO_ALL_CHANNELS)
+    assert profile.row_count == table.num_rows
+    assert profile.geos == sorted(pc.unique(table["geo"]).to_pylist())
+    assert profile.time_periods == len(pc.unique(table["time"]))
+    assert profile.time_start == pc.min(table["time"]).as_py().isoformat()
+    assert profile.time_end == pc.max(table["time"]).as_py().isoformat()
+
+    columns = {column.name: column for column in profile.columns}
+    spend = columns["Channel0_spend"]
+    assert spend.null_count == 0
+    assert spend.min == pc.min(table["Channel0_spend"]).as_py()
+    assert spend.max == pc.max(table["Channel0_spend"]).as_py()
+    assert spend.mean == pytest.approx(pc.mean(table["Channel0_spend"]).as_py())
+    assert columns["geo"].min is None
+    assert columns["geo"].mean is None
+    assert columns["time"].min == profile.time_start
+
+
+def test_profile_is_the_same_across_batches(monkeypatch: pytest.MonkeyPatch):
+    with GEO_ALL_CHANNELS.open("rb") as f:
+        profile = convert_csv_to_parquet(f, io.BytesIO())
+
+    monkeypatch.setattr(parquet, "CSV_BLOCK_SIZE", 16 * 1024)
+    with GEO_ALL_CHANNELS.open("rb") as f:
+        batched = convert_csv_to_parquet(f, io.BytesIO())
+
+    assert batched.model_dump(exclude={"columns"}) == profile.model_dump(
+        exclude={"columns"},
+    )
+    for column, expected in zip(batched.columns, profile.columns, strict=True):
+        assert column.null_count == expected.null_count
+        assert (column.min, column.max) == (expected.min, expected.max)
+        assert column.mean == pytest.approx(expected.mean)
+
+
+def test_profile_counts_nulls():
+    content = b"time,geo,spend\n2025-01-06,FR,1.5\n2025-01-13,FR,\n2025-01-06,DE,2.5\n"
+
+    profile = convert_csv_to_parquet(io.BytesIO(content), io.BytesIO())
+
+    assert profile.model_dump(exclude={"columns"}) == {
+        "row_count": 3,
+        "geos": ["DE", "FR"],
+        "time_periods": 2,
+        "time_start": "2025-01-06",
+        "time_end": "2025-01-13",
+    }
+    spend = profile.columns[2]
+    assert (spend.null_count, spend.min, spend.max, spend.mean) == (1, 1.5, 2.5, 2.0)
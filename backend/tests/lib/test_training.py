@@ -0,0 +1,320 @@
+"""Tests for the arguments of the training of the queued jobs."""
+
+import sys
+import threading
+from collections.abc import Callable, Generator
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+import pytest
+from sqlalchemy import Engine, create_engine
+from sqlmodel import Session, SQLModel, select, update
+
+from app.lib.gcp import check_blob_exists, get_bucket
+from app.lib.job_queue import LeaseLostError
+from app.lib.model_serving import get_served_blob_name
+from app.lib.training import (
+    BlobPriorStore,
+    build_training_args,
+    get_checkpoint_blob_name,
+    run_training_job,
+)
+from app.models import Dataset, Job, Model, Pipeline
+from app.models.enums import JobStatus, KpiType
+
+COLUMNS = {
+    "time": "time",
+    "geo": "geo",
+    "kpi": "conversions",
+    "population": "population",
+    "revenue_per_kpi": "revenue_per_conversion",
+    "media": ["tv_impressions"],
+    "media_spend": ["tv_spend"],
+}
+PARAMS = {
+    "prior": {"n_draws": 100},
+    "posterior": {"n_chains": 4, "n_adapt": 500, "n_burnin": 500, "n_keep": 1000},
+}
+
+
+def _build(model_spec: dict) -> dict:
+    dataset = Dataset(
+        display_name="Sales",
+        kpi_type=KpiType.NON_REVENUE,
+        project_id="project",
+        created_by="user",
+        blob_path="sales.csv",
+    )
+    pipeline = Pipeline(
+        display_name="Pipeline",
+        project_id="project",
+        dataset_id=dataset.id,
+        model_spec=model_spec,
+        columns=COLUMNS,
+    )
+    job = Job(pipeline_id=pipeline.id, params=PARAMS)
+    return build_training_args(dataset, pipeline, job)
+
+
+def test_build_training_args():
+    model_spec = {
+        "max_lag": 4,
+        "priors": {
+            "roi_m": {
+                "distribution": "LogNormal",
+                "params": {"mean": 0.5, "stddev": 0.4},
+            },
+        },
+    }
+
+    assert _build(model_spec) == {
+        "kpi_type": "non_revenue",
+        "time": "time",
+        "geo": "geo",
+        "kpi": "conversions",
+        "population": "population",
+        "controls": [],
+        "revenue_per_kpi": "revenue_per_conversion",
+        "media": ["tv_impressions"],
+        "media_spend": ["tv_spend"],
+        "organic_media": None,
+        "non_media_treatments": None,
+        "roi_mu": 0.5,
+        "roi_sigma": 0.4,
+        "max_lag": 4,
+        "n_draws": 100,
+        "n_chains": 4,
+        "n_adapt": 500,
+        "n_burnin": 500,
+        "n_keep": 1000,
+        "n_processes": 1,
+        "segment_size": None,
+        "init_step_size": None,
+        "dual_averaging_kwargs": None,
+        "seed": None,
+    }
+
+
+def test_build_training_args_with_default_priors():
+    args = _build({})
+
+    assert (args["roi_mu"], args["roi_sigma"]) == (0.2, 0.9)
+    assert args["max_lag"] == 8
+
+
+def test_build_training_args_with_unsupported_prior():
+    model_spec = {
+        "priors": {
+            "roi_m": {"distribution": "HalfNormal", "params": {"scale": 1.0}},
+        },
+    }
+
+    with pytest.raises(ValueError, match="Unsupported ROI prior"):
+        _build(model_spec)
+
+
+@pytest.fixture
+def engine(tmp_path: Path) -> Generator[Engine]:
+    engine = create_engine(f"sqlite:///{tmp_path / 'training.db'}")
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def _add_job(session: Session, params: dict[str, Any]) -> Job:
+    # Foreign keys are not enforced by SQLite
+    dataset = Dataset(
+        display_name="Sales",
+        kpi_type=KpiType.NON_REVENUE,
+        project_id="project",
+        created_by="user",
+        blob_path="project/datasets/sales.csv",
+    )
+    pipeline = Pipeline(
+        display_name="Pipeline",
+        project_id="project",
+        dataset_id=dataset.id,
+        model_spec={},
+        columns=COLUMNS,
+    )
+    # Claimed by a worker
+    job = Job(
+        pipeline_id=pipeline.id,
+        params=params,
+        status=JobStatus.RUNNING,
+        worker_id="worker",
+    )
+    session.add_all([dataset, pipeline, job])
+    session.commit()
+    get_bucket().blob(dataset.blob_path).upload_from_string(b"time,geo")
+    return job
+
+
+def _mock_training(monkeypatch: pytest.MonkeyPatch, train: Callable[..., None]) -> None:
+    module = ModuleType("training.main")
+    module.main = train
+    monkeypatch.setitem(sys.modules, "training.main", module)
+
+
+class _Preempted(Exception):
+    pass
+
+
+@pytest.mark.usefixtures("storage_emulator")
+def test_run_training_job_resumes_from_its_checkpoint(
+    engine: Engine,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    calls: list[dict[str, Any]] = []
+
+    def _train(**kwargs: Any) -> None:
+        """Checkpoint a segment, then get preempted on the first run."""
+        checkpoint = Path(kwargs["checkpoint_dir"]) / "posterior.nc"
+        calls.append({"resume": kwargs["resume"], "exists": checkpoint.exists()})
+        checkpoint.write_bytes(b"draws")
+        kwargs["on_checkpoint"](checkpoint)
+        if len(calls) == 1:
+            raise _Preempted
+        Path(kwargs["file_path"]).write_bytes(b"model")
+        Path(kwargs["served_path"]).write_bytes(b"served")
+
+    _mock_training(monkeypatch, _train)
+
+    with Session(engine) as session:
+        params = {**PARAMS, "posterior": {**PARAMS["posterior"], "segment_size": 250}}
+        job = _add_job(session, params)
+        checkpoint_name = get_checkpoint_blob_name("project", job.id)
+
+        with pytest.raises(_Preempted):
+            run_training_job(session, job, threading.Event())
+        assert check_blob_exists(checkpoint_name)
+
+        run_training_job(session, job, threading.Event())
+
+        assert calls == [
+            {"resume": False, "exists": False},
+            {"resume": True, "exists": True},
+        ]
+        model = session.exec(select(Model).where(Model.job_id == job.id)).one()
+        assert get_bucket().blob(model.uri).download_as_bytes() == b"model"
+        served = get_bucket().blob(get_served_blob_name(model.uri))
+        assert served.download_as_bytes() == b"served"
+        assert not check_blob_exists(checkpoint_name)
+
+
+@pytest.mark.usefixtures("storage_emulator")
+def test_run_training_job_warm_starts_from_a_model(
+    engine: Engine,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    warm_starts: list[bytes | None] = []
+
+    def _train(**kwargs: Any) -> None:
+        # No transaction is left open while training
+        assert not session.in_transaction()
+        assert kwargs["prior_store"] == BlobPriorStore("project")
+        path = kwargs.get("warm_start_path")
+        warm_starts.append(Path(path).read_bytes() if path else None)
+        Path(kwargs["file_path"]).write_bytes(b"model %d" % len(warm_starts))
+        Path(kwargs["served_path"]).write_bytes(b"served")
+
+    _mock_training(monkeypatch, _train)
+
+    with Session(engine) as session:
+        first = _add_job(session, PARAMS)
+        run_training_job(session, first, threading.Event())
+        model = session.exec(select(Model).where(Model.job_id == first.id)).one()
+
+        refit = _add_job(session, {**PARAMS, "warm_start_model_id": model.id})
+        run_training_job(session, refit, threading.Event())
+
+        assert warm_starts == [None, b"model 1"]
+
+        unknown = _add_job(session, {**PARAMS, "warm_start_model_id": "mod_unknown"})
+        with pytest.raises(ValueError, match="not found in project"):
+            run_training_job(session, unknown, threading.Event())
+
+
+@pytest.mark.usefixtures("storage_emulator")
+def test_run_training_job_stops_once_the_lease_is_lost(
+    engine: Engine,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    checkpoints: list[int] = []
+
+    def _train(**kwargs: Any) -> None:
+        checkpoint = Path(kwargs["checkpoint_dir"]) / "posterior.nc"
+        for segment in range(4):
+            checkpoint.write_bytes(b"draws")
+            kwargs["on_checkpoint"](checkpoint)
+            checkpoints.append(segment)
+        Path(kwargs["file_path"]).write_bytes(b"model")
+        Path(kwargs["served_path"]).write_bytes(b"served")
+
+    _mock_training(monkeypatch, _train)
+    lost = threading.Event()
+    lost.set()
+
+    with Session(engine) as session:
+        params = {**PARAMS, "posterior": {**PARAMS["posterior"], "segment_size": 250}}
+        job = _add_job(session, params)
+
+        with pytest.raises(LeaseLostError):
+            run_training_job(session, job, lost)
+
+        assert checkpoints == []
+        assert session.exec(select(Model)).all() == []
+
+
+@pytest.mark.usefixtures("storage_emulator")
+def test_run_training_job_stores_its_model_once(
+    engine: Engine,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    trainings: list[str] = []
+
+    def _set_worker(worker_id: str) -> None:
+        with Session(engine) as session:
+            session.exec(update(Job).values(worker_id=worker_id))
+            session.commit()
+
+    def _train(**kwargs: Any) -> None:
+        trainings.append(kwargs["file_path"])
+        if len(trainings) == 1:
+            # Requeued, then claimed by another worker, during the training
+            _set_worker("other-worker")
+        Path(kwargs["file_path"]).write_bytes(b"model")
+        Path(kwargs["served_path"]).write_bytes(b"served")
+
+    _mock_training(monkeypatch, _train)
+
+    with Session(engine) as session:
+        job = _add_job(session, PARAMS)
+
+        with pytest.raises(LeaseLostError):
+            run_training_job(session, job, threading.Event())
+        assert session.exec(select(Model)).all() == []
+
+        _set_worker("worker")
+        run_training_job(session, job, threading.Event())
+        # Run again after its worker lost the lease before completing it
+        run_training_job(session, job, threading.Event())
+
+        assert len(trainings) == 2
+        assert len(session.exec(select(Model)).all()) == 1
+
+
+@pytest.mark.usefixtures("storage_emulator")
+def test_blob_prior_store(tmp_path: Path):
+    store = BlobPriorStore("project")
+    draws = tmp_path / "prior.nc"
+    draws.write_bytes(b"draws")
+    downloaded = tmp_path / "downloaded.nc"
+
+    assert not store.download("abc", downloaded)
+    store.upload("abc", draws)
+
+    assert store.download("abc", downloaded)
+    assert downloaded.read_bytes() == b"draws"
+    assert check_blob_exists("project/priors/abc.nc")
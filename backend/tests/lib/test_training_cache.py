@@ -0,0 +1,125 @@
+"""Tests for the cache of the trained models."""
+
+import pytest
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.lib.gcp import get_bucket
+from app.lib.job_queue import submit_job
+from app.lib.model_serving import get_served_blob_name
+from app.lib.training_cache import (
+    compute_fingerprint,
+    find_cached_model,
+    get_job_fingerprint,
+)
+from app.models import Blob, Dataset, Model, Pipeline
+from app.models.enums import JobStatus, KpiType
+from app.validations.column_mapping import ColumnMapping
+from app.validations.job_parameters import JobParams, PosteriorParams, PriorParams
+from app.validations.model_spec import ModelSpec
+
+COLUMNS = ColumnMapping(time="time", geo="geo", kpi="revenue", population="pop")
+PARAMS = JobParams(prior=PriorParams(), posterior=PosteriorParams(), seed=42)
+
+
+def _fingerprint(**overrides: object) -> str:
+    inputs = {
+        "content_hash": "sha256:abc",
+        "kpi_type": KpiType.REVENUE,
+        "columns": COLUMNS,
+        "model_spec": ModelSpec(),
+        "params": PARAMS,
+    }
+    return compute_fingerprint(**{**inputs, **overrides})
+
+
+def test_fingerprint_ignores_omitted_defaults():
+    explicit = ModelSpec.model_validate({"max_lag": 8, "hill_before_adstock": False})
+
+    assert _fingerprint(model_spec=explicit) == _fingerprint()
+
+
+def test_fingerprint_ignores_execution_params():
+    posterior = PosteriorParams(n_processes=4, segment_size=100)
+    params = PARAMS.model_copy(update={"posterior": posterior})
+
+    assert _fingerprint(params=params) == _fingerprint()
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {"content_hash": "sha256:abd"},
+        {"kpi_type": KpiType.NON_REVENUE},
+        {"columns": COLUMNS.model_copy(update={"controls": ["gqv"]})},
+        {"model_spec": ModelSpec(max_lag=4)},
+        {"params": PARAMS.model_copy(update={"seed": 43})},
+    ],
+)
+def test_fingerprint_changes_with_each_input(overrides: dict):
+    assert _fingerprint(**overrides) != _fingerprint()
+
+
+async def _add_pipeline(session: AsyncSession, project_id: str) -> Pipeline:
+    # Foreign keys are not enforced by SQLite
+    dataset = Dataset(
+        display_name="Sales",
+        kpi_type=KpiType.REVENUE,
+        project_id=project_id,
+        created_by="user",
+        blob_path="datasets/abc.csv",
+    )
+    pipeline = Pipeline(
+        display_name="Pipeline",
+        project_id=project_id,
+        dataset_id=dataset.id,
+        model_spec={},
+        columns=COLUMNS.model_dump(),
+    )
+    session.add_all([dataset, pipeline])
+    await session.commit()
+    return pipeline
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("storage_emulator")
+async def test_submit_reuses_the_model_of_identical_inputs(session: AsyncSession):
+    pipeline = await _add_pipeline(session, "project")
+    session.add(Blob(path="datasets/abc.csv", sha256="abc", ref_count=1))
+    await session.commit()
+
+    fingerprint = await get_job_fingerprint(session, pipeline, PARAMS)
+    assert fingerprint is not None
+    assert await find_cached_model(session, "project", fingerprint) is None
+    first = await session.run_sync(submit_job, pipeline.id, PARAMS, fingerprint)
+    assert first.status == JobStatus.PENDING
+
+    # The worker records the fingerprint of the job on its model
+    uri = f"project/models/{first.id}.pkl"
+    get_bucket().blob(uri).upload_from_string(b"model")
+    get_bucket().blob(get_served_blob_name(uri)).upload_from_string(b"served")
+    model = Model(job_id=first.id, uri=uri, fingerprint=fingerprint)
+    session.add(model)
+    await session.commit()
+
+    cached = await find_cached_model(session, "project", fingerprint)
+    assert cached.id == model.id
+    second = await session.run_sync(
+        submit_job,
+        pipeline.id,
+        PARAMS,
+        fingerprint,
+        cached,
+    )
+    assert second.status == JobStatus.COMPLETED
+    assert second.cache_hit
+
+    other_seed = PARAMS.model_copy(update={"seed": 7})
+    other_fingerprint = await get_job_fingerprint(session, pipeline, other_seed)
+    assert await find_cached_model(session, "project", other_fingerprint) is None
+
+    # Models of other projects are not reused
+    assert await find_cached_model(session, "other-project", fingerprint) is None
+
+    # Models whose served arrays were deleted are trained again
+    get_bucket().blob(get_served_blob_name(uri)).delete()
+    assert await find_cached_model(session, "project", fingerprint) is None
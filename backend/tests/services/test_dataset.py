@@ -0,0 +1,199 @@
+"""Tests for the content-addressed storage of the dataset files."""
+
+import io
+
+import pytest
+import pytest_asyncio
+from fastapi import UploadFile
+from google.api_core.exceptions import PreconditionFailed
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.datastructures import Headers
+
+from app.lib import gcp
+from app.lib.gcp import get_bucket
+from app.models import Blob, Dataset, Project, User
+from app.models.dataset import DatasetCreate
+from app.services import DatasetService
+
+CONTENT = b"time,geo,revenue,tv_spend\n2025-01-06,FR,1000,10\n2025-01-13,FR,1200,12\n"
+
+
+def _dataset(content: bytes = CONTENT) -> DatasetCreate:
+    file = UploadFile(
+        file=io.BytesIO(content),
+        size=len(content),
+        filename="sales.csv",
+        headers=Headers({"content-type": "text/csv"}),
+    )
+    return DatasetCreate.model_validate(
+        {"displayName": "Sales", "kpiType": "revenue", "file": file},
+    )
+
+
+@pytest.fixture(autouse=True)
+def create_only_uploads(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Check the create-only precondition of the uploads, as the storage does.
+
+    The emulator ignores `if_generation_match`.
+    """
+    upload = gcp.upload_file_to_blob
+
+    def _upload(**kwargs: object) -> None:
+        exists = get_bucket().get_blob(kwargs["blob_name"]) is not None
+        if kwargs.get("if_generation_match") == 0 and exists:
+            msg = "At least one of the pre-conditions did not hold."
+            raise PreconditionFailed(msg)
+        upload(**kwargs)
+
+    monkeypatch.setattr(gcp, "upload_file_to_blob", _upload)
+
+
+@pytest_asyncio.fixture
+async def service(session: AsyncSession, user: User) -> DatasetService:
+    project = Project(name="Deduplication project", owner_id=user.id)
+    session.add(project)
+    await session.commit()
+    return DatasetService(session, project.id)
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("storage_emulator")
+async def test_same_content_is_stored_once(
+    service: DatasetService,
+    session: AsyncSession,
+    user: User,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    first = await service.create(_dataset(), user.id)
+
+    # The second upload reuses the Parquet copy and profile of the first one
+    async def _fail(*_: object, **__: object) -> None:
+        pytest.fail("The dataset was converted again")
+
+    monkeypatch.setattr("app.services.dataset.upload_parquet_copy", _fail)
+    second = await service.create(_dataset(), user.id)
+
+    assert second.id != first.id
+    assert second.blob_path == first.blob_path
+    assert second.parquet_path == first.parquet_path
+    assert second.profile == first.profile
+    blob = await session.get(Blob, first.blob_path)
+    assert blob.ref_count == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("storage_emulator")
+async def test_other_content_is_stored_apart(service: DatasetService, user: User):
+    first = await service.create(_dataset(), user.id)
+    second = await service.create(_dataset(CONTENT.replace(b"1200", b"1300")), user.id)
+
+    assert second.blob_path != first.blob_path
+    assert second.parquet_path != first.parquet_path
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("storage_emulator")
+async def test_blob_is_deleted_with_its_last_dataset(
+    service: DatasetService,
+    session: AsyncSession,
+    user: User,
+):
+    first = await service.create(_dataset(), user.id)
+    second = await service.create(_dataset(), user.id)
+    blob_path, parquet_path = first.blob_path, first.parquet_path
+    bucket = get_bucket()
+
+    assert await service.delete(first.id)
+    assert bucket.get_blob(blob_path) is not None
+    assert bucket.get_blob(parquet_path) is not None
+    assert (await session.get(Blob, blob_path)).ref_count == 1
+
+    assert await service.delete(second.id)
+    assert bucket.get_blob(blob_path) is None
+    assert bucket.get_blob(parquet_path) is None
+    assert await session.get(Blob, blob_path) is None
+    assert await session.get(Dataset, second.id) is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("storage_emulator")
+async def test_missing_blob_is_uploaded_again(
+    service: DatasetService,
+    session: AsyncSession,
+    user: User,
+):
+    # A blob deleted from storage while its row was still referenced
+    first = await service.create(_dataset(), user.id)
+    get_bucket().delete_blobs([first.blob_path, first.parquet_path])
+
+    second = await service.create(_dataset(), user.id)
+
+    assert get_bucket().blob(second.blob_path).download_as_bytes() == CONTENT
+    assert get_bucket().get_blob(second.parquet_path) is not None
+    assert (await session.get(Blob, second.blob_path)).ref_count == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("storage_emulator")
+async def test_failed_conversion_keeps_no_reference(
+    service: DatasetService,
+    session: AsyncSession,
+    user: User,
+):
+    content = b"time,geo\n2025-01-06,FR,1000\n"
+
+    with pytest.raises(ValueError, match="Invalid CSV file"):
+        await service.create(_dataset(content), user.id)
+
+    blobs = get_bucket().list_blobs(prefix=f"{service.project_id}/datasets/")
+    assert [blob.name for blob in blobs] == []
+    assert (await session.exec(select(Blob))).all() == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("storage_emulator")
+async def test_failed_delete_keeps_the_blob(
+    service: DatasetService,
+    session: AsyncSession,
+    user: User,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    dataset = await service.create(_dataset(), user.id)
+    blob_path, parquet_path = dataset.blob_path, dataset.parquet_path
+
+    async def _fail() -> None:
+        msg = "Connection lost"
+        raise ConnectionError(msg)
+
+    # The files are only deleted once the blob row deletion is committed
+    monkeypatch.setattr(session, "commit", _fail)
+    with pytest.raises(ConnectionError):
+        await service.delete(dataset.id)
+
+    assert get_bucket().get_blob(blob_path) is not None
+    assert get_bucket().get_blob(parquet_path) is not None
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("storage_emulator")
+async def test_delete_during_a_create_keeps_the_blob(
+    service: DatasetService,
+    session: AsyncSession,
+    user: User,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    first = await service.create(_dataset(), user.id)
+    get_twin = service._get_twin
+
+    async def _delete_then_get_twin(blob_path: str) -> Dataset | None:
+        # The last dataset of the same content is deleted meanwhile
+        assert await DatasetService(session, service.project_id).delete(first.id)
+        return await get_twin(blob_path)
+
+    monkeypatch.setattr(service, "_get_twin", _delete_then_get_twin)
+    second = await service.create(_dataset(), user.id)
+
+    assert get_bucket().blob(second.blob_path).download_as_bytes() == CONTENT
+    assert get_bucket().get_blob(second.parquet_path) is not None
+    assert (await session.get(Blob, second.blob_path)).ref_count == 1
@@ -0,0 +1,144 @@
+"""Query plan regression tests for list queries.
+
+The schema is built by running the Alembic migrations, then the queries of
+the list endpoints are explained to check that every table is read through
+an index. On SQLite, a sequential scan shows up as `SCAN <table>` instead of
+`SEARCH <table> USING INDEX`.
+
+Set `TEST_POSTGRES_URL` to also check the plans on Postgres, where sequential
+scans are disabled so that the planner only falls back to one when no index
+applies. The migrations run in a temporary schema, dropped afterwards.
+"""
+
+import os
+import re
+from collections.abc import Generator
+from datetime import UTC, datetime
+from pathlib import Path
+from urllib.parse import quote
+from uuid import uuid4
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import Connection, Engine, create_engine, text
+from sqlmodel.sql.expression import SelectOfScalar
+
+from app.core.pagination import Pagination, encode_cursor, page_statement
+from app.models import Dataset, Project
+from app.services import DatasetService, ProjectService
+
+BACKEND_DIR = Path(__file__).parents[2]
+TABLES = ("projects", "memberships", "datasets")
+
+
+def _upgrade(url: str) -> None:
+    """Run the migrations up to the latest revision."""
+    config = Config(BACKEND_DIR / "alembic.ini")
+    config.set_main_option("script_location", str(BACKEND_DIR / "migrations"))
+    config.set_main_option("sqlalchemy.url", url.replace("%", "%%"))
+    command.upgrade(config, "head")
+
+
+@pytest.fixture(scope="module")
+def sqlite_engine(tmp_path_factory: pytest.TempPathFactory) -> Generator[Engine]:
+    url = f"sqlite:///{tmp_path_factory.mktemp('db') / 'migrated.db'}"
+    _upgrade(url)
+    engine = create_engine(url)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def postgres_engine() -> Generator[Engine]:
+    base_url = os.environ.get("TEST_POSTGRES_URL")
+    if not base_url:
+        pytest.skip("TEST_POSTGRES_URL is not set")
+
+    schema = f"query_plans_{uuid4().hex[:8]}"
+    separator = "&" if "?" in base_url else "?"
+    url = f"{base_url}{separator}options={quote(f'-csearch_path={schema}')}"
+    engine = create_engine(url)
+    with engine.begin() as connection:
+        connection.execute(text(f"CREATE SCHEMA {schema}"))
+    try:
+        _upgrade(url)
+        yield engine
+    finally:
+        with engine.begin() as connection:
+            connection.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+        engine.dispose()
+
+
+def _explain(connection: Connection, statement: SelectOfScalar) -> list[str]:
+    """Get the plan of a statement, one line per node."""
+    compiled = statement.compile(connection)
+    if connection.dialect.name == "sqlite":
+        prefix = "EXPLAIN QUERY PLAN "
+    else:
+        prefix = "EXPLAIN "
+        connection.execute(text("SET enable_seqscan = off"))
+    params = (
+        tuple(compiled.params[key] for key in compiled.positiontup)
+        if compiled.positional
+        else compiled.params
+    )
+    rows = connection.exec_driver_sql(prefix + str(compiled), params).all()
+    return [row[-1] for row in rows]
+
+
+def _sequential_scans(plan: list[str]) -> list[str]:
+    """Get the nodes of a plan that read a whole table."""
+    tables = "|".join(TABLES)
+    pattern = re.compile(rf"^SCAN ({tables})\b|Seq Scan on ({tables})\b")
+    return [line for line in plan if pattern.search(line.strip(" ->"))]
+
+
+CURSOR = encode_cursor(datetime(2025, 7, 1, tzinfo=UTC), "last-id")
+
+STATEMENTS = {
+    "user_projects": page_statement(
+        ProjectService.user_projects_query("user-id"),
+        Project,
+        Pagination(),
+    ),
+    "user_projects_next_page": page_statement(
+        ProjectService.user_projects_query("user-id"),
+        Project,
+        Pagination(cursor=CURSOR),
+    ),
+    "project_datasets": page_statement(
+        DatasetService.project_datasets_query("project-id"),
+        Dataset,
+        Pagination(),
+    ),
+    "project_datasets_next_page": page_statement(
+        DatasetService.project_datasets_query("project-id"),
+        Dataset,
+        Pagination(cursor=CURSOR),
+    ),
+}
+
+
+@pytest.mark.parametrize("name", STATEMENTS)
+def test_list_queries_use_indexes_on_sqlite(sqlite_engine: Engine, name: str):
+    with sqlite_engine.connect() as connection:
+        plan = _explain(connection, STATEMENTS[name])
+
+    assert not _sequential_scans(plan), plan
+
+
+@pytest.mark.parametrize("name", STATEMENTS)
+def test_list_queries_use_indexes_on_postgres(postgres_engine: Engine, name: str):
+    with postgres_engine.connect() as connection:
+        plan = _explain(connection, STATEMENTS[name])
+
+    assert not _sequential_scans(plan), plan
+
+
+def test_project_datasets_are_read_in_index_order(sqlite_engine: Engine):
+    with sqlite_engine.connect() as connection:
+        plan = _explain(connection, STATEMENTS["project_datasets_next_page"])
+
+    assert any("ix_datasets_project_id_created_at_id" in line for line in plan)
+    assert not any("TEMP B-TREE FOR ORDER BY" in line for line in plan), plan
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""Benchmark the size and load latency of pickled models against artifacts.
+
+A model is saved with `save_mmm` and as an artifact of chunked, compressed
+NetCDF arrays (see `training.artifact`). For each format, the benchmark
+reports the size on disk, the time to load the model, and the time to
+compute a single ROI summary (the posterior mean of `roi_m`) from the files.
+
+The model is read from `--model`, a pickled model, or trained on
+`data/geo_all_channels.csv` with `--n-chains` chains of `--n-keep` draws.
+Loads are repeated `--repeat` times, and the median is reported: the files
+are in the page cache after the first load.
+
+Usage (from the `ml` directory):
+    uv run python benchmarks/bench_artifact.py --n-keep 1000
+"""
+
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Annotated
+
+import typer
+
+# Add the ml directory to the Python path
+ml_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(ml_dir))
+
+from meridian.model.model import load_mmm, save_mmm
+
+from training.artifact import load_artifact, open_group, save_artifact
+from training.tasks import load, prepare, train
+from utils.constants import (
+    CONTROL_COLS,
+    GEO_COL,
+    KPI_COL,
+    MAX_LAG,
+    MEDIA_COLS,
+    MEDIA_SPEND_COLS,
+    NON_MEDIA_COLS,
+    ORGANIC_COLS,
+    POPULATION_COL,
+    REVENUE_PER_KPI,
+    ROI_MU,
+    ROI_SIGMA,
+    TIME_COL,
+)
+
+cli = typer.Typer(help="Model artifact size and load latency benchmark")
+
+DATASET = ml_dir / "data" / "geo_all_channels.csv"
+
+
+def _train(n_chains: int, n_keep: int):
+    input_data = load(
+        csv_path=str(DATASET),
+        kpi_type="non_revenue",
+        time=TIME_COL,
+        kpi=KPI_COL,
+        controls=CONTROL_COLS,
+        geo=GEO_COL,
+        population=POPULATION_COL,
+        revenue_per_kpi=REVENUE_PER_KPI,
+        media=MEDIA_COLS,
+        media_spend=MEDIA_SPEND_COLS,
+        organic_media=ORGANIC_COLS,
+        non_media_treatments=NON_MEDIA_COLS,
+    )
+    return train(
+        input_data=input_data,
+        model_spec=prepare(roi_mu=ROI_MU, roi_sigma=ROI_SIGMA, max_lag=MAX_LAG),
+        n_draws=n_keep,
+        n_chains=n_chains,
+        n_adapt=100,
+        n_burnin=100,
+        n_keep=n_keep,
+        seed=0,
+    )
+
+
+def _size(path: Path) -> int:
+    if path.is_file():
+        return path.stat().st_size
+    return sum(file.stat().st_size for file in path.rglob("*") if file.is_file())
+
+
+def _median_time(function: Callable[[], object], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+@cli.command()
+def main(
+    model: Annotated[
+        Path | None,
+        typer.Option(help="Pickled model to benchmark", exists=True, dir_okay=False),
+    ] = None,
+    n_chains: Annotated[int, typer.Option(help="Chains of a trained model")] = 4,
+    n_keep: Annotated[int, typer.Option(help="Kept draws of a trained model")] = 500,
+    repeat: Annotated[int, typer.Option(help="Loads per measure")] = 5,
+) -> None:
+    """Compare the pickle and NetCDF formats of a model."""
+    meridian = load_mmm(str(model)) if model else _train(n_chains, n_keep)
+    posterior = meridian.inference_data.posterior
+    typer.echo(
+        f"{posterior.sizes['chain']} chains x {posterior.sizes['draw']} draws, "
+        f"{len(posterior.data_vars)} posterior variables",
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pickle_path = Path(tmp) / "model.pkl"
+        artifact_path = Path(tmp) / "model"
+        save_mmm(meridian, str(pickle_path))
+        save_artifact(meridian, artifact_path)
+
+        def _pickle_roi() -> None:
+            load_mmm(str(pickle_path)).inference_data.posterior["roi_m"].mean(
+                ("chain", "draw"),
+            ).to_numpy()
+
+        def _artifact_roi() -> None:
+            with open_group(artifact_path, "posterior") as group:
+                group["roi_m"].mean(("chain", "draw")).to_numpy()
+
+        rows = [
+            (
+                "pickle",
+                _size(pickle_path),
+                _median_time(lambda: load_mmm(str(pickle_path)), repeat),
+                _median_time(_pickle_roi, repeat),
+            ),
+            (
+                "netcdf",
+                _size(artifact_path),
+                _median_time(lambda: load_artifact(artifact_path), repeat),
+                _median_time(_artifact_roi, repeat),
+            ),
+        ]
+
+    typer.echo(f"{'format':>7} {'size (MB)':>10} {'load (s)':>9} {'ROI (s)':>8}")
+    for name, size, load_time, roi_time in rows:
+        typer.echo(
+            f"{name:>7} {size / 1e6:>10.2f} {load_time:>9.3f} {roi_time:>8.3f}",
+        )
+    pickled, artifact = rows
+    typer.echo(
+        f"Artifact: {pickled[1] / artifact[1]:.2f}x smaller, "
+        f"{pickled[2] / artifact[2]:.2f}x faster to load, "
+        f"{pickled[3] / artifact[3]:.2f}x faster to summarize ROI",
+    )
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Benchmark posterior sampling time against the number of processes.
+
+The model of `data/geo_all_channels.csv` is sampled with `--n-chains` chains,
+once in a single process and then with the chains split into groups sampled
+by 2, 4... processes (see `training.parallel`), up to `--max-processes`.
+
+Usage (from the `ml` directory):
+    uv run python benchmarks/bench_parallel_chains.py --n-chains 8
+"""
+
+import sys
+import time
+from pathlib import Path
+from typing import Annotated
+
+import typer
+
+# Add the ml directory to the Python path
+ml_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(ml_dir))
+
+from meridian.model.model import Meridian
+
+from training.parallel import sample_posterior_parallel
+from training.tasks import load, prepare
+from utils.constants import (
+    CONTROL_COLS,
+    GEO_COL,
+    KPI_COL,
+    MAX_LAG,
+    MEDIA_COLS,
+    MEDIA_SPEND_COLS,
+    NON_MEDIA_COLS,
+    ORGANIC_COLS,
+    POPULATION_COL,
+    REVENUE_PER_KPI,
+    ROI_MU,
+    ROI_SIGMA,
+    TIME_COL,
+)
+
+cli = typer.Typer(help="Process-parallel MCMC chains benchmark")
+
+DATASET = ml_dir / "data" / "geo_all_channels.csv"
+
+
+@cli.command()
+def main(
+    n_chains: Annotated[int, typer.Option(help="Chains sampled per run")] = 8,
+    max_processes: Annotated[int, typer.Option(help="Largest process count")] = 8,
+    n_adapt: Annotated[int, typer.Option(help="Adaptation steps")] = 200,
+    n_burnin: Annotated[int, typer.Option(help="Burn-in steps")] = 200,
+    n_keep: Annotated[int, typer.Option(help="Kept draws per chain")] = 200,
+    seed: Annotated[int, typer.Option(help="Sampling seed")] = 0,
+) -> None:
+    """Compare the wall-clock time of sampling with 1 to N processes."""
+    input_data = load(
+        csv_path=str(DATASET),
+        kpi_type="non_revenue",
+        time=TIME_COL,
+        kpi=KPI_COL,
+        controls=CONTROL_COLS,
+        geo=GEO_COL,
+        population=POPULATION_COL,
+        revenue_per_kpi=REVENUE_PER_KPI,
+        media=MEDIA_COLS,
+        media_spend=MEDIA_SPEND_COLS,
+        organic_media=ORGANIC_COLS,
+        non_media_treatments=NON_MEDIA_COLS,
+    )
+    model_spec = prepare(roi_mu=ROI_MU, roi_sigma=ROI_SIGMA, max_lag=MAX_LAG)
+
+    counts = [1]
+    while counts[-1] * 2 <= min(max_processes, n_chains):
+        counts.append(counts[-1] * 2)
+
+    typer.echo(
+        f"{n_chains} chains, {n_adapt} adaptation + {n_burnin} burn-in "
+        f"+ {n_keep} kept steps",
+    )
+    typer.echo(f"{'processes':>9} {'time (s)':>9} {'speedup':>8}")
+    baseline = None
+    for n_processes in counts:
+        meridian = Meridian(input_data=input_data, model_spec=model_spec)
+        start = time.perf_counter()
+        if n_processes == 1:
+            meridian.sample_posterior(
+                n_chains=n_chains,
+                n_adapt=n_adapt,
+                n_burnin=n_burnin,
+                n_keep=n_keep,
+                seed=seed,
+            )
+        else:
+            sample_posterior_parallel(
+                meridian,
+                n_processes=n_processes,
+                n_chains=n_chains,
+                n_adapt=n_adapt,
+                n_burnin=n_burnin,
+                n_keep=n_keep,
+                seed=seed,
+            )
+        elapsed = time.perf_counter() - start
+        posterior = meridian.inference_data.posterior
+        assert posterior.sizes["chain"] == n_chains
+        assert posterior.sizes["draw"] == n_keep
+        baseline = baseline or elapsed
+        typer.echo(f"{n_processes:>9} {elapsed:>9.1f} {baseline / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    cli()
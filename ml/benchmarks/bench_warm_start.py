@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""Benchmark the time to convergence of a cold start against a warm start.
+
+A reference model of `data/geo_all_channels.csv` is trained first, standing
+for the previous fit of a refit on updated data. The model is then sampled
+again, with another seed, from prior draws (cold start) and from the final
+state of the reference model (warm start, see `training.warm_start`), with
+increasing adaptation and burn-in budgets. For each start, the first budget
+whose draws have a maximum R-hat below `--max-rhat` gives its time to
+convergence.
+
+Usage (from the `ml` directory):
+    uv run python benchmarks/bench_warm_start.py --budgets 25 50 100 200 400
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Annotated
+
+import arviz as az
+import typer
+
+# Add the ml directory to the Python path
+ml_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(ml_dir))
+
+from training.tasks import load, prepare, save, train
+from training.warm_start import load_warm_start
+from utils.constants import (
+    CONTROL_COLS,
+    GEO_COL,
+    KPI_COL,
+    MAX_LAG,
+    MEDIA_COLS,
+    MEDIA_SPEND_COLS,
+    NON_MEDIA_COLS,
+    ORGANIC_COLS,
+    POPULATION_COL,
+    REVENUE_PER_KPI,
+    ROI_MU,
+    ROI_SIGMA,
+    TIME_COL,
+)
+
+cli = typer.Typer(help="Warm start time-to-convergence benchmark")
+
+DATASET = ml_dir / "data" / "geo_all_channels.csv"
+
+
+@cli.command()
+def main(
+    n_chains: Annotated[int, typer.Option(help="Chains sampled per run")] = 4,
+    n_keep: Annotated[int, typer.Option(help="Kept draws per chain")] = 200,
+    budgets: Annotated[
+        list[int] | None,
+        typer.Option(help="Adaptation and burn-in steps to compare"),
+    ] = None,
+    reference_budget: Annotated[
+        int,
+        typer.Option(help="Adaptation and burn-in steps of the reference model"),
+    ] = 500,
+    max_rhat: Annotated[float, typer.Option(help="Convergence threshold")] = 1.1,
+    seed: Annotated[int, typer.Option(help="Seed of the refits")] = 1,
+) -> None:
+    """Compare the time to convergence of cold and warm starts."""
+    budgets = budgets or [25, 50, 100, 200, 400]
+    input_data = load(
+        csv_path=str(DATASET),
+        kpi_type="non_revenue",
+        time=TIME_COL,
+        kpi=KPI_COL,
+        controls=CONTROL_COLS,
+        geo=GEO_COL,
+        population=POPULATION_COL,
+        revenue_per_kpi=REVENUE_PER_KPI,
+        media=MEDIA_COLS,
+        media_spend=MEDIA_SPEND_COLS,
+        organic_media=ORGANIC_COLS,
+        non_media_treatments=NON_MEDIA_COLS,
+    )
+    model_spec = prepare(roi_mu=ROI_MU, roi_sigma=ROI_SIGMA, max_lag=MAX_LAG)
+
+    def _sample(budget: int, **kwargs: object) -> tuple[float, float]:
+        start = time.perf_counter()
+        meridian = train(
+            input_data=input_data,
+            model_spec=model_spec,
+            n_draws=1,
+            n_chains=n_chains,
+            n_adapt=budget,
+            n_burnin=budget,
+            n_keep=n_keep,
+            seed=seed,
+            **kwargs,
+        )
+        elapsed = time.perf_counter() - start
+        rhat = az.rhat(meridian.inference_data.posterior)
+        return elapsed, float(rhat.to_array().max())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        typer.echo(f"Training the reference model ({reference_budget} steps)...")
+        reference = train(
+            input_data=input_data,
+            model_spec=model_spec,
+            n_draws=1,
+            n_chains=n_chains,
+            n_adapt=reference_budget,
+            n_burnin=reference_budget,
+            n_keep=n_keep,
+            seed=0,
+        )
+        file_path = str(Path(tmp) / "reference.pkl")
+        save(reference, file_path)
+        current_state, init_step_size = load_warm_start(file_path, n_chains)
+
+    starts = {
+        "cold": {},
+        "warm": {"current_state": current_state, "init_step_size": init_step_size},
+    }
+    typer.echo(f"{n_chains} chains, {n_keep} kept draws, R-hat < {max_rhat}")
+    typer.echo(f"{'start':>6} {'steps':>6} {'time (s)':>9} {'max R-hat':>10}")
+    converged: dict[str, float] = {}
+    for name, kwargs in starts.items():
+        for budget in budgets:
+            elapsed, rhat = _sample(budget, **kwargs)
+            typer.echo(f"{name:>6} {budget:>6} {elapsed:>9.1f} {rhat:>10.3f}")
+            if rhat < max_rhat:
+                converged[name] = elapsed
+                break
+
+    typer.echo()
+    for name in starts:
+        result = f"{converged[name]:.1f} s" if name in converged else "not converged"
+        typer.echo(f"Time to convergence of the {name} start: {result}")
+    if len(converged) == len(starts):
+        typer.echo(f"Speedup: {converged['cold'] / converged['warm']:.2f}x")
+
+
+if __name__ == "__main__":
+    cli()
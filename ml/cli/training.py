@@ -13,6 +13,7 @@ import typer
 from rich.console import Console
 
 from training.main import main as run_training_pipeline
+from training.prior_cache import DirectoryPriorStore
 from utils.constants import (
     MAX_LAG,
     N_ADAPT,
@@ -20,11 +21,13 @@ from utils.constants import (
     N_CHAINS,
     N_DRAWS,
     N_KEEP,
+    OUTPUT_DIRNAME,
     OUTPUT_FILENAME,
     ROI_MU,
     ROI_SIGMA,
+    SEGMENT_SIZE,
 )
-from utils.enums import KPIType  # noqa: TC001
+from utils.enums import ArtifactFormat, KPIType, Stage  # noqa: TC001
 
 app = typer.Typer(
     name="meridian-training",
@@ -39,7 +42,7 @@ def train(
     csv_path: Annotated[
         Path,
         typer.Argument(
-            help="Path to the CSV file containing input data",
+            help="Path to the CSV or Parquet file containing input data",
             exists=True,
             file_okay=True,
             dir_okay=False,
@@ -168,7 +171,7 @@ def train(
         typer.Option(
             "--n-adapt",
             help="Number of adaptation steps for MCMC sampling",
-            min=100,
+            min=1,
         ),
     ] = N_ADAPT,
     n_burnin: Annotated[
@@ -176,7 +179,7 @@ def train(
         typer.Option(
             "--n-burnin",
             help="Number of burn-in steps for MCMC sampling",
-            min=100,
+            min=0,
         ),
     ] = N_BURNIN,
     n_keep: Annotated[
@@ -187,16 +190,109 @@ def train(
             min=100,
         ),
     ] = N_KEEP,
+    n_processes: Annotated[
+        int,
+        typer.Option(
+            "--n-processes",
+            help="Number of processes sampling groups of chains in parallel",
+            min=1,
+        ),
+    ] = 1,
+    checkpoint_dir: Annotated[
+        Path | None,
+        typer.Option(
+            "--checkpoint-dir",
+            help="Directory to checkpoint the posterior sampling to (optional)",
+            file_okay=False,
+            dir_okay=True,
+        ),
+    ] = None,
+    segment_size: Annotated[
+        int,
+        typer.Option(
+            "--segment-size",
+            help="Number of samples to keep between two checkpoints",
+            min=1,
+        ),
+    ] = SEGMENT_SIZE,
+    resume: Annotated[
+        bool,
+        typer.Option(
+            "--resume",
+            help="Continue the posterior sampling from the last checkpoint",
+        ),
+    ] = False,
+    warm_start: Annotated[
+        Path | None,
+        typer.Option(
+            "--warm-start",
+            help="Previously trained model to start the posterior sampling from",
+            exists=True,
+            file_okay=True,
+            dir_okay=False,
+            readable=True,
+        ),
+    ] = None,
+    init_step_size: Annotated[
+        float | None,
+        typer.Option(
+            "--init-step-size",
+            help="Initial step size of the sampler (optional)",
+            min=0.0,
+        ),
+    ] = None,
+    target_accept_prob: Annotated[
+        float | None,
+        typer.Option(
+            "--target-accept-prob",
+            help="Target acceptance probability of the step size adaptation",
+            min=0.0,
+            max=1.0,
+        ),
+    ] = None,
+    prior_cache_dir: Annotated[
+        Path | None,
+        typer.Option(
+            "--prior-cache-dir",
+            help="Directory caching the prior draws of seeded runs (optional)",
+            file_okay=False,
+            dir_okay=True,
+        ),
+    ] = None,
+    stage: Annotated[
+        Stage,
+        typer.Option(
+            "--stage",
+            help="Sampling stages to run: prior, posterior or all",
+        ),
+    ] = Stage.ALL,
+    seed: Annotated[
+        int | None,
+        typer.Option(
+            "--seed",
+            help="Seed of the prior and posterior sampling (optional)",
+        ),
+    ] = None,
     output: Annotated[
-        Path,
+        Path | None,
         typer.Option(
             "--output",
             "-o",
-            help="Path to save the trained model",
+            help=(
+                "Path to save the trained model: a file, or a directory with "
+                f"--format netcdf (default: {OUTPUT_FILENAME} or {OUTPUT_DIRNAME})"
+            ),
             file_okay=True,
-            dir_okay=False,
+            dir_okay=True,
+        ),
+    ] = None,
+    artifact_format: Annotated[
+        ArtifactFormat,
+        typer.Option(
+            "--format",
+            help="Format of the trained model: pickle file or NetCDF directory",
         ),
-    ] = Path(OUTPUT_FILENAME),
+    ] = ArtifactFormat.PICKLE,
     verbose: Annotated[
         bool,
         typer.Option(
@@ -222,7 +318,29 @@ def train(
             --media "tv,radio,digital" \
             --media-spend "tv_spend,radio_spend,digital_spend" \
             --output my_model.pkl
+
+    With --checkpoint-dir, the posterior sampling is checkpointed every
+    --segment-size kept samples, and an interrupted training continues from
+    its last checkpoint when run again with --resume.
+
+    With --warm-start, the chains start from the last draws of a previously
+    trained model, with its tuned step size: fewer adaptation and burn-in
+    steps are needed, e.g. to refit a model on updated data.
+
+    With --prior-cache-dir and --seed, the prior draws are stored, and reused
+    by the next runs with the same data and specification. --stage prior only
+    samples the prior, and --stage posterior only the posterior.
+
+    With --format netcdf, the model is saved to the --output directory as
+    chunked, compressed arrays, read lazily by `training.artifact`, instead
+    of a pickle file. Saving again to the directory replaces the model.
     """
+    if output is None:
+        output = Path(
+            OUTPUT_DIRNAME
+            if artifact_format == ArtifactFormat.NETCDF
+            else OUTPUT_FILENAME,
+        )
     if verbose:
         console.print("🔧 [bold blue]Configuration:[/bold blue]")
         console.print(f"  📁 Input file: {csv_path}")
@@ -245,7 +363,18 @@ def train(
         console.print(f"  🔄 Adaptation steps: {n_adapt}")
         console.print(f"  🔥 Burn-in steps: {n_burnin}")
         console.print(f"  💾 Samples to keep: {n_keep}")
-        console.print(f"  📤 Output file: {output}")
+        console.print(f"  ⚙️  Processes: {n_processes}")
+        console.print(f"  📍 Checkpoint directory: {checkpoint_dir or 'None'}")
+        console.print(f"  🧩 Segment size: {segment_size}")
+        console.print(f"  ⏯️  Resume: {resume}")
+        console.print(f"  🔥 Warm start: {warm_start or 'None'}")
+        console.print(f"  👣 Initial step size: {init_step_size or 'None'}")
+        console.print(f"  🎯 Target acceptance: {target_accept_prob or 'None'}")
+        console.print(f"  🗃️  Prior cache directory: {prior_cache_dir or 'None'}")
+        console.print(f"  🪜 Stage: {stage.value}")
+        console.print(f"  🌱 Seed: {seed}")
+        console.print(f"  📤 Output: {output}")
+        console.print(f"  🗜️  Format: {artifact_format.value}")
         console.print()
 
     try:
@@ -279,6 +408,23 @@ def train(
             )
             raise typer.Exit(1) from None
 
+        netcdf = artifact_format == ArtifactFormat.NETCDF
+        wrong_kind = output.is_file() if netcdf else output.is_dir()
+        if wrong_kind:
+            console.print(
+                "❌ [bold red]Error:[/bold red] --output must be a file, or a "
+                "directory with --format netcdf",
+                style="red",
+            )
+            raise typer.Exit(1) from None
+
+        if resume and checkpoint_dir is None:
+            console.print(
+                "❌ [bold red]Error:[/bold red] --resume requires --checkpoint-dir",
+                style="red",
+            )
+            raise typer.Exit(1) from None
+
         # Run the training pipeline
         run_training_pipeline(
             csv_path=str(csv_path),
@@ -301,6 +447,23 @@ def train(
             n_adapt=n_adapt,
             n_burnin=n_burnin,
             n_keep=n_keep,
+            seed=seed,
+            n_processes=n_processes,
+            segment_size=segment_size,
+            checkpoint_dir=str(checkpoint_dir) if checkpoint_dir else None,
+            resume=resume,
+            warm_start_path=str(warm_start) if warm_start else None,
+            init_step_size=init_step_size,
+            dual_averaging_kwargs=(
+                {"target_accept_prob": target_accept_prob}
+                if target_accept_prob is not None
+                else None
+            ),
+            prior_store=(
+                DirectoryPriorStore(prior_cache_dir) if prior_cache_dir else None
+            ),
+            stage=stage,
+            artifact_format=artifact_format,
             file_path=str(output),
         )
 
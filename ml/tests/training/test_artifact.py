@@ -0,0 +1,129 @@
+import dataclasses
+import json
+
+import arviz as az
+import h5netcdf
+import numpy as np
+import pytest
+import xarray as xr
+
+from training.artifact import (
+    DRAW_CHUNK,
+    INFERENCE_DATA_FILENAME,
+    MANIFEST_FILENAME,
+    load_artifact,
+    open_group,
+    read_manifest,
+    save_artifact,
+)
+
+
+@dataclasses.dataclass
+class _InputData:
+    kpi: xr.DataArray
+    kpi_type: str
+    media: xr.DataArray | None = None
+
+
+@dataclasses.dataclass
+class _Meridian:
+    input_data: _InputData
+    model_spec: dict
+    inference_data: az.InferenceData
+
+
+@pytest.fixture
+def meridian() -> _Meridian:
+    kpi = xr.DataArray(
+        np.arange(6.0).reshape(2, 3),
+        coords={"geo": ["a", "b"], "time": ["w1", "w2", "w3"]},
+        dims=("geo", "time"),
+        name="kpi",
+    )
+    rng = np.random.default_rng(0)
+    inference_data = az.from_dict(
+        posterior={"roi_m": rng.lognormal(size=(2, 300, 3))},
+        prior={"roi_m": rng.lognormal(size=(1, 50, 3))},
+        dims={"roi_m": ["media_channel"]},
+    )
+    return _Meridian(
+        input_data=_InputData(kpi=kpi, kpi_type="non_revenue"),
+        model_spec={"max_lag": 8},
+        inference_data=inference_data,
+    )
+
+
+@pytest.fixture(autouse=True)
+def _mock_meridian(mocker):
+    mocker.patch("training.artifact.InputData", _InputData)
+    mocker.patch("training.artifact.Meridian", _Meridian)
+
+
+def test_save_artifact(meridian, tmp_path):
+    """Arrays are chunked by chain and draws, compressed, and described."""
+    save_artifact(meridian, tmp_path)
+
+    manifest = read_manifest(tmp_path)
+    assert set(manifest["inference_data"]) == {"posterior", "prior"}
+    assert manifest["inference_data"]["posterior"]["roi_m"]["shape"] == [2, 300, 3]
+    assert manifest["input_data"]["arrays"] == {"kpi": "kpi"}
+    assert manifest["input_data"]["attributes"] == {"kpi_type": "non_revenue"}
+    with h5netcdf.File(tmp_path / INFERENCE_DATA_FILENAME) as f:
+        variable = f["posterior"].variables["roi_m"]
+        assert variable.chunks == (1, DRAW_CHUNK, 3)
+        assert variable.compression == "gzip"
+
+
+def test_load_artifact(meridian, tmp_path):
+    """The model is restored, with its draws read lazily."""
+    save_artifact(meridian, tmp_path)
+
+    loaded = load_artifact(tmp_path)
+
+    assert loaded.model_spec == {"max_lag": 8}
+    assert loaded.input_data.kpi_type == "non_revenue"
+    assert loaded.input_data.media is None
+    xr.testing.assert_identical(loaded.input_data.kpi, meridian.input_data.kpi)
+    posterior = loaded.inference_data.posterior
+    assert not posterior["roi_m"].variable._in_memory
+    np.testing.assert_allclose(
+        posterior["roi_m"].mean(("chain", "draw")),
+        meridian.inference_data.posterior["roi_m"].mean(("chain", "draw")),
+    )
+
+
+def test_open_group(meridian, tmp_path):
+    """Single groups are opened without loading the model."""
+    save_artifact(meridian, tmp_path)
+
+    with open_group(tmp_path, "prior") as prior:
+        assert not prior["roi_m"].variable._in_memory
+        assert prior["roi_m"].shape == (1, 50, 3)
+    with pytest.raises(KeyError, match="no trace group"):
+        open_group(tmp_path, "trace")
+
+
+def test_read_manifest_checks_the_format_version(meridian, tmp_path):
+    path = save_artifact(meridian, tmp_path)
+    assert path == tmp_path / MANIFEST_FILENAME
+
+    path.write_text(json.dumps({**read_manifest(tmp_path), "format_version": 0}))
+
+    with pytest.raises(ValueError, match="Unsupported artifact format"):
+        read_manifest(tmp_path)
+
+
+def test_save_artifact_replaces_an_artifact(meridian, tmp_path, mocker):
+    """An artifact saved again is replaced as a whole, never partially."""
+    directory = tmp_path / "model"
+    save_artifact(meridian, directory)
+    (directory / "stale.nc").write_bytes(b"")
+
+    save_artifact(meridian, directory)
+    assert not (directory / "stale.nc").exists()
+    assert [path.name for path in tmp_path.iterdir()] == ["model"]
+
+    mocker.patch("training.artifact.pickle.dump", side_effect=OSError("Disk full"))
+    with pytest.raises(OSError, match="Disk full"):
+        save_artifact(meridian, directory)
+    assert read_manifest(directory)["format_version"] == 1
@@ -0,0 +1,95 @@
+import arviz as az
+import numpy as np
+import pytest
+
+from training.checkpoint import (
+    get_sampler_state,
+    load_checkpoint,
+    sample_posterior_checkpointed,
+    save_checkpoint,
+    split_segments,
+)
+
+N_CHAINS = 2
+CONFIG = {"n_chains": N_CHAINS, "n_keep": 10}
+
+
+def _draws(n_keep: int, start: float = 0.0) -> az.InferenceData:
+    """Posterior groups of `n_keep` draws of a scalar and a vector parameter."""
+    values = start + np.arange(N_CHAINS * n_keep, dtype=np.float32)
+    values = values.reshape(N_CHAINS, n_keep)
+    return az.from_dict(
+        posterior={"tau_g": values, "roi_m": np.stack([values, -values], axis=-1)},
+        sample_stats={"step_size": np.full((N_CHAINS, n_keep), 0.1 + start)},
+    )
+
+
+def test_split_segments():
+    """Segments cover the kept draws, with a shorter last one."""
+    assert split_segments(1000, 250) == [250, 250, 250, 250]
+    assert split_segments(1000, 300) == [300, 300, 300, 100]
+    assert split_segments(1000, None) == [1000]
+
+
+def test_checkpoint_round_trip(tmp_path):
+    """Checkpoints are only loaded with the configuration they were sampled with."""
+    assert load_checkpoint(tmp_path, CONFIG) is None
+
+    path = save_checkpoint(tmp_path, _draws(5), CONFIG)
+    draws = load_checkpoint(tmp_path, CONFIG)
+
+    assert path.exists()
+    np.testing.assert_array_equal(draws.posterior.tau_g, _draws(5).posterior.tau_g)
+    with pytest.raises(ValueError, match="does not match"):
+        load_checkpoint(tmp_path, {**CONFIG, "n_keep": 20})
+
+
+def test_get_sampler_state():
+    """Chains continue from their last draw, with their last step size."""
+    current_state, step_size = get_sampler_state(_draws(5))
+
+    np.testing.assert_array_equal(current_state["tau_g"], [4, 9])
+    assert current_state["roi_m"].shape == (N_CHAINS, 2)
+    assert step_size == pytest.approx(0.1)
+
+
+def test_sample_posterior_checkpointed_resumes(mocker, tmp_path):
+    """An interrupted sampling continues from its last checkpoint."""
+    meridian = mocker.MagicMock()
+
+    def _sample(meridian, n_keep, **kwargs):
+        meridian.inference_data = _draws(n_keep, start=100 * sample.call_count)
+
+    sample = mocker.patch(
+        "training.checkpoint.sample_posterior",
+        side_effect=_sample,
+    )
+    params = {
+        "checkpoint_dir": tmp_path,
+        "n_chains": N_CHAINS,
+        "n_adapt": 500,
+        "n_burnin": 500,
+        "n_keep": 10,
+        "segment_size": 4,
+        "seed": 42,
+    }
+
+    # Preempted after the checkpoint of the second segment
+    on_checkpoint = mocker.Mock(side_effect=[None, KeyboardInterrupt])
+    with pytest.raises(KeyboardInterrupt):
+        sample_posterior_checkpointed(meridian, on_checkpoint=on_checkpoint, **params)
+    assert sample.call_count == 2
+    first, second = (call.kwargs for call in sample.call_args_list)
+    assert (first["n_adapt"], first["n_burnin"], first["n_keep"]) == (500, 500, 4)
+    assert (second["n_adapt"], second["n_burnin"], second["n_keep"]) == (100, 0, 4)
+    np.testing.assert_array_equal(second["current_state"]["tau_g"], [103, 107])
+
+    with pytest.raises(ValueError, match="does not match"):
+        sample_posterior_checkpointed(meridian, resume=True, n_processes=2, **params)
+    sample_posterior_checkpointed(meridian, resume=True, **params)
+
+    assert sample.call_count == 3
+    last = sample.call_args.kwargs
+    assert last["n_keep"] == 2
+    assert last["seed"] not in (first["seed"], second["seed"])
+    assert meridian.inference_data.posterior.sizes["draw"] == 10
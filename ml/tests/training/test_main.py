@@ -1,5 +1,5 @@
 from training.main import main
-from utils.enums import KPIType
+from utils.enums import ArtifactFormat, KPIType, Stage
 
 
 def test_main(mocker):
@@ -69,9 +69,22 @@ def test_main(mocker):
         n_adapt=params["n_adapt"],
         n_burnin=params["n_burnin"],
         n_keep=params["n_keep"],
+        seed=None,
+        n_processes=1,
+        segment_size=None,
+        checkpoint_dir=None,
+        resume=False,
+        on_checkpoint=None,
+        current_state=None,
+        init_step_size=None,
+        dual_averaging_kwargs=None,
+        prior_store=None,
+        stage=Stage.ALL,
     )
 
     save.assert_called_once_with(
         meridian_model_mock,
         params["file_path"],
+        artifact_format=ArtifactFormat.PICKLE,
+        served_path=None,
     )
@@ -0,0 +1,27 @@
+from training.parallel import spawn_seeds, split_chains, split_cpus
+
+
+def test_split_chains():
+    """Chains are spread evenly, with at most one group per chain."""
+    assert split_chains(8, 4) == [2, 2, 2, 2]
+    assert split_chains(7, 3) == [3, 2, 2]
+    assert split_chains(2, 4) == [1, 1]
+    assert split_chains(4, 1) == [4]
+
+
+def test_split_cpus(mocker):
+    """CPU slices are contiguous and disjoint, or shared if too few CPUs."""
+    mocker.patch("os.sched_getaffinity", return_value=set(range(8)), create=True)
+
+    assert split_cpus(2) == [[0, 1, 2, 3], [4, 5, 6, 7]]
+    assert split_cpus(3) == [[0, 1, 2], [3, 4, 5], [6, 7]]
+    assert split_cpus(16) == [list(range(8))] * 16
+
+
+def test_spawn_seeds():
+    """Seeds of the groups are distinct, and derived from the sampling seed."""
+    seeds = spawn_seeds(42, 4)
+
+    assert len(set(seeds)) == 4
+    assert spawn_seeds(42, 4) == seeds
+    assert spawn_seeds(None, 3) == [None, None, None]
@@ -0,0 +1,98 @@
+import dataclasses
+
+import arviz as az
+import numpy as np
+import pytest
+import xarray as xr
+
+from training.prior_cache import (
+    DirectoryPriorStore,
+    compute_prior_fingerprint,
+    sample_prior,
+)
+
+
+class _LogNormal:
+    """Stands for a distribution of TensorFlow Probability."""
+
+    def __init__(self, loc: float, scale: float) -> None:
+        self.parameters = {"loc": np.float32(loc), "scale": np.float32(scale)}
+
+
+@dataclasses.dataclass(frozen=True)
+class _ModelSpec:
+    roi_m: _LogNormal
+    max_lag: int = 8
+
+
+@dataclasses.dataclass(frozen=True)
+class _InputData:
+    kpi_type: str
+    media_spend: xr.DataArray
+
+
+def _input_data(spend: float = 1.0, geos: tuple[str, ...] = ("a", "b")) -> _InputData:
+    media_spend = xr.DataArray(
+        np.full((len(geos), 3), spend),
+        coords={"geo": list(geos), "time": ["w1", "w2", "w3"]},
+        dims=("geo", "time"),
+    )
+    return _InputData(kpi_type="non_revenue", media_spend=media_spend)
+
+
+def _fingerprint(**overrides: object) -> str:
+    inputs = {
+        "model_spec": _ModelSpec(roi_m=_LogNormal(0.2, 0.9)),
+        "input_data": _input_data(),
+        "n_draws": 500,
+        "seed": 42,
+    }
+    return compute_prior_fingerprint(**{**inputs, **overrides})
+
+
+def test_fingerprint_is_stable():
+    """Equal inputs, built separately, have the same fingerprint."""
+    assert _fingerprint() == _fingerprint()
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {"model_spec": _ModelSpec(roi_m=_LogNormal(0.3, 0.9))},
+        {"model_spec": _ModelSpec(roi_m=_LogNormal(0.2, 0.9), max_lag=4)},
+        {"input_data": _input_data(spend=2.0)},
+        {"input_data": _input_data(geos=("a", "c"))},
+        {"n_draws": 100},
+        {"seed": 7},
+    ],
+)
+def test_fingerprint_changes_with_each_input(overrides: dict):
+    assert _fingerprint(**overrides) != _fingerprint()
+
+
+def test_sample_prior_reuses_stored_draws(mocker, tmp_path):
+    """Seeded prior draws are sampled once, then loaded from the store."""
+    store = DirectoryPriorStore(tmp_path)
+
+    def _sample_prior(n_draws, seed):
+        prior = az.from_dict(prior={"roi_m": np.full((1, n_draws), (seed or 0) / 100)})
+        meridian.inference_data.extend(prior, join="right")
+
+    meridian = mocker.MagicMock()
+    meridian.model_spec = _ModelSpec(roi_m=_LogNormal(0.2, 0.9))
+    meridian.input_data = _input_data()
+    meridian.inference_data = az.InferenceData()
+    meridian.sample_prior.side_effect = _sample_prior
+
+    sample_prior(meridian, n_draws=10, seed=42, store=store)
+    assert meridian.sample_prior.call_count == 1
+    assert len(list(tmp_path.glob("*.nc"))) == 1
+
+    meridian.inference_data = az.InferenceData()
+    sample_prior(meridian, n_draws=10, seed=42, store=store)
+    assert meridian.sample_prior.call_count == 1
+    np.testing.assert_allclose(meridian.inference_data.prior.roi_m, 0.42)
+
+    # Unseeded draws are random, so never cached
+    sample_prior(meridian, n_draws=10, store=store)
+    assert meridian.sample_prior.call_count == 2
@@ -0,0 +1,105 @@
+import arviz as az
+import numpy as np
+import pytest
+import xarray as xr
+
+from training.serving import (
+    SPEND_MULTIPLIERS,
+    extract_served_arrays,
+    save_served_arrays,
+)
+
+N_CHAINS, N_DRAWS = 2, 50
+
+
+class _Analyzer:
+    """Analyzer of a model of two media channels and a reach and frequency one,
+    with concave response curves."""
+
+    def __init__(self, meridian) -> None:
+        rng = np.random.default_rng(0)
+        self.meridian = meridian
+        self.effect = rng.lognormal(size=(N_CHAINS, N_DRAWS, 3))
+        self.expected = 1000 + rng.normal(size=(N_CHAINS, N_DRAWS))
+
+    def incremental_outcome(
+        self,
+        scaling_factor1: float,
+        include_non_paid_channels: bool,
+    ) -> np.ndarray:
+        assert not include_non_paid_channels
+        return self.effect * np.sqrt(scaling_factor1)
+
+    def expected_outcome(self, aggregate_geos: bool, aggregate_times: bool):
+        assert aggregate_geos
+        assert aggregate_times
+        return self.expected
+
+
+@pytest.fixture
+def meridian(mocker):
+    rng = np.random.default_rng(1)
+    meridian = mocker.MagicMock()
+    meridian.inference_data = az.from_dict(
+        posterior={"roi_m": rng.lognormal(size=(N_CHAINS, N_DRAWS, 2))},
+        coords={"media_channel": ["tv", "search"]},
+        dims={"roi_m": ["media_channel"]},
+    )
+    meridian.input_data.media_spend = xr.DataArray(
+        np.ones((2, 3, 2)) * [10.0, 5.0],
+        coords={"media_channel": ["tv", "search"]},
+        dims=("geo", "time", "media_channel"),
+    )
+    return meridian
+
+
+@pytest.fixture(autouse=True)
+def analyzer(mocker):
+    return mocker.patch("training.serving.Analyzer", side_effect=_Analyzer)
+
+
+def test_extract_served_arrays(meridian, analyzer):
+    """The response at the historical spend is the incremental outcome of the
+    analyzer, and adds up with the baseline to its expected outcome."""
+    arrays = extract_served_arrays(meridian)
+
+    analyzer.assert_called_once_with(meridian)
+    np.testing.assert_array_equal(arrays["channels"], ["tv", "search"])
+    np.testing.assert_array_equal(arrays["spend"], [60.0, 30.0])
+    assert arrays["roi"].shape == (N_CHAINS * N_DRAWS, 2)
+    assert arrays["response"].shape == (2, len(SPEND_MULTIPLIERS), N_CHAINS * N_DRAWS)
+
+    reference = _Analyzer(meridian)
+    current = np.flatnonzero(np.isclose(SPEND_MULTIPLIERS, 1.0))[0]
+    outcome = reference.incremental_outcome(
+        scaling_factor1=1.0,
+        include_non_paid_channels=False,
+    )
+    np.testing.assert_allclose(
+        arrays["response"][:, current],
+        outcome.reshape(N_CHAINS * N_DRAWS, 3)[:, :2].T,
+    )
+    np.testing.assert_allclose(
+        arrays["baseline"] + arrays["response"][:, current].sum(axis=0),
+        reference.expected.reshape(-1),
+    )
+    np.testing.assert_array_equal(arrays["response"][:, 0], 0)
+
+
+def test_save_served_arrays(meridian, tmp_path):
+    """Served arrays are read back without pickle."""
+    path = tmp_path / "model.npz"
+
+    save_served_arrays(meridian, path)
+
+    with np.load(path, allow_pickle=False) as served:
+        assert set(served.files) == {
+            "channels",
+            "multipliers",
+            "roi",
+            "spend",
+            "response",
+            "baseline",
+        }
+        assert served["channels"].tolist() == ["tv", "search"]
+        np.testing.assert_array_equal(served["multipliers"], SPEND_MULTIPLIERS)
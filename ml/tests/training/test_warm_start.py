@@ -0,0 +1,43 @@
+import arviz as az
+import numpy as np
+import pytest
+
+from training.warm_start import load_warm_start, match_chains
+
+
+def test_match_chains():
+    """Chains are reused cyclically when more are started."""
+    current_state = {"tau_g": np.array([1.0, 2.0]), "roi_m": np.ones((2, 5))}
+
+    matched = match_chains(current_state, 3)
+
+    np.testing.assert_array_equal(matched["tau_g"], [1.0, 2.0, 1.0])
+    assert matched["roi_m"].shape == (3, 5)
+    np.testing.assert_array_equal(match_chains(current_state, 1)["tau_g"], [1.0])
+
+
+def test_load_warm_start(mocker):
+    """The sampler starts from the last draws and step size of the model."""
+    values = np.arange(6, dtype=np.float32).reshape(2, 3)
+    meridian = mocker.MagicMock()
+    meridian.inference_data = az.from_dict(
+        posterior={"tau_g": values},
+        sample_stats={"step_size": np.array([[0.3, 0.2, 0.1], [0.3, 0.2, 0.3]])},
+    )
+    load_mmm = mocker.patch("training.warm_start.load_mmm", return_value=meridian)
+
+    current_state, init_step_size = load_warm_start("model.pkl", 4)
+
+    load_mmm.assert_called_once_with("model.pkl")
+    np.testing.assert_array_equal(current_state["tau_g"], [2, 5, 2, 5])
+    assert init_step_size == pytest.approx(0.2)
+
+
+def test_load_warm_start_without_posterior(mocker):
+    """Models only sampled from their prior cannot start a sampling."""
+    meridian = mocker.MagicMock()
+    meridian.inference_data = az.from_dict(prior={"tau_g": np.zeros((1, 3))})
+    mocker.patch("training.warm_start.load_mmm", return_value=meridian)
+
+    with pytest.raises(ValueError, match="no posterior draws"):
+        load_warm_start("model.pkl", 4)
@@ -0,0 +1,270 @@
+"""Model artifacts of chunked, compressed arrays, as an alternative to pickle.
+
+`save_mmm` pickles the whole `Meridian` object: loading it deserializes every
+draw into memory, even to read a single variable. An artifact is instead a
+directory of:
+
+- `inference_data.nc`: the groups of the inference data, as NetCDF groups of
+  zlib-compressed arrays, chunked by chain and by `DRAW_CHUNK` draws.
+- `input_data.nc`: the arrays of the input data, one NetCDF group each.
+- `model_spec.pkl`: the model specification. It is small, but holds
+  TensorFlow Probability distributions with no array format, so is pickled.
+- `manifest.json`: the format version, and the groups, variables, dimensions
+  and data types of the arrays, readable without opening them.
+
+NetCDF files are read lazily: a variable, or a slice of it, is only read
+from disk, one chunk at a time, when its values are used.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import pickle
+import shutil
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import arviz as az
+import xarray as xr
+from meridian.data.input_data import InputData
+from meridian.model.model import Meridian
+
+from training.logger import get_logger
+
+if TYPE_CHECKING:
+    import os
+
+logger = get_logger(__name__)
+
+FORMAT_VERSION = 1
+"""Version of the artifact format, to increase on incompatible changes."""
+
+MANIFEST_FILENAME = "manifest.json"
+INFERENCE_DATA_FILENAME = "inference_data.nc"
+INPUT_DATA_FILENAME = "input_data.nc"
+MODEL_SPEC_FILENAME = "model_spec.pkl"
+"""Names of the files of an artifact, in its directory."""
+
+DRAW_CHUNK = 256
+"""Number of draws per chunk of the arrays of the inference data."""
+
+COMPRESSION_LEVEL = 4
+"""Level of the zlib compression of the arrays, from 1 (fastest) to 9."""
+
+ENGINE = "h5netcdf"
+"""Library reading and writing the NetCDF files, also used by `arviz`."""
+
+
+def get_encoding(dataset: xr.Dataset) -> dict[str, dict[str, Any]]:
+    """Get the compression and chunking of the variables of a dataset.
+
+    Numeric variables are chunked by chain and by `DRAW_CHUNK` draws, whole
+    along their other dimensions. Other variables, such as strings, are
+    stored as is.
+
+    Args:
+        dataset: A group of the inference data, or an input data array.
+
+    Returns:
+        The encoding of each variable, for `xarray.Dataset.to_netcdf`.
+
+    """
+    encoding = {}
+    for name, variable in dataset.data_vars.items():
+        if variable.dtype.kind not in "biufc" or not variable.ndim:
+            continue
+        chunks = tuple(
+            1 if dim == "chain" else min(size, DRAW_CHUNK) if dim == "draw" else size
+            for dim, size in variable.sizes.items()
+        )
+        encoding[name] = {
+            "zlib": True,
+            "complevel": COMPRESSION_LEVEL,
+            "chunksizes": tuple(max(chunk, 1) for chunk in chunks),
+        }
+    return encoding
+
+
+def _describe_group(dataset: xr.Dataset) -> dict[str, Any]:
+    return {
+        name: {
+            "dims": list(variable.dims),
+            "shape": list(variable.shape),
+            "dtype": variable.dtype.str,
+        }
+        for name, variable in dataset.data_vars.items()
+    }
+
+
+def _write_groups(path: Path, groups: dict[str, xr.Dataset]) -> None:
+    mode = "w"
+    for group, dataset in groups.items():
+        dataset.to_netcdf(
+            path,
+            mode=mode,
+            group=group,
+            engine=ENGINE,
+            encoding=get_encoding(dataset),
+        )
+        mode = "a"
+
+
+def save_artifact(meridian: Meridian, directory: str | os.PathLike[str]) -> Path:
+    """Save a model as an artifact of chunked, compressed arrays.
+
+    The artifact is written to a directory next to it, then moved over the
+    artifact it replaces, like checkpoints: an interruption never leaves the
+    files of two models in a directory.
+
+    Args:
+        meridian: The trained model.
+        directory: The directory of the artifact, replaced if it exists.
+
+    Returns:
+        The path of the manifest of the artifact.
+
+    """
+    directory = Path(directory)
+    partial = directory.with_name(f".{directory.name}.partial")
+    previous = directory.with_name(f".{directory.name}.previous")
+    # Left by an interrupted save
+    shutil.rmtree(partial, ignore_errors=True)
+    partial.mkdir(parents=True)
+    _write_artifact(meridian, partial)
+
+    if directory.exists():
+        shutil.rmtree(previous, ignore_errors=True)
+        directory.replace(previous)
+        partial.replace(directory)
+        shutil.rmtree(previous)
+    else:
+        partial.replace(directory)
+    logger.info("Model artifact saved to %s", directory)
+    return directory / MANIFEST_FILENAME
+
+
+def _write_artifact(meridian: Meridian, directory: Path) -> None:
+    inference_data = meridian.inference_data
+    inference_groups = {
+        group: inference_data[group] for group in inference_data.groups()
+    }
+    _write_groups(directory / INFERENCE_DATA_FILENAME, inference_groups)
+
+    input_groups = {}
+    input_attrs = {}
+    for field in dataclasses.fields(meridian.input_data):
+        value = getattr(meridian.input_data, field.name)
+        if isinstance(value, xr.DataArray):
+            input_groups[field.name] = value.to_dataset(name=value.name or field.name)
+        elif value is not None:
+            input_attrs[field.name] = value
+    _write_groups(directory / INPUT_DATA_FILENAME, input_groups)
+
+    with (directory / MODEL_SPEC_FILENAME).open("wb") as f:
+        pickle.dump(meridian.model_spec, f)
+
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "draw_chunk": DRAW_CHUNK,
+        "inference_data": {
+            group: _describe_group(dataset)
+            for group, dataset in inference_groups.items()
+        },
+        "input_data": {
+            "arrays": {
+                field: next(iter(dataset.data_vars))
+                for field, dataset in input_groups.items()
+            },
+            "attributes": input_attrs,
+        },
+    }
+    # Written last: an artifact without manifest is incomplete
+    (directory / MANIFEST_FILENAME).write_text(json.dumps(manifest, indent=2))
+
+
+def read_manifest(directory: str | os.PathLike[str]) -> dict[str, Any]:
+    """Read the manifest of an artifact.
+
+    Args:
+        directory: The directory of the artifact.
+
+    Returns:
+        The manifest.
+
+    Raises:
+        FileNotFoundError: If the directory has no manifest, e.g. if the
+            artifact was not completely saved.
+        ValueError: If the artifact has an unsupported format version.
+
+    """
+    manifest = json.loads((Path(directory) / MANIFEST_FILENAME).read_text())
+    if manifest["format_version"] != FORMAT_VERSION:
+        msg = f"Unsupported artifact format version: {manifest['format_version']}"
+        raise ValueError(msg)
+    return manifest
+
+
+def open_group(directory: str | os.PathLike[str], group: str) -> xr.Dataset:
+    """Open a group of the inference data of an artifact, lazily.
+
+    Only the variables, and the slices of them, which are used are read,
+    e.g. `open_group(path, "posterior")["roi_m"].mean(("chain", "draw"))`.
+
+    Args:
+        directory: The directory of the artifact.
+        group: The group, such as `posterior`.
+
+    Returns:
+        The lazily loaded dataset of the group.
+
+    Raises:
+        KeyError: If the artifact has no such group.
+
+    """
+    manifest = read_manifest(directory)
+    if group not in manifest["inference_data"]:
+        msg = f"Artifact has no {group} group"
+        raise KeyError(msg)
+    return xr.open_dataset(
+        Path(directory) / INFERENCE_DATA_FILENAME,
+        group=group,
+        engine=ENGINE,
+    )
+
+
+def load_artifact(directory: str | os.PathLike[str], lazy: bool = True) -> Meridian:
+    """Load a model from an artifact.
+
+    Args:
+        directory: The directory of the artifact.
+        lazy: Whether to read the draws of the inference data when used,
+            rather than all at once. The input data is always read at once.
+
+    Returns:
+        The model.
+
+    """
+    directory = Path(directory)
+    manifest = read_manifest(directory)
+
+    input_path = directory / INPUT_DATA_FILENAME
+    arrays = {
+        field: xr.load_dataarray(input_path, group=field, engine=ENGINE).rename(name)
+        for field, name in manifest["input_data"]["arrays"].items()
+    }
+    input_data = InputData(**arrays, **manifest["input_data"]["attributes"])
+
+    with (directory / MODEL_SPEC_FILENAME).open("rb") as f:
+        model_spec = pickle.load(f)
+
+    with az.rc_context({"data.load": "lazy" if lazy else "eager"}):
+        inference_data = az.from_netcdf(
+            str(directory / INFERENCE_DATA_FILENAME),
+            engine=ENGINE,
+        )
+    return Meridian(
+        input_data=input_data,
+        model_spec=model_spec,
+        inference_data=inference_data,
+    )
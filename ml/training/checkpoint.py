@@ -0,0 +1,255 @@
+"""Posterior sampling by segments of kept draws, checkpointed after each one.
+
+A single `sample_posterior` call cannot be interrupted: a crash or preemption
+loses all of its draws. Here the kept draws are sampled by segments, and the
+draws accumulated so far are written to a checkpoint file after each segment.
+Resuming from the checkpoint skips the segments already sampled.
+
+Each segment after the first starts its chains from their last draw, already
+in the typical set, with the step size tuned by the previous segment: it needs
+no burn-in. The mass matrix of the sampler is not exposed by Meridian, so it
+is adapted again, over `READAPT_STEPS` steps at most.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from itertools import accumulate
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import arviz as az
+import numpy as np
+
+from training.logger import get_logger
+from training.parallel import get_posterior_groups, sample_posterior, spawn_seeds
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from meridian.model.model import Meridian
+
+logger = get_logger(__name__)
+
+CHECKPOINT_FILENAME = "posterior.nc"
+"""Name of the checkpoint file, in the checkpoint directory."""
+
+CONFIG_ATTR = "checkpoint_config"
+"""Attribute of the posterior group holding the sampling configuration."""
+
+READAPT_STEPS = 100
+"""Adaptation steps of the segments continuing from previous draws."""
+
+
+def split_segments(n_keep: int, segment_size: int | None) -> list[int]:
+    """Split the kept draws into segments.
+
+    Args:
+        n_keep: Number of draws kept per chain.
+        segment_size: Number of draws of each segment, the last one being
+            shorter (None for a single segment).
+
+    Returns:
+        The number of draws of each segment.
+
+    """
+    size = segment_size or n_keep
+    return [min(size, n_keep - start) for start in range(0, n_keep, size)]
+
+
+def save_checkpoint(
+    directory: Path,
+    draws: az.InferenceData,
+    config: dict[str, Any],
+) -> Path:
+    """Write the draws and their sampling configuration to a checkpoint file.
+
+    The file is written next to the checkpoint, then moved over it: an
+    interruption never leaves a partial checkpoint.
+
+    Args:
+        directory: The checkpoint directory, created if needed.
+        draws: The posterior groups of the draws sampled so far.
+        config: The sampling configuration, checked on resume.
+
+    Returns:
+        The path of the checkpoint file.
+
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / CHECKPOINT_FILENAME
+    partial = path.with_suffix(".partial")
+    draws.posterior.attrs[CONFIG_ATTR] = json.dumps(config, sort_keys=True)
+    draws.to_netcdf(str(partial))
+    partial.replace(path)
+    return path
+
+
+def load_checkpoint(directory: Path, config: dict[str, Any]) -> az.InferenceData | None:
+    """Read the draws of a checkpoint file.
+
+    Args:
+        directory: The checkpoint directory.
+        config: The sampling configuration, which must match the one of the
+            checkpoint.
+
+    Returns:
+        The posterior groups of the checkpointed draws, or None if there is no
+        checkpoint.
+
+    Raises:
+        ValueError: If the checkpoint was sampled with another configuration.
+
+    """
+    path = directory / CHECKPOINT_FILENAME
+    if not path.exists():
+        return None
+    # Loaded in memory, since the file is replaced by the next checkpoint
+    with az.rc_context({"data.load": "eager"}):
+        draws = az.from_netcdf(str(path))
+    saved = json.loads(draws.posterior.attrs.get(CONFIG_ATTR, "null"))
+    if saved != config:
+        msg = (
+            f"Checkpoint {path} was sampled with {saved}, which does not match {config}"
+        )
+        raise ValueError(msg)
+    return draws
+
+
+def get_sampler_state(
+    draws: az.InferenceData,
+) -> tuple[dict[str, np.ndarray], float | None]:
+    """Get the state from which to continue the chains of some draws.
+
+    Args:
+        draws: The posterior groups of the draws.
+
+    Returns:
+        The last draw of each chain, by parameter, and the median of the last
+        step sizes of the chains (None if the draws have no step sizes).
+
+    """
+    last = draws.posterior.isel(draw=-1)
+    current_state = {name: last[name].to_numpy() for name in last.data_vars}
+    step_sizes = (
+        draws.sample_stats.get("step_size")
+        if "sample_stats" in draws.groups()
+        else None
+    )
+    if step_sizes is None:
+        return current_state, None
+    return current_state, float(np.median(step_sizes.isel(draw=-1)))
+
+
+def sample_posterior_checkpointed(
+    meridian: Meridian,
+    checkpoint_dir: str | os.PathLike[str],
+    n_chains: int,
+    n_adapt: int,
+    n_burnin: int,
+    n_keep: int,
+    segment_size: int | None = None,
+    seed: int | None = None,
+    n_processes: int = 1,
+    resume: bool = False,
+    on_checkpoint: Callable[[Path], None] | None = None,
+    current_state: dict[str, np.ndarray] | None = None,
+    init_step_size: float | None = None,
+    dual_averaging_kwargs: dict[str, float] | None = None,
+) -> None:
+    """Sample the posterior of a model by segments, checkpointing each one.
+
+    Each segment has its own seed, derived from `seed`, from which the seeds
+    of the groups of chains of the processes are derived in turn: a resumed
+    sampling draws the same values as an uninterrupted one, and is thus only
+    resumed with the same number of processes.
+
+    Args:
+        meridian: The model, whose inference data is extended with the draws
+            of all the segments.
+        checkpoint_dir: The directory of the checkpoint file.
+        n_chains: Number of chains.
+        n_adapt: Number of adaptation steps of the first segment.
+        n_burnin: Number of burn-in steps of the first segment.
+        n_keep: Total number of draws kept per chain.
+        segment_size: Number of kept draws per segment (default: None, all
+            the draws in a single segment).
+        seed: Seed from which the seeds of the segments are derived.
+        n_processes: Number of processes, each sampling a group of chains.
+        resume: Whether to continue from the checkpoint of `checkpoint_dir`,
+            if any, instead of overwriting it.
+        on_checkpoint: Called with the path of the checkpoint file after each
+            segment, e.g. to copy it to a blob storage.
+        current_state: Initial state of each chain of the first segment
+            (default: None, drawn from the prior).
+        init_step_size: Initial step size of the first segment (default: None).
+        dual_averaging_kwargs: Arguments of the step size adaptation
+            (default: None).
+
+    Raises:
+        ValueError: If the checkpoint to resume was sampled with another
+            configuration.
+
+    """
+    directory = Path(checkpoint_dir)
+    config = {
+        "n_chains": n_chains,
+        "n_adapt": n_adapt,
+        "n_burnin": n_burnin,
+        "n_keep": n_keep,
+        "segment_size": segment_size,
+        "seed": seed,
+        "n_processes": n_processes,
+    }
+    segments = split_segments(n_keep, segment_size)
+    seeds = spawn_seeds(seed, len(segments))
+
+    draws = load_checkpoint(directory, config) if resume else None
+    n_kept = draws.posterior.sizes["draw"] if draws is not None else 0
+    if n_kept:
+        logger.info("Resuming from %d/%d kept draws", n_kept, n_keep)
+
+    for index, (start, size) in enumerate(
+        zip(accumulate(segments, initial=0), segments, strict=False),
+    ):
+        if start < n_kept:
+            continue
+        if draws is None:
+            kwargs: dict[str, Any] = {
+                "n_adapt": n_adapt,
+                "n_burnin": n_burnin,
+                "current_state": current_state,
+                "init_step_size": init_step_size,
+            }
+        else:
+            last_state, last_step_size = get_sampler_state(draws)
+            kwargs = {
+                "n_adapt": min(n_adapt, READAPT_STEPS),
+                "n_burnin": 0,
+                "current_state": last_state,
+                "init_step_size": last_step_size,
+            }
+        sample_posterior(
+            meridian,
+            n_processes=n_processes,
+            n_chains=n_chains,
+            n_keep=size,
+            dual_averaging_kwargs=dual_averaging_kwargs,
+            seed=seeds[index],
+            **kwargs,
+        )
+        segment = get_posterior_groups(meridian.inference_data)
+        draws = segment if draws is None else az.concat(draws, segment, dim="draw")
+
+        path = save_checkpoint(directory, draws, config)
+        logger.info(
+            "Checkpointed %d/%d kept draws to %s",
+            start + size,
+            n_keep,
+            path,
+        )
+        if on_checkpoint is not None:
+            on_checkpoint(path)
+
+    meridian.inference_data.extend(draws, join="right")
@@ -4,8 +4,15 @@ This module provides functions to load input data, prepare the model specificati
 train the model, and save the trained model.
 """
 
+from collections.abc import Callable
+from pathlib import Path
+
+from utils.enums import ArtifactFormat, Stage
+
 from .logger import get_logger
+from .prior_cache import PriorStore
 from .tasks import load, prepare, save, train
+from .warm_start import load_warm_start
 
 logger = get_logger(__name__)
 
@@ -32,11 +39,24 @@ def main(
     media_spend: list[str] | None = None,
     organic_media: list[str] | None = None,
     non_media_treatments: list[str] | None = None,
+    seed: int | None = None,
+    n_processes: int = 1,
+    segment_size: int | None = None,
+    checkpoint_dir: str | None = None,
+    resume: bool = False,
+    on_checkpoint: Callable[[Path], None] | None = None,
+    warm_start_path: str | None = None,
+    init_step_size: float | None = None,
+    dual_averaging_kwargs: dict[str, float] | None = None,
+    prior_store: PriorStore | None = None,
+    stage: Stage = Stage.ALL,
+    artifact_format: ArtifactFormat = ArtifactFormat.PICKLE,
+    served_path: str | None = None,
 ) -> None:
     """Load, prepare, train and save the Meridian model with the specified parameters.
 
     Args:
-        csv_path: Path to the CSV file containing input data.
+        csv_path: Path to the CSV or Parquet file containing input data.
         kpi_type: Type of KPI to analyze.
         time: Time column in the data.
         kpi: KPI column in the data.
@@ -57,6 +77,27 @@ def main(
         n_burnin: Number of burn-in steps for MCMC sampling.
         n_keep: Number of samples to keep after burn-in.
         file_path: Path to save the trained model.
+        seed: Seed of the prior and posterior sampling, for reproducible draws.
+        n_processes: Number of processes sampling groups of chains in parallel.
+        segment_size: Number of kept draws sampled between two checkpoints.
+        checkpoint_dir: Directory of the checkpoint of the posterior sampling,
+            if checkpointed.
+        resume: Whether to continue from the checkpoint of `checkpoint_dir`.
+        on_checkpoint: Called with the path of the checkpoint file after each
+            segment.
+        warm_start_path: Path to a previously trained model, whose last draws
+            and step size start the posterior sampling.
+        init_step_size: Initial step size of the sampler, overriding the one
+            of the warm start.
+        dual_averaging_kwargs: Arguments of the step size adaptation, such as
+            `target_accept_prob`.
+        prior_store: Store of the prior draws, reused by the runs with the same
+            specification, data and seed.
+        stage: Sampling stages to run: prior, posterior or both.
+        artifact_format: Format of the trained model: a pickle file, or a
+            directory of NetCDF arrays.
+        served_path: Path to save the arrays served by the API, as a `.npz`
+            file, if the model is served (see `training.serving`).
 
     Returns:
         None: The trained model is saved to the specified file path.
@@ -89,6 +130,12 @@ def main(
 
     logger.info("✅ Model specification prepared successfully.")
 
+    current_state = None
+    if warm_start_path is not None:
+        current_state, warm_step_size = load_warm_start(warm_start_path, n_chains)
+        init_step_size = init_step_size or warm_step_size
+        logger.info("✅ Warm start loaded successfully.")
+
     meridian = train(
         input_data=input_data,
         model_spec=model_spec,
@@ -97,10 +144,26 @@ def main(
         n_adapt=n_adapt,
         n_burnin=n_burnin,
         n_keep=n_keep,
+        seed=seed,
+        n_processes=n_processes,
+        segment_size=segment_size,
+        checkpoint_dir=checkpoint_dir,
+        resume=resume,
+        on_checkpoint=on_checkpoint,
+        current_state=current_state,
+        init_step_size=init_step_size,
+        dual_averaging_kwargs=dual_averaging_kwargs,
+        prior_store=prior_store,
+        stage=stage,
     )
 
     logger.info("✅ Meridian model trained successfully.")
 
-    save(meridian, file_path)
+    save(
+        meridian,
+        file_path,
+        artifact_format=artifact_format,
+        served_path=served_path,
+    )
 
     logger.info("✅ Trained model saved to %s", file_path)
@@ -0,0 +1,230 @@
+"""Posterior sampling of MCMC chain groups in separate processes.
+
+In a single process, all the chains share one TensorFlow runtime, and the
+speedup of adding chains on a many-core node is far below linear. Here the
+chains are split into groups, each sampled by its own process pinned to its
+own slice of the CPUs, with an independent seed. The posteriors of the groups
+are then concatenated along the `chain` dimension, as if sampled at once.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import pairwise
+from typing import TYPE_CHECKING, Any
+
+import arviz as az
+import numpy as np
+import tensorflow as tf
+from meridian.model.model import Meridian
+
+from training.logger import get_logger
+
+if TYPE_CHECKING:
+    from meridian.data.input_data import InputData
+    from meridian.model.spec import ModelSpec
+
+logger = get_logger(__name__)
+
+POSTERIOR_GROUPS = ("posterior", "sample_stats", "trace")
+"""Groups of the inference data added by `Meridian.sample_posterior`."""
+
+
+def get_posterior_groups(inference_data: az.InferenceData) -> az.InferenceData:
+    """Keep the groups of the inference data added by the posterior sampling."""
+    return az.InferenceData(
+        **{
+            group: inference_data[group]
+            for group in POSTERIOR_GROUPS
+            if group in inference_data.groups()
+        },
+    )
+
+
+def split_chains(n_chains: int, n_processes: int) -> list[int]:
+    """Split chains into groups of almost equal size, one per process.
+
+    Args:
+        n_chains: Total number of chains.
+        n_processes: Number of processes, capped to the number of chains.
+
+    Returns:
+        The number of chains of each group.
+
+    """
+    n_groups = max(1, min(n_chains, n_processes))
+    size, remainder = divmod(n_chains, n_groups)
+    return [size + (i < remainder) for i in range(n_groups)]
+
+
+def split_cpus(n_groups: int) -> list[list[int]]:
+    """Split the CPUs available to this process into contiguous slices.
+
+    Args:
+        n_groups: Number of slices. CPUs are shared if there are fewer of them.
+
+    Returns:
+        The CPU IDs of each slice.
+
+    """
+    cpus = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else []
+    cpus = cpus or list(range(os.cpu_count() or 1))
+    if len(cpus) < n_groups:
+        return [cpus] * n_groups
+    return [[int(cpu) for cpu in chunk] for chunk in np.array_split(cpus, n_groups)]
+
+
+def spawn_seeds(seed: int | None, n_groups: int) -> list[int | None]:
+    """Derive an independent seed for each chain group.
+
+    Args:
+        seed: The seed of the sampling (None for random draws).
+        n_groups: Number of chain groups.
+
+    Returns:
+        A seed per group, all None without a sampling seed.
+
+    """
+    if seed is None:
+        return [None] * n_groups
+    children = np.random.SeedSequence(seed).spawn(n_groups)
+    # Kept within the range of a signed 32-bit integer for TensorFlow
+    return [int(child.generate_state(1)[0] >> 1) for child in children]
+
+
+def _sample_chain_group(
+    input_data: InputData,
+    model_spec: ModelSpec,
+    cpus: list[int],
+    n_chains: int,
+    n_adapt: int,
+    n_burnin: int,
+    n_keep: int,
+    seed: int | None,
+    current_state: dict[str, np.ndarray] | None = None,
+    init_step_size: float | None = None,
+    dual_averaging_kwargs: dict[str, float] | None = None,
+) -> az.InferenceData:
+    """Sample a group of chains, in a worker process."""
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cpus)
+    tf.config.threading.set_intra_op_parallelism_threads(len(cpus))
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+    meridian = Meridian(input_data=input_data, model_spec=model_spec)
+    meridian.sample_posterior(
+        n_chains=n_chains,
+        n_adapt=n_adapt,
+        n_burnin=n_burnin,
+        n_keep=n_keep,
+        current_state=current_state,
+        init_step_size=init_step_size,
+        dual_averaging_kwargs=dual_averaging_kwargs,
+        seed=seed,
+    )
+    return get_posterior_groups(meridian.inference_data)
+
+
+def sample_posterior_parallel(
+    meridian: Meridian,
+    n_processes: int,
+    n_chains: int,
+    n_adapt: int,
+    n_burnin: int,
+    n_keep: int,
+    seed: int | None = None,
+    current_state: dict[str, np.ndarray] | None = None,
+    init_step_size: float | None = None,
+    dual_averaging_kwargs: dict[str, float] | None = None,
+) -> None:
+    """Sample the posterior of a model with chain groups in separate processes.
+
+    Each process builds its own model from the input data and specification
+    of `meridian`, so only these and the sampled groups cross process
+    boundaries. An initial state is split along its chains between the groups.
+
+    Args:
+        meridian: The model, whose inference data is extended with the
+            merged posterior.
+        n_processes: Number of processes, each sampling a group of chains.
+        n_chains: Total number of chains.
+        n_adapt: Number of adaptation steps of each chain.
+        n_burnin: Number of burn-in steps of each chain.
+        n_keep: Number of draws kept per chain.
+        seed: Seed from which the seeds of the groups are derived.
+        current_state: Initial state of each chain, by parameter, with the
+            chains along the first axis (default: None, drawn from the prior).
+        init_step_size: Initial step size of the sampler (default: None).
+        dual_averaging_kwargs: Arguments of the step size adaptation
+            (default: None).
+
+    """
+    groups = split_chains(n_chains, n_processes)
+    cpus = split_cpus(len(groups))
+    seeds = spawn_seeds(seed, len(groups))
+    bounds = np.cumsum([0, *groups])
+    states = [
+        {name: value[start:stop] for name, value in current_state.items()}
+        if current_state is not None
+        else None
+        for start, stop in pairwise(bounds)
+    ]
+    logger.info(
+        "Sampling %d chains in %d processes: %s",
+        n_chains,
+        len(groups),
+        groups,
+    )
+
+    with ProcessPoolExecutor(
+        max_workers=len(groups),
+        # Fresh interpreters: TensorFlow does not survive a fork
+        mp_context=multiprocessing.get_context("spawn"),
+        # One group per process, so each keeps its own CPU slice
+        max_tasks_per_child=1,
+    ) as executor:
+        futures = [
+            executor.submit(
+                _sample_chain_group,
+                meridian.input_data,
+                meridian.model_spec,
+                group_cpus,
+                group_chains,
+                n_adapt,
+                n_burnin,
+                n_keep,
+                group_seed,
+                group_state,
+                init_step_size,
+                dual_averaging_kwargs,
+            )
+            for group_chains, group_cpus, group_seed, group_state in zip(
+                groups,
+                cpus,
+                seeds,
+                states,
+                strict=True,
+            )
+        ]
+        results = [future.result() for future in futures]
+
+    # Chains are renumbered from 0 across the groups
+    merged = az.concat(*results, dim="chain") if len(results) > 1 else results[0]
+    meridian.inference_data.extend(merged, join="right")
+
+
+def sample_posterior(meridian: Meridian, n_processes: int = 1, **kwargs: Any) -> None:
+    """Sample the posterior of a model, in this process or by chain groups.
+
+    Args:
+        meridian: The model, whose inference data is extended with the posterior.
+        n_processes: Number of processes, each sampling a group of chains.
+        **kwargs: The arguments of `Meridian.sample_posterior`.
+
+    """
+    if n_processes > 1:
+        sample_posterior_parallel(meridian, n_processes=n_processes, **kwargs)
+    else:
+        meridian.sample_posterior(**kwargs)
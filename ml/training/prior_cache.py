@@ -0,0 +1,245 @@
+"""Cache of the prior draws, stored as artifacts keyed by a fingerprint.
+
+The prior draws of a model only depend on its specification, its input data
+and the seed of the sampling: a refit sampling its posterior again, with the
+same seed, can reuse the prior draws of a previous run. The draws are stored
+as NetCDF files, by a `PriorStore`, under the fingerprint of these inputs.
+
+The input data is hashed with its values, not only its coordinates: the prior
+draws of a model parameterized by ROI derive the media coefficients from the
+media data. Without a seed, prior draws are random, and are not cached.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import shutil
+import tempfile
+from collections.abc import Mapping
+from enum import Enum
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Protocol
+
+import arviz as az
+import numpy as np
+import xarray as xr
+
+from training.logger import get_logger
+
+if TYPE_CHECKING:
+    from meridian.data.input_data import InputData
+    from meridian.model.model import Meridian
+    from meridian.model.spec import ModelSpec
+
+logger = get_logger(__name__)
+
+FINGERPRINT_VERSION = 1
+"""Version of the prior inputs, to increase when the prior sampling changes."""
+
+PRIOR_GROUPS = ("prior",)
+"""Groups of the inference data added by `Meridian.sample_prior`."""
+
+PRIOR_FILENAME = "prior.nc"
+"""Name of the temporary files of the prior draws."""
+
+
+class PriorStore(Protocol):
+    """Storage of the prior draws, by fingerprint."""
+
+    def download(self, key: str, path: Path) -> bool:
+        """Copy the draws of a fingerprint to a file, if stored."""
+        ...
+
+    def upload(self, key: str, path: Path) -> None:
+        """Store the draws of a file under a fingerprint."""
+        ...
+
+
+@dataclasses.dataclass
+class DirectoryPriorStore:
+    """Store of the prior draws in a local directory."""
+
+    directory: Path
+
+    def download(self, key: str, path: Path) -> bool:
+        """Copy the draws of a fingerprint to a file, if stored."""
+        source = self.directory / f"{key}.nc"
+        if not source.exists():
+            return False
+        shutil.copyfile(source, path)
+        return True
+
+    def upload(self, key: str, path: Path) -> None:
+        """Store the draws of a file under a fingerprint."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        target = self.directory / f"{key}.nc"
+        partial = target.with_suffix(".partial")
+        shutil.copyfile(path, partial)
+        partial.replace(target)
+
+
+def _hash_array(values: Any) -> str:
+    array = np.ascontiguousarray(values)
+    digest = hashlib.sha256(f"{array.dtype.str}{array.shape}".encode())
+    if array.dtype.kind == "O":
+        digest.update(repr(array.tolist()).encode())
+    else:
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+def _describe(value: Any) -> Any:
+    """Describe a value with JSON types, arrays being hashed."""
+    if value is None or isinstance(value, str | bool | int | float):
+        return value
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, xr.DataArray):
+        return {
+            "dims": list(value.dims),
+            "coords": {
+                name: _hash_array(coord) for name, coord in value.coords.items()
+            },
+            "values": _hash_array(value.to_numpy()),
+        }
+    if isinstance(value, np.ndarray) or hasattr(value, "numpy"):
+        return _hash_array(value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {
+            field.name: _describe(getattr(value, field.name))
+            for field in dataclasses.fields(value)
+        }
+    if isinstance(getattr(value, "parameters", None), Mapping):
+        # Distributions and bijectors of TensorFlow Probability
+        return {"type": type(value).__name__, "parameters": _describe(value.parameters)}
+    if isinstance(value, Mapping):
+        return {str(key): _describe(item) for key, item in value.items()}
+    if isinstance(value, list | tuple):
+        return [_describe(item) for item in value]
+    return repr(value)
+
+
+def compute_prior_fingerprint(
+    model_spec: ModelSpec,
+    input_data: InputData,
+    n_draws: int,
+    seed: int,
+) -> str:
+    """Hash the inputs of the prior sampling.
+
+    Args:
+        model_spec: The model specification, with its prior distributions.
+        input_data: The input data of the model.
+        n_draws: Number of prior draws.
+        seed: Seed of the prior sampling.
+
+    Returns:
+        The SHA-256 hex digest of the inputs.
+
+    """
+    inputs = {
+        "version": FINGERPRINT_VERSION,
+        "model_spec": _describe(model_spec),
+        "input_data": _describe(input_data),
+        "n_draws": n_draws,
+        "seed": seed,
+    }
+    payload = json.dumps(inputs, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def load_prior(meridian: Meridian, store: PriorStore, key: str) -> bool:
+    """Add the stored prior draws of a fingerprint to a model.
+
+    Args:
+        meridian: The model, whose inference data is extended with the draws.
+        store: The store of the prior draws.
+        key: The fingerprint of the prior inputs.
+
+    Returns:
+        Whether draws were stored for the fingerprint.
+
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / PRIOR_FILENAME
+        if not store.download(key, path):
+            return False
+        # Loaded in memory, since the file is deleted with its directory
+        with az.rc_context({"data.load": "eager"}):
+            prior = az.from_netcdf(str(path))
+    meridian.inference_data.extend(prior, join="right")
+    return True
+
+
+def save_prior(meridian: Meridian, store: PriorStore, key: str) -> None:
+    """Store the prior draws of a model under a fingerprint.
+
+    Args:
+        meridian: The model, with prior draws.
+        store: The store of the prior draws.
+        key: The fingerprint of the prior inputs.
+
+    """
+    inference_data = meridian.inference_data
+    prior = az.InferenceData(
+        **{
+            group: inference_data[group]
+            for group in PRIOR_GROUPS
+            if group in inference_data.groups()
+        },
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / PRIOR_FILENAME
+        prior.to_netcdf(str(path))
+        store.upload(key, path)
+
+
+def get_prior_key(
+    meridian: Meridian,
+    n_draws: int,
+    seed: int | None,
+    store: PriorStore | None,
+) -> str | None:
+    """Get the fingerprint of the prior draws of a model, if cacheable.
+
+    Returns:
+        The fingerprint, or None without a store or a seed.
+
+    """
+    if store is None or seed is None:
+        return None
+    return compute_prior_fingerprint(
+        meridian.model_spec,
+        meridian.input_data,
+        n_draws,
+        seed,
+    )
+
+
+def sample_prior(
+    meridian: Meridian,
+    n_draws: int,
+    seed: int | None = None,
+    store: PriorStore | None = None,
+) -> None:
+    """Sample the prior of a model, or reuse its stored draws.
+
+    Args:
+        meridian: The model, whose inference data is extended with the draws.
+        n_draws: Number of prior draws.
+        seed: Seed of the prior sampling. Draws are only cached with a seed.
+        store: The store of the prior draws (default: None, no cache).
+
+    """
+    key = get_prior_key(meridian, n_draws, seed, store)
+    if key is not None and load_prior(meridian, store, key):
+        logger.info("Prior draws %s reused from the cache", key)
+        return
+    meridian.sample_prior(n_draws=n_draws, seed=seed)
+    if key is not None:
+        save_prior(meridian, store, key)
+        logger.info("Prior draws %s stored in the cache", key)
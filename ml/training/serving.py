@@ -0,0 +1,113 @@
+"""Arrays of a trained model served by the API.
+
+The API serves the ROI of the media channels of the deployed models, and
+predicts the outcome of what-if scenarios of their media spend, without
+`meridian`: the arrays it reads are extracted here, once the model is
+trained, and saved next to it as a NumPy `.npz` file (see
+`app.lib.model_serving` in the API).
+
+The `.npz` file holds, with the draws of all the chains flattened:
+
+- `channels`: the media channels.
+- `multipliers`: the `SPEND_MULTIPLIERS` of the response curves.
+- `roi`: the draws of the ROI of each channel, of shape (draws, channels).
+- `spend`: the historical spend of each channel, of shape (channels,).
+- `response`: the draws of the incremental outcome of each channel at each
+  multiplier of its spend, of shape (channels, multipliers, draws).
+- `baseline`: the draws of the outcome without media spend, of shape (draws,).
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+from meridian.analysis.analyzer import Analyzer
+
+from training.logger import get_logger
+
+if TYPE_CHECKING:
+    import os
+
+    from meridian.model.model import Meridian
+
+logger = get_logger(__name__)
+
+MAX_SPEND_MULTIPLIER = 3.0
+"""Largest spend of a channel in a scenario, relative to its historical spend."""
+
+SPEND_MULTIPLIERS = np.linspace(0.0, MAX_SPEND_MULTIPLIER, 31)
+"""Spend multipliers at which the response curves of the channels are served."""
+
+
+def _flatten_draws(values: Any) -> np.ndarray:
+    """Flatten the chain and draw axes of an array of posterior draws."""
+    array = np.asarray(values, dtype=np.float64)
+    return array.reshape(-1, *array.shape[2:])
+
+
+def extract_served_arrays(meridian: Meridian) -> dict[str, np.ndarray]:
+    """Extract the arrays served by the API from a trained model.
+
+    The response curves of the channels are computed over all the posterior
+    draws, with the analyzer of Meridian: the media of a channel is scaled by
+    each multiplier over all geos and times, at a constant cost per media
+    unit, like in the budget optimizer of Meridian.
+
+    Args:
+        meridian: The trained model, with posterior draws.
+
+    Returns:
+        The arrays of the `.npz` file, by name.
+
+    """
+    posterior = meridian.inference_data.posterior
+    roi = posterior["roi_m"].stack(sample=("chain", "draw"))
+    roi = roi.transpose("sample", "media_channel")
+    channels = [str(channel) for channel in roi["media_channel"].values]
+
+    media_spend = meridian.input_data.media_spend
+    spend = media_spend.sum(
+        [dim for dim in media_spend.dims if dim != "media_channel"],
+    ).sel(media_channel=channels)
+
+    analyzer = Analyzer(meridian)
+    shape = (len(channels), len(SPEND_MULTIPLIERS), roi.sizes["sample"])
+    response = np.zeros(shape)
+    for i, multiplier in enumerate(SPEND_MULTIPLIERS[1:], start=1):
+        outcome = analyzer.incremental_outcome(
+            scaling_factor1=float(multiplier),
+            include_non_paid_channels=False,
+        )
+        # Paid channels are the media channels, then the reach and frequency
+        # channels
+        response[:, i] = _flatten_draws(outcome)[:, : len(channels)].T
+    expected = analyzer.expected_outcome(aggregate_geos=True, aggregate_times=True)
+    current = np.flatnonzero(np.isclose(SPEND_MULTIPLIERS, 1.0))[0]
+    return {
+        "channels": np.array(channels),
+        "multipliers": SPEND_MULTIPLIERS,
+        "roi": np.ascontiguousarray(roi.to_numpy(), dtype=np.float64),
+        "spend": spend.to_numpy().astype(np.float64),
+        "response": response,
+        "baseline": _flatten_draws(expected) - response[:, current].sum(axis=0),
+    }
+
+
+def save_served_arrays(meridian: Meridian, path: str | os.PathLike[str]) -> None:
+    """Save the arrays served by the API of a trained model to a `.npz` file.
+
+    Args:
+        meridian: The trained model, with posterior draws.
+        path: The path of the file.
+
+    """
+    arrays = extract_served_arrays(meridian)
+    with Path(path).open("wb") as f:
+        np.savez(f, **arrays)
+    logger.info(
+        "Served arrays of %d channels saved to %s",
+        len(arrays["channels"]),
+        path,
+    )
@@ -1,15 +1,33 @@
 """Save the Meridian model.
 
-This module provides functions to save the trained Meridian model to a file.
+This module provides functions to save the trained Meridian model to a file,
+pickled, or to a directory of chunked, compressed arrays (see
+`training.artifact`), and the arrays served by the API (see `training.serving`).
 """
 
 from meridian.model.model import Meridian, save_mmm
 
+from training.artifact import save_artifact
 from training.logger import get_logger
+from training.serving import save_served_arrays
+from utils.enums import ArtifactFormat
 
 logger = get_logger(__name__)
 
 
-def task(meridian: Meridian, file_path: str) -> None:
-    """Save the Meridian model to a file."""
-    save_mmm(meridian, file_path)
+def task(
+    meridian: Meridian,
+    file_path: str,
+    artifact_format: ArtifactFormat = ArtifactFormat.PICKLE,
+    served_path: str | None = None,
+) -> None:
+    """Save the Meridian model to a file, or to an artifact directory.
+
+    With a `served_path`, the arrays served by the API are saved there too.
+    """
+    if artifact_format == ArtifactFormat.NETCDF:
+        save_artifact(meridian, file_path)
+    else:
+        save_mmm(meridian, file_path)
+    if served_path is not None:
+        save_served_arrays(meridian, served_path)
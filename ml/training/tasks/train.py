@@ -4,11 +4,27 @@ This module provides functions to train the Meridian model using input data
 and model specifications.
 """
 
-from meridian.data.input_data import InputData
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
 from meridian.model.model import Meridian
-from meridian.model.spec import ModelSpec
 
+from training.checkpoint import sample_posterior_checkpointed
 from training.logger import get_logger
+from training.parallel import sample_posterior
+from training.prior_cache import get_prior_key, load_prior, sample_prior
+from utils.enums import Stage
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+    import numpy as np
+    from meridian.data.input_data import InputData
+    from meridian.model.spec import ModelSpec
+
+    from training.prior_cache import PriorStore
 
 logger = get_logger(__name__)
 
@@ -21,17 +37,71 @@ def task(
     n_adapt: int,
     n_burnin: int,
     n_keep: int,
+    seed: int | None = None,
+    n_processes: int = 1,
+    segment_size: int | None = None,
+    checkpoint_dir: str | None = None,
+    resume: bool = False,
+    on_checkpoint: Callable[[Path], None] | None = None,
+    current_state: dict[str, np.ndarray] | None = None,
+    init_step_size: float | None = None,
+    dual_averaging_kwargs: dict[str, float] | None = None,
+    prior_store: PriorStore | None = None,
+    stage: Stage = Stage.ALL,
 ):
     """Run the Meridian model with the given parameters.
 
+    With a `seed`, the prior and posterior draws are reproducible. With more
+    than one process, the chains are sampled by groups in separate processes
+    (see `training.parallel`), each with a seed derived from `seed`. With a
+    `checkpoint_dir`, the kept draws are sampled by segments of `segment_size`
+    and checkpointed after each one, and `resume` continues from the last
+    checkpoint (see `training.checkpoint`). With a `current_state`, the
+    chains start from it instead of prior draws (see `training.warm_start`).
+
+    With a `prior_store` and a `seed`, the prior draws are reused from the
+    store when cached, and cached otherwise (see `training.prior_cache`). The
+    `stage` runs the prior or the posterior sampling only: the posterior stage
+    still adds the cached prior draws to the model, when there are some.
+
     Source: https://developers.google.com/meridian/docs/user-guide/run-model
     """
     meridian = Meridian(input_data=input_data, model_spec=model_spec)
-    meridian.sample_prior(n_draws=n_draws)
-    meridian.sample_posterior(
-        n_chains=n_chains,
-        n_adapt=n_adapt,
-        n_burnin=n_burnin,
-        n_keep=n_keep,
-    )
+    if stage != Stage.POSTERIOR:
+        sample_prior(meridian, n_draws=n_draws, seed=seed, store=prior_store)
+    elif key := get_prior_key(meridian, n_draws, seed, prior_store):
+        load_prior(meridian, prior_store, key)
+    if stage == Stage.PRIOR:
+        return meridian
+
+    if checkpoint_dir is not None:
+        sample_posterior_checkpointed(
+            meridian,
+            checkpoint_dir=checkpoint_dir,
+            n_chains=n_chains,
+            n_adapt=n_adapt,
+            n_burnin=n_burnin,
+            n_keep=n_keep,
+            segment_size=segment_size,
+            seed=seed,
+            n_processes=n_processes,
+            resume=resume,
+            on_checkpoint=on_checkpoint,
+            current_state=current_state,
+            init_step_size=init_step_size,
+            dual_averaging_kwargs=dual_averaging_kwargs,
+        )
+    else:
+        sample_posterior(
+            meridian,
+            n_processes=n_processes,
+            n_chains=n_chains,
+            n_adapt=n_adapt,
+            n_burnin=n_burnin,
+            n_keep=n_keep,
+            current_state=current_state,
+            init_step_size=init_step_size,
+            dual_averaging_kwargs=dual_averaging_kwargs,
+            seed=seed,
+        )
     return meridian
@@ -0,0 +1,74 @@
+"""Warm start of the posterior sampling from a previously trained model.
+
+A refit on updated data starts its chains from the last draws of a previous
+model, close to the new posterior, with the step size tuned by its sampler:
+far fewer adaptation and burn-in steps are needed than from prior draws.
+
+The previous model must have the same parameters, with the same shapes: same
+channels, geos and knots.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+from meridian.model.model import load_mmm
+
+from training.checkpoint import get_sampler_state
+from training.logger import get_logger
+from training.parallel import get_posterior_groups
+
+logger = get_logger(__name__)
+
+
+def match_chains(
+    current_state: dict[str, np.ndarray],
+    n_chains: int,
+) -> dict[str, np.ndarray]:
+    """Reuse the chains of a state for another number of chains.
+
+    Args:
+        current_state: The state of each chain, by parameter, with the chains
+            along the first axis.
+        n_chains: The number of chains to start.
+
+    Returns:
+        The state of `n_chains` chains, taken cyclically from the given ones.
+
+    """
+    return {
+        name: np.take(value, np.arange(n_chains) % len(value), axis=0)
+        for name, value in current_state.items()
+    }
+
+
+def load_warm_start(
+    file_path: str,
+    n_chains: int,
+) -> tuple[dict[str, np.ndarray], float | None]:
+    """Get the initial state of the sampler from a trained model.
+
+    Args:
+        file_path: Path of the trained model, saved with `save_mmm`.
+        n_chains: The number of chains to start.
+
+    Returns:
+        The initial state of each chain, by parameter, and the initial step
+        size (None if the model has no step sizes).
+
+    Raises:
+        ValueError: If the model has no posterior draws.
+
+    """
+    meridian = load_mmm(file_path)
+    if "posterior" not in meridian.inference_data.groups():
+        msg = f"Model {file_path} has no posterior draws to start from"
+        raise ValueError(msg)
+    current_state, init_step_size = get_sampler_state(
+        get_posterior_groups(meridian.inference_data),
+    )
+    logger.info(
+        "Warm start from %s, with a step size of %s",
+        file_path,
+        init_step_size,
+    )
+    return match_chains(current_state, n_chains), init_step_size
@@ -37,7 +37,9 @@ N_CHAINS = 4
 N_ADAPT = 500
 N_BURNIN = 500
 N_KEEP = 1000
+SEGMENT_SIZE = 250
 
 ROI_M = _constants.ROI_M
 
 OUTPUT_FILENAME = "meridian_training_output.pkl"
+OUTPUT_DIRNAME = "meridian_training_output"
@@ -8,3 +8,18 @@ class KPIType(str, Enum):
 
     REVENUE = "revenue"
     NON_REVENUE = "non-revenue"
+
+
+class Stage(str, Enum):
+    """Enum for the sampling stages of a training."""
+
+    ALL = "all"
+    PRIOR = "prior"
+    POSTERIOR = "posterior"
+
+
+class ArtifactFormat(str, Enum):
+    """Enum for the file formats of the trained models."""
+
+    PICKLE = "pickle"
+    NETCDF = "netcdf"